@@ -0,0 +1,63 @@
+"""
+autobuild.py
+
+Times the branch-and-bound "build for me" search on a large catalog and reports how much of
+the build space it covers.
+
+Usage:
+    python3 benchmarks/autobuild.py [parts_per_category] [budget]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from src.autobuild import find_best_build # pylint: disable=import-error, wrong-import-position
+from src.buildspace import BuildSpace # pylint: disable=import-error, wrong-import-position
+from src.inventory import CPU, GPU, RAM, PSU, Motherboard, Storage, Inventory # pylint: disable=import-error, wrong-import-position
+
+SOCKETS = ("LGA1700", "AM4", "AM5", "LGA1200")
+
+def build_catalog(count):
+    """Returns an Inventory with `count` parts of every category."""
+    inventory = Inventory()
+    for number in range(count):
+        socket = SOCKETS[number % len(SOCKETS)]
+        inventory.add_item(CPU(f"CPU_{number}", "Processor", 100 + number % 700,
+                               65 + number % 190, socket))
+        inventory.add_item(Motherboard(f"MB_{number}", "Board", 90 + number % 300, 30 + number % 40,
+                                       SOCKETS[(number // 3) % len(SOCKETS)],
+                                       (2, 4, 8)[number % 3]))
+        inventory.add_item(RAM(f"RAM_{number}", "Memory", 30 + number % 200, 3 + number % 12,
+                               8 << number % 3))
+        inventory.add_item(Storage(f"STO_{number}", "Drive", 40 + number % 250,
+                                   250 * (1 + number % 16)))
+        inventory.add_item(GPU(f"GPU_{number}", "Graphics", 150 + number % 900,
+                               75 + number % 300, number % 2 == 0))
+        inventory.add_item(PSU(f"PSU_{number}", "Power", 40 + number % 160,
+                               300 + 50 * (number % 15)))
+    return inventory
+
+def main():
+    """Prints the search time and result for both objectives."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    budget = int(sys.argv[2]) if len(sys.argv) > 2 else 1500
+    inventory = build_catalog(count)
+
+    start = time.perf_counter()
+    space = BuildSpace(inventory)
+    print(f"Parts per category: {count:,}; build space prepared in "
+          f"{time.perf_counter() - start:.2f} s")
+    for objective in ("ram", "storage"):
+        start = time.perf_counter()
+        result = find_best_build(inventory, budget, objective, space=space)
+        elapsed = time.perf_counter() - start
+        if result is None:
+            print(f"{objective:>8}: no build within {budget} ({elapsed:.2f} s)")
+            continue
+        print(f"{objective:>8}: value {result['value']:,} for ${result['price']:,} in "
+              f"{elapsed:.2f} s ({'exhaustive' if result['complete'] else 'time limit hit'})")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+columnar_memory.py
+
+Compares the memory held by the object-per-part `Inventory` with `ColumnarInventory` for a
+synthetic catalog.
+
+Usage:
+    python3 benchmarks/columnar_memory.py [item_count]
+"""
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from src.columnar import ColumnarInventory # pylint: disable=import-error, wrong-import-position
+from src.inventory import Inventory, create_item # pylint: disable=import-error, wrong-import-position
+
+def synthetic_entries(item_count):
+    """Yields `item_count` item dictionaries spread evenly over the six part types."""
+    for number in range(item_count):
+        kind = number % 6
+        base = {"id": f"PART_{number:07d}", "name": f"Synthetic Part {number}",
+                "price": 50 + number % 950}
+        if kind == 0:
+            yield {**base, "type": "CPU", "power_draw": 65 + number % 200,
+                   "socket": ("LGA", "PGA", "AM5")[number % 3]}
+        elif kind == 1:
+            yield {**base, "type": "GPU", "power_draw": 150 + number % 300,
+                   "overclockable": bool(number % 2)}
+        elif kind == 2:
+            yield {**base, "type": "RAM", "power_draw": 5, "capacity": 8 << (number % 4)}
+        elif kind == 3:
+            yield {**base, "type": "PSU", "power_supplied": 450 + 50 * (number % 20)}
+        elif kind == 4:
+            yield {**base, "type": "Motherboard", "power_draw": 40,
+                   "socket": ("LGA", "PGA", "AM5")[number % 3], "ram_slots": 2 << (number % 2)}
+        else:
+            yield {**base, "type": "Storage", "capacity": 256 << (number % 5)}
+
+def measure(inventory_class, item_count):
+    """Returns the bytes still allocated after loading `item_count` parts."""
+    tracemalloc.start()
+    inventory = inventory_class()
+    for item_data in synthetic_entries(item_count):
+        inventory.add_item(create_item(item_data))
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del inventory
+    return allocated
+
+def main():
+    """Prints the memory used by each backend."""
+    item_count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    object_bytes = measure(Inventory, item_count)
+    columnar_bytes = measure(ColumnarInventory, item_count)
+
+    print(f"Items:             {item_count:,}")
+    print(f"Inventory:         {object_bytes / 2**20:8.1f} MiB "
+          f"({object_bytes / item_count:.0f} B/item)")
+    print(f"ColumnarInventory: {columnar_bytes / 2**20:8.1f} MiB "
+          f"({columnar_bytes / item_count:.0f} B/item)")
+    print(f"Reduction:         {1 - columnar_bytes / object_bytes:.0%}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+combinations.py
+
+Times the vectorized CPU x Motherboard x RAM x PSU evaluation against checking the same rules
+one combination at a time in Python.
+
+Usage:
+    python3 benchmarks/combinations.py [parts_per_category]
+"""
+import itertools
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from src.combinations import count_valid_combinations # pylint: disable=import-error, wrong-import-position
+from src.inventory import CPU, RAM, PSU, Motherboard, Inventory # pylint: disable=import-error, wrong-import-position
+
+SOCKETS = ("LGA1700", "AM4", "AM5", "LGA1200")
+
+def build_catalog(count):
+    """Returns an Inventory with `count` CPUs, motherboards, RAM sticks and PSUs."""
+    inventory = Inventory()
+    for number in range(count):
+        socket = SOCKETS[number % len(SOCKETS)]
+        inventory.add_item(CPU(f"CPU_{number}", "Processor", 100 + number % 700,
+                               65 + number % 190, socket))
+        inventory.add_item(Motherboard(f"MB_{number}", "Board", 90 + number % 300, 30 + number % 40,
+                                       SOCKETS[(number // 3) % len(SOCKETS)],
+                                       (2, 4, 8)[number % 3]))
+        inventory.add_item(RAM(f"RAM_{number}", "Memory", 30 + number % 200, 3 + number % 12,
+                               8 << number % 3))
+        inventory.add_item(PSU(f"PSU_{number}", "Power", 40 + number % 160,
+                               300 + 50 * (number % 15)))
+    return inventory
+
+def python_count(inventory, limit):
+    """Checks the first `limit` combinations (by CPU) one at a time."""
+    count = 0
+    cpus = list(inventory.get_items_by_type("CPU"))[:limit]
+    for cpu, board, ram, psu in itertools.product(
+            cpus, inventory.get_items_by_type("Motherboard"),
+            inventory.get_items_by_type("RAM"), inventory.get_items_by_type("PSU")):
+        if cpu.socket != board.socket:
+            continue
+        for dimm_count in range(1, board.ram_slots + 1):
+            if psu.power_supplied >= cpu.power_draw + board.power_draw + dimm_count * ram.power_draw:
+                count += 1
+    return count, len(cpus)
+
+def main():
+    """Prints both timings; the Python loop is run on a slice and extrapolated."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    inventory = build_catalog(count)
+    print(f"Parts per category: {count:,} ({count ** 4:,} CPU/MB/RAM/PSU products)")
+
+    start = time.perf_counter()
+    valid = count_valid_combinations(inventory)
+    print(f"Vectorized:  {time.perf_counter() - start:8.2f} s, {valid:,} valid combinations")
+
+    start = time.perf_counter()
+    _, cpus_checked = python_count(inventory, max(1, count // 50))
+    elapsed = (time.perf_counter() - start) * count / cpus_checked
+    print(f"Python loop: {elapsed:8.2f} s (extrapolated from {cpus_checked} CPU(s))")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+database_startup.py
+
+Times loading a synthetic catalog from JSON against importing it into SQLite once and then
+opening the database and answering a lookup, a category listing and a socket query.
+
+Usage:
+    python3 benchmarks/database_startup.py [item_count]
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from columnar_memory import synthetic_entries # pylint: disable=import-error, wrong-import-position
+from src.database import import_inventory, open_database # pylint: disable=import-error, wrong-import-position
+from src.loader import load_inventory_file # pylint: disable=import-error, wrong-import-position
+
+def main():
+    """Writes a synthetic catalog and prints the time taken by each loading path."""
+    item_count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    with tempfile.TemporaryDirectory() as directory:
+        inventory_file = os.path.join(directory, "inventory.json")
+        with open(inventory_file, 'w', encoding='utf-8') as file:
+            json.dump({"inventory": [{"item": entry}
+                                     for entry in synthetic_entries(item_count)]}, file)
+
+        start = time.perf_counter()
+        load_inventory_file(inventory_file)
+        json_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        import_inventory(inventory_file)
+        import_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        database = open_database(inventory_file)
+        database.get_item(f"PART_{item_count - 1:07d}")
+        open_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        listed = len(database.get_items_by_type("PSU"))
+        list_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        lookups = 10_000
+        for number in range(lookups):
+            database.get_item(f"part_{number * 7 % item_count:07d}")
+        lookup_seconds = (time.perf_counter() - start) / lookups
+        database.close()
+
+    print(f"Items:                     {item_count:,}")
+    print(f"JSON load:                 {json_seconds * 1000:10.1f} ms")
+    print(f"SQLite import (once):      {import_seconds * 1000:10.1f} ms")
+    print(f"SQLite open + 1 lookup:    {open_seconds * 1000:10.1f} ms")
+    print(f"List {listed:,} PSUs:          {list_seconds * 1000:10.1f} ms")
+    print(f"Lookup by ID:              {lookup_seconds * 1e6:10.1f} us")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+headless.py
+
+Measures how many commands per second the headless command mode sustains on a large catalog,
+with a mix of lookups, compatibility checks, build edits and cart operations.
+
+Usage:
+    python3 benchmarks/headless.py [parts_per_category] [commands]
+"""
+import io
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from autobuild import build_catalog # pylint: disable=import-error, wrong-import-position
+from src.headless import run_commands # pylint: disable=import-error, wrong-import-position
+
+def command_stream(count, parts, seed=0, session_length=40):
+    """
+    Returns `count` commands touching random parts of the catalog, as a series of shopping
+    sessions that each start from an empty build and cart.
+    """
+    generator = random.Random(seed)
+    prefixes = ("CPU", "MB", "RAM", "STO", "GPU", "PSU")
+    commands = ["budget 3000"]
+    while len(commands) < count:
+        if len(commands) % session_length == 0:
+            commands.extend(["build clear", "cart clear"])
+            continue
+        part_id = f"{generator.choice(prefixes)}_{generator.randrange(parts)}".lower()
+        other = f"{generator.choice(prefixes)}_{generator.randrange(parts)}".lower()
+        commands.append(generator.choice((
+            f"details {part_id}",
+            f"compat {part_id},{other}",
+            f"build add {part_id}",
+            "build check",
+            f"cart add {part_id}",
+            f"cart remove {part_id}",
+            "cart show",
+        )))
+    return commands
+
+def main():
+    """Prints the throughput of the command stream."""
+    parts = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 50000
+    inventory = build_catalog(parts)
+    commands = command_stream(count, parts)
+
+    output = io.StringIO()
+    start = time.perf_counter()
+    counts = run_commands(inventory, commands, output)
+    elapsed = time.perf_counter() - start
+    print(f"{count:,} commands on {parts:,} parts per category in {elapsed:.2f} s "
+          f"({count / elapsed:,.0f} commands/s; {counts['failed']:,} failed)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+hot_reload.py
+
+Times how long picking up an edit to a few items takes, compared with reloading the whole
+catalog from scratch.
+
+Usage:
+    python3 benchmarks/hot_reload.py [item_count] [shard_count]
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from columnar_memory import synthetic_entries # pylint: disable=import-error, wrong-import-position
+from src.loader import ( # pylint: disable=import-error, wrong-import-position
+    load_inventory_shards, resolve_inventory_files
+)
+from src.reload import InventoryWatcher # pylint: disable=import-error, wrong-import-position
+
+def write_shard(path, entries):
+    """Writes one shard and bumps its mtime so the change is always visible."""
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump({"inventory": entries}, file)
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+def main():
+    """Writes the shards, edits a few prices in one of them and times the reload."""
+    item_count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    shard_count = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    entries = [{"item": entry} for entry in synthetic_entries(item_count)]
+    shard_size = -(-item_count // shard_count)
+
+    with tempfile.TemporaryDirectory() as directory:
+        for number in range(shard_count):
+            write_shard(os.path.join(directory, f"vendor_{number:03d}.json"),
+                        entries[number * shard_size:(number + 1) * shard_size])
+        shard_files = resolve_inventory_files(directory)
+
+        print(f"Items: {item_count:,} in {shard_count} shards")
+        item_sources = {}
+        start = time.perf_counter()
+        inventory = load_inventory_shards(shard_files, max_workers=1,
+                                          item_sources=item_sources)
+        print(f"Full load:           {(time.perf_counter() - start) * 1000:9.1f} ms")
+
+        watcher = InventoryWatcher(directory, inventory, item_sources)
+        start = time.perf_counter()
+        watcher.reload()
+        print(f"Poll, no changes:    {(time.perf_counter() - start) * 1000:9.1f} ms")
+
+        edited = entries[:shard_size]
+        for entry in edited[:10]:
+            entry["item"]["price"] += 1
+        write_shard(shard_files[0], edited)
+        start = time.perf_counter()
+        diff = watcher.reload()
+        print(f"Reload one shard:    {(time.perf_counter() - start) * 1000:9.1f} ms "
+              f"({diff.summary()})")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+http_load.py
+
+Load test of the HTTP/JSON service: starts the server in its own process on a large catalog,
+then runs many concurrent shoppers, each on one kept-alive connection with its own session,
+sending a mix of lookups, compatibility checks, build edits and cart operations. Reports the
+throughput and the median and p99 latency.
+
+Usage:
+    python3 benchmarks/http_load.py [connections] [requests_per_connection] [parts_per_category]
+"""
+import asyncio
+import json
+import multiprocessing
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from autobuild import build_catalog # pylint: disable=import-error, wrong-import-position
+from src.server import serve # pylint: disable=import-error, wrong-import-position
+
+PREFIXES = ("CPU", "MB", "RAM", "STO", "GPU", "PSU")
+
+def run_server(parts, port_queue):
+    """Serves a generated catalog, reporting the port through the queue."""
+    asyncio.run(serve(build_catalog(parts), "127.0.0.1", 0, port_queue.put))
+
+async def request(reader, writer, method, target, body=None):
+    """Sends one request on a kept-alive connection and returns the status and body."""
+    payload = json.dumps(body).encode() if body is not None else b""
+    writer.write(f"{method} {target} HTTP/1.1\r\nHost: bench\r\n"
+                 f"Content-Length: {len(payload)}\r\n\r\n".encode() + payload)
+    head = await reader.readuntil(b"\r\n\r\n")
+    length = int(head.split(b"Content-Length: ")[1].split(b"\r\n")[0])
+    return int(head.split(b" ")[1]), await reader.readexactly(length)
+
+async def shopper(port, count, parts, seed, latencies):
+    """One shopper: a session and `count` requests on a single connection."""
+    generator = random.Random(seed)
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    _, body = await request(reader, writer, "POST", "/sessions")
+    base = f"/sessions/{json.loads(body)['session']}"
+    await request(reader, writer, "PUT", f"{base}/user", {"budget": 3000})
+
+    def part_id():
+        return f"{generator.choice(PREFIXES)}_{generator.randrange(parts)}".lower()
+
+    for number in range(count):
+        if number % 40 == 0:
+            call = ("DELETE", f"{base}/build", None)
+        else:
+            call = generator.choice((
+                ("GET", f"/parts/{part_id()}", None),
+                ("GET", f"/compatibility?ids={part_id()},{part_id()}", None),
+                ("POST", f"{base}/build/parts", {"part_id": part_id()}),
+                ("GET", f"{base}/build/check", None),
+                ("POST", f"{base}/cart/items", {"part_id": part_id()}),
+                ("GET", f"{base}/cart", None),
+            ))
+        start = time.perf_counter()
+        await request(reader, writer, *call)
+        latencies.append(time.perf_counter() - start)
+    writer.close()
+    await writer.wait_closed()
+
+async def load(port, connections, count, parts):
+    """Runs the shoppers concurrently and returns the latencies and the elapsed time."""
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*(shopper(port, count, parts, seed, latencies)
+                           for seed in range(connections)))
+    return latencies, time.perf_counter() - start
+
+def main():
+    """Prints the throughput and latency of the service under load."""
+    connections = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 400
+    parts = int(sys.argv[3]) if len(sys.argv) > 3 else 2000
+
+    port_queue = multiprocessing.Queue()
+    server = multiprocessing.Process(target=run_server, args=(parts, port_queue), daemon=True)
+    server.start()
+    try:
+        port = port_queue.get(timeout=60)
+        latencies, elapsed = asyncio.run(load(port, connections, count, parts))
+    finally:
+        server.terminate()
+
+    latencies.sort()
+    total = len(latencies)
+    print(f"{total:,} requests over {connections} kept-alive connections in {elapsed:.2f} s: "
+          f"{total / elapsed:,.0f} requests/s")
+    print(f"latency p50 {latencies[total // 2] * 1000:.2f} ms, "
+          f"p99 {latencies[int(total * 0.99)] * 1000:.2f} ms, "
+          f"max {latencies[-1] * 1000:.2f} ms")
+
+if __name__ == "__main__":
+    main()
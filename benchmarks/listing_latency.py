@@ -0,0 +1,77 @@
+"""
+listing_latency.py
+
+Times sorted, range-filtered and paged listings of a generated catalog read from a
+ListingIndex, against sorting and filtering the category for every listing, and reports how
+long the sorted orders took to build.
+
+Usage:
+    python3 benchmarks/listing_latency.py [item_count] [repeats]
+"""
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from columnar_memory import synthetic_entries # pylint: disable=import-error, wrong-import-position
+from src.inventory import Inventory, create_item, gen_parts_dict # pylint: disable=import-error, wrong-import-position
+from src.listing import ListingIndex, parse_listing # pylint: disable=import-error, wrong-import-position
+
+QUERIES = ("all", "gpu sort price desc", "ram capacity >= 32 sort price page 3",
+           "all price 100..120 sort power_draw desc", "cpu price 400..410 power_draw ..100",
+           "storage sort name page 50")
+
+def scan(inventory, listing):
+    """The same page, sorted and filtered from the whole category."""
+    parts = gen_parts_dict(inventory)
+    items = [item for part_type in parts for item in parts[part_type]] \
+        if listing.category == "all" else parts[listing.category]
+    for key, (low, high) in listing.ranges.items():
+        items = [item for item in items if getattr(item, key, None) is not None
+                 and (low is None or getattr(item, key) >= low)
+                 and (high is None or getattr(item, key) <= high)]
+    if listing.sort is not None:
+        items = sorted((item for item in items if getattr(item, listing.sort, None) is not None),
+                       key=lambda item: getattr(item, listing.sort), reverse=listing.descending)
+    start = (listing.page - 1) * listing.page_size
+    return items[start:start + listing.page_size]
+
+def median_ms(function, repeats):
+    """The median time of `repeats` calls, in milliseconds."""
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+def main():
+    """Prints the build cost of the sorted orders and the latency of each listing."""
+    item_count = int(sys.argv[1]) if len(sys.argv) > 1 else 300_000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    inventory = Inventory()
+    for item_data in synthetic_entries(item_count):
+        inventory.add_item(create_item(item_data))
+
+    index = ListingIndex(inventory)
+    start = time.perf_counter()
+    for query in QUERIES:
+        index.query(parse_listing(query))
+    build_seconds = time.perf_counter() - start
+
+    print(f"Items:                {item_count:,}")
+    print(f"Orders sorted:        {build_seconds:8.2f} s (once per inventory version)")
+    print()
+    print(f"{'Listing':<45} {'index ms':>9} {'scan ms':>9} {'total':>9}")
+    for query in QUERIES:
+        listing = parse_listing(query)
+        indexed = median_ms(lambda listing=listing: index.query(listing), repeats)
+        scanned = median_ms(lambda listing=listing: scan(inventory, listing),
+                            max(1, repeats // 10))
+        total = index.query(listing)["total"]
+        print(f"{query:<45} {indexed:9.3f} {scanned:9.1f} {total:9,}")
+
+if __name__ == "__main__":
+    main()
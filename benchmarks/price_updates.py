@@ -0,0 +1,79 @@
+"""
+price_updates.py
+
+Opens many shopper sessions on a generated catalog, then applies a batch of price updates
+and times re-pricing the sessions through the store's price index against thawing,
+re-pricing and freezing every session, and checks that both give the same totals.
+
+Usage:
+    python3 benchmarks/price_updates.py [sessions] [price_updates] [parts_per_category]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from autobuild import build_catalog # pylint: disable=import-error, wrong-import-position
+from src.headless import CommandSession # pylint: disable=import-error, wrong-import-position
+from src.prices import apply_price_updates # pylint: disable=import-error, wrong-import-position
+from src.session_store import SessionStore, freeze, thaw # pylint: disable=import-error, wrong-import-position
+
+PREFIXES = ("CPU", "MB", "RAM", "STO", "GPU", "PSU")
+
+def open_sessions(inventory, count: int, parts: int, generator: random.Random) -> SessionStore:
+    """A store of sessions, each with a few parts in its build and cart."""
+    store = SessionStore(lambda: CommandSession(inventory))
+    for _ in range(count):
+        session_id = store.create()
+        session = store.load(session_id)
+        for _ in range(4):
+            part_id = f"{generator.choice(PREFIXES)}_{generator.randrange(parts)}"
+            session.execute(f"build add {part_id}")
+            session.execute(f"cart add {generator.choice(PREFIXES)}_{generator.randrange(parts)}")
+        store.save(session_id, session)
+    return store
+
+def main():
+    """Prints the time taken by each way of re-pricing the sessions."""
+    session_count = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    update_count = int(sys.argv[2]) if len(sys.argv) > 2 else 1_000
+    parts = int(sys.argv[3]) if len(sys.argv) > 3 else 5_000
+    generator = random.Random(7)
+    inventory = build_catalog(parts)
+    store = open_sessions(inventory, session_count, parts, generator)
+    session_ids = list(store._records) # pylint: disable=protected-access
+    updates = [(f"{generator.choice(PREFIXES)}_{generator.randrange(parts)}",
+                generator.randrange(20, 1000)) for _ in range(update_count)]
+
+    start = time.perf_counter()
+    with store.locked():
+        diff, _ = apply_price_updates(inventory, updates)
+        applied = time.perf_counter()
+        repriced = store.apply_inventory_diff(diff)
+    indexed = time.perf_counter()
+    totals = [(store.record(session_id).build_total, store.record(session_id).cart_total)
+              for session_id in session_ids]
+
+    # Every session thawed from its record, re-priced and frozen again
+    scan_start = time.perf_counter()
+    scanned = []
+    for session_id in session_ids:
+        session = thaw(store.record(session_id), CommandSession(inventory))
+        session.apply_inventory_diff(diff)
+        record = freeze(session)
+        scanned.append((record.build_total, record.cart_total))
+    scan_seconds = time.perf_counter() - scan_start
+
+    print(f"Sessions:                      {session_count:,}")
+    print(f"Prices changed:                {len(diff.changed):,} of {update_count:,} updates")
+    print(f"Inventory update (one pass):   {(applied - start) * 1000:10.1f} ms")
+    print(f"Re-price via index:            {(indexed - applied) * 1000:10.1f} ms "
+          f"({repriced:,} sessions)")
+    print(f"Re-price by walking sessions:  {scan_seconds * 1000:10.1f} ms "
+          f"({session_count:,} sessions)")
+    print(f"Totals match:                  {totals == scanned}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+search_latency.py
+
+Builds the search index of a generated catalog whose parts have brand, series and model
+number names, then times exact, prefix, substring, misspelled, multi-word and ID queries
+against it and reports the time and memory the index took to build.
+
+Usage:
+    python3 benchmarks/search_latency.py [item_count] [repeats]
+"""
+import os
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from columnar_memory import synthetic_entries # pylint: disable=import-error, wrong-import-position
+from src.inventory import Inventory, create_item # pylint: disable=import-error, wrong-import-position
+from src.search import SearchIndex # pylint: disable=import-error, wrong-import-position
+
+BRANDS = ("PyProcessor", "Voltaic", "Northbridge", "Quasar", "Hexacore", "Lumen", "Stratus",
+          "Ironclad", "Helix", "Kestrel", "Obsidian", "Zephyr")
+SERIES = ("Thunderbolt", "Lightning", "Render", "Vortex", "Titan", "Nimbus", "Falcon",
+          "Aurora", "Pulse", "Summit", "Glacier", "Ember", "Cobalt", "Radiant", "Vector")
+SUFFIXES = ("", "X", "Ti", "K", " Pro", " Max")
+
+QUERIES = {
+    "exact word": ["thunderbolt", "glacier", "gpu", "kestrel"],
+    "prefix": ["thund", "obsid", "aur", "zeph"],
+    "substring": ["bolt", "core", "clad", "tex"],
+    "misspelled": ["thunderbolr", "lightnign", "quasr", "vorteks"],
+    "multi-word": ["quasar vortex 4812", "helix titan pro", "lumen radi", "gpu ironclad max"],
+    "model number": ["4812", "7600x", "9990ti"],
+    "ID": ["part_0000123", "part 123", "PART-999999"],
+}
+
+def named_entries(item_count):
+    """Yields `item_count` item dictionaries named like real parts."""
+    generator = random.Random(11)
+    for entry in synthetic_entries(item_count):
+        entry["name"] = (f"{generator.choice(BRANDS)} {generator.choice(SERIES)} "
+                         f"{generator.randrange(1000, 10000)}{generator.choice(SUFFIXES)}")
+        yield entry
+
+def main():
+    """Prints the build cost of the index and the latency of each kind of query."""
+    item_count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    inventory = Inventory()
+    for item_data in named_entries(item_count):
+        inventory.add_item(create_item(item_data))
+
+    index = SearchIndex(inventory)
+    start = time.perf_counter()
+    index.refresh()
+    build_seconds = time.perf_counter() - start
+
+    # A second index, built under tracemalloc, for the memory it keeps
+    tracemalloc.start()
+    traced = SearchIndex(inventory)
+    traced.refresh()
+    index_bytes, peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del traced
+
+    print(f"Items:             {item_count:,}")
+    print(f"Index build:       {build_seconds:8.2f} s")
+    print(f"Index memory:      {index_bytes / 2**20:8.1f} MiB "
+          f"({index_bytes / item_count:.0f} B/item; item IDs are shared with the inventory)")
+    print(f"Peak while built:  {peak_bytes / 2**20:8.1f} MiB")
+    print()
+    print(f"{'Query kind':<15} {'median ms':>10} {'p99 ms':>10}  first result")
+    # The first queries also build the bitmaps of the common words they use
+    for kind, queries in QUERIES.items():
+        timings = []
+        for _ in range(repeats):
+            for query in queries:
+                start = time.perf_counter()
+                results = index.search(query, 10)
+                timings.append(time.perf_counter() - start)
+        timings.sort()
+        first = index.search(queries[0], 1)
+        print(f"{kind:<15} {statistics.median(timings) * 1000:10.3f} "
+              f"{timings[int(len(timings) * 0.99)] * 1000:10.3f}  "
+              f"{queries[0]!r} -> {first[0].name if first else None}")
+    del results
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+shard_loading.py
+
+Times loading a sharded synthetic catalog with different process pool sizes.
+
+Usage:
+    python3 benchmarks/shard_loading.py [item_count] [shard_count]
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from columnar_memory import synthetic_entries # pylint: disable=import-error, wrong-import-position
+from src.loader import ( # pylint: disable=import-error, wrong-import-position
+    load_inventory_file, load_inventory_shards, resolve_inventory_files
+)
+
+def main():
+    """Writes the shards and prints the load time for each pool size."""
+    item_count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    shard_count = int(sys.argv[2]) if len(sys.argv) > 2 else 24
+    entries = [{"item": entry} for entry in synthetic_entries(item_count)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        shard_size = -(-item_count // shard_count)
+        for number in range(shard_count):
+            with open(os.path.join(directory, f"vendor_{number:02d}.json"), 'w',
+                      encoding='utf-8') as file:
+                json.dump({"inventory": entries[number * shard_size:(number + 1) * shard_size]},
+                          file)
+        shard_files = resolve_inventory_files(directory)
+
+        print(f"Items: {item_count:,} in {shard_count} shards, {os.cpu_count()} CPU(s)")
+        start = time.perf_counter()
+        for shard_file in shard_files:
+            load_inventory_file(shard_file)
+        print(f"Sequential streaming:  {time.perf_counter() - start:8.2f} s")
+
+        workers = 1
+        while workers <= (os.cpu_count() or 1):
+            start = time.perf_counter()
+            load_inventory_shards(shard_files, max_workers=workers)
+            print(f"Pool of {workers:2d} worker(s): {time.perf_counter() - start:8.2f} s")
+            workers *= 2
+
+if __name__ == "__main__":
+    main()
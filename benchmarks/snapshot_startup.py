@@ -0,0 +1,50 @@
+"""
+snapshot_startup.py
+
+Times loading a synthetic catalog from JSON against opening its memory-mapped snapshot.
+
+Usage:
+    python3 benchmarks/snapshot_startup.py [item_count]
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from columnar_memory import synthetic_entries # pylint: disable=import-error, wrong-import-position
+from src.loader import load_inventory_file # pylint: disable=import-error, wrong-import-position
+from src.snapshot import open_snapshot, write_snapshot # pylint: disable=import-error, wrong-import-position
+
+def main():
+    """Writes a synthetic catalog and prints the startup time of each loading path."""
+    item_count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    with tempfile.TemporaryDirectory() as directory:
+        inventory_file = os.path.join(directory, "inventory.json")
+        with open(inventory_file, 'w', encoding='utf-8') as file:
+            json.dump({"inventory": [{"item": entry}
+                                     for entry in synthetic_entries(item_count)]}, file)
+
+        start = time.perf_counter()
+        load_inventory_file(inventory_file)
+        json_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        write_snapshot(inventory_file)
+        compile_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        snapshot = open_snapshot(inventory_file)
+        snapshot.get_item(f"PART_{item_count - 1:07d}")
+        open_seconds = time.perf_counter() - start
+        snapshot.close()
+
+    print(f"Items:                     {item_count:,}")
+    print(f"JSON load:                 {json_seconds * 1000:10.1f} ms")
+    print(f"Snapshot compile (once):   {compile_seconds * 1000:10.1f} ms")
+    print(f"Snapshot open + 1 lookup:  {open_seconds * 1000:10.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+stock_contention.py
+
+Runs many shopper threads that each hold a few parts and check them out, against a ledger
+whose parts are spread over many lock stripes and against one with a single lock, and checks
+that no part is ever sold beyond its stock.
+
+Usage:
+    python3 benchmarks/stock_contention.py [threads] [checkouts_per_thread]
+"""
+import os
+import random
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from src.inventory import CPU # pylint: disable=import-error, wrong-import-position
+from src.stock import LOCK_STRIPES, OutOfStockError, StockHold, StockLedger # pylint: disable=import-error, wrong-import-position
+
+PART_COUNT = 200
+# The few parts every shopper wants, stocked short so that checkouts run out of them
+HOT_PARTS = 5
+
+def make_parts() -> list:
+    """Parts with stock; the first few are popular and scarce."""
+    parts = []
+    for number in range(PART_COUNT):
+        part = CPU(f"CPU_{number:04d}", f"Part {number}", 100, 65, "LGA")
+        part.stock = 300 if number < HOT_PARTS else 10_000
+        parts.append(part)
+    return parts
+
+def run(stripes: int, thread_count: int, checkouts: int) -> dict:
+    """Runs the shoppers against one ledger and returns the throughput and sales."""
+    parts = make_parts()
+    ledger = StockLedger(stripes=stripes)
+    sold = [0] * thread_count
+
+    def shop(number: int):
+        chooser = random.Random(number)
+        for _ in range(checkouts):
+            contents = [chooser.choice(parts[:HOT_PARTS])] + chooser.sample(parts, 3)
+            hold = StockHold(ledger)
+            hold.sources.append(lambda contents=contents: contents)
+            try:
+                hold.sync()
+                hold.commit(contents)
+                sold[number] += 1
+            except OutOfStockError:
+                hold.release()
+
+    threads = [threading.Thread(target=shop, args=(number,)) for number in range(thread_count)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    seconds = time.perf_counter() - start
+
+    oversold = [part.item_id for part in parts if ledger.available(part) < 0]
+    return {"seconds": seconds, "attempts": thread_count * checkouts, "sold": sum(sold),
+            "hot_left": sum(ledger.available(part) for part in parts[:HOT_PARTS]),
+            "oversold": oversold}
+
+def main():
+    """Prints the checkouts per second with striped locks and with a single lock."""
+    thread_count = int(sys.argv[1]) if len(sys.argv) > 1 else 16
+    checkouts = int(sys.argv[2]) if len(sys.argv) > 2 else 2_000
+    print(f"{thread_count} threads x {checkouts:,} checkouts, {HOT_PARTS} hot parts "
+          f"of {PART_COUNT}")
+    for stripes in (LOCK_STRIPES, 1):
+        result = run(stripes, thread_count, checkouts)
+        print(f"{stripes:3d} stripe(s): {result['attempts'] / result['seconds']:10,.0f} "
+              f"checkouts/s, {result['sold']:,} sold, {result['hot_left']} hot units left, "
+              f"oversold: {', '.join(result['oversold']) or 'none'}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,283 @@
+"""
+autobuild.py
+
+"Build for me": finds the best complete, compatible build within a budget by branch and bound.
+
+An objective names the category whose capacity is maximised ("ram" or "storage"). The search
+decides the motherboard first, then the objective category (its choices tried from the
+largest capacity down), and for each of those looks for the cheapest completion: the
+remaining categories, tried cheapest first, and the cheapest PSU that covers the power draw.
+Of the builds reaching the best capacity the cheapest is kept. Branches are cut when:
+
+- the cost so far plus the cheapest possible rest of the build exceeds the budget, or the
+  price of the cheapest build of the best capacity found so far,
+- no PSU can cover the power draw so far plus the lowest possible draw of the rest, or
+- the best capacity still reachable cannot beat the best build found so far.
+
+A completion only depends on the motherboard's socket class and slots, the category reached
+and the power drawn so far, so the cheapest one found for those is remembered, as is the
+largest price limit under which there was none; the search never explores the same rest of
+a build twice.
+
+Motherboards are ordered by the capacity they could reach at best and dealt out to a process
+pool; the workers share the best capacity found so far so that each prunes with the others'
+results. Every worker looks at a deadline while it completes builds as well as between
+them and stops once it passes, so the search returns in bounded time, reporting whether it
+was exhaustive.
+
+Functions:
+- find_best_build(inventory, budget, objective, time_limit, max_workers): Runs the search.
+
+Acknowledged Pylint Standard Errors:
+src\\autobuild.py:41:0: E0401: Unable to import 'src.buildspace' (import-error)
+"""
+import multiprocessing
+import os
+import time
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional
+
+from src.buildspace import BuildSpace, PartChoice # pylint: disable=import-error
+
+# Objective name -> (category whose capacity is maximised, description for the menu).
+OBJECTIVES = {
+    "ram": ("RAM", "maximum RAM capacity"),
+    "storage": ("Storage", "maximum storage capacity"),
+}
+
+# Seconds the search may run before returning the best build found so far.
+DEFAULT_TIME_LIMIT = 5.0
+
+# Categories decided after the motherboard and the objective category, in this order.
+_NEUTRAL_ORDER = ["CPU", "RAM", "Storage", "GPU"]
+
+# Completions tried between two looks at the clock.
+DEADLINE_CHECK_NODES = 256
+
+# State of a worker process, set by `_init_worker`.
+_WORKER = {}
+
+class _TimeUp(Exception):
+    """Raised inside the search once its deadline has passed."""
+
+class _Search:
+    """Branch-and-bound search over the motherboards given to one worker."""
+    def __init__(self, space: BuildSpace, budget: int, category: str, deadline: float,
+                 shared_best=None):
+        self.space = space
+        self.budget = budget
+        self.category = category
+        self.deadline = deadline
+        self.shared_best = shared_best
+        self.neutral = [part_type for part_type in _NEUTRAL_ORDER if part_type != category]
+        self.best: Optional[tuple] = None
+        self.timed_out = False
+        self._tables = {}
+        # Completions of the neutral categories already searched: the cheapest one found, or
+        # the largest price limit under which there is none.
+        self._solved = {}
+        self._failed = {}
+        self._nodes = 0
+
+    def _choices(self, part_type: str, motherboard: PartChoice) -> List[PartChoice]:
+        if part_type == "CPU":
+            return self.space.cpus_for(motherboard)
+        if part_type == "RAM":
+            return self.space.rams_for(motherboard)
+        if part_type == "Storage":
+            return self.space.storage
+        return self.space.gpus
+
+    def _best_value(self) -> int:
+        local = self.best[0] if self.best else -1
+        if self.shared_best is None:
+            return local
+        return max(local, self.shared_best.value)
+
+    def _publish(self, value: int):
+        if self.shared_best is not None:
+            with self.shared_best.get_lock():
+                if value > self.shared_best.value:
+                    self.shared_best.value = value
+
+    def _objective_table(self, motherboard: PartChoice) -> tuple:
+        """
+        Returns the motherboard's objective choices by decreasing capacity, plus their prices
+        in increasing order with the running maximum capacity, for the bound.
+        """
+        key = int(motherboard.item.ram_slots) if self.category == "RAM" else None
+        table = self._tables.get(key)
+        if table is None:
+            choices = self._choices(self.category, motherboard)
+            prices, most = [], []
+            for choice in choices:
+                prices.append(choice.price)
+                most.append(max(choice.capacity, most[-1] if most else -1))
+            by_value = sorted(choices, key=lambda choice: (-choice.capacity, choice.price))
+            table = (by_value, prices, most)
+            self._tables[key] = table
+        return table
+
+    def upper_bound(self, motherboard: PartChoice) -> int:
+        """Largest capacity any build on this motherboard could reach within the budget."""
+        rest = sum(self.space.min_price[part_type] for part_type in self.neutral)
+        allowance = self.budget - motherboard.price - rest - self.space.min_price["PSU"]
+        _, prices, most = self._objective_table(motherboard)
+        affordable = bisect_right(prices, allowance)
+        return most[affordable - 1] if affordable else -1
+
+    def _cheapest_rest(self, motherboard: PartChoice, index: int, draw: int, limit: int):
+        """
+        Cheapest completion of the neutral categories from `index` on and the PSU, costing
+        at most `limit`, as (price, choices), or None.
+        """
+        self._nodes += 1
+        if self._nodes % DEADLINE_CHECK_NODES == 0 and time.time() > self.deadline:
+            raise _TimeUp
+        if index == len(self.neutral):
+            psu = self.space.cheapest_psu(draw)
+            if psu is None or psu.price > limit:
+                return None
+            return psu.price, [psu]
+
+        # Below the objective category the rest only depends on the choices that fit the
+        # motherboard and the draw so far: the cheapest rest found is cheapest for good, and
+        # a limit that found nothing rules out every lower one.
+        key = (self.space.board_class(motherboard), int(motherboard.item.ram_slots), index,
+               draw)
+        solved = self._solved.get(key)
+        if solved is not None:
+            return solved if solved[0] <= limit else None
+        if limit <= self._failed.get(key, -1):
+            return None
+
+        rest = self.neutral[index + 1:]
+        rest_price = sum(self.space.min_price[part_type] for part_type in rest)
+        rest_draw = sum(self.space.min_draw[part_type] for part_type in rest)
+        best = None
+        for choice in self._choices(self.neutral[index], motherboard):
+            if choice.price + rest_price + self.space.min_price["PSU"] > limit:
+                break
+            new_draw = draw + choice.power_draw
+            psu = self.space.cheapest_psu(new_draw + rest_draw)
+            if psu is None or choice.price + rest_price + psu.price > limit:
+                continue
+            tail = self._cheapest_rest(motherboard, index + 1, new_draw, limit - choice.price)
+            if tail is not None:
+                best = (choice.price + tail[0], [choice] + tail[1])
+                # Only a strictly cheaper completion replaces it
+                limit = best[0] - 1
+        if best is None:
+            self._failed[key] = max(limit, self._failed.get(key, -1))
+        else:
+            self._solved[key] = best
+        return best
+
+    def search(self, motherboards: List[PartChoice]):
+        """Explores the motherboards in order, keeping the best build in `self.best`."""
+        try:
+            self._search(motherboards)
+        except _TimeUp:
+            self.timed_out = True
+
+    def _search(self, motherboards: List[PartChoice]):
+        least_rest = sum(self.space.min_price[part_type] for part_type in self.neutral) + \
+            self.space.min_price["PSU"]
+        for motherboard in motherboards:
+            if self.upper_bound(motherboard) < self._best_value():
+                continue
+            for choice in self._objective_table(motherboard)[0]:
+                if time.time() > self.deadline:
+                    raise _TimeUp
+                if choice.capacity < self._best_value():
+                    break
+                cost = motherboard.price + choice.price
+                limit = self.budget - cost
+                if self.best is not None and choice.capacity == self.best[0]:
+                    # The choices of equal capacity come cheapest first, so once none of
+                    # them can undercut the best build, none after it can either
+                    if cost + least_rest >= self.best[1]:
+                        break
+                    limit = min(limit, self.best[1] - cost - 1)
+                rest = self._cheapest_rest(motherboard, 0,
+                                           motherboard.power_draw + choice.power_draw, limit)
+                if rest is None:
+                    continue
+                price = cost + rest[0]
+                if self.best is None or (choice.capacity, -price) > (self.best[0], -self.best[1]):
+                    self.best = (choice.capacity, price, [motherboard, choice] + rest[1])
+                    self._publish(choice.capacity)
+
+def _init_worker(space: BuildSpace, budget: int, category: str, deadline: float, shared_best):
+    """Process-pool initializer: keeps the search parameters in the worker."""
+    _WORKER.update(space=space, budget=budget, category=category, deadline=deadline,
+                   shared_best=shared_best)
+
+def _search_chunk(motherboards: List[PartChoice]):
+    """Process-pool worker: searches one chunk of motherboards."""
+    search = _Search(_WORKER["space"], _WORKER["budget"], _WORKER["category"],
+                     _WORKER["deadline"], _WORKER["shared_best"])
+    search.search(motherboards)
+    return search.best, search.timed_out
+
+def find_best_build(inventory, budget: int, objective: str = "ram",
+                    time_limit: float = DEFAULT_TIME_LIMIT, max_workers: Optional[int] = None,
+                    space: Optional[BuildSpace] = None) -> Optional[dict]:
+    """
+    Finds the complete, compatible build with the largest capacity for the objective whose
+    total price is within the budget. Ties go to the cheaper build.
+
+    Args:
+        inventory: Any inventory backend.
+        budget (int): The most the build may cost.
+        objective (str): A key of OBJECTIVES ("ram" or "storage").
+        time_limit (float): Seconds after which the best build found so far is returned.
+        max_workers (int, optional): Size of the process pool. Defaults to the CPU count;
+            1 searches in this process.
+        space (BuildSpace, optional): A space already built for the inventory.
+
+    Returns:
+        dict: The build ("parts", in the form `Build` keeps), its "price", "power_draw",
+        "ram_capacity", "storage_capacity", the "objective" and "value" reached, and
+        "complete" (False if the time limit cut the search short). None if no build fits.
+
+    Raises:
+        ValueError: If the objective is unknown.
+    """
+    if objective not in OBJECTIVES:
+        raise ValueError(f"Unknown objective: {objective}")
+    category = OBJECTIVES[objective][0]
+    space = space or BuildSpace(inventory)
+    if space.is_empty():
+        return None
+
+    deadline = time.time() + time_limit
+    ranking = _Search(space, budget, category, deadline)
+    bounds = [(ranking.upper_bound(motherboard), motherboard)
+              for motherboard in space.motherboards]
+    motherboards = [motherboard for bound, motherboard in
+                    sorted(bounds, key=lambda pair: (-pair[0], pair[1].price)) if bound >= 0]
+
+    workers = max_workers or os.cpu_count() or 1
+    if workers == 1 or len(motherboards) < 2:
+        ranking.search(motherboards)
+        results = [(ranking.best, ranking.timed_out)]
+    else:
+        # Round-robin dealing gives every chunk some of the most promising motherboards.
+        chunk_count = min(len(motherboards), workers * 4)
+        chunks = [motherboards[start::chunk_count] for start in range(chunk_count)]
+        shared_best = multiprocessing.Value('q', -1)
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(space, budget, category, deadline,
+                                           shared_best)) as executor:
+            results = list(executor.map(_search_chunk, chunks))
+
+    found = [best for best, _ in results if best is not None]
+    if not found:
+        return None
+    value, _, choices = max(found, key=lambda best: (best[0], -best[1]))
+    result = BuildSpace.describe(choices)
+    result.update(objective=objective, value=value,
+                  complete=not any(timed_out for _, timed_out in results))
+    return result
@@ -0,0 +1,186 @@
+"""
+browse.py
+
+Streams every valid build under a price cap in ascending price order, one page at a time.
+
+The builds are those of `BuildSpace`: a motherboard, a CPU in its socket class, N identical
+RAM sticks that fit its slots, one to four identical drives, an optional GPU and a PSU that
+covers the total power draw. Within one motherboard every category is sorted by price, so a
+combination of choices is a tuple of indices and the cheapest combinations can be produced
+with a priority queue, as when merging sorted lists:
+
+- The queue starts with the cheapest combination of every motherboard.
+- Popping a combination pushes its successors: the same tuple with one index advanced, for
+  every position at or after the last non-zero index. Every tuple has exactly one parent
+  that way, so no combination is produced twice and no "seen" set is needed.
+- A combination is keyed by its price plus the cheapest PSU price, a lower bound for all of
+  its successors. Popping it also queues its cheapest covering PSU as an exact build; popping
+  that build yields it and queues the next covering PSU.
+
+Keys never decrease along a parent -> child edge, so builds leave the queue in price order,
+and nothing priced above the cap is ever queued. Only the queue itself is held in memory.
+
+A cursor ({"price": ..., "rank": ...}) names the last build of a page: its price and how many
+builds of that same price came up to it. `page_builds` resumes after a cursor, and
+`BuildBrowser` keeps the queue alive between pages so that the next page costs only its own
+builds.
+
+Classes:
+- BuildBrowser: Pages through the builds of one inventory and budget.
+
+Functions:
+- iter_builds(inventory, budget, cursor, space): Yields builds in ascending price order.
+- page_builds(inventory, budget, page_size, cursor, space): Returns one page and its cursor.
+
+Acknowledged Pylint Standard Errors:
+src\\browse.py:42:0: E0401: Unable to import 'src.buildspace' (import-error)
+"""
+import heapq
+from itertools import count
+from typing import Iterator, List, Optional
+
+from src.buildspace import BuildSpace # pylint: disable=import-error
+
+# Builds shown per page by default.
+PAGE_SIZE = 10
+
+# Queue entry kinds. Combinations sort before builds of the same key, so every build of a
+# given price is queued before the first of them is yielded.
+_COMBINATION = 0
+_BUILD = 1
+
+def _choice_lists(space: BuildSpace, motherboard) -> list:
+    """The categories decided per motherboard, each sorted by price."""
+    return [space.cpus_for(motherboard), space.rams_for(motherboard), space.storage,
+            space.gpus]
+
+def iter_builds(inventory, budget: int, cursor: Optional[dict] = None,
+                space: Optional[BuildSpace] = None) -> Iterator[dict]:
+    """
+    Yields every valid build priced at most `budget`, cheapest first.
+
+    Args:
+        inventory: Any inventory backend.
+        budget (int): The price cap.
+        cursor (dict, optional): Resume after this build, as returned with an earlier one.
+        space (BuildSpace, optional): A space already built for the inventory.
+
+    Yields:
+        dict: The build as described by `BuildSpace.describe`, plus its "cursor".
+    """
+    space = space or BuildSpace(inventory)
+    if space.is_empty():
+        return
+    skip_below = cursor["price"] if cursor else None
+    skip_rank = cursor["rank"] if cursor else 0
+
+    psus = sorted(space.psus, key=lambda choice: choice.price)
+    cheapest_psu = psus[0].price
+    tie_breaker = count()
+    frontier = []
+
+    def push_combination(board, lists, indices):
+        choices = [board] + [lists[position][index] for position, index in enumerate(indices)]
+        price = sum(choice.price for choice in choices)
+        if price + cheapest_psu <= budget:
+            heapq.heappush(frontier, (price + cheapest_psu, _COMBINATION, next(tie_breaker),
+                                      board, lists, indices, price,
+                                      sum(choice.power_draw for choice in choices)))
+
+    def push_build(board, lists, indices, price, draw, start):
+        for psu_index in range(start, len(psus)):
+            psu = psus[psu_index]
+            if price + psu.price > budget:
+                return
+            if int(psu.item.power_supplied) >= draw:
+                heapq.heappush(frontier, (price + psu.price, _BUILD, next(tie_breaker),
+                                          board, lists, indices, price, draw, psu_index))
+                return
+
+    for board in space.motherboards:
+        lists = _choice_lists(space, board)
+        if all(lists):
+            push_combination(board, lists, (0,) * len(lists))
+
+    last_price, rank = None, 0
+    while frontier:
+        entry = heapq.heappop(frontier)
+        key, kind, _, board, lists, indices, price, draw = entry[:8]
+        if kind == _COMBINATION:
+            last_moved = max((position for position, index in enumerate(indices) if index),
+                             default=0)
+            for position in range(last_moved, len(indices)):
+                if indices[position] + 1 < len(lists[position]):
+                    advanced = list(indices)
+                    advanced[position] += 1
+                    push_combination(board, lists, tuple(advanced))
+            push_build(board, lists, indices, price, draw, 0)
+            continue
+
+        psu_index = entry[8]
+        push_build(board, lists, indices, price, draw, psu_index + 1)
+        rank = rank + 1 if key == last_price else 1
+        last_price = key
+        if skip_below is not None and (key < skip_below or
+                                       (key == skip_below and rank <= skip_rank)):
+            continue
+        choices = [board] + [lists[position][index] for position, index in enumerate(indices)]
+        result = BuildSpace.describe(choices + [psus[psu_index]])
+        result["cursor"] = {"price": key, "rank": rank}
+        yield result
+
+def page_builds(inventory, budget: int, page_size: int = PAGE_SIZE,
+                cursor: Optional[dict] = None, space: Optional[BuildSpace] = None) -> dict:
+    """
+    Returns one page of builds, resuming after `cursor`.
+
+    Args:
+        inventory: Any inventory backend.
+        budget (int): The price cap.
+        page_size (int): The most builds to return.
+        cursor (dict, optional): The cursor of the previous page.
+        space (BuildSpace, optional): A space already built for the inventory.
+
+    Returns:
+        dict: "builds" (list) and "cursor", the cursor for the next page or None if this was
+        the last page.
+    """
+    builds = []
+    for build in iter_builds(inventory, budget, cursor, space):
+        if len(builds) == page_size:
+            return {"builds": builds, "cursor": builds[-1]["cursor"]}
+        builds.append(build)
+    return {"builds": builds, "cursor": None}
+
+class BuildBrowser:
+    """
+    Pages through the builds of one inventory and budget, keeping the enumeration running
+    between pages.
+
+    Attributes:
+        budget (int): The price cap.
+        page_size (int): Builds per page.
+        cursor (dict): The cursor of the last build returned (None before the first page).
+            A browser started with a cursor resumes after it.
+        exhausted (bool): Whether every build has been returned.
+    """
+    def __init__(self, inventory, budget: int, page_size: int = PAGE_SIZE,
+                 cursor: Optional[dict] = None):
+        self.budget = budget
+        self.page_size = page_size
+        self.cursor: Optional[dict] = cursor
+        self.exhausted = False
+        self._builds = iter_builds(inventory, budget, cursor)
+
+    def next_page(self) -> List[dict]:
+        """Returns the next page of builds (empty once every build has been returned)."""
+        page = []
+        for build in self._builds:
+            page.append(build)
+            if len(page) == self.page_size:
+                break
+        else:
+            self.exhausted = True
+        if page:
+            self.cursor = page[-1]["cursor"]
+        return page
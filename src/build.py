@@ -13,6 +13,15 @@ Classes:
 Functions:
 - add_item: Adds an item to the build.
 - remove_item: Removes an item from the build.
+- record_added / record_removed: Keep the totals and the compatibility state in step with
+  the parts.
+- recalculate_totals: Recomputes the cost and power balance from the build's parts.
+- apply_inventory_diff: Re-prices and re-validates the build after an inventory reload.
+- load_parts: Replaces the build with a complete set of parts.
+- auto_build: Generates the best build for the user's budget and an objective.
+- browse_builds: Pages through every valid build within the user's budget, cheapest first.
+- best_value_builds: Lists the non-dominated builds within the user's budget.
+- show_candidates: Lists the parts that can still lead to a valid build within the budget.
 - clear_build: Clears the entire build.
 - add_to_cart: Adds the build to the cart if it passes compatibility checks.
 - display_build_list: Displays the current list of items in the build.
@@ -20,12 +29,23 @@ Functions:
 - build_menu: Displays and handles the build menu.
 
 Acknowledged Pylint Standard Errors:
-src\\build.py:23:0: E0401: Unable to import 'src.utils' (import-error)
-src\\build.py:309:31: E1101: Instance of 'list' has no 'name' member (no-member)
-src\\build.py:309:51: E1101: Instance of 'list' has no 'id' member (no-member)
-src\\build.py:310:28: E1101: Instance of 'list' has no 'price' member (no-member)
+src\\build.py:47:0: E0401: Unable to import 'src.search' (import-error)
+src\\build.py:48:0: E0401: Unable to import 'src.stock' (import-error)
+src\\build.py:49:0: E0401: Unable to import 'src.utils' (import-error)
+src\\build.py:640:31: E1101: Instance of 'list' has no 'name' member (no-member)
+src\\build.py:640:51: E1101: Instance of 'list' has no 'item_id' member (no-member)
+src\\build.py:641:28: E1101: Instance of 'list' has no 'price' member (no-member)
 """
 # pylint: disable=R0801
+from src.autobuild import OBJECTIVES, find_best_build # pylint: disable=import-error
+from src.browse import PAGE_SIZE, BuildBrowser # pylint: disable=import-error
+from src.build_state import BuildState # pylint: disable=import-error
+from src.candidates import CATEGORIES, CandidateFinder # pylint: disable=import-error
+from src.compatibility_matrix import CompatibilityMatrix # pylint: disable=import-error
+from src.pareto import ParetoFrontier # pylint: disable=import-error
+from src.reload import refresh_parts # pylint: disable=import-error
+from src.search import SearchIndex, choose_part # pylint: disable=import-error
+from src.stock import OutOfStockError, StockHold # pylint: disable=import-error
 from src.utils import clear_screen # pylint: disable=import-error
 
 class Build:
@@ -41,25 +61,44 @@ class Build:
         cart_object: The shopping cart for storing completed builds.
         inventory_object: The inventory of available parts.
         compatibility_object: Handles compatibility checks for the build.
+        pareto_frontier (ParetoFrontier): The best value builds, kept until the inventory changes.
+        state (BuildState): Live compatibility state, updated with every added or removed part.
+        candidate_finder (CandidateFinder): Works out which parts can still be added.
         total_cost (int): The total cost of the build.
         total_power_draw (int): The total power draw of the build.
         build (dict): Dictionary holding the components of the build.
+        stock_hold (StockHold): Holds the stock of the parts in the build for the user.
+        search_index (SearchIndex): Offers the closest parts for a mistyped part ID.
 
     Methods:
         add_item(part_id): Adds an item to the build, updating cost and power draw.
         remove_item(): Removes an item from the build, updating cost and power draw.
+        record_added(item), record_removed(item): Account for a part put in or taken out.
         clear_build(): Resets the build, clearing all components and data.
+        auto_build(): Fills the build with the best parts for the budget and an objective.
+        browse_builds(): Pages through the valid builds within the budget, cheapest first.
+        best_value_builds(): Lists the builds no other build beats on every objective.
+        show_candidates(): Lists the parts that can still be added on the way to a valid build.
         add_to_cart(): Adds the current build to the shopping cart if it's compatible.
         display_build_list(): Displays the list of current items in the build.
         build_display(): Displays details of the build along with menu options.
         build_menu(): Provides a menu for interacting with the build.
     """
 
-    def __init__(self, user_object, cart_object, inventory_object, compatibility_object):
+    def __init__(self, user_object, cart_object, inventory_object, compatibility_object, # pylint: disable=too-many-arguments, too-many-positional-arguments
+                 stock_hold=None, search_index=None):
         self.user_object = user_object
         self.cart_object = cart_object
         self.inventory_object = inventory_object
         self.compatibility_object = compatibility_object
+        self.pareto_frontier = ParetoFrontier(inventory_object)
+        matrix = getattr(compatibility_object, "matrix", None)
+        if not isinstance(matrix, CompatibilityMatrix):
+            matrix = None
+        self.state = BuildState(matrix.socket_class if matrix else None)
+        self.candidate_finder = CandidateFinder(inventory_object, matrix)
+        self.search_index = search_index if search_index is not None \
+            else SearchIndex(inventory_object)
 
         self.total_cost: int = 0
         self.total_power_draw: int = 0
@@ -71,6 +110,8 @@ class Build:
                     "Motherboard": None,
                     "Storage": []
                     }
+        self.stock_hold = stock_hold if stock_hold is not None else StockHold(None)
+        self.stock_hold.sources.append(lambda: self.build)
 
     def default(self):
         """
@@ -114,10 +155,40 @@ class Build:
         """
         self.total_power_draw -= wattage
 
+    def record_added(self, item):
+        """
+        Accounts for a part that was put into the build: its cost, its power draw (or the
+        power a PSU supplies) and the compatibility state.
+
+        Args:
+            item (Item): The part.
+        """
+        self.increase_total_cost(item.price)
+        if item.item_type != "PSU":
+            self.decreate_available_power(item.power_draw)
+        else:
+            self.increase_available_power(item.power_supplied)
+        self.state.add(item)
+
+    def record_removed(self, item):
+        """
+        Accounts for a part that was taken out of the build, undoing `record_added`.
+
+        Args:
+            item (Item): The part.
+        """
+        self.decrease_total_cost(item.price)
+        if item.item_type != "PSU":
+            self.increase_available_power(item.power_draw)
+        else:
+            self.decreate_available_power(item.power_supplied)
+        self.state.remove(item)
+
     def add_item(self, part_id=None):
         """
         Add an item to the build based on its part ID. If no part ID is provided,
-        prompts the user for input and searches the inventory for a matching item.
+        prompts the user for input and searches the inventory for a matching item; an ID
+        that is not in the inventory lists the closest parts to pick from instead.
 
         Args:
             part_id (str, optional): The ID of the part to add. If None, the method
@@ -125,30 +196,46 @@ class Build:
         
         The method updates the build with the part, adjusts the total cost, and updates
         power draw or supplied power based on the type of item (RAM, Storage, PSU, etc.).
+        A part that only fits once (CPU, Motherboard, PSU, ...) replaces the previous one.
+        A part that is out of stock is not added.
+
+        Returns:
+            Item: The added item, or None if the part ID is unknown or out of stock.
         """
         clear_screen()
         if part_id is None:
             print("What is the part ID of the item you want to add?")
             part_id = input("Item ID: ")
             clear_screen()
+            item = choose_part(self.search_index, part_id)
+        else:
+            item = self.inventory_object.get_item(part_id)
+        if item is None:
+            return None
 
-            for item in self.inventory_object.items:
-                if item.id.lower() == part_id.lower():
-                    if item.type.lower() == "ram":
-                        self.build["RAM"].append(item)
-                    elif item.type.lower() == "storage":
-                        self.build["Storage"].append(item)
-                    else:
-                        self.build[item.type] = item
-
-                    self.increase_total_cost(item.price)
+        previous = None
+        if item.item_type in ("RAM", "Storage"):
+            self.build[item.item_type].append(item)
+        else:
+            previous = self.build[item.item_type]
+            self.build[item.item_type] = item
+
+        try:
+            self.stock_hold.sync()
+        except OutOfStockError as error:
+            if item.item_type in ("RAM", "Storage"):
+                self.build[item.item_type].pop()
+            else:
+                self.build[item.item_type] = previous
+            print(f"{error}.")
+            return None
 
-                    if item.type != "PSU":
-                        self.decreate_available_power(item.power_draw)
-                    else:
-                        self.increase_available_power(item.power_supplied)
+        if previous is not None:
+            self.record_removed(previous)
+        self.record_added(item)
+        return item
 
-    def ram_storage_removal(self, item):
+    def ram_storage_removal(self, part_type):
         """
         Remove a RAM or Storage item from the build.
 
@@ -162,35 +249,40 @@ class Build:
         Part ID of the item they wish to remove, and that item is removed.
 
         Args:
-            item: The item to be removed from the build (either RAM or storage).
+            part_type (str): The build component to remove from ("RAM" or "Storage").
+
+        Returns:
+            Item: The removed item, or None if nothing was removed.
         """
-        if len(self.build[item.type]) == 0:
-            self.build[item.type] = []
+        removed_item = None
+        if len(self.build[part_type]) == 0:
             clear_screen()
-            print(f"Nothing in {item.type} to delete.")
-        elif len(self.build[item.type]) == 1:
-            self.build[item.type] = []
-            self.decrease_total_cost(item.price)
-            self.increase_available_power(item.power_draw)
+            print(f"Nothing in {part_type} to delete.")
+            return None
+
+        if len(self.build[part_type]) == 1:
+            removed_item = self.build[part_type].pop()
             clear_screen()
-        elif len(self.build[item.type]) > 1:
+        else:
             clear_screen()
-            user_input = input(f"What is the {item.type} Part ID: ")
-            for ram_object in self.build[item.type]:
-                if ram_object.id.lower() == user_input.lower():
-                    self.build[item.type].remove(ram_object)
-                    self.decrease_total_cost(item.price)
-                    self.increase_available_power(item.power_draw)
+            user_input = input(f"What is the {part_type} Part ID: ")
+            for part_object in self.build[part_type]:
+                if part_object.item_id.lower() == user_input.strip().lower():
+                    self.build[part_type].remove(part_object)
+                    removed_item = part_object
                     break
 
+        if removed_item is not None:
+            self.record_removed(removed_item)
+        return removed_item
+
     def psu_removal(self, item):
         """
         Removes the PSU from the build, updates the total cost, and decreases the available 
         power capacity.
         """
-        self.build[item.type] = None
-        self.decrease_total_cost(item.price)
-        self.decreate_available_power(item.power_capacity)
+        self.build[item.item_type] = None
+        self.record_removed(item)
         clear_screen()
 
     def remove_item(self):
@@ -199,27 +291,256 @@ class Build:
         the part type and optionally a specific part ID if multiple items of that type exist.
 
         The method adjusts the build by removing the part, clears the item from the build,
-        and prompts the user when no items are available to delete.
-
-        After removing the item, future steps will need to adjust the total cost and power
-        draw or supplied power.
+        and prompts the user when no items are available to delete. Only the build itself
+        is consulted, the inventory is never scanned. The stock held for the part is
+        released.
         """
         clear_screen()
         print("What is the part type of the item you want to remove?")
-        part = input("Part Type: ")
-
-        for item in self.inventory_object.items:
-            if item.type.lower() == part.lower():
-                if item.type.lower() == "ram" or item.type.lower() == "storage":
-                    self.ram_storage_removal(item)
-                    print(f"Item has been removed from {item.type}.")
-                elif item.type.lower() == "psu":
-                    self.psu_removal(item)
-                    print(f"Item has been removed from {item.type}.")
-                else:
-                    self.build[item.type] = None
-                    clear_screen()
-                    print(f"{item.name} ({item.id}) was removed from build.\n")
+        part = input("Part Type: ").strip().lower()
+
+        part_type = next((key for key in self.build if key.lower() == part), None)
+        if part_type is None:
+            clear_screen()
+            print(f"{part} is not a valid part type.")
+            return
+
+        if part_type in ("RAM", "Storage"):
+            if self.ram_storage_removal(part_type) is not None:
+                print(f"Item has been removed from {part_type}.")
+        elif self.build[part_type] is None:
+            clear_screen()
+            print(f"Nothing in {part_type} to delete.")
+        elif part_type == "PSU":
+            self.psu_removal(self.build[part_type])
+            print(f"Item has been removed from {part_type}.")
+        else:
+            item = self.build[part_type]
+            self.build[part_type] = None
+            self.record_removed(item)
+            clear_screen()
+            print(f"{item.name} ({item.item_id}) was removed from build.\n")
+        self.stock_hold.refresh()
+
+    def recalculate_totals(self):
+        """
+        Recomputes the total cost, power balance and compatibility state from the parts
+        currently in the build.
+        """
+        self.total_cost = 0
+        self.total_power_draw = 0
+        self.state.reset()
+        for part in self.build.values():
+            for item in part if isinstance(part, list) else [part]:
+                if item is not None:
+                    self.record_added(item)
+
+    def apply_inventory_diff(self, diff):
+        """
+        Re-prices and re-validates the build after the inventory was reloaded.
+
+        Changed parts are swapped for their new versions, parts that no longer exist are
+        dropped, and the total cost and power balance are recomputed.
+
+        Args:
+            diff (InventoryDiff): The changes that were applied to the inventory.
+
+        Returns:
+            List[str]: Notices describing what changed in the build.
+        """
+        messages = refresh_parts(self.build, diff, "build")
+        self.recalculate_totals()
+        self.stock_hold.refresh()
+        return messages
+
+    def load_parts(self, parts):
+        """
+        Replaces the build with the given parts and recomputes the totals.
+
+        Args:
+            parts (dict): Part type -> item, or list of items for RAM and Storage.
+
+        Raises:
+            OutOfStockError: If the parts are not in stock; the build is unchanged.
+        """
+        previous = self.build
+        self.build = {
+            "CPU": parts.get("CPU"),
+            "GPU": parts.get("GPU"),
+            "RAM": list(parts.get("RAM", [])),
+            "PSU": parts.get("PSU"),
+            "Motherboard": parts.get("Motherboard"),
+            "Storage": list(parts.get("Storage", []))
+            }
+        try:
+            self.stock_hold.sync()
+        except OutOfStockError:
+            self.build = previous
+            raise
+        self.recalculate_totals()
+
+    def auto_build(self, objective=None, max_workers=None):
+        """
+        Generates the best compatible build within the user's budget and loads it into the
+        build, replacing the current parts.
+
+        Args:
+            objective (str, optional): A key of OBJECTIVES. If None, the user is asked.
+            max_workers (int, optional): Processes the search may use; see `find_best_build`.
+        """
+        clear_screen()
+        if objective is None:
+            print("What should the build be optimised for?")
+            for name, (_, description) in OBJECTIVES.items():
+                print(f"    {name}: {description}")
+            objective = input("Objective: ").strip().lower()
+            clear_screen()
+
+        if objective not in OBJECTIVES:
+            print(f"{objective} is not a valid objective.")
+            return
+
+        budget = self.user_object.get_budget()
+        print(f"Searching for the best build under ${budget:,}.00...", flush=True)
+        result = find_best_build(self.inventory_object, budget, objective,
+                                 max_workers=max_workers)
+        clear_screen()
+        if result is None:
+            print(f"No compatible build fits within your budget of ${budget:,}.00.")
+            return
+
+        try:
+            self.load_parts(result["parts"])
+        except OutOfStockError as error:
+            print(f"The generated build is not in stock. {error}.")
+            return
+        print(f"Generated a build with {OBJECTIVES[objective][1]} "
+              f"({result['value']:,}) for ${result['price']:,}.00.")
+        if not result["complete"]:
+            print("The search hit its time limit; a better build may exist.")
+        print("")
+
+    def browse_builds(self):
+        """
+        Pages through every valid build within the user's budget, cheapest first.
+
+        The first page is shown as soon as it is found; later pages continue the same
+        enumeration.
+        """
+        clear_screen()
+        budget = self.user_object.get_budget()
+        browser = BuildBrowser(self.inventory_object, budget)
+        self.choose_build(browser.next_page,
+                          f"No more compatible builds within your budget of ${budget:,}.00.")
+
+    def best_value_builds(self):
+        """
+        Lists the builds within the user's budget that no other build beats on price, RAM
+        capacity, storage capacity and PSU headroom all at once, cheapest first. Entering a
+        build's number loads it into the build.
+        """
+        clear_screen()
+        budget = self.user_object.get_budget()
+        builds = self.pareto_frontier.builds(budget)
+        pages = (builds[start:start + PAGE_SIZE] for start in range(0, len(builds), PAGE_SIZE))
+        self.choose_build(lambda: next(pages, []),
+                          f"No more compatible builds within your budget of ${budget:,}.00.")
+
+    def show_candidates(self, shown=5):
+        """
+        Lists, per category, the parts that can be added to the current build without ruling
+        out a valid complete build within the user's budget, cheapest first. Entering a part
+        ID adds it to the build and refreshes the lists; 'm' returns to the build menu.
+
+        Args:
+            shown (int): The most candidates listed per category.
+        """
+        clear_screen()
+        while True:
+            candidates = self.candidate_finder.candidates(self.build,
+                                                          self.user_object.get_budget())
+            print("--------------------------------------------------------------------------")
+            for part_type in CATEGORIES:
+                parts = candidates[part_type]
+                print(f"{part_type.upper()}: {len(parts)} compatible")
+                for item in parts[:shown]:
+                    print(f"    {item.name} ({item.item_id.lower()}) - ${item.price:,}.00")
+                if len(parts) > shown:
+                    print(f"    ... and {len(parts) - shown} more")
+            print("--------------------------------------------------------------------------")
+            print("Part ID: add to build    m: Build Menu")
+            user_input = input("\nSelect an option: ").strip()
+            if user_input.lower() in ('m', 'build_menu'):
+                clear_screen()
+                return
+            if self.add_item(user_input) is None:
+                print(f"{user_input} is not a valid part ID.")
+
+    @staticmethod
+    def build_summary(result):
+        """
+        Formats a generated build as one line.
+
+        Args:
+            result (dict): A build as described by `BuildSpace.describe`.
+
+        Returns:
+            str: The price and parts of the build, with its capacities and PSU headroom
+            when the result carries them.
+        """
+        parts = result["parts"]
+        summary = (f"${result['price']:,}.00 | {parts['Motherboard'].name} | "
+                   f"{parts['CPU'].name} | {len(parts['RAM'])}x {parts['RAM'][0].name} | "
+                   f"{len(parts['Storage'])}x {parts['Storage'][0].name} | "
+                   f"{parts['GPU'].name if parts['GPU'] else 'No GPU'} | "
+                   f"{parts['PSU'].name}")
+        if "headroom" in result:
+            summary += (f" | {result['ram_capacity']}GB RAM, "
+                        f"{result['storage_capacity']}GB storage, {result['headroom']}W spare")
+        return summary
+
+    def choose_build(self, next_page, empty_message):
+        """
+        Shows generated builds page by page and loads the one the user picks.
+
+        Entering a build's number loads it into the build, 'n' shows the next page and 'm'
+        returns to the build menu.
+
+        Args:
+            next_page (callable): Returns the next page of builds, or an empty list.
+            empty_message (str): Shown when there are no more builds.
+        """
+        page = next_page()
+        first_number = 1
+        while True:
+            if not page:
+                print(empty_message)
+                print("")
+                return
+
+            print("--------------------------------------------------------------------------")
+            for number, result in enumerate(page, start=first_number):
+                print(f"{number}. {self.build_summary(result)}")
+            print("--------------------------------------------------------------------------")
+            print("#: load build    n: next page    m: Build Menu")
+            user_input = input("\nSelect an option: ").strip().lower()
+            clear_screen()
+
+            if user_input == "n":
+                first_number += len(page)
+                page = next_page()
+            elif user_input.isdigit() and 0 <= int(user_input) - first_number < len(page):
+                try:
+                    self.load_parts(page[int(user_input) - first_number]["parts"])
+                except OutOfStockError as error:
+                    print(f"{error}.")
+                    print("")
+                    continue
+                return
+            elif user_input in ('m', 'build_menu'):
+                return
+            else:
+                self.default()
 
     def clear_build(self):
         """
@@ -249,6 +570,8 @@ class Build:
                     }
             self.total_cost = 0
             self.total_power_draw = 0
+            self.state.reset()
+            self.stock_hold.refresh()
             print("Build has successfully been reset.")
         else:
             clear_screen()
@@ -258,25 +581,27 @@ class Build:
         """
         Add the current build to the shopping cart if it passes the compatibility check.
 
-        The method performs a compatibility test on the current build using the 
-        `compatibility_object`. If the build passes the test, it adds the build 
-        and its total cost to the cart using the `cart_object` and notifies the user 
-        that the build has been successfully added.
+        The verdict is read from the build's live compatibility `state`, so the build is not
+        re-validated. If the build is compatible, it adds the build and its total cost to
+        the cart using the `cart_object` and notifies the user that the build has been
+        successfully added.
 
-        If the build is not compatible, the method alerts the user and suggests reviewing 
+        If the build is not compatible, the method lists the problems and suggests reviewing
         the compatibility check for more details.
 
         This method clears the screen before displaying messages.
         """
-        compatibility_test = self.compatibility_object.build_check(
-            self.build, self.total_power_draw
-        )
-        if compatibility_test:
-            self.cart_object.add_build(self.build, self.total_cost)
-            clear_screen()
+        clear_screen()
+        if self.state.valid:
+            try:
+                self.cart_object.add_build(self.build, self.total_cost)
+            except OutOfStockError as error:
+                print(f"{error}.")
+                return
             print("Build has been added to the shopping cart!")
         else:
-            clear_screen()
+            for problem in self.state.problems():
+                print(problem)
             print("Build is not compatible. See Build - Compatibility Check for more information.")
 
     def display_build_list(self):
@@ -302,17 +627,17 @@ class Build:
                 if item_key == "RAM":
                     print("RAM:")
                     for dimm in item_object:
-                        print(f"    {dimm.name} ({dimm.id.lower()}) - ${dimm.price:,}.00")
+                        print(f"    {dimm.name} ({dimm.item_id.lower()}) - ${dimm.price:,}.00")
 
                 elif item_key == "Storage":
                     print("Storage:")
                     for drive in item_object:
-                        print(f"    {drive.name} ({drive.id.lower()}) - ${drive.price:,}.00")
+                        print(f"    {drive.name} ({drive.item_id.lower()}) - ${drive.price:,}.00")
 
                 else:
                     print(f"{item_key.upper()}:")
                     print(
-                        f"    {item_object.name} ({item_object.id.lower()}) - " # pylint: disable=no-member
+                        f"    {item_object.name} ({item_object.item_id.lower()}) - " # pylint: disable=no-member
                         f"${item_object.price:,}.00" # pylint: disable=no-member
                     )
 
@@ -335,12 +660,18 @@ class Build:
         print("--------------------------------------------------------------------------")
         print(f"Total Cost: ${self.total_cost:,}.00")
         print(f"Power Draw: {self.total_power_draw}W")
+        problems = self.state.problems()
+        print(f"Compatibility: {'; '.join(problems) if problems else 'OK'}")
         print("--------------------------------------------------------------------------")
         print("1. add item")
         print("2. remove item")
         print("3. check compatibility")
         print("4. clear build")
         print("5. add build to cart")
+        print("6. build for me")
+        print("7. browse builds")
+        print("8. best value builds")
+        print("9. show compatible candidates")
         print("--------------------------------------------------------------------------")
         print("m: Main Menu")
 
@@ -379,7 +710,11 @@ class Build:
                     self.build, self.total_power_draw
                 ),
                 "4": self.clear_build,
-                "5": self.add_to_cart
+                "5": self.add_to_cart,
+                "6": self.auto_build,
+                "7": self.browse_builds,
+                "8": self.best_value_builds,
+                "9": self.show_candidates
             }
             run_option = menu_dict.get(user_input, self.default)
             run_option()
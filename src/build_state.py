@@ -0,0 +1,210 @@
+"""
+build_state.py
+
+Live compatibility state of a build, updated part by part.
+
+`BuildState` keeps the facts the compatibility rules depend on as running totals: the part
+count per type, the socket classes of the motherboard and CPU, the RAM sticks per ID and the
+board's slots, and the power supplied and drawn. Adding or removing a part touches a fixed
+number of them, so each update is O(1) and the verdict can be read at any time without
+re-validating the whole build.
+
+The verdict has the same shape as those of `CompatibilityMatrix` (a "complete" rule and the
+"socket", "ram_slots", "ram_match" and "power" rules), so `Compatibility.report` can print it.
+
+Classes:
+- BuildState: Running compatibility state of one build.
+
+Acknowledged Pylint Standard Errors:
+src\\build_state.py:24:0: E0401: Unable to import 'src.compatibility_matrix' (import-error)
+"""
+from collections import Counter
+from typing import Callable, Optional
+
+from src.compatibility_matrix import FAIL, PASS, REQUIRED_PARTS, SKIPPED, normalize_socket # pylint: disable=import-error
+
+class BuildState:
+    """
+    Running compatibility state of one build.
+
+    Attributes:
+        part_counts (Counter): Number of parts of every type.
+        item_counts (Counter): Number of parts per lower-cased ID.
+        motherboard, cpu (Item): The build's motherboard and CPU, or None.
+        ram_counts (Counter): Number of RAM sticks per lower-cased ID.
+        ram_count (int): Number of RAM sticks.
+        power_supplied (int): Watts supplied by the PSU.
+        power_draw (int): Watts drawn by every other part.
+    """
+    def __init__(self, socket_class: Optional[Callable[[str], str]] = None):
+        """
+        Args:
+            socket_class (callable, optional): Maps a socket name to its equivalence class,
+                such as `CompatibilityMatrix.socket_class`. Defaults to `normalize_socket`.
+        """
+        self.socket_class = socket_class or normalize_socket
+        self.reset()
+
+    def reset(self):
+        """Empties the state, as for a build without parts."""
+        self.part_counts = Counter()
+        self.item_counts = Counter()
+        self.motherboard = None
+        self.cpu = None
+        self._motherboard_class = None
+        self._cpu_class = None
+        self.ram_counts = Counter()
+        self.ram_count = 0
+        self.power_supplied = 0
+        self.power_draw = 0
+
+    def add(self, item):
+        """
+        Records a part added to the build. A motherboard, CPU or PSU replaces the one the
+        state held, so the caller must `remove` the previous part first.
+
+        Args:
+            item (Item): The part.
+        """
+        self.part_counts[item.item_type] += 1
+        self.item_counts[item.item_id.lower()] += 1
+        if item.item_type == "PSU":
+            self.power_supplied += int(item.power_supplied)
+            return
+
+        self.power_draw += int(item.power_draw)
+        if item.item_type == "Motherboard":
+            self.motherboard = item
+            self._motherboard_class = self.socket_class(item.socket)
+        elif item.item_type == "CPU":
+            self.cpu = item
+            self._cpu_class = self.socket_class(item.socket)
+        elif item.item_type == "RAM":
+            self.ram_counts[item.item_id.lower()] += 1
+            self.ram_count += 1
+
+    def remove(self, item):
+        """
+        Records a part removed from the build.
+
+        Args:
+            item (Item): The part.
+        """
+        self.part_counts[item.item_type] -= 1
+        self.item_counts[item.item_id.lower()] -= 1
+        if not self.item_counts[item.item_id.lower()]:
+            del self.item_counts[item.item_id.lower()]
+        if item.item_type == "PSU":
+            self.power_supplied -= int(item.power_supplied)
+            return
+
+        self.power_draw -= int(item.power_draw)
+        if item.item_type == "Motherboard":
+            self.motherboard = None
+            self._motherboard_class = None
+        elif item.item_type == "CPU":
+            self.cpu = None
+            self._cpu_class = None
+        elif item.item_type == "RAM":
+            ram_id = item.item_id.lower()
+            self.ram_counts[ram_id] -= 1
+            if not self.ram_counts[ram_id]:
+                del self.ram_counts[ram_id]
+            self.ram_count -= 1
+
+    @property
+    def power_balance(self) -> int:
+        """Watts supplied minus watts drawn."""
+        return self.power_supplied - self.power_draw
+
+    @property
+    def missing(self) -> list:
+        """The part types a complete build needs but this one lacks."""
+        return [part_type for part_type in REQUIRED_PARTS if not self.part_counts[part_type]]
+
+    @property
+    def socket_match(self) -> Optional[bool]:
+        """Whether the CPU fits the motherboard; None unless the build has both."""
+        if self.motherboard is None or self.cpu is None:
+            return None
+        return self._motherboard_class == self._cpu_class
+
+    @property
+    def free_ram_slots(self) -> Optional[int]:
+        """RAM slots left on the motherboard (negative if overfull); None without one."""
+        if self.motherboard is None:
+            return None
+        return int(self.motherboard.ram_slots) - self.ram_count
+
+    @property
+    def ram_matches(self) -> bool:
+        """Whether every RAM stick is the same part."""
+        return len(self.ram_counts) <= 1
+
+    @property
+    def valid(self) -> bool:
+        """Whether the build is complete and passes every rule."""
+        return (not self.missing and self.socket_match is not False
+                and (self.free_ram_slots is None or self.free_ram_slots >= 0)
+                and self.ram_matches and self.power_balance >= 0)
+
+    def verdict(self) -> dict:
+        """
+        Returns the verdict for the build, as `CompatibilityMatrix.check_build` would.
+
+        Returns:
+            dict: "part_ids", "valid", "unknown_ids" and "rules".
+        """
+        missing = self.missing
+        ram_ids = list(self.ram_counts.elements())
+        rules = {
+            "complete": {"status": FAIL if missing else PASS, "missing": missing},
+            "socket": {"status": SKIPPED, "pairs": []},
+            "ram_slots": {"status": SKIPPED, "ram_count": self.ram_count, "motherboards": []},
+            "ram_match": {"status": SKIPPED if self.ram_count <= 1 else
+                          PASS if self.ram_matches else FAIL, "ram_ids": ram_ids},
+            "power": {"status": SKIPPED, "supplied": self.power_supplied,
+                      "draw": self.power_draw, "headroom": self.power_balance},
+        }
+        if self.socket_match is not None:
+            rules["socket"] = {"status": PASS if self.socket_match else FAIL, "pairs": [
+                {"cpu": self.cpu.item_id.lower(),
+                 "motherboard": self.motherboard.item_id.lower(),
+                 "compatible": self.socket_match}]}
+        if self.motherboard is not None:
+            fits = self.free_ram_slots >= 0
+            rules["ram_slots"]["motherboards"] = [
+                {"motherboard": self.motherboard.item_id.lower(),
+                 "ram_slots": int(self.motherboard.ram_slots), "fits": fits}]
+            if self.ram_count:
+                rules["ram_slots"]["status"] = PASS if fits else FAIL
+        if self.part_counts["PSU"]:
+            rules["power"]["status"] = PASS if self.power_balance >= 0 else FAIL
+
+        return {
+            "part_ids": list(self.item_counts.elements()),
+            "valid": self.valid,
+            "unknown_ids": [],
+            "rules": rules,
+        }
+
+    def problems(self) -> list:
+        """
+        Returns one short description per failed rule.
+
+        Returns:
+            List[str]: The problems, empty for a valid build.
+        """
+        problems = []
+        if self.missing:
+            problems.append(f"Missing: {', '.join(self.missing)}")
+        if self.socket_match is False:
+            problems.append(f"CPU socket {self.cpu.socket} does not fit motherboard socket "
+                            f"{self.motherboard.socket}")
+        if self.free_ram_slots is not None and self.free_ram_slots < 0:
+            problems.append(f"{self.ram_count} RAM sticks for {self.motherboard.ram_slots} slots")
+        if not self.ram_matches:
+            problems.append("RAM sticks do not match")
+        if self.part_counts["PSU"] and self.power_balance < 0:
+            problems.append(f"PSU is {-self.power_balance}W short")
+        return problems
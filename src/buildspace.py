@@ -0,0 +1,193 @@
+"""
+buildspace.py
+
+The space of complete builds that can be assembled from an inventory, shared by the build
+generators (the budget optimiser, the price-ordered enumerator and the Pareto frontier).
+
+A build is one motherboard, one CPU whose socket is in the motherboard's socket class, up to
+one GPU, N identical RAM sticks (N no larger than the motherboard's `ram_slots`, since the
+compatibility rules require matching RAM), one to `MAX_STORAGE_DRIVES` identical drives and
+one PSU whose `power_supplied` covers the summed `power_draw`. Each of those decisions is a
+`PartChoice`; `BuildSpace` lists the choices per category once, sorted by price, together
+with the per-category minimums the search algorithms use as bounds.
+
+Classes:
+- PartChoice: One decision of a build: a part and how many of it.
+- BuildSpace: The choices of every category and helpers to combine them.
+
+Acknowledged Pylint Standard Errors:
+src\\buildspace.py:25:0: E0401: Unable to import 'src.compatibility_matrix' (import-error)
+src\\buildspace.py:26:0: E0401: Unable to import 'src.versioned' (import-error)
+"""
+from bisect import bisect_left
+from typing import Dict, List, Optional
+
+from src.compatibility_matrix import CompatibilityMatrix # pylint: disable=import-error
+from src.versioned import pinned # pylint: disable=import-error
+
+# Most identical drives a generated build may contain.
+MAX_STORAGE_DRIVES = 4
+
+# Categories in the order the generators decide them; the PSU always comes last because it
+# only depends on the total power draw.
+CATEGORIES = ["Motherboard", "CPU", "RAM", "Storage", "GPU", "PSU"]
+
+class PartChoice: # pylint: disable=too-few-public-methods
+    """
+    One decision of a build.
+
+    Attributes:
+        part_type (str): The build slot the choice fills ("CPU", "RAM", ...).
+        item (Item): The part, or None for "no GPU".
+        count (int): How many of the part the build contains.
+        price (int): Total price of the choice.
+        power_draw (int): Total power drawn by the choice (0 for PSUs).
+        capacity (int): Total capacity for RAM and Storage, 0 otherwise.
+    """
+    __slots__ = ("part_type", "item", "count", "price", "power_draw", "capacity")
+
+    def __init__(self, part_type: str, item, count: int = 1):
+        self.part_type = part_type
+        self.item = item
+        self.count = count
+        self.price = 0 if item is None else int(item.price) * count
+        self.power_draw = 0 if item is None or part_type == "PSU" else \
+            int(item.power_draw) * count
+        self.capacity = int(getattr(item, "capacity", 0)) * count
+
+    def __repr__(self) -> str:
+        name = "none" if self.item is None else self.item.item_id
+        return f"PartChoice({self.part_type}, {name} x{self.count})"
+
+class BuildSpace:
+    """
+    Every choice per category, sorted by price, for one version of an inventory.
+
+    Attributes:
+        motherboards, gpus, rams, storage, psus (List[PartChoice]): The choices of each
+            category, cheapest first. `gpus` starts with the "no GPU" choice; `rams` holds
+            every stick with every count up to the largest motherboard's slots; `psus` is
+            sorted by `power_supplied` instead.
+        cpus_by_class (Dict[str, List[PartChoice]]): CPU choices per socket class.
+        min_price (Dict[str, int]): Cheapest choice of every category.
+        min_draw (Dict[str, int]): Lowest power draw of every category.
+    """
+    def __init__(self, inventory, matrix: Optional[CompatibilityMatrix] = None):
+        matrix = matrix or CompatibilityMatrix(inventory)
+        with pinned(inventory) as reader:
+            items = {part_type: list(reader.get_items_by_type(part_type))
+                     for part_type in CATEGORIES}
+
+        def by_price(choices):
+            return sorted(choices, key=lambda choice: choice.price)
+
+        self.motherboards = by_price(PartChoice("Motherboard", board)
+                                     for board in items["Motherboard"])
+        max_slots = max((int(board.ram_slots) for board in items["Motherboard"]), default=0)
+
+        # Socket classes are resolved here, so the space can be pickled for worker processes
+        self._board_classes = {
+            choice.item.item_id.lower(): matrix.socket_class(choice.item.socket)
+            for choice in self.motherboards
+        }
+        self.cpus_by_class: Dict[str, List[PartChoice]] = {}
+        for cpu in items["CPU"]:
+            self.cpus_by_class.setdefault(matrix.socket_class(cpu.socket), []).append(
+                PartChoice("CPU", cpu))
+        for socket_class, choices in self.cpus_by_class.items():
+            self.cpus_by_class[socket_class] = by_price(choices)
+
+        self.rams = by_price(PartChoice("RAM", ram, count)
+                             for ram in items["RAM"] for count in range(1, max_slots + 1))
+        self._rams_by_slots: Dict[int, List[PartChoice]] = {}
+        self.storage = by_price(PartChoice("Storage", drive, count) for drive in items["Storage"]
+                                for count in range(1, MAX_STORAGE_DRIVES + 1))
+        self.gpus = [PartChoice("GPU", None)] + by_price(PartChoice("GPU", gpu)
+                                                         for gpu in items["GPU"])
+
+        self.psus = sorted((PartChoice("PSU", psu) for psu in items["PSU"]),
+                           key=lambda choice: int(choice.item.power_supplied))
+        self._psu_supplied = [int(choice.item.power_supplied) for choice in self.psus]
+        # Cheapest PSU among those supplying at least as much as the one at each position.
+        self._cheapest_psu_from: List[Optional[PartChoice]] = [None] * (len(self.psus) + 1)
+        for position in range(len(self.psus) - 1, -1, -1):
+            cheaper = self._cheapest_psu_from[position + 1]
+            choice = self.psus[position]
+            self._cheapest_psu_from[position] = choice if cheaper is None or \
+                choice.price <= cheaper.price else cheaper
+
+        all_cpus = [choice for choices in self.cpus_by_class.values() for choice in choices]
+        categories = {"Motherboard": self.motherboards, "CPU": all_cpus, "RAM": self.rams,
+                      "Storage": self.storage, "GPU": self.gpus, "PSU": self.psus}
+        self.min_price = {part_type: min((choice.price for choice in choices), default=0)
+                          for part_type, choices in categories.items()}
+        self.min_draw = {part_type: min((choice.power_draw for choice in choices), default=0)
+                         for part_type, choices in categories.items()}
+        self.max_supplied = self._psu_supplied[-1] if self._psu_supplied else 0
+
+    def is_empty(self) -> bool:
+        """Tells whether some required category has no parts at all."""
+        return not (self.motherboards and self.cpus_by_class and self.rams and self.storage
+                    and self.psus)
+
+    def board_class(self, motherboard: PartChoice) -> str:
+        """Returns the socket class of a motherboard choice."""
+        return self._board_classes[motherboard.item.item_id.lower()]
+
+    def cpus_for(self, motherboard: PartChoice) -> List[PartChoice]:
+        """Returns the CPU choices that fit the motherboard, cheapest first."""
+        return self.cpus_by_class.get(self.board_class(motherboard), [])
+
+    def rams_for(self, motherboard: PartChoice) -> List[PartChoice]:
+        """Returns the RAM choices that fit in the motherboard's slots, cheapest first."""
+        slots = int(motherboard.item.ram_slots)
+        choices = self._rams_by_slots.get(slots)
+        if choices is None:
+            choices = [choice for choice in self.rams if choice.count <= slots]
+            self._rams_by_slots[slots] = choices
+        return choices
+
+    def cheapest_psu(self, power_draw: int) -> Optional[PartChoice]:
+        """Returns the cheapest PSU supplying at least `power_draw` watts, or None."""
+        return self._cheapest_psu_from[bisect_left(self._psu_supplied, power_draw)]
+
+    @staticmethod
+    def to_build(choices: List[PartChoice]) -> dict:
+        """
+        Turns a list of choices into a build dictionary as kept by `Build`.
+
+        Args:
+            choices (List[PartChoice]): One choice per category.
+
+        Returns:
+            dict: Part type -> item, or list of items for RAM and Storage.
+        """
+        build = {"CPU": None, "GPU": None, "RAM": [], "PSU": None, "Motherboard": None,
+                 "Storage": []}
+        for choice in choices:
+            if choice.item is None:
+                continue
+            if choice.part_type in ("RAM", "Storage"):
+                build[choice.part_type].extend([choice.item] * choice.count)
+            else:
+                build[choice.part_type] = choice.item
+        return build
+
+    @staticmethod
+    def describe(choices: List[PartChoice]) -> dict:
+        """
+        Summarises a list of choices.
+
+        Returns:
+            dict: The build dictionary ("parts"), total "price", "power_draw",
+            "ram_capacity" and "storage_capacity".
+        """
+        return {
+            "parts": BuildSpace.to_build(choices),
+            "price": sum(choice.price for choice in choices),
+            "power_draw": sum(choice.power_draw for choice in choices),
+            "ram_capacity": sum(choice.capacity for choice in choices
+                                if choice.part_type == "RAM"),
+            "storage_capacity": sum(choice.capacity for choice in choices
+                                    if choice.part_type == "Storage"),
+        }
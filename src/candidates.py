@@ -0,0 +1,279 @@
+"""
+candidates.py
+
+Which parts can still be added to a partial build on the way to a valid complete build.
+
+The build is treated as a small constraint problem. The variables are the motherboard, CPU,
+RAM, storage, GPU and PSU, and the constraints are the compatibility rules plus the budget:
+
+- socket: the CPU and the motherboard share a socket class,
+- ram_slots / ram_match: the RAM sticks are identical and fit the motherboard's slots,
+- power: the PSU supplies at least the summed power draw,
+- budget: the summed price stays within the budget.
+
+The domains come from indexes built once per inventory version: CPUs and motherboards per
+socket class, motherboards per class and slot count, and every category sorted by price. A
+part already in the build fixes its variable, which narrows the others through the pairwise
+rules (a fixed motherboard leaves only the CPUs of its class, fixed RAM only more of the same
+stick, ...). The price and power sums are propagated on bounds: a candidate is kept only if
+the cheapest supports of the still-missing parts fit the budget and their lowest power draw
+can be covered by an affordable PSU. Only the candidates under the price bound taken from the
+sorted indexes are examined.
+
+A part that is not offered can never be completed into a valid build within the budget. A
+part that is offered passes every pairwise rule and the bounds; because the cheapest and the
+least power-hungry supports may be different parts, it is a candidate rather than a promise.
+
+Candidates replace the part a single-part category already holds (as `Build.add_item` does)
+and add to RAM and Storage.
+
+Classes:
+- CandidateFinder: Indexes of one inventory and the candidates of a partial build.
+
+Acknowledged Pylint Standard Errors:
+src\\candidates.py:40:0: E0401: Unable to import 'src.compatibility_matrix' (import-error)
+src\\candidates.py:41:0: E0401: Unable to import 'src.versioned' (import-error)
+"""
+from bisect import bisect_left, bisect_right
+from typing import Dict, List, Optional
+
+from src.compatibility_matrix import CompatibilityMatrix # pylint: disable=import-error
+from src.versioned import pinned # pylint: disable=import-error
+
+# Categories in the order the candidates are shown.
+CATEGORIES = ["Motherboard", "CPU", "RAM", "Storage", "GPU", "PSU"]
+
+class _Partial:
+    """The parts of a build that matter to the constraints, with running totals."""
+    def __init__(self, build: dict):
+        self.parts = {part_type: build.get(part_type) for part_type in
+                      ("Motherboard", "CPU", "GPU", "PSU")}
+        self.rams = list(build.get("RAM", []))
+        self.storage_count = len(build.get("Storage", []))
+        items = [item for part in build.values()
+                 for item in (part if isinstance(part, list) else [part]) if item is not None]
+        self.cost = sum(int(item.price) for item in items)
+        self.draw = sum(int(item.power_draw) for item in items if item.item_type != "PSU")
+        self.ram_ids = {ram.item_id.lower() for ram in self.rams}
+
+    def with_part(self, item) -> tuple:
+        """
+        Returns (motherboard, cpu, psu, ram count, storage count, cost, draw) after adding
+        `item`, replacing the part of a single-part category.
+        """
+        parts = dict(self.parts)
+        cost, draw = self.cost + int(item.price), self.draw
+        ram_count, storage_count = len(self.rams), self.storage_count
+        if item.item_type == "RAM":
+            ram_count += 1
+        elif item.item_type == "Storage":
+            storage_count += 1
+        else:
+            previous = parts[item.item_type]
+            if previous is not None:
+                cost -= int(previous.price)
+                if item.item_type != "PSU":
+                    draw -= int(previous.power_draw)
+            parts[item.item_type] = item
+        if item.item_type != "PSU":
+            draw += int(item.power_draw)
+        return (parts["Motherboard"], parts["CPU"], parts["PSU"], ram_count, storage_count,
+                cost, draw)
+
+class _Sorted:
+    """Parts sorted by price, with their prices for bisection."""
+    def __init__(self, items):
+        self.items = sorted(items, key=lambda item: int(item.price))
+        self.prices = [int(item.price) for item in self.items]
+        self.min_price = self.prices[0] if self.prices else None
+        self.min_draw = min((int(getattr(item, "power_draw", 0)) for item in self.items),
+                            default=None)
+
+    def up_to(self, price: int) -> list:
+        """The parts costing at most `price`, cheapest first."""
+        return self.items[:bisect_right(self.prices, price)]
+
+class CandidateFinder:
+    """
+    Indexes of one inventory for computing the candidates of partial builds. The indexes are
+    rebuilt whenever the inventory's version changes, and the candidates of the last partial
+    build asked about are kept until the build, the budget or the inventory changes.
+
+    Attributes:
+        inventory_object: The inventory the candidates come from.
+        matrix (CompatibilityMatrix): Supplies the socket classes.
+        built_version (int): The inventory version the indexes were built from.
+    """
+    def __init__(self, inventory_object, matrix: Optional[CompatibilityMatrix] = None):
+        self.inventory_object = inventory_object
+        self.matrix = matrix or CompatibilityMatrix(inventory_object)
+        self.built_version: Optional[int] = None
+        self.sorted: Dict[str, _Sorted] = {}
+        self.cpus_by_class: Dict[str, _Sorted] = {}
+        self.boards_by_class: Dict[str, _Sorted] = {}
+        self._board_bounds: Dict[str, tuple] = {}
+        self._psu_supplied: List[int] = []
+        self._psu_cheapest: List[int] = []
+        self._last = (None, None)
+
+    def refresh(self):
+        """Rebuilds the indexes if the inventory changed since they were built."""
+        version = getattr(self.inventory_object, "version", None)
+        if version is not None and version == self.built_version:
+            return
+
+        with pinned(self.inventory_object) as inventory:
+            items = {part_type: list(inventory.get_items_by_type(part_type))
+                     for part_type in CATEGORIES}
+        self.sorted = {part_type: _Sorted(parts) for part_type, parts in items.items()}
+
+        self.cpus_by_class = {}
+        for socket_class, cpus in self._group(items["CPU"]).items():
+            self.cpus_by_class[socket_class] = _Sorted(cpus)
+        self.boards_by_class = {}
+        # Per class: distinct slot counts, and the cheapest price and lowest draw of the
+        # boards with at least that many slots.
+        self._board_bounds = {}
+        for socket_class, boards in self._group(items["Motherboard"]).items():
+            self.boards_by_class[socket_class] = _Sorted(boards)
+            slots = sorted({int(board.ram_slots) for board in boards})
+            prices, draws = [], []
+            for threshold in slots:
+                fitting = [board for board in boards if int(board.ram_slots) >= threshold]
+                prices.append(min(int(board.price) for board in fitting))
+                draws.append(min(int(board.power_draw) for board in fitting))
+            self._board_bounds[socket_class] = (slots, prices, draws)
+
+        psus = sorted(items["PSU"], key=lambda psu: int(psu.power_supplied))
+        self._psu_supplied = [int(psu.power_supplied) for psu in psus]
+        # Cheapest price among the PSUs supplying at least as much as the one at each index.
+        self._psu_cheapest = [0] * len(psus)
+        cheapest = None
+        for index in range(len(psus) - 1, -1, -1):
+            price = int(psus[index].price)
+            cheapest = price if cheapest is None else min(cheapest, price)
+            self._psu_cheapest[index] = cheapest
+
+        self.built_version = version
+        self._last = (None, None)
+
+    def _group(self, items) -> Dict[str, list]:
+        groups: Dict[str, list] = {}
+        for item in items:
+            groups.setdefault(self.matrix.socket_class(item.socket), []).append(item)
+        return groups
+
+    def _cheapest_psu_price(self, draw: int) -> Optional[int]:
+        index = bisect_left(self._psu_supplied, draw)
+        return self._psu_cheapest[index] if index < len(self._psu_cheapest) else None
+
+    def _board_bound(self, socket_class: str, ram_count: int) -> Optional[tuple]:
+        """Cheapest price and lowest draw of a board of the class with enough slots."""
+        bounds = self._board_bounds.get(socket_class)
+        if bounds is None:
+            return None
+        slots, prices, draws = bounds
+        index = bisect_left(slots, max(ram_count, 1))
+        return (prices[index], draws[index]) if index < len(slots) else None
+
+    def _feasible(self, state: tuple, budget: int) -> bool:
+        """Bounds check: can this partial build still become a valid complete build?"""
+        motherboard, cpu, psu, ram_count, storage_count, cost, draw = state
+        extra_price = extra_draw = 0
+        if motherboard is not None:
+            board_class = self.matrix.socket_class(motherboard.socket)
+            if ram_count > int(motherboard.ram_slots) or int(motherboard.ram_slots) < 1:
+                return False
+            if cpu is not None:
+                if self.matrix.socket_class(cpu.socket) != board_class:
+                    return False
+            else:
+                cpus = self.cpus_by_class.get(board_class)
+                if cpus is None:
+                    return False
+                extra_price += cpus.min_price
+                extra_draw += cpus.min_draw
+        elif cpu is not None:
+            bound = self._board_bound(self.matrix.socket_class(cpu.socket), ram_count)
+            if bound is None:
+                return False
+            extra_price += bound[0]
+            extra_draw += bound[1]
+        else:
+            pairs = [(bound, self.cpus_by_class[socket_class])
+                     for socket_class in self.cpus_by_class
+                     for bound in [self._board_bound(socket_class, ram_count)] if bound]
+            if not pairs:
+                return False
+            extra_price += min(bound[0] + cpus.min_price for bound, cpus in pairs)
+            extra_draw += min(bound[1] + cpus.min_draw for bound, cpus in pairs)
+
+        if ram_count == 0:
+            if self.sorted["RAM"].min_price is None:
+                return False
+            extra_price += self.sorted["RAM"].min_price
+            extra_draw += self.sorted["RAM"].min_draw
+        if storage_count == 0:
+            if self.sorted["Storage"].min_price is None:
+                return False
+            extra_price += self.sorted["Storage"].min_price
+            extra_draw += self.sorted["Storage"].min_draw
+
+        total_draw = draw + extra_draw
+        if psu is not None:
+            return cost + extra_price <= budget and int(psu.power_supplied) >= total_draw
+        psu_price = self._cheapest_psu_price(total_draw)
+        return psu_price is not None and cost + extra_price + psu_price <= budget
+
+    def _domain(self, part_type: str, partial: _Partial, limit: int) -> list:
+        """The parts of a category the pairwise rules allow, costing at most `limit`."""
+        if part_type == "CPU":
+            board = partial.parts["Motherboard"]
+            if board is not None:
+                cpus = self.cpus_by_class.get(self.matrix.socket_class(board.socket))
+                return cpus.up_to(limit) if cpus else []
+        elif part_type == "Motherboard":
+            cpu = partial.parts["CPU"]
+            if cpu is not None:
+                boards = self.boards_by_class.get(self.matrix.socket_class(cpu.socket))
+                return boards.up_to(limit) if boards else []
+        elif part_type == "RAM" and partial.rams:
+            # Only more of the same stick keeps the RAM matching
+            stick = partial.rams[0]
+            return [stick] if len(partial.ram_ids) == 1 and int(stick.price) <= limit else []
+        return self.sorted[part_type].up_to(limit)
+
+    def candidates(self, build: dict, budget: int) -> Dict[str, list]:
+        """
+        Returns, per category, the parts that can be added to the build without ruling out
+        a valid complete build within the budget.
+
+        Args:
+            build (dict): Part type -> item, or list of items for RAM and Storage.
+            budget (int): The most the complete build may cost.
+
+        Returns:
+            Dict[str, list]: Category -> candidate parts, cheapest first.
+        """
+        self.refresh()
+        # Items compare by identity, so a replaced part changes the key
+        key = (budget, tuple((part_type, tuple(part) if isinstance(part, list) else part)
+                             for part_type, part in sorted(build.items())))
+        if self._last[0] == key:
+            return self._last[1]
+
+        partial = _Partial(build)
+        result: Dict[str, List] = {part_type: [] for part_type in CATEGORIES}
+        if len(partial.ram_ids) > 1:
+            # Mismatched RAM cannot be fixed by adding parts
+            self._last = (key, result)
+            return result
+        for part_type in CATEGORIES:
+            previous = partial.parts.get(part_type)
+            limit = budget - partial.cost + (int(previous.price) if previous is not None else 0)
+            result[part_type] = [
+                item for item in self._domain(part_type, partial, limit)
+                if self._feasible(partial.with_part(item), budget)
+            ]
+        self._last = (key, result)
+        return result
@@ -6,18 +6,27 @@ Classes:
     
 Methods in Cart:
     - default(): Handles invalid input options.
-    - checkout(): Processes the purchase if the user has sufficient funds.
-    - add_item(): Adds an item to the cart by its part ID.
+    - checkout(): Processes the purchase if the user has sufficient funds and the parts are
+      in stock, taking them out of stock.
+    - add_item(): Adds an item to the cart by its part ID, offering the closest parts for an
+      ID that is not in the inventory.
     - add_build(): Adds a complete PC build to the cart.
     - remove_item(): Removes an item from the cart by its part ID.
+    - apply_inventory_diff(): Re-prices the cart after an inventory reload.
     - clear_cart(): Clears the entire cart after user confirmation.
     - cart_display(): Displays the contents of the cart along with the user's name and budget.
     - cart_menu(): Manages the cart menu and user actions.
 
 Acknowledged Pylint Standard Errors:
-src\\cart.py:18:0: E0401: Unable to import 'src.utils' (import-error)
+src\\cart.py:27:0: E0401: Unable to import 'src.reload' (import-error)
+src\\cart.py:28:0: E0401: Unable to import 'src.search' (import-error)
+src\\cart.py:29:0: E0401: Unable to import 'src.stock' (import-error)
+src\\cart.py:30:0: E0401: Unable to import 'src.utils' (import-error)
 """
 import sys
+from src.reload import refresh_parts # pylint: disable=import-error
+from src.search import SearchIndex, choose_part # pylint: disable=import-error
+from src.stock import OutOfStockError, StockHold # pylint: disable=import-error
 from src.utils import clear_screen # pylint: disable=import-error
 
 class Cart:
@@ -36,10 +45,16 @@ class Cart:
         total_cost (int): The total cost of the items in the cart.
         build_cost (int): The total cost of a custom build, if applicable.
         cart (dict): A dictionary storing selected parts and/or a custom build.
+        stock_hold (StockHold): Holds the stock of the parts in the cart for the user.
+        search_index (SearchIndex): Offers the closest parts for a mistyped part ID.
     """
-    def __init__(self, user_object, inventory_object):
+    def __init__(self, user_object, inventory_object, stock_hold=None, search_index=None):
         self.user_object = user_object
         self.inventory_object = inventory_object
+        self.search_index = search_index if search_index is not None \
+            else SearchIndex(inventory_object)
+        self.stock_hold = stock_hold if stock_hold is not None else StockHold(None)
+        self.stock_hold.sources.append(lambda: self.cart)
 
         self.total_cost: int = 0
         self.build_cost: int = 0
@@ -67,6 +82,12 @@ class Cart:
 
         if user_input.lower() == "yes" or user_input == "y":
             clear_screen()
+            try:
+                self.stock_hold.commit(self.cart)
+            except OutOfStockError as error:
+                print(f"{error}.")
+                print("Please remove these items from the shopping cart.\n")
+                return
             print("Your purchase has been made. Thank you for choosing us for your PC needs!")
             sys.exit(0)
         else:
@@ -78,18 +99,28 @@ class Cart:
         
         Args:
             part_id (str, optional): The ID of the item to add. If not provided, the user is 
-            prompted for input.
+            prompted for input, and an ID that is not in the inventory lists the closest
+            parts to pick from instead.
         """
         clear_screen()
         if part_id is None:
             print("What is the item ID of the part you want to add?")
             part_id = input("Item ID: ")
             clear_screen()
-
-            for item in self.inventory_object.items:
-                if item.id.lower() == part_id.lower():
-                    self.cart[item.id] = item
-                    self.total_cost = self.total_cost + item.price
+            item = choose_part(self.search_index, part_id)
+        else:
+            item = self.inventory_object.get_item(part_id)
+        if item is not None:
+            previous = self.cart.get(item.item_id.upper())
+            self.cart[item.item_id.upper()] = item
+            try:
+                self.stock_hold.sync()
+            except OutOfStockError as error:
+                if previous is None:
+                    del self.cart[item.item_id.upper()]
+                print(f"{error}.")
+                return
+            self.total_cost = self.total_cost + item.price
 
     def add_build(self, build_data, build_cost):
         """
@@ -98,9 +129,21 @@ class Cart:
         Args:
             build_data (dict): A dictionary containing the parts of the custom build.
             build_cost (int): The total cost of the custom build.
+
+        Raises:
+            OutOfStockError: If the build's parts are not in stock; the cart is unchanged.
         """
-        self.build_cost = 0
+        previous = self.cart.get("BUILD")
         self.cart["BUILD"] = build_data
+        try:
+            self.stock_hold.sync()
+        except OutOfStockError:
+            if previous is None:
+                del self.cart["BUILD"]
+            else:
+                self.cart["BUILD"] = previous
+            raise
+        self.build_cost = 0
         self.build_cost += build_cost
         self.total_cost += self.build_cost
 
@@ -126,8 +169,40 @@ class Cart:
                 self.total_cost = self.total_cost - int(item_price)
                 print(f"{item_name} was successfully removed from your cart.\n")
             del self.cart[part_id.upper()]
+            self.stock_hold.refresh()
             clear_screen()
 
+    def apply_inventory_diff(self, diff):
+        """
+        Re-prices the cart after the inventory was reloaded.
+
+        Changed items (including the parts of a custom build) are swapped for their new
+        versions, items that no longer exist are dropped, and the costs are recomputed.
+
+        Args:
+            diff (InventoryDiff): The changes that were applied to the inventory.
+
+        Returns:
+            List[str]: Notices describing what changed in the cart.
+        """
+        build_data = self.cart.pop("BUILD", None)
+        messages = refresh_parts(self.cart, diff, "cart")
+        self.cart = {key: item for key, item in self.cart.items() if item is not None}
+
+        self.total_cost = sum(item.price for item in self.cart.values())
+        if build_data is not None:
+            messages.extend(refresh_parts(build_data, diff, "cart's custom build"))
+            self.build_cost = sum(
+                item.price
+                for part in build_data.values()
+                for item in (part if isinstance(part, list) else [part])
+                if item is not None
+            )
+            self.cart["BUILD"] = build_data
+            self.total_cost += self.build_cost
+        self.stock_hold.refresh()
+        return messages
+
     def clear_cart(self):
         """Clears the entire shopping cart after user confirmation."""
         clear_screen()
@@ -135,6 +210,7 @@ class Cart:
         user_input = input("Yes/No: ")
         if user_input.lower() == 'yes' or user_input.lower() == 'y':
             self.cart = {}
+            self.stock_hold.refresh()
             clear_screen()
         else:
             clear_screen()
@@ -0,0 +1,368 @@
+"""
+columnar.py
+
+A column-oriented alternative to `Inventory` for very large catalogs.
+
+`Inventory` keeps one Python object, with its own `__dict__`, per part. `ColumnarInventory`
+instead stores every attribute in its own column: numeric fields live in typed `array`
+columns, `item_type` and `socket` are dictionary-encoded into small integer codes, and IDs
+and names are packed as UTF-8 into a shared byte heap addressed by an offsets column. The
+ID lookup is an open-addressing hash table of row numbers rather than a dict of strings. A
+CPU/GPU/RAM/PSU/Motherboard/Storage object is built from a row only when a lookup or
+listing asks for it, so the rest of the application (listing, details, build and
+compatibility) works against it unchanged.
+
+Removed rows are tombstoned and skipped; the row lists of the secondary indexes are
+compacted once more than half of their entries are dead. A replaced item is overwritten in
+its own row.
+
+Classes:
+- ColumnarInventory: Drop-in replacement for Inventory backed by columns.
+
+Acknowledged Pylint Standard Errors:
+src\\columnar.py:28:0: E0401: Unable to import 'src.inventory' (import-error)
+"""
+from array import array
+from typing import Dict, List, Optional
+
+from src.inventory import CPU, GPU, RAM, PSU, Motherboard, Storage, Item # pylint: disable=import-error
+
+# Marker stored in code columns for attributes a part type does not have.
+NO_CODE = -1
+
+# Slot value for an unused entry of the ID hash table (slots store row + 1).
+EMPTY_SLOT = 0
+
+class ColumnarInventory:
+    """
+    Inventory whose parts are stored column by column.
+
+    Attributes:
+        strings (bytearray): UTF-8 heap holding the ID and name of every row.
+        id_offsets, name_offsets (array): Start of each row's ID / name in `strings`; the
+            value ends where the next one starts.
+        type_codes (array): Dictionary-encoded `item_type` of every row.
+        socket_codes (array): Dictionary-encoded `socket` of every row (NO_CODE if none).
+        price, power_draw, power_supplied, capacity, ram_slots (array): Numeric columns,
+            0 for rows whose type does not have the attribute.
+        overclockable (array): 1/0 for GPUs, NO_CODE for other rows.
+        stock (array): Units in stock, NO_CODE for rows whose stock is not tracked.
+        live (bytearray): 1 for rows that are still in the inventory, 0 for removed rows.
+        version (int): Incremented on every change, so dependants can tell when to refresh.
+    """
+    def __init__(self) -> None:
+        self.strings = bytearray()
+        self.id_offsets = array('q')
+        self.name_offsets = array('q')
+        self.type_codes = array('b')
+        self.socket_codes = array('h')
+        self.price = array('q')
+        self.power_draw = array('q')
+        self.power_supplied = array('q')
+        self.capacity = array('q')
+        self.ram_slots = array('q')
+        self.overclockable = array('b')
+        self.stock = array('q')
+        self.live = bytearray()
+
+        self.type_names: List[str] = []
+        self.type_lookup: Dict[str, int] = {}
+        self.socket_names: List[str] = []
+        self.socket_lookup: Dict[str, int] = {}
+
+        self.id_slots = array('q', [EMPTY_SLOT] * 8)
+        self.live_count = 0
+        self.type_rows: Dict[int, array] = {}
+        self.socket_rows: Dict[tuple, array] = {}
+        self.ram_slots_rows: Dict[int, array] = {}
+        self.dead_rows: Dict[tuple, int] = {}
+        self.version: int = 0
+
+    @property
+    def items(self):
+        """All items in the inventory, in insertion order, materialised one at a time."""
+        return (self._materialize(row) for row in range(len(self.live)) if self.live[row])
+
+    def __len__(self) -> int:
+        return self.live_count
+
+    def add_item(self, item: Item):
+        """
+        Adds an item to the inventory by appending one value to every column.
+
+        Args:
+            item (Item): The item to be added to the inventory.
+
+        Raises:
+            ValueError: If an item with the same ID (ignoring case) is already in the inventory.
+        """
+        item_key = item.item_id.strip().lower()
+        if self._find_row(item_key) is not None:
+            raise ValueError(f"Duplicate item ID: {item.item_id}")
+
+        row = len(self.live)
+        self.id_offsets.append(len(self.strings))
+        self.strings += item.item_id.encode('utf-8')
+        self.name_offsets.append(len(self.strings))
+        self.strings += item.name.encode('utf-8')
+        for column, value in zip(self._value_columns(), self._values(item)):
+            column.append(value)
+        self.live.append(1)
+        self.live_count += 1
+
+        self._insert_slot(item_key, row)
+        for index, key in self._bucket_keys(row):
+            index.setdefault(key, array('l')).append(row)
+        self.version += 1
+
+    def remove_item(self, item_id: str) -> Optional[Item]:
+        """
+        Removes an item from the inventory by tombstoning its row.
+
+        Args:
+            item_id (str): The ID of the item, matched without regard to case.
+
+        Returns:
+            Item: A view of the removed item, or None if the ID is not in the inventory.
+        """
+        row = self._find_row(item_id.strip().lower())
+        if row is None:
+            return None
+
+        item = self._materialize(row)
+        self.live[row] = 0
+        self.live_count -= 1
+        for index, key in self._bucket_keys(row):
+            dead_key = (id(index), key)
+            self.dead_rows[dead_key] = self.dead_rows.get(dead_key, 0) + 1
+            self._compact(index, key)
+        self.version += 1
+        return item
+
+    def replace_item(self, item: Item) -> Optional[Item]:
+        """
+        Replaces the item that has the same ID by overwriting its row, so it keeps its place
+        in every listing. A new name (or a new spelling of the ID) changes the length of the
+        row's strings, which shifts the offsets of every later row.
+
+        Args:
+            item (Item): The new version of the item.
+
+        Returns:
+            Item: A view of the replaced item, or None (and nothing is changed) if the ID is
+            not in the inventory.
+        """
+        row = self._find_row(item.item_id.strip().lower())
+        if row is None:
+            return None
+
+        old_item = self._materialize(row)
+        old_buckets = list(self._bucket_keys(row))
+        old_bucket_ids = {(id(index), key) for index, key in old_buckets}
+        self._write_strings(row, item)
+        for column, value in zip(self._value_columns(), self._values(item)):
+            column[row] = value
+
+        # Like Inventory, the row keeps its place in the buckets it stays in and joins the
+        # end of the ones it moves to
+        new_buckets = list(self._bucket_keys(row))
+        new_bucket_ids = {(id(index), key) for index, key in new_buckets}
+        for index, key in old_buckets:
+            if (id(index), key) not in new_bucket_ids:
+                index[key].remove(row)
+                if not index[key]:
+                    del index[key]
+                    self.dead_rows.pop((id(index), key), None)
+        for index, key in new_buckets:
+            if (id(index), key) not in old_bucket_ids:
+                index.setdefault(key, array('l')).append(row)
+        self.version += 1
+        return old_item
+
+    def get_item(self, item_id: str) -> Optional[Item]:
+        """
+        Looks up an item by its ID.
+
+        Args:
+            item_id (str): The ID of the item, matched without regard to case.
+
+        Returns:
+            Item: A freshly built view of the matching item, or None if the ID is unknown.
+        """
+        row = self._find_row(item_id.strip().lower())
+        return None if row is None else self._materialize(row)
+
+    def get_items_by_type(self, item_type: str):
+        """
+        Returns the items of one type (e.g. "CPU", "RAM") in insertion order.
+        """
+        type_code = self.type_lookup.get(item_type)
+        return self._materialize_rows(self.type_rows.get(type_code, ()))
+
+    def get_items_by_socket(self, item_type: str, socket: str):
+        """
+        Returns the CPUs or motherboards (per `item_type`) that use the given socket.
+        """
+        key = (self.type_lookup.get(item_type), self.socket_lookup.get(socket))
+        return self._materialize_rows(self.socket_rows.get(key, ()))
+
+    def get_items_by_ram_slots(self, ram_slots: int):
+        """
+        Returns the motherboards that have exactly `ram_slots` RAM slots.
+        """
+        return self._materialize_rows(self.ram_slots_rows.get(ram_slots, ()))
+
+    def get_ram_slot_counts(self) -> List[int]:
+        """
+        Returns the distinct motherboard RAM slot counts present, in ascending order.
+        """
+        return sorted(
+            ram_slots for ram_slots, rows in self.ram_slots_rows.items()
+            if any(self.live[row] for row in rows)
+        )
+
+    def _string(self, offsets: array, row: int) -> str:
+        """Decodes one value from the string heap."""
+        start = offsets[row]
+        if offsets is self.id_offsets:
+            end = self.name_offsets[row]
+        elif row + 1 < len(self.id_offsets):
+            end = self.id_offsets[row + 1]
+        else:
+            end = len(self.strings)
+        return self.strings[start:end].decode('utf-8')
+
+    def _write_strings(self, row: int, item: Item):
+        """Overwrites the ID and name of a row in the string heap."""
+        start = self.id_offsets[row]
+        end = self.id_offsets[row + 1] if row + 1 < len(self.id_offsets) else len(self.strings)
+        item_id = item.item_id.encode('utf-8')
+        name = item.name.encode('utf-8')
+        self.strings[start:end] = item_id + name
+        self.name_offsets[row] = start + len(item_id)
+        shift = len(item_id) + len(name) - (end - start)
+        if shift:
+            for later in range(row + 1, len(self.id_offsets)):
+                self.id_offsets[later] += shift
+                self.name_offsets[later] += shift
+
+    def _value_columns(self) -> tuple:
+        """The columns `_values` fills, in the same order."""
+        return (self.type_codes, self.socket_codes, self.price, self.power_draw,
+                self.power_supplied, self.capacity, self.ram_slots, self.overclockable,
+                self.stock)
+
+    def _values(self, item: Item) -> tuple:
+        """Encodes an item's attributes, other than its ID and name, as one row's values."""
+        socket = getattr(item, "socket", None)
+        overclockable = getattr(item, "overclockable", None)
+        return (_encode(item.item_type, self.type_names, self.type_lookup),
+                NO_CODE if socket is None else _encode(
+                    socket, self.socket_names, self.socket_lookup),
+                int(item.price),
+                int(item.power_draw),
+                int(getattr(item, "power_supplied", 0)),
+                int(getattr(item, "capacity", 0)),
+                int(getattr(item, "ram_slots", 0)),
+                NO_CODE if overclockable is None else int(overclockable),
+                NO_CODE if item.stock is None else int(item.stock))
+
+    def _find_row(self, item_key: str) -> Optional[int]:
+        """Returns the live row whose lower-cased ID is `item_key`, probing the hash table."""
+        mask = len(self.id_slots) - 1
+        slot = hash(item_key) & mask
+        while self.id_slots[slot] != EMPTY_SLOT:
+            row = self.id_slots[slot] - 1
+            if self.live[row] and self._string(self.id_offsets, row).lower() == item_key:
+                return row
+            slot = (slot + 1) & mask
+        return None
+
+    def _insert_slot(self, item_key: str, row: int):
+        """Stores `row` in the hash table, growing the table past two-thirds load."""
+        if (len(self.live) + 1) * 3 > len(self.id_slots) * 2:
+            self._resize_slots(len(self.id_slots) * 2)
+
+        mask = len(self.id_slots) - 1
+        slot = hash(item_key) & mask
+        while self.id_slots[slot] != EMPTY_SLOT:
+            slot = (slot + 1) & mask
+        self.id_slots[slot] = row + 1
+
+    def _resize_slots(self, size: int):
+        """Rebuilds the hash table with `size` slots, dropping removed rows."""
+        while self.live_count * 3 > size * 2:
+            size *= 2
+        self.id_slots = array('q', [EMPTY_SLOT]) * size
+        mask = size - 1
+        for row, is_live in enumerate(self.live):
+            if not is_live:
+                continue
+            slot = hash(self._string(self.id_offsets, row).lower()) & mask
+            while self.id_slots[slot] != EMPTY_SLOT:
+                slot = (slot + 1) & mask
+            self.id_slots[slot] = row + 1
+
+    def _bucket_keys(self, row: int):
+        """Yields (index, key) for every secondary index bucket the row belongs to."""
+        type_code = self.type_codes[row]
+        yield self.type_rows, type_code
+
+        type_name = self.type_names[type_code]
+        if type_name in ("CPU", "Motherboard"):
+            yield self.socket_rows, (type_code, self.socket_codes[row])
+        if type_name == "Motherboard":
+            yield self.ram_slots_rows, self.ram_slots[row]
+
+    def _compact(self, index: dict, key):
+        """Drops dead rows from a bucket once they make up more than half of it."""
+        rows = index[key]
+        dead_key = (id(index), key)
+        if self.dead_rows[dead_key] * 2 <= len(rows):
+            return
+
+        del self.dead_rows[dead_key]
+        live_rows = array('l', (row for row in rows if self.live[row]))
+        if live_rows:
+            index[key] = live_rows
+        else:
+            del index[key]
+
+    def _materialize_rows(self, rows) -> List[Item]:
+        """Builds item views for the live rows of a bucket."""
+        return [self._materialize(row) for row in rows if self.live[row]]
+
+    def _materialize(self, row: int) -> Item:
+        """Builds the Item subclass object for one row."""
+        item_type = self.type_names[self.type_codes[row]]
+        item_id = self._string(self.id_offsets, row)
+        name = self._string(self.name_offsets, row)
+        price = self.price[row]
+
+        if item_type == "CPU":
+            item = CPU(item_id, name, price, self.power_draw[row],
+                       self.socket_names[self.socket_codes[row]])
+        elif item_type == "GPU":
+            item = GPU(item_id, name, price, self.power_draw[row],
+                       bool(self.overclockable[row]))
+        elif item_type == "RAM":
+            item = RAM(item_id, name, price, self.power_draw[row], self.capacity[row])
+        elif item_type == "PSU":
+            item = PSU(item_id, name, price, self.power_supplied[row])
+        elif item_type == "Motherboard":
+            item = Motherboard(item_id, name, price, self.power_draw[row],
+                               self.socket_names[self.socket_codes[row]], self.ram_slots[row])
+        else:
+            item = Storage(item_id, name, price, self.capacity[row])
+        if self.stock[row] != NO_CODE:
+            item.stock = self.stock[row]
+        return item
+
+def _encode(value: str, names: List[str], lookup: Dict[str, int]) -> int:
+    """Returns the dictionary code for `value`, assigning the next code if it is new."""
+    code = lookup.get(value)
+    if code is None:
+        code = len(names)
+        names.append(value)
+        lookup[value] = code
+    return code
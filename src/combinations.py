@@ -0,0 +1,278 @@
+"""
+combinations.py
+
+Vectorized evaluation of every CPU x Motherboard x RAM x PSU combination in the catalog.
+
+The attributes of each category are loaded into NumPy arrays once. The socket rule is then
+checked for a block of CPUs against every motherboard as one broadcast comparison, leaving
+the matching CPU/motherboard pairs. For a block of pairs the remaining rules (the DIMM count
+fits `ram_slots`, `power_supplied` covers the summed `power_draw`) are evaluated over a
+pairs x DIMM counts x RAM x PSU array. Blocks are sized so that no intermediate array holds
+more than `max_cells` elements, so memory stays bounded however large the cross product is.
+
+A combination uses one CPU, one motherboard, one PSU and `dimm_count` sticks of the same RAM
+(the compatibility rules require matching RAM). Valid combinations are returned as a compact
+`CombinationTable` of integer columns that index into the part lists.
+
+NumPy is required by this module only; nothing else imports it, so the storefront itself
+still runs without NumPy installed.
+
+Classes:
+- CombinationTable: Column-oriented table of valid combinations.
+
+Functions:
+- iter_combination_chunks(inventory, max_cells, matrix): Yields the valid combinations chunk
+  by chunk.
+- evaluate_combinations(inventory, max_cells, matrix): Returns every valid combination.
+- count_valid_combinations(inventory, max_cells, matrix): Counts them without keeping them.
+
+Acknowledged Pylint Standard Errors:
+src\\combinations.py:36:0: E0401: Unable to import 'numpy' (import-error)
+src\\combinations.py:38:0: E0401: Unable to import 'src.compatibility_matrix' (import-error)
+src\\combinations.py:39:0: E0401: Unable to import 'src.versioned' (import-error)
+"""
+from typing import List, Optional
+
+import numpy as np # pylint: disable=import-error
+
+from src.compatibility_matrix import CompatibilityMatrix # pylint: disable=import-error
+from src.versioned import pinned # pylint: disable=import-error
+
+# Upper bound on the elements of any intermediate array (about 16 MB for a boolean mask).
+DEFAULT_MAX_CELLS = 1 << 24
+
+class CombinationTable:
+    """
+    Valid combinations stored column by column.
+
+    Attributes:
+        cpus, motherboards, rams, psus (list): The parts the index columns refer to.
+        cpu, motherboard, ram, psu (ndarray): Index of the part used by every combination.
+        dimm_count (ndarray): Number of RAM sticks in every combination.
+        price (ndarray): Total price of every combination.
+        power_draw (ndarray): Total power draw of every combination.
+        headroom (ndarray): PSU capacity left over in every combination.
+    """
+    COLUMNS = ("cpu", "motherboard", "ram", "dimm_count", "psu", "price", "power_draw",
+               "headroom")
+
+    def __init__(self, parts: dict, columns: dict):
+        self.cpus = parts["CPU"]
+        self.motherboards = parts["Motherboard"]
+        self.rams = parts["RAM"]
+        self.psus = parts["PSU"]
+        self.cpu = columns["cpu"]
+        self.motherboard = columns["motherboard"]
+        self.ram = columns["ram"]
+        self.dimm_count = columns["dimm_count"]
+        self.psu = columns["psu"]
+        self.price = columns["price"]
+        self.power_draw = columns["power_draw"]
+        self.headroom = columns["headroom"]
+
+    def __len__(self) -> int:
+        return len(self.price)
+
+    @classmethod
+    def concatenate(cls, parts: dict, tables: List["CombinationTable"]) -> "CombinationTable":
+        """Joins chunk tables built from the same part lists into one table."""
+        return cls(parts, {
+            column: np.concatenate([getattr(table, column) for table in tables])
+            if tables else np.empty(0, dtype=_COLUMN_TYPES[column])
+            for column in cls.COLUMNS
+        })
+
+    def row(self, index: int) -> dict:
+        """
+        Returns one combination with the part IDs spelled out.
+
+        Args:
+            index (int): Row number in the table.
+
+        Returns:
+            dict: The part IDs, DIMM count, total price, power draw and headroom.
+        """
+        return {
+            "cpu": self.cpus[self.cpu[index]].item_id,
+            "motherboard": self.motherboards[self.motherboard[index]].item_id,
+            "ram": self.rams[self.ram[index]].item_id,
+            "dimm_count": int(self.dimm_count[index]),
+            "psu": self.psus[self.psu[index]].item_id,
+            "price": int(self.price[index]),
+            "power_draw": int(self.power_draw[index]),
+            "headroom": int(self.headroom[index]),
+        }
+
+    def cheapest(self, count: int = 10) -> List[dict]:
+        """Returns the `count` cheapest combinations, cheapest first."""
+        count = min(count, len(self))
+        if count == 0:
+            return []
+        candidates = np.argpartition(self.price, count - 1)[:count]
+        return [self.row(index) for index in candidates[np.argsort(self.price[candidates],
+                                                                    kind="stable")]]
+
+_COLUMN_TYPES = {
+    "cpu": np.int32, "motherboard": np.int32, "ram": np.int32, "dimm_count": np.int16,
+    "psu": np.int32, "price": np.int64, "power_draw": np.int64, "headroom": np.int64,
+}
+
+def _load_parts(inventory) -> dict:
+    """Reads the four categories out of one version of the inventory."""
+    return {part_type: list(inventory.get_items_by_type(part_type))
+            for part_type in ("CPU", "Motherboard", "RAM", "PSU")}
+
+def _socket_codes(matrix: CompatibilityMatrix, cpus: list, motherboards: list):
+    """Encodes the socket class of every CPU and motherboard as a small integer."""
+    codes = {}
+    def encode(items):
+        return np.fromiter(
+            (codes.setdefault(matrix.socket_class(item.socket), len(codes)) for item in items),
+            dtype=np.int32, count=len(items)
+        )
+    return encode(cpus), encode(motherboards)
+
+def _column(items: list, attribute: str):
+    return np.fromiter((int(getattr(item, attribute)) for item in items), dtype=np.int64,
+                       count=len(items))
+
+def _socket_pairs(cpu_codes, board_codes, max_cells: int):
+    """Yields the (cpu, motherboard) index arrays of the matching pairs, block by block."""
+    block = max(1, max_cells // max(1, len(board_codes)))
+    for start in range(0, len(cpu_codes), block):
+        matches = cpu_codes[start:start + block, None] == board_codes[None, :]
+        cpu_index, board_index = np.nonzero(matches)
+        yield (cpu_index + start).astype(np.int32), board_index.astype(np.int32)
+
+def iter_combination_chunks(inventory, max_cells: int = DEFAULT_MAX_CELLS,
+                            matrix: Optional[CompatibilityMatrix] = None):
+    """
+    Evaluates the whole cross product and yields the valid combinations in chunks.
+
+    Args:
+        inventory: Any inventory backend; a VersionedInventory is read from one version.
+        max_cells (int): Upper bound on the elements of any intermediate array.
+        matrix (CompatibilityMatrix, optional): Supplies the socket equivalence classes.
+            A matrix without aliases is used when omitted.
+
+    Yields:
+        CombinationTable: The valid combinations of one block of CPU/motherboard pairs.
+    """
+    with pinned(inventory) as reader:
+        parts = _load_parts(reader)
+    return _iter_chunks(parts, max_cells, matrix or CompatibilityMatrix(inventory))
+
+def _prepare(parts: dict, matrix: CompatibilityMatrix) -> dict:
+    """Loads the attributes the rules need into NumPy columns."""
+    cpu_codes, board_codes = _socket_codes(matrix, parts["CPU"], parts["Motherboard"])
+    board_slots = _column(parts["Motherboard"], "ram_slots")
+    return {
+        "cpu_codes": cpu_codes, "board_codes": board_codes,
+        "cpu_price": _column(parts["CPU"], "price"),
+        "cpu_draw": _column(parts["CPU"], "power_draw"),
+        "board_price": _column(parts["Motherboard"], "price"),
+        "board_draw": _column(parts["Motherboard"], "power_draw"),
+        "board_slots": board_slots,
+        "ram_price": _column(parts["RAM"], "price"),
+        "ram_draw": _column(parts["RAM"], "power_draw"),
+        "psu_price": _column(parts["PSU"], "price"),
+        "psu_supplied": _column(parts["PSU"], "power_supplied"),
+        "dimm_counts": np.arange(1, max(1, int(board_slots.max())) + 1, dtype=np.int64),
+    }
+
+def _iter_blocks(columns: dict, max_cells: int, psu_axis: int):
+    """
+    Yields (cpus, boards, ram_start, draw, fits) for blocks of socket-compatible pairs and
+    RAM sticks. `draw` is the pairs x DIMM counts x RAM power draw and `fits` the pairs x DIMM
+    counts slot check; blocks are sized so that `draw` times `psu_axis` stays under
+    `max_cells`.
+    """
+    dimm_counts = columns["dimm_counts"]
+    ram_count = len(columns["ram_draw"])
+    ram_block = min(ram_count, max(1, max_cells // (len(dimm_counts) * psu_axis)))
+    pair_block = max(1, max_cells // (len(dimm_counts) * ram_block * psu_axis))
+
+    for cpu_index, board_index in _socket_pairs(columns["cpu_codes"], columns["board_codes"],
+                                                max_cells):
+        for start in range(0, len(cpu_index), pair_block):
+            cpus = cpu_index[start:start + pair_block]
+            boards = board_index[start:start + pair_block]
+            base_draw = columns["cpu_draw"][cpus] + columns["board_draw"][boards]
+            fits = columns["board_slots"][boards][:, None] >= dimm_counts[None, :]
+
+            for ram_start in range(0, ram_count, ram_block):
+                ram_draw = columns["ram_draw"][ram_start:ram_start + ram_block]
+                # pairs x DIMM counts x RAM
+                draw = (base_draw[:, None, None]
+                        + dimm_counts[None, :, None] * ram_draw[None, None, :])
+                yield cpus, boards, ram_start, draw, fits
+
+def _iter_chunks(parts: dict, max_cells: int, matrix: CompatibilityMatrix):
+    """Generator behind `iter_combination_chunks`, working on already loaded parts."""
+    if not all(parts.values()):
+        return
+
+    columns = _prepare(parts, matrix)
+    psu_supplied = columns["psu_supplied"]
+    for cpus, boards, ram_start, draw, fits in _iter_blocks(columns, max_cells,
+                                                            len(psu_supplied)):
+        # pairs x DIMM counts x RAM x PSU
+        valid = (psu_supplied[None, None, None, :] >= draw[..., None]) & fits[:, :, None, None]
+        pair, dimm, ram, psu = np.nonzero(valid)
+        if not len(pair):
+            continue
+
+        combo_draw = draw[pair, dimm, ram]
+        count = columns["dimm_counts"][dimm]
+        ram_index = ram + ram_start
+        yield CombinationTable(parts, {
+            "cpu": cpus[pair],
+            "motherboard": boards[pair],
+            "ram": ram_index.astype(np.int32),
+            "dimm_count": count.astype(np.int16),
+            "psu": psu.astype(np.int32),
+            "price": (columns["cpu_price"][cpus[pair]] + columns["board_price"][boards[pair]]
+                      + count * columns["ram_price"][ram_index] + columns["psu_price"][psu]),
+            "power_draw": combo_draw,
+            "headroom": psu_supplied[psu] - combo_draw,
+        })
+
+def evaluate_combinations(inventory, max_cells: int = DEFAULT_MAX_CELLS,
+                          matrix: Optional[CompatibilityMatrix] = None) -> CombinationTable:
+    """
+    Returns every valid CPU x Motherboard x RAM x PSU combination in one table.
+
+    Args:
+        inventory: Any inventory backend.
+        max_cells (int): Upper bound on the elements of any intermediate array.
+        matrix (CompatibilityMatrix, optional): Supplies the socket equivalence classes.
+
+    Returns:
+        CombinationTable: The valid combinations.
+    """
+    with pinned(inventory) as reader:
+        parts = _load_parts(reader)
+    tables = list(_iter_chunks(parts, max_cells, matrix or CompatibilityMatrix(inventory)))
+    return CombinationTable.concatenate(parts, tables)
+
+def count_valid_combinations(inventory, max_cells: int = DEFAULT_MAX_CELLS,
+                             matrix: Optional[CompatibilityMatrix] = None) -> int:
+    """
+    Counts the valid combinations without keeping them, for catalogs whose valid cross
+    product is too large to hold.
+
+    The PSU axis is not broadcast here: with the PSU capacities sorted, the number of PSUs
+    that cover a draw is one `searchsorted`, so each block is pairs x DIMM counts x RAM.
+    """
+    with pinned(inventory) as reader:
+        parts = _load_parts(reader)
+    if not all(parts.values()):
+        return 0
+
+    columns = _prepare(parts, matrix or CompatibilityMatrix(inventory))
+    supplied = np.sort(columns["psu_supplied"])
+    total = 0
+    for _, _, _, draw, fits in _iter_blocks(columns, max_cells, 1):
+        covering = len(supplied) - np.searchsorted(supplied, draw, side="left")
+        total += int((covering * fits[:, :, None]).sum())
+    return total
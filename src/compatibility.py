@@ -16,10 +16,33 @@ Create an instance of `Compatibility` by passing an inventory object. Then use
 methods like `compatibility_check` or `build_check` to perform the validation 
 process.
 
+The rules themselves are evaluated by a `CompatibilityMatrix`, which returns structured
+verdicts; `check_parts` hands those to callers, while the interactive checks print them.
+Each check reads a single pinned version of the inventory, so an update published while a
+check runs cannot give it a mix of old and new parts. Verdicts are cached by the matrix;
+`cache_stats` reports how well the cache is doing and `apply_inventory_diff` drops the
+verdicts of reloaded parts.
+
 Acknowledged Pylint Standard Errors:
-src\\compatibility.py:19:0: E0401: Unable to import 'src.utils' (import-error)
+src\\compatibility.py:27:0: E0401: Unable to import 'src.utils' (import-error)
+src\\compatibility.py:28:0: E0401: Unable to import 'src.versioned' (import-error)
+src\\compatibility.py:29:0: E0401: Unable to import 'src.compatibility_matrix' (import-error)
 """
 from src.utils import clear_screen # pylint: disable=import-error
+from src.versioned import pinned # pylint: disable=import-error
+from src.compatibility_matrix import CompatibilityMatrix, FAIL, SKIPPED # pylint: disable=import-error
+
+# Message printed for the first part a build is missing.
+MISSING_PART_MESSAGES = {
+    "Motherboard": "A valid build requires a single motherboard. Please select one for your "
+                   "build.",
+    "RAM": "A valid build requires RAM. Please add to your build.\nKeep in mind that your "
+           "Motherboard has a limited number of RAM slots.",
+    "CPU": "A valid build requires a CPU. Please select one for your build.\nPlease note "
+           "that your Motherboard socket and CPU socket need to match.",
+    "Storage": "A valid build requires Storage. Please select one for your build.",
+    "PSU": "A valid build requires a Power Supply (PSU). Please select one for your build.",
+}
 
 class Compatibility:
     """
@@ -29,6 +52,7 @@ class Compatibility:
     """
     def __init__(self, inventory_object):
         self.inventory_object = inventory_object
+        self.matrix = CompatibilityMatrix(inventory_object)
         self.total_power_consuption: int = 0
 
     def update_power_draw(self, item_type, wattage):
@@ -66,33 +90,49 @@ class Compatibility:
             "Storage": []
         }
 
-        # Check that each user provided item id exists within the inventory data.
-        id_list = []
-
-        # Creating a list of IDs to validate the user's input before processing.
-        for item in self.inventory_object.items:
-            id_list.append(item.id)
-
         # validating user input and adding valid items to the dict.
         for individual_item in item_id_list:
-            if individual_item.upper() in id_list:
-                for item in self.inventory_object.items:
-                    if item.id.lower() == individual_item.lower():
-                        part_dict[item.type].append(item)
-
-                        # Update Power Draw / Supply variable
-                        if item.type != "PSU":
-                            self.update_power_draw(item.type, item.power_draw)
-                        else:
-                            self.update_power_draw(item.type, item.power_supplied)
-            else:
+            item = self.inventory_object.get_item(individual_item)
+            if item is None:
                 # Ending the validation process and returning None if the user provides
                 # an invalid part id.
                 return None
 
+            part_dict[item.item_type].append(item)
+
+            # Update Power Draw / Supply variable
+            if item.item_type != "PSU":
+                self.update_power_draw(item.item_type, item.power_draw)
+            else:
+                self.update_power_draw(item.item_type, item.power_supplied)
+
         # return the completed dict.
         return part_dict
 
+    def get_compatible_cpus(self, motherboard):
+        """
+        Returns the CPUs in the inventory whose socket matches the motherboard.
+
+        Args:
+            motherboard (object): The motherboard object.
+        """
+        return self.matrix.compatible_cpus(motherboard)
+
+    def get_compatible_motherboards(self, cpu, ram_count=0):
+        """
+        Returns the motherboards that fit the CPU's socket and have at least `ram_count`
+        RAM slots.
+
+        Args:
+            cpu (object): The CPU object.
+            ram_count (int): The number of RAM sticks the motherboard must hold.
+        """
+        return [
+            motherboard
+            for motherboard in self.matrix.compatible_motherboards(cpu)
+            if int(motherboard.ram_slots) >= ram_count
+        ]
+
     def motherboard_cpu_validation(self, motherboard, cpu):
         """
         Validates whether the CPU is compatible with the motherboard based on the socket type.
@@ -101,11 +141,14 @@ class Compatibility:
             motherboard (object): The motherboard object.
             cpu (object): The CPU object.
         """
-        if motherboard.socket != cpu.socket:
-            print(f"{cpu.name} ({cpu.id}) is not compatible with {motherboard.name} "
-                  f"({motherboard.id})")
+        if not self.matrix.sockets_match(motherboard, cpu):
+            print(f"{cpu.name} ({cpu.item_id}) is not compatible with {motherboard.name} "
+                  f"({motherboard.item_id})")
+            print(f"{len(self.get_compatible_cpus(motherboard))} CPU(s) in the inventory fit "
+                  f"the {motherboard.socket} socket.")
         else:
-            print(f"{cpu.name} ({cpu.id}) is compatible with {motherboard.name} ({motherboard.id})")
+            print(f"{cpu.name} ({cpu.item_id}) is compatible with {motherboard.name} "
+                  f"({motherboard.item_id})")
 
     def ram_id_validation(self, ram_list):
         """
@@ -117,9 +160,9 @@ class Compatibility:
         if len(ram_list) == 1:
             print("All motherboards are compatible when only given 1 RAM.")
         else:
-            first_ram_id = ram_list[0].id
+            first_ram_id = ram_list[0].item_id.lower()
             for ram_object in ram_list[1:]:
-                if ram_object.id == first_ram_id:
+                if ram_object.item_id.lower() == first_ram_id:
                     print("RAM Matches")
                 else:
                     print("RAM ID's Do Not Match. All motherboards require matching RAM.")
@@ -142,6 +185,13 @@ class Compatibility:
         else:
             print("The total amount of RAM listed is greater than the number of slots on the \
                   motherboard.")
+            larger_boards = sum(
+                len(self.inventory_object.get_items_by_ram_slots(ram_slots))
+                for ram_slots in self.inventory_object.get_ram_slot_counts()
+                if ram_slots >= ram_list_len
+            )
+            print(f"{larger_boards} motherboard(s) in the inventory have at least "
+                  f"{ram_list_len} RAM slots.")
 
     def power_draw_check(self):
         """
@@ -154,6 +204,77 @@ class Compatibility:
         else:
             print("The powerdraw for these parts is at max capacity. Consider upgrading the PSU.")
 
+    def check_parts(self, item_id_list, require_complete=False):
+        """
+        Checks a set of parts without printing anything.
+
+        Args:
+            item_id_list (list): The IDs of the parts to check.
+            require_complete (bool): Also require every part a complete build needs.
+
+        Returns:
+            dict: The structured verdict from `CompatibilityMatrix.check_set`.
+        """
+        return self.matrix.check_set(item_id_list, require_complete)
+
+    def report(self, verdict, parts=None):
+        """
+        Prints a verdict produced by the compatibility matrix.
+
+        Args:
+            verdict (dict): The verdict to print.
+            parts (dict, optional): Lower-cased part ID -> item for parts that may no longer
+                be in the inventory, such as the parts of a build.
+        """
+        rules = verdict["rules"]
+        if rules["complete"]["status"] == FAIL:
+            print(MISSING_PART_MESSAGES[rules["complete"]["missing"][0]])
+            return
+
+        parts = parts or {}
+        def get_item(part_id):
+            return parts.get(part_id) or self.inventory_object.get_item(part_id)
+        for pair in rules["socket"]["pairs"]:
+            self.motherboard_cpu_validation(get_item(pair["motherboard"]), get_item(pair["cpu"]))
+
+        ram_rule = rules["ram_slots"]
+        if ram_rule["status"] != SKIPPED:
+            ram_list = [get_item(ram_id) for ram_id in rules["ram_match"]["ram_ids"]]
+            for board in ram_rule["motherboards"]:
+                self.motherboard_ram_slot_validation(get_item(board["motherboard"]), ram_list)
+
+        if rules["ram_match"]["ram_ids"]:
+            self.ram_id_validation([get_item(ram_id) for ram_id in rules["ram_match"]["ram_ids"]])
+
+        if rules["power"]["status"] != SKIPPED:
+            self.total_power_consuption = rules["power"]["headroom"]
+            self.power_draw_check()
+
+    def cache_stats(self):
+        """
+        Returns the counters of the verdict cache.
+
+        Returns:
+            dict: Hits, misses, evictions, invalidations, size, capacity and hit rate.
+        """
+        return self.matrix.cache.stats()
+
+    def apply_inventory_diff(self, diff):
+        """
+        Drops the cached verdicts of every part the inventory reload added, removed or
+        changed.
+
+        Args:
+            diff (InventoryDiff): The changes that were applied to the inventory.
+
+        Returns:
+            List[str]: Notices for the user (none; the cache is not visible to them).
+        """
+        part_ids = [item.item_id for item in diff.added + diff.removed]
+        part_ids.extend(old.item_id for old, _ in diff.changed)
+        self.matrix.cache.invalidate(part_ids)
+        return []
+
     def compatibility_check(self):
         """
         Performs a compatibility check on the selected parts provided by the user.
@@ -175,31 +296,17 @@ class Compatibility:
                   request.""")
             return
 
-        valid_id_dict = self.check_ids(item_id_list)
-
-        try:
+        with pinned(self.inventory_object):
+            verdict = self.check_parts(item_id_list)
             clear_screen()
-            print(f"Power Draw: {self.total_power_consuption}W")
-            print(f"Listed Items: {user_input}")
+            if verdict["unknown_ids"]:
+                print(f"Unknown part ID(s): {', '.join(verdict['unknown_ids'])}. "
+                      "Please try again.")
+                return
 
-            # Run through each check for each motherboard in the list.
-            if valid_id_dict["Motherboard"]:
-                for motherboard in valid_id_dict["Motherboard"]:
-                    # Loop through each item in the "CPU" list.
-                    if valid_id_dict["CPU"]:
-                        for cpu in valid_id_dict["CPU"]:
-                            self.motherboard_cpu_validation(motherboard, cpu)
-                    if valid_id_dict["RAM"]:
-                        self.motherboard_ram_slot_validation(motherboard, valid_id_dict["RAM"])
-
-            if valid_id_dict["RAM"]:
-                self.ram_id_validation(valid_id_dict["RAM"])
-
-            if valid_id_dict["PSU"]:
-                self.power_draw_check()
-        except TypeError:
-            clear_screen()
-            print("There was an error when attempting to process this request. Please try again.")
+            print(f"Power Draw: {verdict['rules']['power']['headroom']}W")
+            print(f"Listed Items: {user_input}")
+            self.report(verdict)
 
     def build_check(self, build_object, build_power_draw):
         """
@@ -215,43 +322,14 @@ class Compatibility:
         """
         clear_screen()
         self.total_power_consuption = build_power_draw
-
-        # Validate that a motherboard exists
-        if not build_object["Motherboard"]:
-            print("A valid build requires a single motherboard. Please select one for your build.")
-            return
-
-        # Validate that RAM exists
-        if not build_object["RAM"]:
-            print("A valid build requires RAM. Please add to your build.")
-            print("Keep in mind that your Motherboard has a limited number of RAM slots.")
-            return
-
-        # Validate that a CPU exists
-        if not build_object["CPU"]:
-            print("A valid build requires a CPU. Please select one for your build.")
-            print("Please note that your Motherboard socket and CPU socket need to match.")
-            return
-
-        # Validate that storage exists
-        if not build_object["Storage"]:
-            print("A valid build requires Storage. Please select one for your build.")
-            return
-
-        # Validate that a PSU exists
-        if not build_object["PSU"]:
-            print("A valid build requires a Power Supply (PSU). Please select one for your build.")
-            return
-
-        # Validate motherboard and CPU compatibility
-        self.motherboard_cpu_validation(build_object["Motherboard"], build_object["CPU"])
-
-        # Validate that motherboard RAM slots <= total number of RAM
-        self.motherboard_ram_slot_validation(build_object["Motherboard"], build_object["RAM"])
-
-        # Validate that RAM types are the same if there are more than 1
-        self.ram_id_validation(build_object["RAM"])
-
-        # Validate that the PSU can support the power draw
-        self.power_draw_check()
+        with pinned(self.inventory_object):
+            verdict = self.matrix.check_build(build_object)
+            parts = {
+                item.item_id.lower(): item
+                for part in build_object.values()
+                for item in (part if isinstance(part, list) else [part])
+                if item is not None
+            }
+            self.report(verdict, parts)
         print("")
+        return verdict["valid"]
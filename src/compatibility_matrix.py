@@ -0,0 +1,345 @@
+"""
+compatibility_matrix.py
+
+Precomputed compatibility data and a batch query API that returns structured verdicts.
+
+`CompatibilityMatrix` groups every socket spelling into an equivalence class ("LGA 1700",
+"lga-1700" and any aliases passed in are one class) and, once per inventory version, files
+every CPU and motherboard under its class. A CPU/motherboard pair then matches when both sit
+in the same class, and the compatible partners of a part are a dictionary lookup.
+
+Inventories that answer lookups from indexes (a DatabaseInventory has `indexed` set) are not
+tabled: only the parts being checked are classed, and the partners of a part are read
+through the (type, socket) index, so a check loads nothing beyond the parts it names.
+
+`check_set` and `check_sets` evaluate part-ID sets against every rule and return plain
+dictionaries instead of printing, so other code (and other programs) can consume them:
+
+    {
+        "part_ids": ["cpu_01", "mb_01", "ram_01", "psu_01"],
+        "valid": True,
+        "unknown_ids": [],
+        "rules": {
+            "complete": {"status": "skipped", "missing": []},
+            "socket": {"status": "pass", "pairs": [
+                {"cpu": "cpu_01", "motherboard": "mb_01", "compatible": True}]},
+            "ram_slots": {"status": "pass", "ram_count": 1, "motherboards": [
+                {"motherboard": "mb_01", "ram_slots": 4, "fits": True}]},
+            "ram_match": {"status": "pass", "ram_ids": ["ram_01"]},
+            "power": {"status": "pass", "supplied": 500, "draw": 460, "headroom": 40},
+        },
+    }
+
+A rule is "skipped" when the set does not contain the parts it needs. A set is valid when
+every ID is known and no rule failed.
+
+Verdicts are memoised in a `VerdictCache` under the multiset of their part IDs, so checking
+the same parts again (in any order) costs a lookup until one of those parts changes.
+
+Classes:
+- CompatibilityMatrix: Socket classes, CPU/motherboard pairs and batch rule evaluation.
+
+Functions:
+- normalize_socket(socket): Canonical spelling of a socket name.
+
+Acknowledged Pylint Standard Errors:
+src\\compatibility_matrix.py:52:0: E0401: Unable to import 'src.verdict_cache' (import-error)
+src\\compatibility_matrix.py:53:0: E0401: Unable to import 'src.versioned' (import-error)
+"""
+import re
+from typing import Dict, Iterable, List, Optional
+
+from src.verdict_cache import DEFAULT_CAPACITY, VerdictCache, multiset_key # pylint: disable=import-error
+from src.versioned import pinned # pylint: disable=import-error
+
+PASS = "pass"
+FAIL = "fail"
+SKIPPED = "skipped"
+
+# Parts a complete build needs, in the order they are reported when missing.
+REQUIRED_PARTS = ["Motherboard", "RAM", "CPU", "Storage", "PSU"]
+
+_SOCKET_SEPARATORS = re.compile(r'[\s_-]+')
+
+def normalize_socket(socket: str) -> str:
+    """
+    Returns the canonical spelling of a socket name, ignoring case, spaces, hyphens and
+    underscores, so "LGA 1700" and "lga-1700" compare equal.
+    """
+    return _SOCKET_SEPARATORS.sub('', str(socket)).upper()
+
+class CompatibilityMatrix:
+    """
+    Precomputed socket classes and CPU/motherboard pairs for one inventory.
+
+    The tables are rebuilt whenever the inventory's version changes, the first time they are
+    needed afterwards.
+
+    Attributes:
+        inventory_object: The inventory the matrix is computed for.
+        built_version (int): The inventory version the tables were built from (None before
+            the first build).
+        cache (VerdictCache): Verdicts already computed, by part-ID multiset.
+    """
+    def __init__(self, inventory_object, equivalences: Iterable[Iterable[str]] = (),
+                 cache_size: int = DEFAULT_CAPACITY):
+        """
+        Args:
+            inventory_object: Any inventory backend.
+            equivalences (iterable, optional): Groups of socket names that should be treated
+                as the same socket, e.g. [("AM4", "AM4+")].
+            cache_size (int, optional): The most verdicts the cache keeps.
+        """
+        self.inventory_object = inventory_object
+        self.built_version: Optional[int] = None
+        self.cache = VerdictCache(cache_size)
+        self._aliases: Dict[str, str] = {}
+        for group in equivalences:
+            names = [normalize_socket(name) for name in group]
+            for name in names:
+                self._aliases[name] = names[0]
+
+        self._indexed = getattr(inventory_object, "indexed", False)
+        self._cpu_class: Dict[str, str] = {}
+        self._board_class: Dict[str, str] = {}
+        self._class_cpus: Dict[str, list] = {}
+        self._class_boards: Dict[str, list] = {}
+
+    def socket_class(self, socket: str) -> str:
+        """Returns the equivalence class a socket name belongs to."""
+        name = normalize_socket(socket)
+        return self._aliases.get(name, name)
+
+    def refresh(self):
+        """
+        Rebuilds the tables if the inventory changed since they were built. Indexed
+        inventories keep no tables, so there is nothing to rebuild.
+        """
+        version = getattr(self.inventory_object, "version", None)
+        if self._indexed or (version is not None and version == self.built_version):
+            self.built_version = version
+            return
+
+        with pinned(self.inventory_object) as inventory:
+            self._cpu_class = {}
+            self._board_class = {}
+            self._class_cpus = {}
+            self._class_boards = {}
+            for item_type, part_class, class_parts in (
+                    ("CPU", self._cpu_class, self._class_cpus),
+                    ("Motherboard", self._board_class, self._class_boards)):
+                for item in inventory.get_items_by_type(item_type):
+                    socket_class = self.socket_class(item.socket)
+                    part_class[item.item_id.lower()] = socket_class
+                    class_parts.setdefault(socket_class, []).append(item)
+            self.built_version = getattr(inventory, "version", None)
+
+    def compatible_cpus(self, motherboard) -> list:
+        """Returns the CPUs whose socket is in the same class as the motherboard's."""
+        return self._class_parts("CPU", motherboard.socket)
+
+    def compatible_motherboards(self, cpu) -> list:
+        """Returns the motherboards whose socket is in the same class as the CPU's."""
+        return self._class_parts("Motherboard", cpu.socket)
+
+    def _class_parts(self, item_type: str, socket: str) -> list:
+        """The parts of one type whose socket is in the same class as `socket`."""
+        self.refresh()
+        socket_class = self.socket_class(socket)
+        if not self._indexed:
+            class_parts = self._class_cpus if item_type == "CPU" else self._class_boards
+            return list(class_parts.get(socket_class, []))
+        # Every spelling of the class, each read through the socket index
+        inventory = self.inventory_object
+        return [item for spelling in inventory.get_socket_counts(item_type)
+                if self.socket_class(spelling) == socket_class
+                for item in inventory.get_items_by_socket(item_type, spelling)]
+
+    def pair_count(self) -> int:
+        """Returns the number of compatible CPU/motherboard pairs in the inventory."""
+        self.refresh()
+        if self._indexed:
+            counts: Dict[str, Dict[str, int]] = {"CPU": {}, "Motherboard": {}}
+            for item_type, class_counts in counts.items():
+                for spelling, count in self.inventory_object.get_socket_counts(
+                        item_type).items():
+                    socket_class = self.socket_class(spelling)
+                    class_counts[socket_class] = class_counts.get(socket_class, 0) + count
+            return sum(count * counts["Motherboard"].get(socket_class, 0)
+                       for socket_class, count in counts["CPU"].items())
+        return sum(len(cpus) * len(self._class_boards.get(socket_class, ()))
+                   for socket_class, cpus in self._class_cpus.items())
+
+    def sockets_match(self, motherboard, cpu) -> bool:
+        """Tells whether a CPU fits a motherboard, using the precomputed classes."""
+        board_class = self._board_class.get(motherboard.item_id.lower())
+        cpu_class = self._cpu_class.get(cpu.item_id.lower())
+        if board_class is None or cpu_class is None:
+            return self.socket_class(motherboard.socket) == self.socket_class(cpu.socket)
+        return board_class == cpu_class
+
+    def check_set(self, part_ids: List[str], require_complete: bool = False) -> dict:
+        """
+        Evaluates one set of part IDs against every compatibility rule.
+
+        Args:
+            part_ids (List[str]): The IDs of the parts, matched without regard to case.
+            require_complete (bool): Also require every part a build needs (the
+                "complete" rule); otherwise that rule is skipped.
+
+        Returns:
+            dict: The verdict, as described in the module docstring.
+        """
+        return self.check_sets([part_ids], require_complete)[0]
+
+    def check_sets(self, id_sets: Iterable[List[str]], require_complete: bool = False) -> list:
+        """
+        Evaluates many sets of part IDs against one version of the inventory.
+
+        Args:
+            id_sets (iterable): The sets of part IDs to check.
+            require_complete (bool): Also require every part a build needs.
+
+        Returns:
+            list: One verdict per set, in the same order.
+        """
+        with pinned(self.inventory_object) as inventory:
+            self.refresh()
+            version = getattr(inventory, "version", None)
+            lookups: Dict[str, object] = {}
+            verdicts = []
+            for part_ids in id_sets:
+                part_ids = list(part_ids)
+                multiset = multiset_key(part_ids)
+                for item_key, _ in multiset:
+                    if item_key not in lookups:
+                        lookups[item_key] = inventory.get_item(item_key)
+                members = [lookups[item_key] for item_key, _ in multiset]
+                key = (multiset, require_complete)
+                verdict = self.cache.get(key, version, members)
+                if verdict is None:
+                    verdict = self._evaluate_ids(part_ids, lookups, require_complete)
+                    self.cache.put(key, version, members, verdict)
+                elif verdict["part_ids"] != part_ids:
+                    # Same parts listed in another order or spelling
+                    verdict = dict(verdict, part_ids=part_ids, unknown_ids=[
+                        part_id for part_id in part_ids
+                        if lookups[part_id.strip().lower()] is None])
+                verdicts.append(verdict)
+        return verdicts
+
+    def _evaluate_ids(self, part_ids: List[str], lookups: dict, require_complete: bool) -> dict:
+        """Resolves the IDs of one set and evaluates it."""
+        parts = {part_type: [] for part_type in self._part_types()}
+        unknown_ids = []
+        for part_id in part_ids:
+            item = lookups[part_id.strip().lower()]
+            if item is None:
+                unknown_ids.append(part_id)
+            else:
+                parts.setdefault(item.item_type, []).append(item)
+        return self._evaluate(part_ids, parts, unknown_ids, require_complete)
+
+    def check_build(self, build: dict) -> dict:
+        """
+        Evaluates a build dictionary (as kept by `Build`) as a complete build.
+
+        Args:
+            build (dict): Part type -> item, or list of items for RAM and Storage.
+
+        Returns:
+            dict: The verdict, with the "complete" rule applied.
+        """
+        self.refresh()
+        items = [item for part in build.values()
+                 for item in (part if isinstance(part, list) else [part]) if item is not None]
+        by_id = {item.item_id.lower(): item for item in items}
+        multiset = multiset_key(item.item_id for item in items)
+        members = [by_id[item_key] for item_key, _ in multiset]
+        key = (multiset, "build")
+        version = getattr(self.inventory_object, "version", None)
+        # The items come from the build rather than the inventory, so always compare them
+        verdict = self.cache.get(key, version, members, verify=True)
+        if verdict is not None:
+            return verdict
+
+        parts = {part_type: [] for part_type in self._part_types()}
+        part_ids = []
+        for part_type, part in build.items():
+            for item in part if isinstance(part, list) else [part]:
+                if item is not None:
+                    parts.setdefault(part_type, []).append(item)
+                    part_ids.append(item.item_id.lower())
+        verdict = self._evaluate(part_ids, parts, [], True)
+        self.cache.put(key, version, members, verdict)
+        return verdict
+
+    @staticmethod
+    def _part_types() -> List[str]:
+        return ["CPU", "GPU", "RAM", "PSU", "Motherboard", "Storage"]
+
+    def _evaluate(self, part_ids: list, parts: dict, unknown_ids: list,
+                  require_complete: bool) -> dict:
+        """Applies every rule to the resolved parts of one set."""
+        rules = {
+            "complete": self._complete_rule(parts, require_complete),
+            "socket": self._socket_rule(parts),
+            "ram_slots": self._ram_slots_rule(parts),
+            "ram_match": self._ram_match_rule(parts),
+            "power": self._power_rule(parts),
+        }
+        return {
+            "part_ids": part_ids,
+            "valid": not unknown_ids and all(rule["status"] != FAIL for rule in rules.values()),
+            "unknown_ids": unknown_ids,
+            "rules": rules,
+        }
+
+    @staticmethod
+    def _complete_rule(parts: dict, require_complete: bool) -> dict:
+        if not require_complete:
+            return {"status": SKIPPED, "missing": []}
+        missing = [part_type for part_type in REQUIRED_PARTS if not parts.get(part_type)]
+        return {"status": FAIL if missing else PASS, "missing": missing}
+
+    def _socket_rule(self, parts: dict) -> dict:
+        pairs = [
+            {"cpu": cpu.item_id.lower(), "motherboard": motherboard.item_id.lower(),
+             "compatible": self.sockets_match(motherboard, cpu)}
+            for motherboard in parts["Motherboard"] for cpu in parts["CPU"]
+        ]
+        if not pairs:
+            return {"status": SKIPPED, "pairs": []}
+        return {"status": PASS if all(pair["compatible"] for pair in pairs) else FAIL,
+                "pairs": pairs}
+
+    @staticmethod
+    def _ram_slots_rule(parts: dict) -> dict:
+        ram_count = len(parts["RAM"])
+        motherboards = [
+            {"motherboard": motherboard.item_id.lower(), "ram_slots": int(motherboard.ram_slots),
+             "fits": ram_count <= int(motherboard.ram_slots)}
+            for motherboard in parts["Motherboard"]
+        ]
+        if not ram_count or not motherboards:
+            return {"status": SKIPPED, "ram_count": ram_count, "motherboards": motherboards}
+        return {"status": PASS if all(board["fits"] for board in motherboards) else FAIL,
+                "ram_count": ram_count, "motherboards": motherboards}
+
+    @staticmethod
+    def _ram_match_rule(parts: dict) -> dict:
+        ram_ids = [ram.item_id.lower() for ram in parts["RAM"]]
+        if len(ram_ids) <= 1:
+            return {"status": SKIPPED, "ram_ids": ram_ids}
+        return {"status": PASS if len(set(ram_ids)) == 1 else FAIL, "ram_ids": ram_ids}
+
+    @staticmethod
+    def _power_rule(parts: dict) -> dict:
+        supplied = sum(int(psu.power_supplied) for psu in parts["PSU"])
+        draw = sum(int(item.power_draw) for part_type, items in parts.items()
+                   if part_type != "PSU" for item in items)
+        if not parts["PSU"]:
+            return {"status": SKIPPED, "supplied": supplied, "draw": draw,
+                    "headroom": supplied - draw}
+        return {"status": PASS if supplied >= draw else FAIL, "supplied": supplied,
+                "draw": draw, "headroom": supplied - draw}
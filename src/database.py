@@ -0,0 +1,464 @@
+"""
+database.py
+
+SQLite-backed inventory for catalogs too large to re-read from JSON on every start.
+
+The first time a JSON inventory is opened with the database enabled it is streamed into
+`<inventory_file>.sqlite3` next to the source: the entries are inserted in batches with
+`executemany`, all inside a single transaction, into a database that is renamed into place
+once it is complete. Later launches open the database and read nothing up front. The
+database is current while the source's mtime and size match the ones recorded at import;
+otherwise it is imported again.
+
+Every lookup is a query on an index: the lower-cased ID (unique), the type, the type and
+socket, the type and price, and the RAM slot count. The SQL of each query is a constant, so
+the connection's statement cache keeps it prepared. Only the rows a listing or a check asks
+for are turned into Items, and an Item is shared while anything still refers to it, so
+looking the same part up twice returns the same object.
+
+Classes:
+- DatabaseInventory: Inventory backed by a SQLite database.
+
+Functions:
+- database_path(inventory_file): Returns where the database of a source file lives.
+- import_inventory(inventory_file, database_file, batch_size): Bulk-imports a JSON inventory.
+- open_database(inventory_file): Opens a current database, importing the source first if the
+  database is missing or stale.
+
+Acknowledged Pylint Standard Errors:
+src\\database.py:40:0: E0401: Unable to import 'src.inventory' (import-error)
+src\\database.py:41:0: E0401: Unable to import 'src.loader' (import-error)
+"""
+import os
+import sqlite3
+import threading
+import weakref
+from contextlib import contextmanager
+from itertools import islice
+from typing import Dict, List, Optional, Tuple
+
+from src.inventory import Item, create_item # pylint: disable=import-error
+from src.loader import iter_inventory_items # pylint: disable=import-error
+
+DATABASE_SUFFIX = ".sqlite3"
+# Rows inserted per `executemany` call while importing.
+IMPORT_BATCH_SIZE = 5000
+# Rows read per query while iterating the whole inventory.
+PAGE_SIZE = 500
+
+# The item fields stored, named as in the JSON inventory.
+COLUMNS = ("id", "type", "name", "price", "power_draw", "power_supplied", "capacity",
+           "ram_slots", "socket", "overclockable", "stock")
+# Stored as the database's user_version; a database with another version is imported again.
+SCHEMA_VERSION = 2
+
+SCHEMA = """
+CREATE TABLE parts (
+    row INTEGER PRIMARY KEY,
+    item_key TEXT NOT NULL UNIQUE,
+    id TEXT NOT NULL,
+    type TEXT NOT NULL,
+    name TEXT NOT NULL,
+    price INTEGER NOT NULL,
+    power_draw INTEGER,
+    power_supplied INTEGER,
+    capacity INTEGER,
+    ram_slots INTEGER,
+    socket TEXT,
+    overclockable INTEGER,
+    stock INTEGER
+);
+CREATE INDEX parts_by_type ON parts (type);
+CREATE INDEX parts_by_socket ON parts (type, socket);
+CREATE INDEX parts_by_price ON parts (type, price);
+CREATE INDEX parts_by_ram_slots ON parts (ram_slots) WHERE ram_slots IS NOT NULL;
+CREATE TABLE source (mtime_ns INTEGER NOT NULL, size INTEGER NOT NULL);
+"""
+
+_SELECT = f"SELECT {', '.join(COLUMNS)} FROM parts"
+_INSERT = (f"INSERT INTO parts (item_key, {', '.join(COLUMNS)}) "
+           f"VALUES ({', '.join('?' * (len(COLUMNS) + 1))})")
+_IMPORT = _INSERT.replace("INSERT", "INSERT OR IGNORE", 1)
+_UPDATE = (f"UPDATE parts SET {', '.join(f'{column} = ?' for column in COLUMNS)} "
+           "WHERE item_key = ?")
+_BY_KEY = f"{_SELECT} WHERE item_key = ?"
+_BY_TYPE = f"{_SELECT} WHERE type = ? ORDER BY row"
+_BY_SOCKET = f"{_SELECT} WHERE type = ? AND socket = ? ORDER BY row"
+_BY_PRICE = f"{_SELECT} WHERE type = ? AND price <= ? ORDER BY price, row"
+_BY_RAM_SLOTS = f"{_SELECT} WHERE ram_slots = ? AND type = 'Motherboard' ORDER BY row"
+_RAM_SLOT_COUNTS = ("SELECT DISTINCT ram_slots FROM parts "
+                    "WHERE ram_slots IS NOT NULL AND type = 'Motherboard' ORDER BY ram_slots")
+_SOCKET_COUNTS = ("SELECT socket, COUNT(*) FROM parts WHERE type = ? AND socket IS NOT NULL "
+                  "GROUP BY socket ORDER BY socket")
+_PAGE = f"SELECT row, {', '.join(COLUMNS)} FROM parts WHERE row > ? ORDER BY row LIMIT ?"
+
+def database_path(inventory_file: str) -> str:
+    """Returns the path of the database kept next to `inventory_file`."""
+    return inventory_file + DATABASE_SUFFIX
+
+def _row_of(item: Item) -> tuple:
+    """Returns the values inserted for an item: its lower-cased ID, then `COLUMNS`."""
+    overclockable = getattr(item, "overclockable", None)
+    return (item.item_id.lower(), item.item_id, item.item_type, item.name, int(item.price),
+            getattr(item, "power_draw", None), getattr(item, "power_supplied", None),
+            getattr(item, "capacity", None), getattr(item, "ram_slots", None),
+            getattr(item, "socket", None),
+            None if overclockable is None else int(overclockable), item.stock)
+
+def import_inventory(inventory_file: str, database_file: Optional[str] = None,
+                     batch_size: int = IMPORT_BATCH_SIZE) -> str:
+    """
+    Streams a JSON inventory into a new SQLite database.
+
+    The entries are inserted in batches inside one transaction, and the indexes are built
+    once the rows are in. The database is written to a temporary file and renamed into
+    place, so a concurrent reader never opens a half-imported database. When an ID appears
+    more than once only the first entry is kept and the duplicates are reported.
+
+    Args:
+        inventory_file (str): Path to the JSON inventory.
+        database_file (str, optional): Destination. Defaults to `database_path(inventory_file)`.
+        batch_size (int): Rows inserted per `executemany` call.
+
+    Returns:
+        str: The path of the written database.
+
+    Raises:
+        InventoryFormatError: If the file is not valid inventory JSON.
+        OSError: If the file cannot be opened or read.
+    """
+    database_file = database_file or database_path(inventory_file)
+    source_stat = os.stat(inventory_file)
+    temporary_file = f"{database_file}.{os.getpid()}.tmp"
+    if os.path.exists(temporary_file):
+        os.remove(temporary_file)
+
+    connection = sqlite3.connect(temporary_file, isolation_level=None)
+    try:
+        # The file is renamed into place only once it is complete, so it needs no journal
+        connection.execute("PRAGMA journal_mode = OFF")
+        connection.execute("PRAGMA synchronous = OFF")
+        connection.execute("BEGIN")
+        statements = [statement for statement in SCHEMA.split(";") if statement.strip()]
+        connection.execute(statements[0])
+        submitted = 0
+        with open(inventory_file, 'rb') as file:
+            rows = (_row_of(item) for _, item in iter_inventory_items(file))
+            while True:
+                batch = list(islice(rows, batch_size))
+                if not batch:
+                    break
+                connection.executemany(_IMPORT, batch)
+                submitted += len(batch)
+        duplicates = submitted - connection.execute("SELECT COUNT(*) FROM parts").fetchone()[0]
+        for statement in statements[1:]:
+            connection.execute(statement)
+        connection.execute("INSERT INTO source VALUES (?, ?)",
+                           (source_stat.st_mtime_ns, source_stat.st_size))
+        connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        connection.execute("COMMIT")
+        connection.execute("ANALYZE")
+    except BaseException:
+        connection.close()
+        os.remove(temporary_file)
+        raise
+    connection.close()
+    os.replace(temporary_file, database_file)
+
+    if duplicates:
+        print(f"Warning: Skipped {duplicates} duplicate item ID(s).")
+    return database_file
+
+def _database_is_current(inventory_file: str, database_file: str) -> bool:
+    """Checks the schema version, and the source's mtime and size against the ones recorded
+    at import."""
+    if not os.path.isfile(database_file):
+        return False
+    try:
+        connection = sqlite3.connect(f"file:{database_file}?mode=ro", uri=True)
+        try:
+            (version,) = connection.execute("PRAGMA user_version").fetchone()
+            recorded = connection.execute("SELECT mtime_ns, size FROM source").fetchone()
+        finally:
+            connection.close()
+    except sqlite3.DatabaseError:
+        return False
+    source_stat = os.stat(inventory_file)
+    return version == SCHEMA_VERSION and \
+        recorded == (source_stat.st_mtime_ns, source_stat.st_size)
+
+def open_database(inventory_file: str):
+    """
+    Opens the database of an inventory file, importing the file first if the database is
+    missing or stale.
+
+    Args:
+        inventory_file (str): Path to the JSON inventory.
+
+    Returns:
+        DatabaseInventory: The inventory.
+    """
+    database_file = database_path(inventory_file)
+    if not _database_is_current(inventory_file, database_file):
+        import_inventory(inventory_file, database_file)
+    return DatabaseInventory(database_file)
+
+class DatabaseInventory:
+    """
+    Inventory backed by a SQLite database.
+
+    Lookups, listings and changes are queries on the database; nothing is read when it is
+    opened. The connection is shared by every thread that uses the inventory and each query
+    holds a lock. Changes are committed as they are made, or together at the end of an
+    `update()` block.
+
+    Attributes:
+        database_file (str): Path of the database.
+        version (int): Incremented on every change, so dependants can tell when to refresh.
+        indexed (bool): Always True: dependants should look parts up through the indexes
+            as they need them instead of keeping tables of the whole catalog.
+    """
+    indexed = True
+
+    def __init__(self, database_file: str) -> None:
+        self.database_file = database_file
+        self._connection = sqlite3.connect(database_file, isolation_level=None,
+                                           check_same_thread=False)
+        self._lock = threading.RLock()
+        self._items = weakref.WeakValueDictionary()
+        self.version: int = 0
+
+    @property
+    def items(self):
+        """All items in insertion order, read a page of rows at a time."""
+        last_row = 0
+        while True:
+            with self._lock:
+                page = self._connection.execute(_PAGE, (last_row, PAGE_SIZE)).fetchall()
+            if not page:
+                return
+            for row in page:
+                yield self._materialize(row[1:])
+            last_row = page[-1][0]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM parts").fetchone()[0]
+
+    @contextmanager
+    def update(self):
+        """
+        Groups several changes into one transaction, committed when the block ends. Queries
+        from other threads wait until then; if the block raises, nothing is written.
+
+        Yields:
+            DatabaseInventory: The inventory, to make the changes on.
+        """
+        with self._lock:
+            self._connection.execute("BEGIN")
+            try:
+                yield self
+            except BaseException:
+                self._connection.execute("ROLLBACK")
+                # Items of the rolled back changes must not be handed out
+                self._items.clear()
+                self.version += 1
+                raise
+            self._connection.execute("COMMIT")
+
+    def add_item(self, item: Item):
+        """
+        Inserts an item.
+
+        Args:
+            item (Item): The item to be added to the inventory.
+
+        Raises:
+            ValueError: If an item with the same ID (ignoring case) is already in the inventory.
+        """
+        try:
+            with self._lock:
+                self._connection.execute(_INSERT, _row_of(item))
+        except sqlite3.IntegrityError as error:
+            raise ValueError(f"Duplicate item ID: {item.item_id}") from error
+        self._items[item.item_id.lower()] = item
+        self.version += 1
+
+    def remove_item(self, item_id: str) -> Optional[Item]:
+        """
+        Deletes an item.
+
+        Args:
+            item_id (str): The ID of the item, matched without regard to case.
+
+        Returns:
+            Item: The removed item, or None if the ID is not in the inventory.
+        """
+        item_key = item_id.strip().lower()
+        item = self.get_item(item_key)
+        if item is None:
+            return None
+        with self._lock:
+            self._connection.execute("DELETE FROM parts WHERE item_key = ?", (item_key,))
+        self._items.pop(item_key, None)
+        self.version += 1
+        return item
+
+    def replace_item(self, item: Item) -> Optional[Item]:
+        """
+        Replaces the item that has the same ID, keeping its position.
+
+        Args:
+            item (Item): The new version of the item.
+
+        Returns:
+            Item: The replaced item, or None (and nothing is changed) if the ID is not in the
+            inventory.
+        """
+        item_key = item.item_id.lower()
+        old_item = self.get_item(item_key)
+        if old_item is None:
+            return None
+        with self._lock:
+            self._connection.execute(_UPDATE, _row_of(item)[1:] + (item_key,))
+        self._items[item_key] = item
+        self.version += 1
+        return old_item
+
+    def get_item(self, item_id: str) -> Optional[Item]:
+        """
+        Looks up an item by its ID.
+
+        Args:
+            item_id (str): The ID of the item, matched without regard to case.
+
+        Returns:
+            Item: The matching item, or None if the ID is not in the inventory.
+        """
+        item_key = item_id.strip().lower()
+        item = self._items.get(item_key)
+        if item is not None:
+            return item
+        with self._lock:
+            row = self._connection.execute(_BY_KEY, (item_key,)).fetchone()
+        return None if row is None else self._materialize(row)
+
+    def get_items_by_type(self, item_type: str) -> List[Item]:
+        """
+        Returns the items of one type (e.g. "CPU", "RAM") in insertion order.
+        """
+        return self._query(_BY_TYPE, (item_type,))
+
+    def get_items_by_socket(self, item_type: str, socket: str) -> List[Item]:
+        """
+        Returns the CPUs or motherboards (per `item_type`) that use the given socket.
+        """
+        return self._query(_BY_SOCKET, (item_type, socket))
+
+    def get_items_by_ram_slots(self, ram_slots: int) -> List[Item]:
+        """
+        Returns the motherboards that have exactly `ram_slots` RAM slots.
+        """
+        return self._query(_BY_RAM_SLOTS, (ram_slots,))
+
+    def get_items_by_price(self, item_type: str, max_price: int) -> List[Item]:
+        """
+        Returns the items of one type that cost at most `max_price`, cheapest first.
+        """
+        return self._query(_BY_PRICE, (item_type, max_price))
+
+    def get_ram_slot_counts(self) -> List[int]:
+        """
+        Returns the distinct motherboard RAM slot counts present, in ascending order.
+        """
+        with self._lock:
+            return [count for (count,) in self._connection.execute(_RAM_SLOT_COUNTS)]
+
+    def list_items(self, item_types: List[str], sort: Optional[str] = None, # pylint: disable=too-many-arguments, too-many-positional-arguments
+                   descending: bool = False,
+                   ranges: Optional[Dict[str, Tuple[Optional[int], Optional[int]]]] = None,
+                   offset: int = 0, limit: int = -1) -> Tuple[int, List[Item]]:
+        """
+        Returns one page of the items of some types, sorted and filtered by the database, and
+        how many items there are on every page together. Only the page's rows become Items.
+        A single type sorted by price, or kept to a price range, is read in order from the
+        (type, price) index.
+
+        Args:
+            item_types (List[str]): The types listed, in the order they are listed in.
+            sort (str, optional): The column sorted by (items without a value come last);
+                None keeps the catalog order: by type, then as inserted.
+            descending (bool): Largest first. Ties stay in catalog order either way.
+            ranges (dict, optional): Column -> (lowest, highest) value kept, inclusive; None
+                leaves an end open. Items without a value in the column are left out.
+            offset (int): The rows skipped.
+            limit (int): The most rows returned; -1 for all of them.
+
+        Returns:
+            tuple: The number of matching items, and the items of the page.
+
+        Raises:
+            ValueError: If a column is not one of `COLUMNS`.
+        """
+        ranges = ranges or {}
+        for column in [sort, *ranges]:
+            if column is not None and column not in COLUMNS:
+                raise ValueError(f"Unknown column: {column}")
+        conditions = [f"type IN ({', '.join('?' * len(item_types))})"]
+        parameters: list = list(item_types)
+        for column, (low, high) in ranges.items():
+            conditions.append(f"{column} IS NOT NULL")
+            for operator, bound in ((">=", low), ("<=", high)):
+                if bound is not None:
+                    conditions.append(f"{column} {operator} ?")
+                    parameters.append(bound)
+        where = " AND ".join(conditions)
+
+        # The catalog order; one type is in row order already, which keeps the index usable
+        catalog, order_parameters = "row", []
+        if len(item_types) > 1:
+            catalog, order_parameters = "instr(?, type || ' '), row", [" ".join(item_types) + " "]
+        if sort is None:
+            order = catalog
+        else:
+            key = "name COLLATE NOCASE" if sort == "name" else sort
+            # NULL sorts first in SQLite; only columns that may be NULL need moving
+            nulls = " NULLS LAST" if not descending and sort not in ("price", "name") else ""
+            order = f"{key} {'DESC' if descending else 'ASC'}{nulls}, {catalog}"
+        with self._lock:
+            total = self._connection.execute(
+                f"SELECT COUNT(*) FROM parts WHERE {where}", parameters).fetchone()[0]
+            rows = self._connection.execute(
+                f"{_SELECT} WHERE {where} ORDER BY {order} LIMIT ? OFFSET ?",
+                parameters + order_parameters + [limit, offset]).fetchall()
+        return total, [self._materialize(row) for row in rows]
+
+    def get_socket_counts(self, item_type: str) -> Dict[str, int]:
+        """
+        Returns the number of CPUs or motherboards (per `item_type`) of each socket, read
+        from the socket index alone.
+        """
+        with self._lock:
+            return dict(self._connection.execute(_SOCKET_COUNTS, (item_type,)).fetchall())
+
+    def close(self):
+        """Closes the connection."""
+        self._connection.close()
+
+    def _query(self, sql: str, parameters: tuple) -> List[Item]:
+        """Runs a query selecting `COLUMNS` and returns its rows as Items."""
+        with self._lock:
+            rows = self._connection.execute(sql, parameters).fetchall()
+        return [self._materialize(row) for row in rows]
+
+    def _materialize(self, row: tuple) -> Item:
+        """Turns a row of `COLUMNS` into its Item, reusing the one already in use."""
+        item_key = row[0].lower()
+        item = self._items.get(item_key)
+        if item is None:
+            fields = {column: value for column, value in zip(COLUMNS, row) if value is not None}
+            if "overclockable" in fields:
+                fields["overclockable"] = bool(fields["overclockable"])
+            item = create_item(fields)
+            self._items[item_key] = item
+        return item
@@ -0,0 +1,640 @@
+"""
+headless.py
+
+Runs the storefront without the interactive menus: commands are read one per line and every
+command answers with one JSON object per line, so scripts and tests can drive a session and
+parse the results.
+
+The commands run against one loaded inventory and one session (user, build and cart):
+
+- list <category|all> [sort <key> [desc]] [<key> <low>..<high>] [page <n>], details <part_id>,
+  compat <part_id>,<part_id>,...
+- search <words> (parts by words of their name, type or ID, best first)
+- name [name], budget [amount]
+- build add|remove <part_id>, build show|check|clear|candidates, build auto [ram|storage]
+- builds (next page of valid builds, cheapest first), pareto (best value builds)
+- cart add|remove <part_id>, cart add-build, cart show|clear|checkout
+- help
+
+Commands that change the build or the cart answer with its running totals; "build show" and
+"cart show" list the parts. Blank lines and lines starting with '#' are skipped. Each result
+is {"line": ..., "command": ..., "ok": true, "result": ...}, or "ok": false with an "error";
+a failed command does not stop the stream, even one that fails unexpectedly. Nothing clears
+the screen or prompts, and the lookups go through the inventory's indexes and the cached
+compatibility verdicts, so a session keeps up with thousands of commands per second.
+
+Parts in the build or cart are held in a `StockLedger`, and checkout takes the cart's parts
+out of stock. A command that needs more of a part than is in stock fails and leaves the
+build or cart as it was.
+
+A part ID that is not in the inventory fails with the closest matches found by the search
+index, so a mistyped ID can be corrected on the next line.
+
+Classes:
+- CommandError: A command that could not be carried out.
+- CommandSession: One user's build and cart, driven by text commands.
+
+Functions:
+- part_summary(item): The listing fields of a part.
+- part_details(item): Every field of a part.
+- run_commands(inventory, lines, output, session, flush_lines): Runs a stream of commands
+  and writes the results.
+
+Acknowledged Pylint Standard Errors:
+src\\headless.py:61:0: E0401: Unable to import 'src.autobuild' (import-error)
+src\\headless.py:62:0: E0401: Unable to import 'src.browse' (import-error)
+src\\headless.py:63:0: E0401: Unable to import 'src.build_state' (import-error)
+src\\headless.py:64:0: E0401: Unable to import 'src.candidates' (import-error)
+src\\headless.py:65:0: E0401: Unable to import 'src.compatibility' (import-error)
+src\\headless.py:66:0: E0401: Unable to import 'src.inventory' (import-error)
+src\\headless.py:67:0: E0401: Unable to import 'src.listing' (import-error)
+src\\headless.py:68:0: E0401: Unable to import 'src.pareto' (import-error)
+src\\headless.py:69:0: E0401: Unable to import 'src.reload' (import-error)
+src\\headless.py:70:0: E0401: Unable to import 'src.search' (import-error)
+src\\headless.py:71:0: E0401: Unable to import 'src.stock' (import-error)
+src\\headless.py:72:0: E0401: Unable to import 'src.user' (import-error)
+src\\headless.py:73:0: E0401: Unable to import 'src.versioned' (import-error)
+"""
+import json
+from typing import Iterable, List, Optional, TextIO
+
+from src.autobuild import OBJECTIVES, find_best_build # pylint: disable=import-error
+from src.browse import BuildBrowser # pylint: disable=import-error
+from src.build_state import BuildState # pylint: disable=import-error
+from src.candidates import CATEGORIES, CandidateFinder # pylint: disable=import-error
+from src.compatibility import Compatibility # pylint: disable=import-error
+from src.inventory import part_types # pylint: disable=import-error
+from src.listing import ListingIndex, parse_listing # pylint: disable=import-error
+from src.pareto import ParetoFrontier # pylint: disable=import-error
+from src.reload import refresh_parts # pylint: disable=import-error
+from src.search import SearchIndex # pylint: disable=import-error
+from src.stock import OutOfStockError, StockHold, StockLedger # pylint: disable=import-error
+from src.user import User # pylint: disable=import-error
+from src.versioned import pinned # pylint: disable=import-error
+
+# Parts the search command returns, and the closest matches an unknown ID is answered with.
+SEARCH_LIMIT = 10
+SUGGESTION_LIMIT = 3
+
+class CommandError(Exception):
+    """Raised when a command is unknown, malformed or cannot be carried out."""
+
+def part_summary(item) -> dict:
+    """
+    Returns the fields a listing shows for a part.
+
+    Args:
+        item (Item): The part.
+
+    Returns:
+        dict: "id" (lower-cased), "type", "name" and "price".
+    """
+    return {"id": item.item_id.lower(), "type": item.item_type, "name": item.name,
+            "price": item.price}
+
+def part_details(item) -> dict:
+    """
+    Returns every field of a part.
+
+    Args:
+        item (Item): The part.
+
+    Returns:
+        dict: The listing fields plus the attributes of the part's type (power draw, socket,
+        capacity, ...).
+    """
+    details = part_summary(item)
+    for attr, value in vars(item).items():
+        if attr not in ("item_id", "item_type", "name", "price"):
+            details[attr] = value
+    return details
+
+def _split_ids(arguments: list) -> list:
+    """Part IDs given separated by commas and/or spaces."""
+    return [part_id for argument in arguments for part_id in argument.split(",") if part_id]
+
+class CommandSession:
+    """
+    One user's build and cart, driven by text commands instead of menus.
+
+    Attributes:
+        inventory_object: The inventory the commands run against.
+        user_object (User): The session's name and budget.
+        compatibility_object (Compatibility): Checks sets of parts.
+        build (dict): Part type -> item, or list of items for RAM and Storage.
+        state (BuildState): The build's live compatibility state.
+        cart (dict): Upper-cased part ID (or "BUILD") -> item (or build dictionary).
+        cart_total (int): The total price of the cart.
+        browse_cursor (dict): Where the paging through valid builds has got to, or None.
+        stock_hold (StockHold): Holds the stock of the parts in the build and cart.
+        search_index (SearchIndex): Finds parts by words of their name, type or ID.
+        listing_index (ListingIndex): Sorted, range-filtered and paged listings.
+    """
+    def __init__(self, inventory_object, compatibility_object: Optional[Compatibility] = None, # pylint: disable=too-many-arguments, too-many-positional-arguments
+                 candidate_finder: Optional[CandidateFinder] = None,
+                 pareto_frontier: Optional[ParetoFrontier] = None,
+                 stock_ledger: Optional[StockLedger] = None,
+                 search_index: Optional[SearchIndex] = None,
+                 listing_index: Optional[ListingIndex] = None):
+        """
+        Args:
+            inventory_object: The inventory the commands run against.
+            compatibility_object, candidate_finder, pareto_frontier, stock_ledger,
+                search_index, listing_index (optional): Helpers of the inventory to share between
+                sessions; new ones are made when omitted.
+        """
+        self.inventory_object = inventory_object
+        self.user_object = User()
+        self.compatibility_object = compatibility_object or Compatibility(inventory_object)
+        matrix = self.compatibility_object.matrix
+        self.candidate_finder = candidate_finder or CandidateFinder(inventory_object, matrix)
+        self.pareto_frontier = pareto_frontier or ParetoFrontier(inventory_object)
+        self.search_index = search_index or SearchIndex(inventory_object)
+        self.listing_index = listing_index or ListingIndex(inventory_object)
+        self.state = BuildState(matrix.socket_class)
+        self.build: dict = {}
+        self.cart: dict = {}
+        self.cart_total = 0
+        self.build_cost = 0
+        self.build_total = 0
+        self.browse_cursor: Optional[dict] = None
+        self._browser: Optional[BuildBrowser] = None
+        self._reset_build()
+        self.stock_hold = StockHold(stock_ledger if stock_ledger is not None else StockLedger())
+        self.stock_hold.sources.extend((lambda: self.build, lambda: self.cart))
+
+        self._commands = {
+            "help": self.help,
+            "list": self.list_parts,
+            "details": self.details,
+            "search": self.search,
+            "compat": self.compat,
+            "name": self.name,
+            "budget": self.budget,
+            "build": self.build_command,
+            "builds": self.next_builds,
+            "pareto": self.pareto,
+            "cart": self.cart_command,
+        }
+
+    def execute(self, line: str):
+        """
+        Runs one command.
+
+        Args:
+            line (str): The command and its arguments, separated by whitespace.
+
+        Returns:
+            The command's result, ready to be serialised as JSON.
+
+        Raises:
+            CommandError: If the command fails.
+        """
+        words = line.split()
+        if not words:
+            raise CommandError("Empty command")
+        handler = self._commands.get(words[0].lower())
+        if handler is None:
+            raise CommandError(f"Unknown command: {words[0]}")
+        return handler(words[1:])
+
+    def help(self, _arguments: list) -> list:
+        """Lists the commands."""
+        return sorted(self._commands)
+
+    def _item(self, part_id: str):
+        item = self.inventory_object.get_item(part_id)
+        if item is None:
+            matches = self.search_index.search(part_id, SUGGESTION_LIMIT)
+            hint = (f". Did you mean: {', '.join(match.item_id.lower() for match in matches)}?"
+                    if matches else "")
+            raise CommandError(f"Unknown part ID: {part_id}{hint}")
+        return item
+
+    def _budget(self) -> int:
+        budget = self.user_object.get_budget()
+        if budget <= 0:
+            raise CommandError("Set a budget first")
+        return budget
+
+    def list_parts(self, arguments: list) -> dict:
+        """
+        Lists the parts of one category, or of every category with 'all'. Followed by sort,
+        range or page clauses it returns one page of the sorted, filtered listing instead:
+        {"items": [...], "total": ..., "page": ..., "pages": ...}.
+        """
+        if not arguments:
+            raise CommandError("Usage: list <category|all> [sort <key> [desc]] "
+                               "[<key> <low>..<high>] [page <n>]")
+        if len(arguments) > 1:
+            try:
+                listing = parse_listing(" ".join(arguments))
+            except ValueError as error:
+                raise CommandError(str(error)) from error
+            return self.page_parts(listing)
+        wanted = arguments[0].lower()
+        types = [part_type for part_type in part_types
+                 if wanted in ("all", part_type.lower())]
+        if not types:
+            raise CommandError(f"Unknown category: {arguments[0]}")
+        with pinned(self.inventory_object) as inventory:
+            return {part_type.lower(): [part_summary(item) for item in
+                                        inventory.get_items_by_type(part_type)]
+                    for part_type in types}
+
+    def page_parts(self, listing) -> dict:
+        """One page of a sorted, range-filtered listing (a `ListingQuery`)."""
+        page = self.listing_index.query(listing)
+        page["items"] = [part_summary(item) for item in page["items"]]
+        return page
+
+    def details(self, arguments: list) -> dict:
+        """Returns every field of a part, and the units available if its stock is tracked."""
+        if len(arguments) != 1:
+            raise CommandError("Usage: details <part_id>")
+        item = self._item(arguments[0])
+        details = part_details(item)
+        if item.stock is not None:
+            details["available"] = self.stock_hold.ledger.available(item)
+        return details
+
+    def search(self, arguments: list) -> list:
+        """Finds the parts best matching some words of their name, type or ID."""
+        if not arguments:
+            raise CommandError("Usage: search <words>")
+        return [part_summary(item) for item in
+                self.search_index.search(" ".join(arguments), SEARCH_LIMIT)]
+
+    def compat(self, arguments: list) -> dict:
+        """Checks a set of parts; 'compat complete ...' also requires a complete build."""
+        require_complete = bool(arguments) and arguments[0].lower() == "complete"
+        part_ids = _split_ids(arguments[1:] if require_complete else arguments)
+        if not part_ids:
+            raise CommandError("Usage: compat [complete] <part_id>,<part_id>,...")
+        return self.compatibility_object.check_parts(part_ids, require_complete)
+
+    def name(self, arguments: list) -> dict:
+        """Shows or sets the user's name."""
+        if arguments:
+            name = " ".join(arguments)
+            if len(name) >= 50:
+                raise CommandError("The name exceeds the max length (50)")
+            self.user_object.user_name = name
+        return {"name": self.user_object.get_name()}
+
+    def budget(self, arguments: list) -> dict:
+        """Shows or sets the user's budget."""
+        if arguments:
+            try:
+                budget = int(arguments[0])
+            except ValueError as error:
+                raise CommandError("The budget must be an integer") from error
+            if budget <= 0:
+                raise CommandError("The budget must be a positive integer")
+            self.user_object.budget = budget
+            self._browser = None
+            self.browse_cursor = None
+        return {"budget": self.user_object.get_budget()}
+
+    def build_command(self, arguments: list):
+        """Runs a 'build' subcommand."""
+        subcommands = {
+            "add": self.build_add,
+            "remove": self.build_remove,
+            "show": lambda _: self.build_show(),
+            "check": lambda _: self.build_check(),
+            "clear": lambda _: self.clear_build(),
+            "candidates": lambda _: self.build_candidates(),
+            "auto": self.build_auto,
+        }
+        if not arguments or arguments[0].lower() not in subcommands:
+            raise CommandError(f"Usage: build <{'|'.join(subcommands)}>")
+        return subcommands[arguments[0].lower()](arguments[1:])
+
+    def clear_build(self) -> dict:
+        """Removes every part from the build."""
+        self._reset_build()
+        self.stock_hold.refresh()
+        return self.build_status()
+
+    def _reset_build(self):
+        self.build = {"CPU": None, "GPU": None, "RAM": [], "PSU": None, "Motherboard": None,
+                      "Storage": []}
+        self.state.reset()
+        self.build_total = 0
+
+    def _hold_or_restore(self, restore):
+        """Holds the stock of a change just made, undoing it with `restore` if it fails."""
+        try:
+            self.stock_hold.sync()
+        except OutOfStockError as error:
+            restore()
+            raise CommandError(str(error)) from error
+
+    def _build_parts(self) -> dict:
+        """A copy of the build's parts, to restore them with `_load`."""
+        return {part_type: list(part) if isinstance(part, list) else part
+                for part_type, part in self.build.items()}
+
+    def _put(self, item):
+        if item.item_type in ("RAM", "Storage"):
+            self.build[item.item_type].append(item)
+        else:
+            if self.build[item.item_type] is not None:
+                self._take(self.build[item.item_type])
+            self.build[item.item_type] = item
+        self.state.add(item)
+        self.build_total += int(item.price)
+
+    def _take(self, item):
+        self.state.remove(item)
+        self.build_total -= int(item.price)
+
+    def build_add(self, arguments: list) -> dict:
+        """Adds parts to the build; a single-part category's part is replaced."""
+        part_ids = _split_ids(arguments)
+        if not part_ids:
+            raise CommandError("Usage: build add <part_id>")
+        # Resolve every ID first so that a bad one leaves the build untouched
+        items = [self._item(part_id) for part_id in part_ids]
+        before = self._build_parts()
+        self.put_parts(items)
+        self._hold_or_restore(lambda: self._load(before))
+        return self.build_status()
+
+    def put_parts(self, items: Iterable):
+        """Adds parts to the build, replacing the part of a single-part category."""
+        for item in items:
+            self._put(item)
+
+    def build_remove(self, arguments: list) -> dict:
+        """Removes a part from the build."""
+        if len(arguments) != 1:
+            raise CommandError("Usage: build remove <part_id>")
+        part_id = arguments[0].lower()
+        for part_type, part in self.build.items():
+            if isinstance(part, list):
+                for item in part:
+                    if item.item_id.lower() == part_id:
+                        part.remove(item)
+                        self._take(item)
+                        self.stock_hold.refresh()
+                        return self.build_status()
+            elif part is not None and part.item_id.lower() == part_id:
+                self.build[part_type] = None
+                self._take(part)
+                self.stock_hold.refresh()
+                return self.build_status()
+        raise CommandError(f"{arguments[0]} is not in the build")
+
+    def build_status(self) -> dict:
+        """Returns the build's cost, power balance and problems, read from the running state."""
+        return {
+            "part_count": sum(self.state.part_counts.values()),
+            "cost": self.build_total,
+            "power_balance": self.state.power_balance,
+            "valid": self.state.valid,
+            "problems": self.state.problems(),
+        }
+
+    def build_show(self) -> dict:
+        """Returns the build's parts along with its status."""
+        shown = self.build_status()
+        shown["parts"] = {
+            part_type: [part_summary(item) for item in part] if isinstance(part, list)
+            else part_summary(part) if part is not None else None
+            for part_type, part in self.build.items()}
+        return shown
+
+    def build_check(self) -> dict:
+        """Returns the build's compatibility verdict."""
+        return self.state.verdict()
+
+    def build_candidates(self) -> dict:
+        """Returns the parts that can still lead to a valid build within the budget."""
+        candidates = self.candidate_finder.candidates(self.build, self._budget())
+        return {part_type.lower(): [part_summary(item) for item in candidates[part_type]]
+                for part_type in CATEGORIES}
+
+    def _load(self, parts: dict):
+        self._reset_build()
+        for part in parts.values():
+            for item in part if isinstance(part, list) else [part]:
+                if item is not None:
+                    self._put(item)
+
+    def build_auto(self, arguments: list) -> dict:
+        """Replaces the build with the best build for an objective within the budget."""
+        objective = arguments[0].lower() if arguments else "ram"
+        if objective not in OBJECTIVES:
+            raise CommandError(f"Unknown objective: {objective}")
+        result = find_best_build(self.inventory_object, self._budget(), objective)
+        if result is None:
+            raise CommandError("No compatible build fits within the budget")
+        before = self._build_parts()
+        self._load(result["parts"])
+        self._hold_or_restore(lambda: self._load(before))
+        shown = self.build_show()
+        shown.update(objective=objective, value=result["value"], exhaustive=result["complete"])
+        return shown
+
+    @staticmethod
+    def _build_summary(result: dict) -> dict:
+        summary = {key: value for key, value in result.items() if key != "parts"}
+        summary["parts"] = [item.item_id.lower() for part in result["parts"].values()
+                            for item in (part if isinstance(part, list) else [part])
+                            if item is not None]
+        return summary
+
+    def next_builds(self, _arguments: list) -> dict:
+        """Returns the next page of valid builds within the budget, cheapest first."""
+        budget = self._budget()
+        if self._browser is None:
+            self._browser = BuildBrowser(self.inventory_object, budget,
+                                         cursor=self.browse_cursor)
+        page = self._browser.next_page()
+        self.browse_cursor = self._browser.cursor
+        return {"builds": [self._build_summary(result) for result in page],
+                "exhausted": self._browser.exhausted}
+
+    def pareto(self, _arguments: list) -> list:
+        """Returns the best value builds within the budget."""
+        return [self._build_summary(result)
+                for result in self.pareto_frontier.builds(self._budget())]
+
+    def cart_command(self, arguments: list):
+        """Runs a 'cart' subcommand."""
+        subcommands = {
+            "add": self.cart_add,
+            "add-build": lambda _: self.cart_add_build(),
+            "remove": self.cart_remove,
+            "show": lambda _: self.cart_show(),
+            "clear": lambda _: self.cart_clear(),
+            "checkout": lambda _: self.checkout(),
+        }
+        if not arguments or arguments[0].lower() not in subcommands:
+            raise CommandError(f"Usage: cart <{'|'.join(subcommands)}>")
+        return subcommands[arguments[0].lower()](arguments[1:])
+
+    def cart_add(self, arguments: list) -> dict:
+        """Adds a part to the cart."""
+        if len(arguments) != 1:
+            raise CommandError("Usage: cart add <part_id>")
+        item = self._item(arguments[0])
+        key = item.item_id.upper()
+        previous = self.cart.get(key)
+        self.cart[key] = item
+        self._hold_or_restore(lambda: self.cart.__setitem__(key, previous) if previous
+                              else self.cart.pop(key))
+        if previous is not None:
+            self.cart_total -= int(previous.price)
+        self.cart_total += int(item.price)
+        return self.cart_status()
+
+    def cart_add_build(self) -> dict:
+        """Adds the build to the cart if it is a valid complete build."""
+        if not self.state.valid:
+            raise CommandError("The build is not valid: " + "; ".join(self.state.problems()))
+        previous = self.cart.get("BUILD")
+        self.cart["BUILD"] = self._build_parts()
+        self._hold_or_restore(lambda: self.cart.__setitem__("BUILD", previous) if previous
+                              else self.cart.pop("BUILD"))
+        self.cart_total -= self.build_cost
+        self.build_cost = self.build_total
+        self.cart_total += self.build_cost
+        return self.cart_status()
+
+    def cart_remove(self, arguments: list) -> dict:
+        """Removes a part, or the build with 'build', from the cart."""
+        if len(arguments) != 1:
+            raise CommandError("Usage: cart remove <part_id|build>")
+        key = arguments[0].upper()
+        if key not in self.cart:
+            raise CommandError(f"{arguments[0]} is not in the cart")
+        if key == "BUILD":
+            self.cart_total -= self.build_cost
+            self.build_cost = 0
+        else:
+            self.cart_total -= int(self.cart[key].price)
+        del self.cart[key]
+        self.stock_hold.refresh()
+        return self.cart_status()
+
+    def cart_clear(self) -> dict:
+        """Empties the cart."""
+        self.cart = {}
+        self.cart_total = 0
+        self.build_cost = 0
+        self.stock_hold.refresh()
+        return self.cart_status()
+
+    def cart_status(self) -> dict:
+        """Returns the number of cart entries and the total against the budget."""
+        return {"item_count": len(self.cart), "total": self.cart_total,
+                "budget": self.user_object.get_budget()}
+
+    def cart_show(self) -> dict:
+        """Returns the cart's contents and total against the budget."""
+        items = []
+        for key, entry in self.cart.items():
+            if key == "BUILD":
+                items.append({"id": "build", "price": self.build_cost, "parts": [
+                    item.item_id.lower() for part in entry.values()
+                    for item in (part if isinstance(part, list) else [part])
+                    if item is not None]})
+            else:
+                items.append(part_summary(entry))
+        shown = self.cart_status()
+        shown["items"] = items
+        return shown
+
+    def checkout(self) -> dict:
+        """
+        Buys the cart if the budget covers it and every part is in stock, taking the parts
+        out of stock and leaving the cart empty.
+        """
+        if not self.cart:
+            raise CommandError("The cart is empty")
+        if self.user_object.get_budget() < self.cart_total:
+            raise CommandError("The budget does not cover the cart")
+        try:
+            self.stock_hold.commit(self.cart)
+        except OutOfStockError as error:
+            raise CommandError(str(error)) from error
+        purchase = self.cart_show()
+        self.cart_clear()
+        return purchase
+
+    def apply_inventory_diff(self, diff) -> List[str]:
+        """
+        Re-prices the build and cart after the inventory changed, e.g. by a price update.
+
+        Changed parts are swapped for their new versions, parts that no longer exist are
+        dropped, and the totals are recomputed from the new prices.
+
+        Args:
+            diff (InventoryDiff): The changes that were applied to the inventory.
+
+        Returns:
+            List[str]: Notices describing what changed in the build and cart.
+        """
+        build = self._build_parts()
+        messages = refresh_parts(build, diff, "build")
+        self._load(build)
+
+        build_data = self.cart.pop("BUILD", None)
+        messages.extend(refresh_parts(self.cart, diff, "cart"))
+        self.cart = {key: item for key, item in self.cart.items() if item is not None}
+        self.cart_total = sum(int(item.price) for item in self.cart.values())
+        if build_data is not None:
+            messages.extend(refresh_parts(build_data, diff, "cart's custom build"))
+            self.build_cost = sum(int(item.price) for part in build_data.values()
+                                  for item in (part if isinstance(part, list) else [part])
+                                  if item is not None)
+            self.cart["BUILD"] = build_data
+            self.cart_total += self.build_cost
+        self.stock_hold.refresh()
+        return messages
+
+def run_commands(inventory_object, lines: Iterable[str], output: TextIO,
+                 session: Optional[CommandSession] = None, flush_lines: bool = False) -> dict:
+    """
+    Runs a stream of commands and writes one JSON result per command.
+
+    Args:
+        inventory_object: The inventory the commands run against.
+        lines (iterable): The commands, one per line (e.g. an open file or sys.stdin).
+        output (file): Where the results are written.
+        session (CommandSession, optional): The session to run the commands in; a new one is
+            started when omitted.
+        flush_lines (bool): Flush after every result, for a caller that waits for each
+            answer before sending the next command. Otherwise the output stays buffered
+            until the stream ends.
+
+    Returns:
+        dict: The number of commands that "succeeded" and "failed".
+    """
+    session = session or CommandSession(inventory_object)
+    counts = {"succeeded": 0, "failed": 0}
+    for number, line in enumerate(lines, start=1):
+        command = line.strip()
+        if not command or command.startswith("#"):
+            continue
+        record = {"line": number, "command": command, "ok": True}
+        try:
+            record["result"] = session.execute(command)
+            counts["succeeded"] += 1
+        except CommandError as error:
+            record["ok"] = False
+            record["error"] = str(error)
+            counts["failed"] += 1
+        except Exception as error: # pylint: disable=broad-exception-caught
+            # A bug behind one command must not end the stream for the commands after it
+            record["ok"] = False
+            record["error"] = f"Internal error: {type(error).__name__}: {error}"
+            counts["failed"] += 1
+        output.write(json.dumps(record) + "\n")
+        if flush_lines:
+            output.flush()
+    output.flush()
+    return counts
@@ -12,21 +12,25 @@ Classes:
     - Motherboard: Represents a motherboard, extending Item, with additional socket and 
       ram_slots attributes.
     - Storage: Represents storage devices, extending Item, with an additional capacity attribute.
-    - Inventory: Manages a collection of items, providing functionality to add items.
+    - Inventory: Manages a collection of items, providing functionality to add and remove
+      items and to look them up by ID, type, socket or RAM slot count through indexes.
 
 Functions:
+    - create_item: Builds the Item subclass matching a single item entry's type.
     - load_inventory: Loads inventory data from a dictionary and populates it with items based 
       on their types.
     - print_categories: Prints a list of available item categories.
     - gen_parts_dict: Generates a dictionary categorizing parts by their type.
-    - list_parts: Lists all parts or parts from a specific category based on user input.
     - get_part_details: Retrieves details of a specific part by its item ID.
     - display_part_details: Displays detailed information about a specific part.
-    - get_details: Fetches and displays part details, optionally based on user input.
+    - get_details: Fetches and displays part details, optionally based on user input, offering
+      the closest parts when the ID typed is not in the inventory.
 """
 
-from typing import List
+from typing import Dict, List, Optional
+from src.search import choose_part # pylint: disable=import-error
 from src.utils import clear_screen # pylint: disable=import-error
+from src.versioned import pinned # pylint: disable=import-error
 
 class Item: # pylint: disable=too-few-public-methods
     """
@@ -38,11 +42,16 @@ class Item: # pylint: disable=too-few-public-methods
         - name (str): The name of the item.
         - price (int): The price of the item in dollars.
         - power_draw (int): The amount of power (in watts) the item draws. Default is 0.
+        - stock (int): The units in stock when the catalog was loaded, or None when the
+          catalog does not track the item's stock. Live levels are kept by a `StockLedger`.
         
     Methods:
         - __str__: Returns a string representation of the item, including its name, type, 
         and price.
     """
+    # Untracked unless the catalog entry has a "stock" field
+    stock: Optional[int] = None
+
     def __init__(self, item_id: str, item_type: str, name: str, price: int, power_draw: int = 0): # pylint: disable=too-many-positional-arguments, too-many-arguments
         self.item_id = item_id
         self.item_type = item_type
@@ -122,15 +131,36 @@ class Storage(Item): # pylint: disable=too-few-public-methods
         super().__init__(item_id, "Storage", name, price)
         self.capacity = capacity
 
-class Inventory: # pylint: disable=too-few-public-methods
+class Inventory:
     """
     Represents an inventory of items.
-    
+
+    Besides the primary ID index the inventory keeps secondary indexes that are updated on
+    every insert and delete, so listings and compatibility lookups never re-bucket the
+    whole catalog.
+
     Attributes:
-        items (List[Item]): A list to store the items in the inventory.
+        item_index (Dict[str, Item]): A case-insensitive index mapping each item ID to its item.
+        type_index (Dict[str, Dict[str, Item]]): Items bucketed by `item_type`.
+        socket_index (Dict[tuple, Dict[str, Item]]): CPUs and motherboards bucketed by
+            `(item_type, socket)`.
+        ram_slots_index (Dict[int, Dict[str, Item]]): Motherboards bucketed by `ram_slots`.
+        version (int): Incremented on every change, so dependants can tell when to refresh.
     """
     def __init__(self) -> None:
-        self.items: List[Item] = []
+        self.item_index: Dict[str, Item] = {}
+        self.type_index: Dict[str, Dict[str, Item]] = {}
+        self.socket_index: Dict[tuple, Dict[str, Item]] = {}
+        self.ram_slots_index: Dict[int, Dict[str, Item]] = {}
+        self.version: int = 0
+
+    @property
+    def items(self):
+        """All items in the inventory, in insertion order."""
+        return self.item_index.values()
+
+    def __len__(self) -> int:
+        return len(self.item_index)
 
     def add_item(self, item: Item):
         """
@@ -138,8 +168,189 @@ class Inventory: # pylint: disable=too-few-public-methods
 
         Args:
             item (Item): The item to be added to the inventory.
+
+        Raises:
+            ValueError: If an item with the same ID (ignoring case) is already in the inventory.
+        """
+        item_key = item.item_id.lower()
+        if item_key in self.item_index:
+            raise ValueError(f"Duplicate item ID: {item.item_id}")
+
+        self.item_index[item_key] = item
+        for index, bucket_key in self._bucket_keys(item):
+            index.setdefault(bucket_key, {})[item_key] = item
+        self.version += 1
+
+    def remove_item(self, item_id: str) -> Optional[Item]:
+        """
+        Removes an item, and its secondary index entries, from the inventory.
+
+        Args:
+            item_id (str): The ID of the item, matched without regard to case.
+
+        Returns:
+            Item: The removed item, or None if the ID is not in the inventory.
+        """
+        item_key = item_id.strip().lower()
+        item = self.item_index.pop(item_key, None)
+        if item is None:
+            return None
+
+        for index, bucket_key in self._bucket_keys(item):
+            _discard_from_bucket(index, bucket_key, item_key)
+        self.version += 1
+        return item
+
+    def replace_item(self, item: Item) -> Optional[Item]:
+        """
+        Replaces the item that has the same ID, keeping its position in every index whose
+        bucket did not change.
+
+        Args:
+            item (Item): The new version of the item.
+
+        Returns:
+            Item: The replaced item, or None (and nothing is changed) if the ID is not in the
+            inventory.
         """
-        self.items.append(item)
+        item_key = item.item_id.lower()
+        old_item = self.item_index.get(item_key)
+        if old_item is None:
+            return None
+
+        new_buckets = self._bucket_keys(item)
+        new_bucket_ids = {(id(index), bucket_key) for index, bucket_key in new_buckets}
+        for index, bucket_key in self._bucket_keys(old_item):
+            if (id(index), bucket_key) not in new_bucket_ids:
+                _discard_from_bucket(index, bucket_key, item_key)
+        self.item_index[item_key] = item
+        for index, bucket_key in new_buckets:
+            index.setdefault(bucket_key, {})[item_key] = item
+        self.version += 1
+        return old_item
+
+    def _bucket_keys(self, item: Item) -> List[tuple]:
+        """Returns (index, bucket key) for every secondary index bucket the item belongs in."""
+        bucket_keys = [(self.type_index, item.item_type)]
+        if item.item_type in ("CPU", "Motherboard"):
+            bucket_keys.append((self.socket_index, (item.item_type, item.socket)))
+        if item.item_type == "Motherboard":
+            bucket_keys.append((self.ram_slots_index, int(item.ram_slots)))
+        return bucket_keys
+
+    def get_item(self, item_id: str) -> Optional[Item]:
+        """
+        Looks up an item by its ID.
+
+        Args:
+            item_id (str): The ID of the item, matched without regard to case.
+
+        Returns:
+            Item: The matching item, or None if the ID is not in the inventory.
+        """
+        return self.item_index.get(item_id.strip().lower())
+
+    def get_items_by_type(self, item_type: str):
+        """
+        Returns the items of one type (e.g. "CPU", "RAM") in insertion order.
+        """
+        return self.type_index.get(item_type, {}).values()
+
+    def get_items_by_socket(self, item_type: str, socket: str):
+        """
+        Returns the CPUs or motherboards (per `item_type`) that use the given socket.
+        """
+        return self.socket_index.get((item_type, socket), {}).values()
+
+    def get_items_by_ram_slots(self, ram_slots: int):
+        """
+        Returns the motherboards that have exactly `ram_slots` RAM slots.
+        """
+        return self.ram_slots_index.get(ram_slots, {}).values()
+
+    def get_ram_slot_counts(self) -> List[int]:
+        """
+        Returns the distinct motherboard RAM slot counts present, in ascending order.
+        """
+        return sorted(self.ram_slots_index)
+
+def _discard_from_bucket(index: dict, bucket_key, item_key: str):
+    """Removes `item_key` from one bucket of a secondary index, dropping empty buckets."""
+    bucket = index.get(bucket_key)
+    if bucket is not None:
+        bucket.pop(item_key, None)
+        if not bucket:
+            del index[bucket_key]
+
+def create_item(item_data: dict) -> Item:
+    """
+    Creates the Item subclass matching an item entry's "type".
+
+    Args:
+        item_data (dict): The fields of a single inventory item. "stock" is optional.
+
+    Returns:
+        Item: The populated CPU, GPU, RAM, PSU, Motherboard or Storage object.
+
+    Raises:
+        KeyError: If a field required by the item's type is missing.
+        ValueError: If the item type is not recognised.
+    """
+    item_type = item_data["type"]
+
+    if item_type == "CPU":
+        item = CPU(
+            item_id=item_data["id"],
+            name=item_data["name"],
+            price=item_data["price"],
+            power_draw=item_data["power_draw"],
+            socket=item_data["socket"]
+        )
+    elif item_type == "GPU":
+        item = GPU(
+            item_id=item_data["id"],
+            name=item_data["name"],
+            price=item_data["price"],
+            power_draw=item_data["power_draw"],
+            overclockable=item_data["overclockable"]
+        )
+    elif item_type == "RAM":
+        item = RAM(
+            item_id=item_data["id"],
+            name=item_data["name"],
+            price=item_data["price"],
+            power_draw=item_data["power_draw"],
+            capacity=item_data["capacity"]
+        )
+    elif item_type == "PSU":
+        item = PSU(
+            item_id=item_data["id"],
+            name=item_data["name"],
+            price=item_data["price"],
+            power_supplied=item_data["power_supplied"]
+        )
+    elif item_type == "Motherboard":
+        item = Motherboard(
+            item_id=item_data["id"],
+            name=item_data["name"],
+            price=item_data["price"],
+            power_draw=item_data["power_draw"],
+            socket=item_data["socket"],
+            ram_slots=item_data["ram_slots"]
+        )
+    elif item_type == "Storage":
+        item = Storage(
+            item_id=item_data["id"],
+            name=item_data["name"],
+            price=item_data["price"],
+            capacity=item_data["capacity"]
+        )
+    else:
+        raise ValueError(f"Unknown item type: {item_type}")
+
+    if item_data.get("stock") is not None:
+        item.stock = int(item_data["stock"])
+    return item
 
 def load_inventory(data: dict) -> Inventory:
     """
@@ -149,65 +360,26 @@ def load_inventory(data: dict) -> Inventory:
         data (dict): The data containing inventory details.
 
     Returns:
-        Inventory: The inventory object populated with items.
+        Inventory: The inventory object populated with items. When an ID appears more than
+        once only the first entry is kept and the duplicates are reported.
     """
     inventory = Inventory()
+    duplicate_ids = []
     for entry in data["inventory"]:
-        item_data = entry["item"]
-        item_type = item_data["type"]
-
-        if item_type == "CPU":
-            item = CPU(
-                item_id=item_data["id"],
-                name=item_data["name"],
-                price=item_data["price"],
-                power_draw=item_data["power_draw"],
-                socket=item_data["socket"]
-            )
-        elif item_type == "GPU":
-            item = GPU(
-                item_id=item_data["id"],
-                name=item_data["name"],
-                price=item_data["price"],
-                power_draw=item_data["power_draw"],
-                overclockable=item_data["overclockable"]
-            )
-        elif item_type == "RAM":
-            item = RAM(
-                item_id=item_data["id"],
-                name=item_data["name"],
-                price=item_data["price"],
-                power_draw=item_data["power_draw"],
-                capacity=item_data["capacity"]
-            )
-        elif item_type == "PSU":
-            item = PSU(
-                item_id=item_data["id"],
-                name=item_data["name"],
-                price=item_data["price"],
-                power_supplied=item_data["power_supplied"]
-            )
-        elif item_type == "Motherboard":
-            item = Motherboard(
-                item_id=item_data["id"],
-                name=item_data["name"],
-                price=item_data["price"],
-                power_draw=item_data["power_draw"],
-                socket=item_data["socket"],
-                ram_slots=item_data["ram_slots"]
-            )
-        elif item_type == "Storage":
-            item = Storage(
-                item_id=item_data["id"],
-                name=item_data["name"],
-                price=item_data["price"],
-                capacity=item_data["capacity"]
-            )
-
-        inventory.add_item(item) # pylint: disable=possibly-used-before-assignment
+        item = create_item(entry["item"])
+        try:
+            inventory.add_item(item)
+        except ValueError:
+            duplicate_ids.append(item.item_id)
+
+    if duplicate_ids:
+        print(f"Warning: Skipped {len(duplicate_ids)} duplicate item ID(s): "
+              f"{', '.join(duplicate_ids)}")
 
     return inventory
 
+part_types = ["CPU", "GPU", "RAM", "PSU", "Motherboard", "Storage"]
+
 available_category_options = [
     "all", "cpu", "gpu", "ram", "psu", "motherboard", "storage"
 ]
@@ -228,61 +400,19 @@ def gen_parts_dict(inventory_data):
     Generates a dictionary that categorizes parts in the inventory by their type.
 
     Args:
-        inventory_data (object): An object containing a list of parts (items) 
-        in the inventory, where each item has attributes such as `item_type`.
+        inventory_data (object): The inventory, whose type index already buckets
+        the parts by `item_type`.
 
     Returns:
         dict: A dictionary where the keys are part types (e.g., "cpu", "gpu", etc.)
         and the values are lists of items corresponding to each part type.
     """
-    parts_dict = {
-        "cpu": [],
-        "gpu": [],
-        "ram": [],
-        "psu": [],
-        "motherboard": [],
-        "storage": []
-    }
-
-    for item in inventory_data.items:
-        parts_dict[item.item_type.lower()].append(item)
-    return parts_dict
-
-def list_parts(inventory_data):
-    """
-    Displays a list of parts from the inventory based on user selection.
-
-    Args:
-        inventory_data (object): An object containing the inventory, which 
-        holds the list of parts and their details.
-
-    The function:
-    1. Clears the screen.
-    2. Generates a dictionary of parts categorized by type.
-    3. Prompts the user to select a category or list all parts.
-    4. Displays parts in the selected category or all parts if 'all' is chosen.
-    """
-    clear_screen()
-    parts_dictionary = gen_parts_dict(inventory_data)
-    print_categories()
-    print("\nFrom the provided categories what would you like to list? ")
-    user_input = input("Option: ").lower()
-
-    if user_input == 'all':
-        clear_screen()
-        for part_key in parts_dictionary:
-            print(part_key.upper())
-            parts_list = parts_dictionary.get(part_key)
-            for part_item in parts_list:
-                print(f"    {part_item.name} ({part_item.item_id.lower()})    \
-                      ${part_item.price:,}.00")
-    elif user_input in parts_dictionary:
-        clear_screen()
-        print(user_input.upper())
-        parts_list = parts_dictionary.get(user_input)
-        for part_item in parts_list:
-            print(f"    {part_item.name} ({part_item.item_id.lower()})    \
-                  ${part_item.price:,}.00")
+    # All categories are read from the same version of the inventory
+    with pinned(inventory_data) as inventory:
+        return {
+            part_type.lower(): list(inventory.get_items_by_type(part_type))
+            for part_type in part_types
+        }
 
 def get_part_details(inventory_data, user_input):
     """
@@ -296,10 +426,7 @@ def get_part_details(inventory_data, user_input):
         object: The item from the inventory that matches the user's input (by `item_id`), 
         or `None` if no match is found.
     """
-    for item in inventory_data.items:
-        if item.item_id.lower() == user_input.lower():
-            return item
-    return None
+    return inventory_data.get_item(user_input)
 
 def display_part_details(part_details):
     """
@@ -336,15 +463,17 @@ def display_part_details(part_details):
         for attr, value in other_attr_data.items():
             print(f"\t{attr}: {value}")
 
-def get_details(inventory_data, part_id=None):
+def get_details(inventory_data, part_id=None, search_index=None):
     """
     Fetches and displays part details based on the provided part ID.
 
-    If no part ID is provided, it prompts the user for input.
+    If no part ID is provided, it prompts the user for input. With a search index, an ID
+    typed that is not in the inventory lists the closest parts for the user to pick from.
 
     Args:
         inventory_data (dict): The inventory data containing all parts.
         part_id (str, optional): The part ID to look up. If None, user input is requested.
+        search_index (SearchIndex, optional): The index of `inventory_data` to search.
 
     Returns:
         dict or None: The details of the part, or None if not found or user returns to the 
@@ -361,6 +490,10 @@ def get_details(inventory_data, part_id=None):
             return None
 
         part_details = get_part_details(inventory_data, user_input)
+        if part_details is None and search_index is not None:
+            part_details = choose_part(search_index, user_input)
+            if part_details is not None:
+                clear_screen()
 
         if part_details is None:
             return None
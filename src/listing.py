@@ -0,0 +1,457 @@
+"""
+listing.py
+
+Sorted, range-filtered and paged listings of the parts of a category.
+
+A listing is asked for in a few words: the category, then any of
+
+- sort <key> [asc|desc]: the order, by price, power_draw, power_supplied, capacity or name
+  (the catalog order when omitted),
+- <key> <low>..<high>, <key> >= <n>, <key> < <n>, ...: keeps the parts whose numeric key is in
+  range (either end of a range may be left open, e.g. price ..400),
+- page <n>: the page to show,
+
+for example "gpu sort price desc price 100..400" or "ram capacity >= 32 page 2".
+
+A category is read the first time it is listed, and for each key its parts are sorted once
+per inventory version, with their keys kept in a list beside them. A range on a key is then
+two bisections into that order, and a listing with ranges starts from the narrowest of them
+and only checks the other ranges on the parts inside it. When many parts are in range and
+the listing is sorted by another key, the page is found by walking that key's order only as
+far as the page reaches instead of sorting them all. A listing without ranges reads its page
+straight out of the sorted order. Parts that lack the sort key (a CPU has no capacity) come
+after the others and are dropped by a range on that key. Parts that tie on the key are always
+in catalog order, whichever way the listing runs.
+
+A DatabaseInventory sorts, filters and pages listings itself, reading a category's price
+order straight from its (type, price) index, so only the parts of the page are loaded.
+
+The "list" menu option, the headless "list" command and the server's /parts endpoint all
+read their listings from a ListingIndex.
+
+Classes:
+- ListingQuery: The category, order, ranges and page of a listing.
+- ListingIndex: The sorted orders of one inventory and the listings read from them.
+
+Functions:
+- parse_listing(text): Reads a listing query from its words.
+- print_listing(listing, page): Prints one page of a listing.
+- list_parts(inventory_data, listing_index): Lists parts page by page as the user asks.
+
+Acknowledged Pylint Standard Errors:
+src\\listing.py:51:0: E0401: Unable to import 'src.inventory' (import-error)
+src\\listing.py:52:0: E0401: Unable to import 'src.utils' (import-error)
+src\\listing.py:53:0: E0401: Unable to import 'src.versioned' (import-error)
+"""
+import re
+from bisect import bisect_left, bisect_right
+from itertools import chain
+from typing import Dict, List, Optional, Set, Tuple
+
+from src.inventory import available_category_options, part_types, print_categories # pylint: disable=import-error
+from src.utils import clear_screen # pylint: disable=import-error
+from src.versioned import pinned # pylint: disable=import-error
+
+# Keys parts can be sorted by, and those that can also be given a range.
+SORT_KEYS = ("price", "power_draw", "power_supplied", "capacity", "name")
+RANGE_KEYS = ("price", "power_draw", "power_supplied", "capacity")
+# Parts shown on one page.
+PAGE_SIZE = 20
+# Parts within the ranges above which a page is found by walking the listing's sorted order
+# instead of sorting them all.
+SORT_LIMIT = 1024
+
+_CLAUSE = re.compile(r"""\s*(?:
+      sort\s+(?P<sort>[a-z_]+)(?:\s+(?P<direction>asc|desc)\b)?
+    | page\s+(?P<page>\d+)
+    | (?P<key>[a-z_]+)\s*(?:
+          (?P<low>\d+)?\s*\.\.\s*(?P<high>\d+)?
+        | (?P<operator>>=|<=|>|<|=)\s*(?P<value>\d+)
+      )
+    )\s*""", re.VERBOSE)
+
+class ListingQuery: # pylint: disable=too-few-public-methods
+    """
+    The category, order, ranges and page of a listing.
+
+    Attributes:
+        category (str): A lower-cased category, or "all".
+        sort (str): The sort key, or None for the catalog order.
+        descending (bool): Largest (or last by name) first; ignored without a sort key.
+        ranges (dict): Key -> (lowest, highest) value kept, inclusive; None leaves an end open.
+        page (int): The page shown, counting from 1.
+        page_size (int): The parts on a page (PAGE_SIZE by default).
+    """
+    def __init__(self, category: str = "all", sort: Optional[str] = None, # pylint: disable=too-many-arguments, too-many-positional-arguments
+                 descending: bool = False,
+                 ranges: Optional[Dict[str, Tuple[Optional[int], Optional[int]]]] = None,
+                 page: int = 1, page_size: Optional[int] = None):
+        self.category = category
+        self.sort = sort
+        self.descending = descending
+        self.ranges = dict(ranges or {})
+        self.page = page
+        self.page_size = page_size or PAGE_SIZE
+
+    def add_range(self, key: str, low: Optional[int], high: Optional[int]):
+        """
+        Keeps only the parts whose key is within low..high as well.
+
+        Raises:
+            ValueError: If the key cannot be given a range.
+        """
+        if key not in RANGE_KEYS:
+            raise ValueError(f"Cannot filter by '{key}'; use one of {', '.join(RANGE_KEYS)}")
+        current_low, current_high = self.ranges.get(key, (None, None))
+        if current_low is not None and (low is None or current_low > low):
+            low = current_low
+        if current_high is not None and (high is None or current_high < high):
+            high = current_high
+        self.ranges[key] = (low, high)
+
+def parse_listing(text: str) -> ListingQuery:
+    """
+    Reads a listing query from its words, e.g. "gpu sort price desc price 100..400".
+
+    Args:
+        text (str): The category followed by any sort, range and page clauses.
+
+    Returns:
+        ListingQuery: The query.
+
+    Raises:
+        ValueError: If the category, a key or a clause is not understood.
+    """
+    words = text.strip().lower().split(maxsplit=1)
+    if not words or words[0] not in available_category_options:
+        raise ValueError(f"Unknown category: {words[0] if words else ''}")
+    query = ListingQuery(words[0])
+    rest = words[1] if len(words) > 1 else ""
+    position = 0
+    while position < len(rest):
+        clause = _CLAUSE.match(rest, position)
+        if clause is None or clause.end() == position:
+            raise ValueError(f"Cannot read '{rest[position:].strip()}'")
+        position = clause.end()
+        if clause["sort"]:
+            if clause["sort"] not in SORT_KEYS:
+                raise ValueError(f"Cannot sort by '{clause['sort']}'; "
+                                 f"use one of {', '.join(SORT_KEYS)}")
+            query.sort = clause["sort"]
+            query.descending = clause["direction"] == "desc"
+        elif clause["page"]:
+            query.page = max(1, int(clause["page"]))
+        elif clause["operator"]:
+            value = int(clause["value"])
+            query.add_range(clause["key"], *{
+                ">=": (value, None), ">": (value + 1, None), "<=": (None, value),
+                "<": (None, value - 1), "=": (value, value)}[clause["operator"]])
+        else:
+            query.add_range(clause["key"],
+                            int(clause["low"]) if clause["low"] else None,
+                            int(clause["high"]) if clause["high"] else None)
+    return query
+
+def _key_of(item, key: Optional[str]):
+    """The value a part is sorted by, or None if it lacks the key."""
+    value = getattr(item, key, None)
+    if value is None:
+        return None
+    return value.lower() if key == "name" else int(value)
+
+class _Order:
+    """
+    The parts of a category sorted by one key, with the keys beside them for bisection.
+    Parts that tie on the key are in catalog order, in `items` and in `descending` alike;
+    parts lacking the key follow in catalog order.
+    """
+    def __init__(self, items: list, key: Optional[str]):
+        self._descending: Optional[list] = None
+        if key is None:
+            self.items, self.keys, self.missing = items, [], []
+            return
+        keyed = [(value, number) for number, value in
+                 enumerate(_key_of(item, key) for item in items) if value is not None]
+        keyed.sort()
+        self.items = [items[number] for _, number in keyed]
+        self.keys = [value for value, _ in keyed]
+        with_key = {number for _, number in keyed}
+        self.missing = [item for number, item in enumerate(items) if number not in with_key]
+
+    @property
+    def descending(self) -> list:
+        """The parts largest key first, made on first use: the runs of `items` in reverse."""
+        if self._descending is None:
+            self._descending = []
+            end = len(self.keys)
+            while end > 0:
+                start = bisect_left(self.keys, self.keys[end - 1], 0, end)
+                self._descending.extend(self.items[start:end])
+                end = start
+        return self._descending
+
+    def bounds(self, low: Optional[int], high: Optional[int]) -> Tuple[int, int]:
+        """The positions of the first and past the last part with a key in low..high."""
+        start = bisect_left(self.keys, low) if low is not None else 0
+        end = bisect_right(self.keys, high) if high is not None else len(self.keys)
+        return start, max(start, end)
+
+class ListingIndex:
+    """
+    The parts of one inventory sorted by every key, per category, and the listings read from
+    them. A category is read and sorted by a key the first time a listing asks for it, and
+    everything is dropped whenever the inventory's version changes. Inventories that answer
+    lookups from indexes (a DatabaseInventory) are listed by the database itself, so only the
+    parts of the page are loaded.
+
+    Attributes:
+        inventory_object: The inventory listed.
+        built_version (int): The inventory version the orders were sorted from.
+    """
+    def __init__(self, inventory_object):
+        self.inventory_object = inventory_object
+        self.built_version: Optional[int] = None
+        self._indexed = getattr(inventory_object, "indexed", False)
+        self._catalog: Dict[str, list] = {}
+        self._orders: Dict[Tuple[str, Optional[str]], _Order] = {}
+        self._positions: Dict[str, Dict[int, int]] = {}
+
+    def refresh(self):
+        """Drops the categories read and their orders if the inventory changed since."""
+        version = getattr(self.inventory_object, "version", None)
+        if version is not None and version == self.built_version:
+            return
+        self._catalog = {}
+        self._orders = {}
+        self._positions = {}
+        self.built_version = version
+
+    def _category(self, category: str) -> list:
+        """The parts of a category in catalog order, reading them on first use."""
+        parts = self._catalog.get(category)
+        if parts is None:
+            types = _types_of(category)
+            with pinned(self.inventory_object) as inventory:
+                parts = [item for part_type in types
+                         for item in inventory.get_items_by_type(part_type)]
+            self._catalog[category] = parts
+        return parts
+
+    def _order(self, category: str, key: Optional[str]) -> _Order:
+        """The parts of a category sorted by a key, sorting them on first use."""
+        order = self._orders.get((category, key))
+        if order is None:
+            order = self._orders[(category, key)] = _Order(self._category(category), key)
+        return order
+
+    def query(self, listing: ListingQuery) -> dict:
+        """
+        Reads one page of a listing.
+
+        Args:
+            listing (ListingQuery): The category, order, ranges and page.
+
+        Returns:
+            dict: "items" on the page, "total" parts in the listing, the "page" shown and
+            the number of "pages".
+        """
+        if listing.category not in available_category_options:
+            raise ValueError(f"Unknown category: {listing.category}")
+        # The catalog order only runs one way
+        descending = listing.descending and listing.sort is not None
+        page_size = max(1, listing.page_size)
+        if self._indexed:
+            return self._query_database(listing, descending, page_size)
+
+        self.refresh()
+        if listing.ranges:
+            ranked = self._in_ranges(listing, descending)
+        else:
+            order = self._order(listing.category, listing.sort)
+            ranked = _Joined(order.descending if descending else order.items, order.missing)
+        total = len(ranked)
+        pages = max(1, -(-total // page_size))
+        page = min(max(1, listing.page), pages)
+        start = (page - 1) * page_size
+        return {"items": ranked[start:start + page_size], "total": total, "page": page,
+                "pages": pages}
+
+    def _query_database(self, listing: ListingQuery, descending: bool, page_size: int) -> dict:
+        """One page of a listing, sorted, filtered and paged by the database."""
+        types = _types_of(listing.category)
+        page = max(1, listing.page)
+        total, items = self.inventory_object.list_items(
+            types, listing.sort, descending, listing.ranges, (page - 1) * page_size, page_size)
+        pages = max(1, -(-total // page_size))
+        if page > pages:
+            # Past the end: show the last page, as the in-memory listing does
+            page = pages
+            total, items = self.inventory_object.list_items(
+                types, listing.sort, descending, listing.ranges, (page - 1) * page_size,
+                page_size)
+        return {"items": items, "total": total, "page": page, "pages": pages}
+
+    def _in_ranges(self, listing: ListingQuery, descending: bool):
+        """The parts within every range, in the listing's order."""
+        slices = []
+        for key, (low, high) in listing.ranges.items():
+            start, end = self._order(listing.category, key).bounds(low, high)
+            slices.append((end - start, key, start, end))
+        _, narrowest, start, end = min(slices)
+        order = self._order(listing.category, narrowest)
+        if descending and listing.sort == narrowest:
+            # The range is as long a block of the descending order, from the other end
+            count = len(order.items)
+            parts = order.descending[count - end:count - start]
+        else:
+            parts = order.items[start:end]
+        others = [(key, low, high) for key, (low, high) in listing.ranges.items()
+                  if key != narrowest]
+        if others:
+            parts = [item for item in parts if all(
+                _within(_key_of(item, key), low, high) for key, low, high in others)]
+
+        if listing.sort == narrowest:
+            return parts
+        if len(parts) > SORT_LIMIT:
+            # Too many to sort for every page: walk the listing's order as far as the page
+            members = {id(item) for item in parts}
+            return _Filtered(self._order(listing.category, listing.sort), members,
+                             descending)
+        # Catalog order first, so the stable sort leaves ties in it either way round
+        position = self._positions.get(listing.category)
+        if position is None:
+            position = self._positions[listing.category] = {
+                id(item): number for number, item in
+                enumerate(self._category(listing.category))}
+        parts.sort(key=lambda item: position[id(item)])
+        if listing.sort is None:
+            return parts
+        keyed = [item for item in parts if _key_of(item, listing.sort) is not None]
+        keyed.sort(key=lambda item: _key_of(item, listing.sort), reverse=descending)
+        return keyed + [item for item in parts if _key_of(item, listing.sort) is None]
+
+def _types_of(category: str) -> List[str]:
+    """The part types a category lists."""
+    return [part_type for part_type in part_types if category in ("all", part_type.lower())]
+
+def _within(value, low: Optional[int], high: Optional[int]) -> bool:
+    """Whether a key is present and within low..high."""
+    return value is not None and (low is None or value >= low) and \
+        (high is None or value <= high)
+
+class _Joined:
+    """The sorted parts then the parts lacking the key, sliced without copying either."""
+    def __init__(self, items: List, missing: List):
+        self.items = items
+        self.missing = missing
+
+    def __len__(self) -> int:
+        return len(self.items) + len(self.missing)
+
+    def __getitem__(self, window: slice) -> list:
+        start, stop, _ = window.indices(len(self))
+        page = self.items[start:min(stop, len(self.items))]
+        if stop > len(self.items):
+            page.extend(self.missing[max(0, start - len(self.items)):stop - len(self.items)])
+        return page
+
+class _Filtered:
+    """
+    The parts of an order that are in a set, in that order. A page walks the order only as
+    far as the page's last part.
+    """
+    def __init__(self, order: _Order, members: Set[int], descending: bool):
+        self.order = order
+        self.members = members
+        self.descending = descending
+
+    def __len__(self) -> int:
+        return len(self.members)
+
+    def __getitem__(self, window: slice) -> list:
+        start, stop, _ = window.indices(len(self))
+        walked = chain(self.order.descending if self.descending else self.order.items,
+                       self.order.missing)
+        page, seen = [], 0
+        for item in walked:
+            if seen >= stop:
+                break
+            if id(item) in self.members:
+                if seen >= start:
+                    page.append(item)
+                seen += 1
+        return page
+
+def _part_line(item, sort: Optional[str]) -> str:
+    """One part of a listing, with the value it is sorted by unless that is shown anyway."""
+    line = f"    {item.name} ({item.item_id.lower()})    ${item.price:,}.00"
+    if sort not in (None, "price", "name"):
+        value = getattr(item, sort, None)
+        line += f"    {sort}: {'-' if value is None else value}"
+    return line
+
+def print_listing(listing: ListingQuery, page: dict):
+    """
+    Prints one page of a listing: grouped under the part types in catalog order, or under
+    one heading naming the order when sorted.
+
+    Args:
+        listing (ListingQuery): The query the page was read for.
+        page (dict): The page, as returned by ListingIndex.query.
+    """
+    if listing.sort is not None:
+        direction = "descending" if listing.descending else "ascending"
+        print(f"{listing.category.upper()} by {listing.sort} ({direction})")
+    part_type = None
+    for item in page["items"]:
+        if listing.sort is None and item.item_type != part_type:
+            part_type = item.item_type
+            print(part_type.upper())
+        print(_part_line(item, listing.sort))
+    if not page["items"]:
+        print("No parts match.")
+    print(f"\nPage {page['page']} of {page['pages']} ({page['total']:,} parts)")
+
+def list_parts(inventory_data, listing_index: Optional[ListingIndex] = None):
+    """
+    Displays a list of parts from the inventory based on user selection.
+
+    Args:
+        inventory_data (object): An object containing the inventory, which 
+        holds the list of parts and their details.
+        listing_index (ListingIndex, optional): The sorted orders to read the listing from,
+        shared between listings; a new one is made when omitted.
+
+    The function:
+    1. Clears the screen and prints the categories.
+    2. Prompts the user for a category, optionally followed by an order, ranges and a page
+       (e.g. "gpu sort price desc price 100..400").
+    3. Displays the listing one page at a time, moving to the next or previous page on
+       request.
+    """
+    listing_index = listing_index or ListingIndex(inventory_data)
+    clear_screen()
+    print_categories()
+    print("\nFrom the provided categories what would you like to list? ")
+    print(f"Sort by {', '.join(SORT_KEYS)} or keep a range, e.g. "
+          "'gpu sort price desc price 100..400' or 'ram capacity >= 32'.")
+    try:
+        listing = parse_listing(input("Option: "))
+    except ValueError as error:
+        print(error)
+        return
+
+    while True:
+        page = listing_index.query(listing)
+        clear_screen()
+        print_listing(listing, page)
+        if page["pages"] == 1:
+            return
+        choice = input("\n[n]ext page, [p]revious page, or Enter to go back: ").strip().lower()
+        if choice == "n":
+            listing.page = min(page["page"] + 1, page["pages"])
+        elif choice == "p":
+            listing.page = max(page["page"] - 1, 1)
+        else:
+            return
@@ -0,0 +1,341 @@
+"""
+loader.py
+
+Streaming loader for inventory files of the form {"inventory": [{"item": {...}}, ...]}.
+
+Rather than decoding the whole document with `json.load` and then converting it, the file
+is read in fixed-size chunks and each entry of the "inventory" array is decoded on its own,
+turned into an Item and handed to the Inventory before the next entry is read. Peak memory
+is therefore one read buffer plus one entry on top of the finished Inventory.
+
+Classes:
+- InventoryFormatError: Raised when the file is not valid inventory JSON. Carries the byte
+  offset at which the problem was found.
+
+Functions:
+- iter_inventory_entries(file_object, chunk_size): Yields (byte_offset, entry) for every entry
+  of the "inventory" array.
+- iter_inventory_items(file_object, chunk_size): Yields (byte_offset, Item), reporting and
+  skipping entries that cannot be turned into an Item.
+- load_inventory_file(inventory_file, inventory): Streams a file into an Inventory.
+- resolve_inventory_files(inventory_path): Expands a file, directory or glob into shard files.
+- load_inventory_shards(shard_files, inventory, max_workers): Parses shards in a process pool
+  and merges them into one Inventory, reporting ID conflicts between shards.
+
+Acknowledged Pylint Standard Errors:
+src\\loader.py:36:0: E0401: Unable to import 'src.inventory' (import-error)
+"""
+import codecs
+import glob
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+from src.inventory import Inventory, Item, create_item # pylint: disable=import-error
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+# Decode errors this close to the end of the buffer may just be a value (or a literal such
+# as "true") cut off by the chunk boundary, so more data is read before giving up.
+_TRUNCATION_MARGIN = 16
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+_DECODER = json.JSONDecoder()
+
+class InventoryFormatError(ValueError):
+    """
+    Raised when an inventory file cannot be decoded.
+
+    Attributes:
+        message (str): Description of the problem.
+        offset (int): Byte offset into the file where the problem was detected.
+        source (str): The file the problem was found in, when known.
+    """
+    def __init__(self, message: str, offset: int, source: Optional[str] = None):
+        location = f"{source}: " if source else ""
+        super().__init__(f"{location}{message} (byte offset {offset})")
+        self.message = message
+        self.offset = offset
+        self.source = source
+
+    def __reduce__(self):
+        # Keeps the error picklable so it can cross a process pool boundary.
+        return (self.__class__, (self.message, self.offset, self.source))
+
+class _ChunkReader:
+    """
+    Incrementally decodes a binary file into a text buffer and tracks byte offsets.
+
+    `pos` indexes into `buffer`; `offset` is the byte offset in the file that corresponds
+    to `pos`. Consumed text is dropped from the buffer whenever more data is read.
+    """
+    def __init__(self, file_object, chunk_size: int):
+        self.file_object = file_object
+        self.chunk_size = chunk_size
+        self.decoder = codecs.getincrementaldecoder('utf-8')()
+        self.buffer = ""
+        self.pos = 0
+        self.offset = 0
+        self.eof = False
+
+    def read_more(self) -> bool:
+        """Appends the next chunk to the buffer. Returns False once the file is exhausted."""
+        if self.eof:
+            return False
+        chunk = self.file_object.read(self.chunk_size)
+        if isinstance(chunk, str):
+            chunk = chunk.encode('utf-8')
+        self.eof = not chunk
+        self.buffer = self.buffer[self.pos:] + self.decoder.decode(chunk, final=self.eof)
+        self.pos = 0
+        return not self.eof or bool(self.buffer)
+
+    def advance(self, new_pos: int):
+        """Moves `pos` forward, keeping the byte offset in step."""
+        consumed = self.buffer[self.pos:new_pos]
+        self.offset += len(consumed) if consumed.isascii() else len(consumed.encode('utf-8'))
+        self.pos = new_pos
+
+    def peek(self) -> str:
+        """Skips whitespace and returns the next character, or "" at end of file."""
+        while True:
+            self.advance(_WHITESPACE.match(self.buffer, self.pos).end())
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.read_more():
+                return ""
+
+    def expect(self, characters: str) -> str:
+        """Consumes the next non-whitespace character, which must be one of `characters`."""
+        character = self.peek()
+        if not character or character not in characters:
+            found = repr(character) if character else "end of file"
+            raise InventoryFormatError(
+                f"Expecting one of {', '.join(repr(c) for c in characters)}, found {found}",
+                self.offset
+            )
+        self.advance(self.pos + 1)
+        return character
+
+    def decode_value(self):
+        """
+        Decodes one complete JSON value starting at the next non-whitespace character,
+        reading further chunks while the value is still incomplete.
+        """
+        self.peek()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError as error:
+                if self._is_truncated(error) and self.read_more():
+                    continue
+                error_offset = self.offset + len(
+                    self.buffer[self.pos:error.pos].encode('utf-8')
+                )
+                raise InventoryFormatError(error.msg, error_offset) from error
+
+            # A number that ends exactly at the end of the buffer may continue in the
+            # next chunk.
+            if end == len(self.buffer) and not self.eof and isinstance(value, (int, float)):
+                self.read_more()
+                continue
+
+            self.advance(end)
+            return value
+
+    def _is_truncated(self, error: json.JSONDecodeError) -> bool:
+        """Tells whether a decode error may only be caused by the buffer ending early."""
+        if self.eof:
+            return False
+        near_end = error.pos >= len(self.buffer) - _TRUNCATION_MARGIN
+        return near_end or error.msg.startswith("Unterminated")
+
+def iter_inventory_entries(file_object, chunk_size: int = DEFAULT_CHUNK_SIZE):
+    """
+    Yields every entry of the top-level "inventory" array without loading the whole file.
+
+    Args:
+        file_object: A file opened in binary mode.
+        chunk_size (int): Number of bytes read from the file at a time.
+
+    Yields:
+        tuple: (byte_offset, entry) where `entry` is the decoded array element.
+
+    Raises:
+        InventoryFormatError: If the document is not valid JSON or has no "inventory" array.
+    """
+    reader = _ChunkReader(file_object, chunk_size)
+    found_inventory = False
+
+    reader.expect("{")
+    if reader.peek() == "}":
+        reader.advance(reader.pos + 1)
+    else:
+        while True:
+            reader.peek()
+            key_offset = reader.offset
+            key = reader.decode_value()
+            if not isinstance(key, str):
+                raise InventoryFormatError("Expecting property name", key_offset)
+            reader.expect(":")
+
+            if key == "inventory":
+                found_inventory = True
+                reader.expect("[")
+                if reader.peek() == "]":
+                    reader.advance(reader.pos + 1)
+                else:
+                    while True:
+                        reader.peek()
+                        entry_offset = reader.offset
+                        yield entry_offset, reader.decode_value()
+                        if reader.expect(",]") == "]":
+                            break
+            else:
+                reader.decode_value()
+
+            if reader.expect(",}") == "}":
+                break
+
+    if reader.peek():
+        raise InventoryFormatError("Extra data after the inventory document", reader.offset)
+    if not found_inventory:
+        raise InventoryFormatError("Missing \"inventory\" array", reader.offset)
+
+def iter_inventory_items(file_object, chunk_size: int = DEFAULT_CHUNK_SIZE):
+    """
+    Yields an Item for every well-formed entry of the inventory file.
+
+    Entries that decode as JSON but do not describe a valid item (missing "item" key,
+    missing fields, unknown type) are reported with their byte offset and skipped.
+
+    Args:
+        file_object: A file opened in binary mode.
+        chunk_size (int): Number of bytes read from the file at a time.
+
+    Yields:
+        tuple: (byte_offset, Item)
+    """
+    for entry_offset, entry in iter_inventory_entries(file_object, chunk_size):
+        try:
+            item = create_item(entry["item"])
+        except (KeyError, TypeError, ValueError) as error:
+            print(f"Warning: Skipped malformed entry at byte {entry_offset}: "
+                  f"{type(error).__name__}: {error}")
+            continue
+        yield entry_offset, item
+
+def load_inventory_file(inventory_file: str, inventory=None,
+                        chunk_size: int = DEFAULT_CHUNK_SIZE):
+    """
+    Streams an inventory file into an Inventory one item at a time.
+
+    Args:
+        inventory_file (str): Path to the JSON inventory file.
+        inventory (Inventory, optional): The inventory to fill. A new Inventory is created
+            when omitted.
+        chunk_size (int): Number of bytes read from the file at a time.
+
+    Returns:
+        Inventory: The populated inventory.
+
+    Raises:
+        InventoryFormatError: If the file is not valid inventory JSON.
+        OSError: If the file cannot be opened or read.
+    """
+    if inventory is None:
+        inventory = Inventory()
+
+    with open(inventory_file, 'rb') as file:
+        for entry_offset, item in iter_inventory_items(file, chunk_size):
+            try:
+                inventory.add_item(item)
+            except ValueError:
+                print(f"Warning: Skipped duplicate item ID {item.item_id} "
+                      f"at byte {entry_offset}.")
+
+    return inventory
+
+def resolve_inventory_files(inventory_path: str) -> List[str]:
+    """
+    Expands an inventory path into the list of files to load.
+
+    Args:
+        inventory_path (str): A single file, a directory of `.json` shards, or a glob
+            pattern such as `exports/vendor_*.json`.
+
+    Returns:
+        List[str]: The matching files in sorted order. A plain file path is returned as is.
+    """
+    if os.path.isdir(inventory_path):
+        return sorted(glob.glob(os.path.join(inventory_path, "*.json")))
+    if glob.has_magic(inventory_path):
+        return sorted(glob.glob(inventory_path))
+    return [inventory_path]
+
+def _parse_shard(shard_file: str) -> List[Item]:
+    """
+    Process-pool worker: parses one shard into Items.
+
+    Raises:
+        InventoryFormatError: Tagged with the shard's path.
+    """
+    try:
+        with open(shard_file, 'rb') as file:
+            return [item for _, item in iter_inventory_items(file)]
+    except InventoryFormatError as error:
+        raise InventoryFormatError(error.message, error.offset, shard_file) from None
+
+def load_inventory_shards(shard_files: List[str], inventory=None,
+                          max_workers: Optional[int] = None,
+                          item_sources: Optional[Dict[str, str]] = None):
+    """
+    Parses inventory shards in parallel and merges them into one Inventory.
+
+    Every shard is parsed into Items in its own worker process; the parent only merges the
+    results, in shard order, so the ID index and secondary indexes are built exactly once.
+    When two shards define the same ID (ignoring case) the first shard wins and every
+    conflict is reported with both shard names.
+
+    Args:
+        shard_files (List[str]): The shard files to load.
+        inventory (Inventory, optional): The inventory to fill. A new Inventory is created
+            when omitted.
+        max_workers (int, optional): Size of the process pool. Defaults to the CPU count.
+        item_sources (dict, optional): When given, filled with the shard each loaded item
+            came from, keyed by lower-cased item ID.
+
+    Returns:
+        Inventory: The merged inventory.
+
+    Raises:
+        InventoryFormatError: If any shard is not valid inventory JSON.
+        OSError: If a shard cannot be opened or read.
+    """
+    if inventory is None:
+        inventory = Inventory()
+    if item_sources is None:
+        item_sources = {}
+    if len(shard_files) == 1:
+        load_inventory_file(shard_files[0], inventory)
+        item_sources.update((item.item_id.lower(), shard_files[0]) for item in inventory.items)
+        return inventory
+
+    conflicts = []
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        for shard_file, items in zip(shard_files, executor.map(_parse_shard, shard_files)):
+            for item in items:
+                item_key = item.item_id.lower()
+                if item_key in item_sources:
+                    conflicts.append((item.item_id, item_sources[item_key], shard_file))
+                    continue
+                inventory.add_item(item)
+                item_sources[item_key] = shard_file
+
+    for item_id, first_shard, conflicting_shard in conflicts:
+        print(f"Warning: Item ID {item_id} in {conflicting_shard} conflicts with "
+              f"{first_shard}; keeping the first definition.")
+
+    return inventory
@@ -5,10 +5,13 @@ Menu system for storefront.py
 import sys
 
 from src.utils import clear_screen # pylint: disable=import-error
-from src.inventory import list_parts, get_details # pylint: disable=import-error
+from src.inventory import get_details # pylint: disable=import-error
 from src.compatibility import Compatibility # pylint: disable=import-error
 from src.build import Build # pylint: disable=import-error
 from src.cart import Cart # pylint: disable=import-error
+from src.listing import ListingIndex, list_parts # pylint: disable=import-error
+from src.search import SearchIndex # pylint: disable=import-error
+from src.stock import StockHold, StockLedger # pylint: disable=import-error
 from src.user import User # pylint: disable=import-error
 
 def default():
@@ -19,7 +22,7 @@ def default():
 def help_option():
     """Display the help options to the user."""
     print("""
-          - list: Get a list of parts by category.
+          - list: Get a list of parts by category, sorted or within price/capacity ranges.
           - details: Get the details of an individial item by providing the item ID.
           - compatibility: Check the compatibility of two or more parts.
           - build: Select parts to create your own custom PC.
@@ -53,11 +56,28 @@ def display_menu(user_name, budget):
     print("--------------------------------------------------------------------------")
     print("11. Help    12. Exit")
 
-def main_menu(inventory_data):
+def report_reload(diff):
+    """Tells the user what changed after the inventory was reloaded."""
+    print(f"Inventory updated: {diff.summary()}.")
+    for message in diff.messages:
+        print(f"  {message}")
+
+def main_menu(inventory_data, watcher=None, stock_ledger=None):
     """
     Displays the main menu and handles user input for selecting various options related to 
     inventory, compatibility checks, build configurations, cart management, and user 
     settings. Loops continuously until the user opts to exit the program.
+
+    When an InventoryWatcher is given, changed inventory files are picked up before the
+    menu is shown, the current build and cart are re-priced against the new inventory and
+    the cached compatibility verdicts of changed parts are dropped.
+
+    The parts in the build and cart are held in the StockLedger given (a new one when
+    omitted) until checkout takes them out of stock.
+
+    The details, build and cart prompts share one SearchIndex, which offers the closest
+    parts when a part ID typed is not in the inventory, and listings share one
+    ListingIndex, which keeps each category sorted by every key between listings.
     """
     user_object = User()
     user_object.update_name()
@@ -65,20 +85,29 @@ def main_menu(inventory_data):
     clear_screen()
 
     compatibility_object = Compatibility(inventory_data)
-    cart_object = Cart(user_object, inventory_data)
-    build_object = Build(user_object, cart_object, inventory_data, compatibility_object)
+    search_index = SearchIndex(inventory_data)
+    listing_index = ListingIndex(inventory_data)
+    stock_hold = StockHold(stock_ledger if stock_ledger is not None else StockLedger())
+    cart_object = Cart(user_object, inventory_data, stock_hold, search_index)
+    build_object = Build(user_object, cart_object, inventory_data, compatibility_object,
+                         stock_hold, search_index)
 
     while True:
+        if watcher is not None:
+            diff = watcher.reload(build_object, cart_object, compatibility_object,
+                                  search_index)
+            if diff:
+                report_reload(diff)
         display_menu(user_object.get_name(), user_object.get_budget())
         user_input = input("\nSelect an option: ").strip().lower()
 
         # Dictionary of available command options
         menu_dict: dict = {
-            "1": lambda: list_parts(inventory_data),
-            "list": lambda: list_parts(inventory_data),
+            "1": lambda: list_parts(inventory_data, listing_index),
+            "list": lambda: list_parts(inventory_data, listing_index),
 
-            "2": lambda: get_details(inventory_data),
-            "detail": lambda: get_details(inventory_data),
+            "2": lambda: get_details(inventory_data, search_index=search_index),
+            "detail": lambda: get_details(inventory_data, search_index=search_index),
 
             "3": compatibility_object.compatibility_check,
             "compatibility": compatibility_object.compatibility_check,
@@ -0,0 +1,228 @@
+"""
+pareto.py
+
+The builds that give the most for the money: the Pareto frontier over price (lower is
+better), total RAM capacity, total storage capacity and PSU headroom (`power_supplied` minus
+the summed `power_draw`, higher is better). A build is on the frontier when no other build is
+at least as good on all four and better on one.
+
+The frontier is built stage by stage from the choices of `BuildSpace`. Motherboards are
+grouped by socket class and RAM slots, since the later choices only depend on those; each
+group is extended with a CPU, then RAM, Storage, a GPU and finally a PSU. Every stage adds
+the same price, capacity and power draw to each partial build, so a partial build that is
+dominated on (price, RAM, storage, power draw) can never complete into a non-dominated build
+and is dropped before the next stage. Partial builds above the budget are dropped too.
+
+Because a GPU adds price and power draw but none of the four objectives, the "no GPU" choice
+dominates every GPU and frontier builds never contain one.
+
+Classes:
+- ParetoFrontier: The frontier of one inventory, recomputed when the inventory changes.
+
+Functions:
+- pareto_filter(entries): Keeps the non-dominated entries of a list.
+- pareto_builds(inventory, budget, space): Returns the non-dominated builds within a budget.
+
+Acknowledged Pylint Standard Errors:
+src\\pareto.py:31:0: E0401: Unable to import 'src.buildspace' (import-error)
+"""
+from typing import Dict, List, Optional, Tuple
+
+from src.buildspace import BuildSpace, PartChoice # pylint: disable=import-error
+
+# A partial build: its objective vector (every component minimised) and its choices.
+_Entry = Tuple[tuple, list]
+
+class _PrefixMinimum:
+    """
+    Two-dimensional Fenwick tree of minimums: `lower(row, column)` is the smallest value
+    stored at any position with a row and column no greater than the given ones.
+    """
+    def __init__(self, rows: int, columns: int):
+        self.columns = columns
+        self.tree = [[float("inf")] * (columns + 1) for _ in range(rows + 1)]
+
+    def store(self, row: int, column: int, value):
+        """Lowers the value at a position (rows and columns count from 1)."""
+        while row < len(self.tree):
+            tree_row = self.tree[row]
+            position = column
+            while position <= self.columns:
+                if value < tree_row[position]:
+                    tree_row[position] = value
+                position += position & -position
+            row += row & -row
+
+    def lower(self, row: int, column: int):
+        """Returns the smallest value stored at or before a position."""
+        smallest = float("inf")
+        while row > 0:
+            tree_row = self.tree[row]
+            position = column
+            while position > 0:
+                if tree_row[position] < smallest:
+                    smallest = tree_row[position]
+                position -= position & -position
+            row -= row & -row
+        return smallest
+
+def pareto_filter(entries: List[_Entry]) -> List[_Entry]:
+    """
+    Keeps the entries whose vector no other entry dominates. Every component of the vectors
+    is minimised; of several entries with the same vector only the first is kept.
+
+    Args:
+        entries (list): (vector, payload) pairs; vectors have one to four components.
+
+    Returns:
+        list: The non-dominated entries, in lexicographic order of their vectors.
+
+    Raises:
+        ValueError: If the vectors have more than four components.
+    """
+    # In lexicographic order no entry can be dominated by a later one, and every earlier
+    # entry is no worse on the first component. An entry is therefore dominated exactly when
+    # some kept entry is no worse on the middle components and on the last one, which the
+    # tree answers with the smallest last component kept at or below the middle components.
+    ordered = sorted(entries, key=lambda entry: entry[0])
+    if not ordered:
+        return []
+    if len(ordered[0][0]) > 4:
+        raise ValueError("Pareto vectors may have at most four components")
+
+    def middle(vector):
+        inner = tuple(vector[1:-1])
+        return inner + (0,) * (2 - len(inner))
+
+    rows = {value: rank for rank, value in
+            enumerate(sorted({middle(vector)[0] for vector, _ in ordered}), start=1)}
+    columns = {value: rank for rank, value in
+               enumerate(sorted({middle(vector)[1] for vector, _ in ordered}), start=1)}
+    minimums = _PrefixMinimum(len(rows), len(columns))
+
+    kept: List[_Entry] = []
+    for vector, payload in ordered:
+        first, second = middle(vector)
+        row, column = rows[first], columns[second]
+        if minimums.lower(row, column) <= vector[-1]:
+            continue
+        minimums.store(row, column, vector[-1])
+        kept.append((vector, payload))
+    return kept
+
+def _extend(entries: List[_Entry], choices: List[PartChoice], budget: Optional[int],
+            objective: Optional[str] = None) -> List[_Entry]:
+    """
+    Adds one choice to every partial build and drops the dominated results.
+
+    The partial vectors are (price, -RAM capacity, -storage capacity, power draw); the
+    capacity of `choices` counts towards `objective` ("RAM" or "Storage").
+    """
+    extended = []
+    for (price, ram, storage, draw), picked in entries:
+        for choice in choices:
+            new_price = price + choice.price
+            if budget is not None and new_price > budget:
+                break
+            extended.append(((new_price,
+                              ram - choice.capacity if objective == "RAM" else ram,
+                              storage - choice.capacity if objective == "Storage" else storage,
+                              draw + choice.power_draw), picked + [choice]))
+    return pareto_filter(extended)
+
+def _choice_filter(choices: List[PartChoice], objective: Optional[str] = None) \
+        -> List[PartChoice]:
+    """The non-dominated choices of one category, cheapest first."""
+    return sorted((picked[0] for _, picked in pareto_filter(
+        [((choice.price, -choice.capacity if objective else 0, choice.power_draw), [choice])
+         for choice in choices])), key=lambda choice: choice.price)
+
+def pareto_builds(inventory, budget: Optional[int] = None,
+                  space: Optional[BuildSpace] = None) -> List[dict]:
+    """
+    Returns every non-dominated complete build within the budget, cheapest first.
+
+    Args:
+        inventory: Any inventory backend.
+        budget (int, optional): The most a build may cost; no limit if None.
+        space (BuildSpace, optional): A space already built for the inventory.
+
+    Returns:
+        List[dict]: The builds as described by `BuildSpace.describe`, plus "headroom".
+    """
+    space = space or BuildSpace(inventory)
+    if space.is_empty():
+        return []
+
+    groups: Dict[tuple, List[PartChoice]] = {}
+    for board in space.motherboards:
+        if space.cpus_for(board):
+            key = (space.board_class(board), int(board.item.ram_slots))
+            groups.setdefault(key, []).append(board)
+
+    storage = _choice_filter(space.storage, "Storage")
+    gpus = _choice_filter(space.gpus)
+    # A PSU that costs more and supplies less than another never helps.
+    psus = sorted((picked[0] for _, picked in pareto_filter(
+        [((choice.price, -int(choice.item.power_supplied)), [choice])
+         for choice in space.psus])), key=lambda choice: choice.price)
+
+    complete: List[_Entry] = []
+    for boards in groups.values():
+        entries = [((0, 0, 0, 0), [])]
+        entries = _extend(entries, _choice_filter(boards), budget)
+        entries = _extend(entries, _choice_filter(space.cpus_for(boards[0])), budget)
+        entries = _extend(entries, _choice_filter(space.rams_for(boards[0]), "RAM"), budget,
+                          "RAM")
+        entries = _extend(entries, storage, budget, "Storage")
+        entries = _extend(entries, gpus, budget)
+        for (price, ram, storage_capacity, draw), picked in entries:
+            for psu in psus:
+                supplied = int(psu.item.power_supplied)
+                if budget is not None and price + psu.price > budget:
+                    break
+                if supplied >= draw:
+                    complete.append(((price + psu.price, ram, storage_capacity,
+                                      draw - supplied), picked + [psu]))
+
+    builds = []
+    for vector, picked in sorted(pareto_filter(complete), key=lambda entry: entry[0]):
+        result = BuildSpace.describe(picked)
+        result["headroom"] = -vector[3]
+        builds.append(result)
+    return builds
+
+class ParetoFrontier:
+    """
+    The Pareto frontier of one inventory, kept until the inventory's version changes.
+
+    The frontier is computed without a budget: a build within a budget that is dominated is
+    dominated by a build that costs no more, so the frontier under any budget is the cheap
+    end of the full one.
+
+    Attributes:
+        inventory_object: The inventory the frontier is computed for.
+        built_version (int): The inventory version the frontier was computed from.
+    """
+    def __init__(self, inventory_object):
+        self.inventory_object = inventory_object
+        self.built_version: Optional[int] = None
+        self._builds: List[dict] = []
+
+    def refresh(self):
+        """Recomputes the frontier if the inventory changed since it was computed."""
+        version = getattr(self.inventory_object, "version", None)
+        if version is not None and version == self.built_version:
+            return
+        self._builds = pareto_builds(self.inventory_object)
+        self.built_version = version
+
+    def builds(self, budget: Optional[int] = None) -> List[dict]:
+        """
+        Returns the non-dominated builds within the budget, cheapest first.
+
+        Args:
+            budget (int, optional): The most a build may cost; no limit if None.
+        """
+        self.refresh()
+        return [build for build in self._builds if budget is None or build["price"] <= budget]
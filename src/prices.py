@@ -0,0 +1,139 @@
+"""
+prices.py
+
+Price updates from a feed, applied to the inventory in one pass and carried only to the
+builds and carts that hold the re-priced parts.
+
+`apply_price_updates` takes a batch of (item ID, new price) pairs and replaces every
+re-priced part with a copy carrying its new price, all inside one `updating` block: a
+VersionedInventory publishes the batch as a single version and a DatabaseInventory commits
+it as a single transaction. The result is an `InventoryDiff`, the same description of
+changes a hot reload produces, so builds, carts and caches take it the way they take a
+reload.
+
+The totals of builds and carts are sums of the prices the parts had when they were added.
+`PriceIndex` is a reverse index from every part to the owners (builds, carts or whole
+sessions) that hold it. Owners report what they hold after they change, and a batch of price
+changes looks up only the owners of the changed parts, so an update costs in proportion to
+the parts it changes and the owners holding them, not to the number of open sessions.
+
+Classes:
+- PriceIndex: Which owners hold each part.
+
+Functions:
+- apply_price_updates(inventory, updates): Applies a batch of new prices in one pass.
+
+Acknowledged Pylint Standard Errors:
+src\\prices.py:34:0: E0401: Unable to import 'src.reload' (import-error)
+src\\prices.py:35:0: E0401: Unable to import 'src.versioned' (import-error)
+"""
+import copy
+import threading
+from typing import Dict, Hashable, Iterable, List, Tuple
+
+from src.reload import InventoryDiff # pylint: disable=import-error
+from src.versioned import updating # pylint: disable=import-error
+
+def apply_price_updates(inventory, updates: Iterable[tuple]) -> Tuple[InventoryDiff, List[str]]:
+    """
+    Applies a batch of new prices to an inventory in one pass.
+
+    Args:
+        inventory: Any inventory backend.
+        updates (iterable): (item ID, new price) pairs. IDs are matched without regard to
+            case, and a later price for the same ID wins.
+
+    Returns:
+        tuple: The `InventoryDiff` of the re-priced parts (parts whose price is unchanged are
+        left out) and the IDs that are not in the inventory.
+
+    Raises:
+        ValueError: If a price is not a whole number of dollars (a boolean is not one) or is
+            negative; nothing is changed.
+    """
+    prices: Dict[str, int] = {}
+    for item_id, price in updates:
+        try:
+            new_price = int(price)
+        except (TypeError, ValueError) as error:
+            raise ValueError(f"Invalid price for {item_id}: {price!r}") from error
+        # True would otherwise pass as a price of $1
+        if new_price < 0 or isinstance(price, bool) or (
+                new_price != price and not isinstance(price, str)):
+            raise ValueError(f"Invalid price for {item_id}: {price!r}")
+        prices[str(item_id).strip().lower()] = new_price
+
+    diff = InventoryDiff()
+    unknown = []
+    with updating(inventory) as writer:
+        for item_key, price in prices.items():
+            item = writer.get_item(item_key)
+            if item is None:
+                unknown.append(item_key)
+            elif int(item.price) != price:
+                new_item = copy.copy(item)
+                new_item.price = price
+                writer.replace_item(new_item)
+                diff.changed.append((item, new_item))
+    return diff, unknown
+
+class PriceIndex:
+    """
+    Which owners hold each part: a reverse index from lower-cased item IDs to the builds,
+    carts or sessions that contain them.
+
+    Owners are any hashable value, such as a session ID. An owner reports the parts it holds
+    with `track` after they change; only the parts that came or went are re-indexed.
+    """
+    def __init__(self):
+        # Item key -> owners holding it, and owner -> the item keys it holds
+        self._owners: Dict[str, set] = {}
+        self._parts: Dict[Hashable, frozenset] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._parts)
+
+    def track(self, owner: Hashable, item_keys: Iterable[str]):
+        """
+        Records the parts an owner holds now.
+
+        Args:
+            owner: The owner.
+            item_keys (iterable): The lower-cased IDs of its parts.
+        """
+        parts = frozenset(item_keys)
+        with self._lock:
+            previous = self._parts.get(owner, frozenset())
+            if parts == previous:
+                return
+            for item_key in previous - parts:
+                owners = self._owners[item_key]
+                owners.discard(owner)
+                if not owners:
+                    del self._owners[item_key]
+            for item_key in parts - previous:
+                self._owners.setdefault(item_key, set()).add(owner)
+            if parts:
+                self._parts[owner] = parts
+            else:
+                del self._parts[owner]
+
+    def forget(self, owner: Hashable):
+        """Drops an owner from the index."""
+        self.track(owner, ())
+
+    def owners_of(self, diff: InventoryDiff) -> set:
+        """
+        Returns the owners holding a part the diff changed or removed.
+
+        Args:
+            diff (InventoryDiff): The applied inventory changes.
+        """
+        item_keys = [old.item_id.lower() for old, _ in diff.changed]
+        item_keys.extend(item.item_id.lower() for item in diff.removed)
+        owners = set()
+        with self._lock:
+            for item_key in item_keys:
+                owners.update(self._owners.get(item_key, ()))
+        return owners
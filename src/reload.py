@@ -0,0 +1,267 @@
+"""
+reload.py
+
+Hot reload of the inventory while the storefront is running.
+
+`InventoryWatcher` remembers the modification time and size of every inventory file (or
+shard) and which items each one supplied. `poll()` only stats the files; when one has
+changed it alone is re-parsed and compared with the items it supplied before, producing an
+`InventoryDiff` of added, removed and changed items. `apply_diff` then applies just those
+changes to the inventory and its indexes, and open builds and carts are re-priced and
+re-validated from the same diff, so nobody's session is lost.
+
+For a catalog split into shards a change to a few items only re-reads the shard that holds
+them. A single-file catalog is re-scanned, but the inventory is still updated in place
+rather than rebuilt.
+
+Classes:
+- InventoryDiff: The added, removed and changed items between two versions of the inventory.
+- InventoryWatcher: Detects changed inventory files and computes the diff.
+
+Functions:
+- refresh_parts(parts, diff, location): Re-points a build's or cart's parts at the new items.
+- apply_diff(inventory, diff): Applies a diff to any inventory backend.
+
+Acknowledged Pylint Standard Errors:
+src\\reload.py:32:0: E0401: Unable to import 'src.loader' (import-error)
+src\\reload.py:33:0: E0401: Unable to import 'src.versioned' (import-error)
+"""
+import os
+from typing import Dict, List, Optional, Tuple
+
+from src.loader import iter_inventory_items, resolve_inventory_files # pylint: disable=import-error
+from src.versioned import updating # pylint: disable=import-error
+
+class InventoryDiff:
+    """
+    The differences between two versions of the inventory.
+
+    Attributes:
+        added (List[Item]): Items that did not exist before.
+        removed (List[Item]): Items that no longer exist.
+        changed (List[tuple]): (old_item, new_item) pairs for items whose fields changed.
+        messages (List[str]): Notices from the builds and carts the diff was applied to.
+    """
+    def __init__(self):
+        self.added = []
+        self.removed = []
+        self.changed: List[Tuple] = []
+        self.messages: List[str] = []
+        self._replacements = None
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.changed)
+
+    def summary(self) -> str:
+        """Returns a one-line description of the diff."""
+        return (f"{len(self.added)} added, {len(self.removed)} removed, "
+                f"{len(self.changed)} changed")
+
+    def resolve(self, item):
+        """
+        Maps an item held by a build or cart onto the new inventory.
+
+        Args:
+            item (Item): An item from before the diff was applied.
+
+        Returns:
+            Item: The new version of a changed item, None for a removed item, or the item
+            itself when it was not affected.
+        """
+        if self._replacements is None:
+            self._replacements = {old.item_id.lower(): new for old, new in self.changed}
+            self._replacements.update((old.item_id.lower(), None) for old in self.removed)
+        return self._replacements.get(item.item_id.lower(), item)
+
+def refresh_parts(parts: dict, diff: InventoryDiff, location: str) -> List[str]:
+    """
+    Swaps the items of a build-style parts dictionary (single items or lists of items per
+    part type) for their new versions, dropping removed items.
+
+    Args:
+        parts (dict): The parts to refresh, updated in place.
+        diff (InventoryDiff): The applied inventory changes.
+        location (str): Where the parts live ("build", "cart"), used in the notices.
+
+    Returns:
+        List[str]: A notice for every removed or re-priced item.
+    """
+    messages = []
+
+    def refresh(item):
+        new_item = diff.resolve(item)
+        if new_item is None:
+            messages.append(f"{item.name} ({item.item_id.lower()}) is no longer available and "
+                            f"was removed from your {location}.")
+        elif new_item.price != item.price:
+            messages.append(f"The price of {item.name} ({item.item_id.lower()}) in your "
+                            f"{location} changed from ${item.price:,}.00 to "
+                            f"${new_item.price:,}.00.")
+        return new_item
+
+    for part_type, part in parts.items():
+        if isinstance(part, list):
+            part[:] = [new_item for new_item in map(refresh, part) if new_item is not None]
+        elif part is not None:
+            parts[part_type] = refresh(part)
+    return messages
+
+def apply_diff(inventory, diff: InventoryDiff):
+    """
+    Applies a diff to an inventory, updating only the affected entries of its indexes. A
+    VersionedInventory publishes the whole diff as a single new version.
+
+    Args:
+        inventory: Any inventory backend (Inventory, ColumnarInventory, SnapshotInventory,
+            VersionedInventory).
+        diff (InventoryDiff): The changes to apply.
+    """
+    with updating(inventory) as writer:
+        for item in diff.removed:
+            writer.remove_item(item.item_id)
+        for _, new_item in diff.changed:
+            writer.replace_item(new_item)
+        for item in diff.added:
+            writer.add_item(item)
+
+class InventoryWatcher:
+    """
+    Watches the inventory file(s) for changes and computes incremental diffs.
+
+    Attributes:
+        inventory_path (str): The file, directory or glob the inventory was loaded from.
+        inventory: The live inventory the diffs are computed against.
+    """
+    def __init__(self, inventory_path: str, inventory,
+                 item_sources: Optional[Dict[str, str]] = None):
+        """
+        Args:
+            inventory_path (str): The file, directory or glob the inventory was loaded from.
+            inventory: The loaded inventory.
+            item_sources (dict, optional): Lower-cased item ID -> file it was loaded from, as
+                filled by `load_inventory_shards`. When omitted every item is attributed to
+                the single inventory file, which is only worked out once that file changes
+                so that lazily loaded inventories are not read in full at startup.
+        """
+        self.inventory_path = inventory_path
+        self.inventory = inventory
+        self._file_stats: Dict[str, Tuple[int, int]] = {}
+        self._file_items: Optional[Dict[str, set]] = None
+
+        for shard_file in resolve_inventory_files(inventory_path):
+            self._file_stats[shard_file] = self._stat(shard_file)
+
+        if item_sources is not None:
+            self._file_items = {shard_file: set() for shard_file in self._file_stats}
+            for item_key, shard_file in item_sources.items():
+                self._file_items.setdefault(shard_file, set()).add(item_key)
+
+    def _items_of(self, shard_file: str) -> set:
+        """Returns the keys of the items a file supplied at the last (re)load."""
+        if self._file_items is None:
+            self._file_items = {known_file: set() for known_file in self._file_stats}
+            single_file = next(iter(self._file_stats), shard_file)
+            self._file_items[single_file] = {item.item_id.lower()
+                                             for item in self.inventory.items}
+        return self._file_items.get(shard_file, set())
+
+    @staticmethod
+    def _stat(path: str) -> Optional[Tuple[int, int]]:
+        """Returns (mtime_ns, size) for a file, or None if it no longer exists."""
+        try:
+            file_stat = os.stat(path)
+        except OSError:
+            return None
+        return (file_stat.st_mtime_ns, file_stat.st_size)
+
+    def changed_files(self) -> List[str]:
+        """Returns the files that were added, removed or modified since the last poll."""
+        current_files = set(resolve_inventory_files(self.inventory_path))
+        changed = []
+        for shard_file in sorted(current_files | set(self._file_stats)):
+            if self._stat(shard_file) != self._file_stats.get(shard_file):
+                changed.append(shard_file)
+        return changed
+
+    def poll(self) -> InventoryDiff:
+        """
+        Computes the diff caused by every changed file, without applying it.
+
+        Only files whose mtime or size changed are parsed. An item that moved from one
+        changed file to another counts as changed, not as removed and added. If a changed
+        file cannot be read or decoded it is reported and left out until it changes again.
+
+        Returns:
+            InventoryDiff: The changes; empty (falsy) when nothing changed.
+        """
+        parsed_files = {}
+        for shard_file in self.changed_files():
+            file_stat = self._stat(shard_file)
+            new_items = {}
+            if file_stat is not None:
+                try:
+                    with open(shard_file, 'rb') as file:
+                        for _, item in iter_inventory_items(file):
+                            new_items.setdefault(item.item_id.lower(), item)
+                except (OSError, ValueError) as error:
+                    print(f"Warning: Could not reload {shard_file}: {error}")
+                    self._file_stats[shard_file] = file_stat
+                    continue
+            parsed_files[shard_file] = (file_stat, new_items)
+
+        # Keys a changed file no longer supplies; they are removed unless another file
+        # picks them up below.
+        released = {}
+        for shard_file, (_, new_items) in parsed_files.items():
+            for item_key in self._items_of(shard_file) - new_items.keys():
+                old_item = self.inventory.get_item(item_key)
+                if old_item is not None:
+                    released[item_key] = old_item
+
+        diff = InventoryDiff()
+        for shard_file, (file_stat, new_items) in parsed_files.items():
+            old_keys = self._items_of(shard_file)
+            kept_keys = set()
+            for item_key, new_item in new_items.items():
+                old_item = self.inventory.get_item(item_key)
+                if item_key in old_keys or item_key in released:
+                    released.pop(item_key, None)
+                    if old_item is not None and (type(old_item) is not type(new_item)
+                                                 or vars(old_item) != vars(new_item)):
+                        diff.changed.append((old_item, new_item))
+                elif old_item is None:
+                    diff.added.append(new_item)
+                else:
+                    print(f"Warning: Item ID {new_item.item_id} in {shard_file} conflicts "
+                          f"with an item from another file; keeping the existing definition.")
+                    continue
+                kept_keys.add(item_key)
+
+            if file_stat is None:
+                self._file_stats.pop(shard_file, None)
+                self._file_items.pop(shard_file, None)
+            else:
+                self._file_stats[shard_file] = file_stat
+                self._file_items[shard_file] = kept_keys
+
+        diff.removed.extend(released.values())
+        return diff
+
+    def reload(self, *holders) -> InventoryDiff:
+        """
+        Polls for changes, applies them to the inventory, then lets every holder (a Build or
+        Cart) re-price and re-validate itself against the diff.
+
+        Args:
+            *holders: Objects with an `apply_inventory_diff(diff)` method that returns a
+                list of notices for the user.
+
+        Returns:
+            InventoryDiff: The applied changes, with the holders' notices in `messages`.
+        """
+        diff = self.poll()
+        if diff:
+            apply_diff(self.inventory, diff)
+            for holder in holders:
+                diff.messages.extend(holder.apply_inventory_diff(diff))
+        return diff
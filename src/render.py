@@ -0,0 +1,181 @@
+"""
+render.py
+
+Buffered rendering of the storefront's screens.
+
+The menus print their screens line by line and clear the terminal between them. Clearing by
+running `clear` (or `cls`) forks a shell and a process every time, and every `print` becomes
+its own write, which is slow on a remote terminal. `TerminalRenderer` replaces stdout while
+the menus run:
+
+- Everything printed is collected into the current screen instead of being written.
+- `clear` starts a new screen; nothing is sent to the terminal yet.
+- The screen is sent when stdout is flushed, which `input` does before reading a line, so a
+  whole screen, prompt included, goes out as a single write. While the renderer is installed
+  the prompt is written through it, and `input` then reads the line itself; the renderer
+  passes on the terminal's `fileno` and `isatty`, so that line is edited with readline and
+  kept in its history as usual.
+- A new screen is drawn with ANSI sequences over the previous one, rewriting only the rows
+  that changed and erasing what is left below. If the screen is wider or taller than the
+  terminal, or the rows on the terminal are not known, it is cleared and redrawn whole.
+
+When stdout is not a terminal (a pipe, a file, the tests) clearing does nothing and the
+output is written as it would be without the renderer, in order, only buffered.
+
+Classes:
+- TerminalRenderer: A text stream that renders screens to the real stdout.
+
+Functions:
+- buffered_output(stream): Installs a renderer as sys.stdout, and has `input` write its
+  prompt through it, for the duration of a block.
+"""
+import builtins
+import io
+import os
+import shutil
+import sys
+from contextlib import contextmanager
+from typing import List, Optional
+
+# ANSI sequences: cursor to the top left, erase the screen, erase to the end of the line,
+# erase below the cursor.
+HOME = "\x1b[H"
+ERASE_SCREEN = "\x1b[2J"
+ERASE_LINE = "\x1b[K"
+ERASE_BELOW = "\x1b[J"
+
+def _move_to(row: int, column: int = 0) -> str:
+    """The sequence moving the cursor to a row and column, both counted from 0."""
+    return f"\x1b[{row + 1};{column + 1}H"
+
+class TerminalRenderer(io.TextIOBase):
+    """
+    A text stream collecting screens and writing each one to the terminal in one go.
+
+    Attributes:
+        stream: The stream the screens are written to, normally the real stdout.
+        interactive (bool): Whether `stream` is a terminal; if not, output is append-only.
+    """
+    def __init__(self, stream=None, interactive: Optional[bool] = None):
+        super().__init__()
+        self.stream = stream if stream is not None else sys.__stdout__
+        if interactive is None:
+            isatty = getattr(self.stream, "isatty", None)
+            interactive = bool(isatty and isatty())
+        self.interactive = interactive
+        self._pending: List[str] = []
+        self._cleared = False
+        # The current screen as sent so far (its last line may be unfinished), and the rows
+        # the terminal shows, None where they are not known.
+        self._screen = ""
+        self._shown: List[Optional[str]] = []
+        if self.interactive and os.name == "nt":
+            # Makes the Windows console interpret ANSI sequences
+            os.system("")
+
+    def writable(self) -> bool:
+        return True
+
+    def fileno(self) -> int:
+        return self.stream.fileno()
+
+    def isatty(self) -> bool:
+        isatty = getattr(self.stream, "isatty", None)
+        return bool(isatty and isatty())
+
+    @property
+    def encoding(self):
+        return getattr(self.stream, "encoding", "utf-8")
+
+    def write(self, text: str) -> int:
+        self._pending.append(text)
+        return len(text)
+
+    def clear(self):
+        """Starts a new screen, drawn over the current one at the next flush."""
+        if self.interactive:
+            self._pending = []
+            self._screen = ""
+            self._cleared = True
+
+    def flush(self):
+        """Sends what was written since the last flush, as one write."""
+        text = "".join(self._pending)
+        self._pending = []
+        if not self.interactive:
+            if text:
+                self.stream.write(text)
+            self.stream.flush()
+            return
+
+        if self._cleared:
+            self._cleared = False
+            self._screen = text
+            output = self._draw(self._screen.split("\n"))
+        else:
+            self._screen += text
+            output = text
+            if self._shown:
+                self._shown = self._rows(self._screen.split("\n"), self._shown)
+        if output:
+            self.stream.write(output)
+        self.stream.flush()
+
+        if self._screen and not self._screen.endswith("\n"):
+            # An unfinished last line is a prompt: the answer is echoed after it, and the
+            # Enter key moves the cursor to the next row.
+            self._screen += "\n"
+            if self._shown:
+                answered = self._screen.count("\n") - 1
+                fits = answered + 2 <= shutil.get_terminal_size().lines
+                self._shown = self._shown[:answered] + [None, None] if fits else []
+
+    def _rows(self, lines: List[str], shown: List[Optional[str]]) -> List[Optional[str]]:
+        """The rows the terminal shows after `lines`, or unknown if they did not fit."""
+        columns, rows = shutil.get_terminal_size()
+        if len(lines) > rows or any(len(line.expandtabs()) >= columns for line in lines):
+            return []
+        return lines + [None] * (len(shown) - len(lines))
+
+    def _draw(self, lines: List[str]) -> str:
+        """The sequences turning the rows on the terminal into `lines`."""
+        shown = self._shown
+        self._shown = self._rows(lines, [])
+        if not self._shown or not shown:
+            return HOME + ERASE_SCREEN + "\n".join(lines)
+
+        output = []
+        for row, line in enumerate(lines):
+            if row >= len(shown) or shown[row] != line:
+                output.append(_move_to(row) + line + ERASE_LINE)
+        if len(shown) > len(lines):
+            output.append(_move_to(len(lines)) + ERASE_BELOW)
+        output.append(_move_to(len(lines) - 1, len(lines[-1])))
+        return "".join(output)
+
+@contextmanager
+def buffered_output(stream=None):
+    """
+    Replaces sys.stdout with a `TerminalRenderer` for the duration of the block, writing
+    whatever is left when the block ends. Prompts given to `input` are written through the
+    renderer, so it knows where they leave the cursor.
+
+    Args:
+        stream (optional): The stream the renderer writes to. Defaults to sys.stdout.
+
+    Yields:
+        TerminalRenderer: The renderer.
+    """
+    previous, read_line = sys.stdout, builtins.input
+    renderer = TerminalRenderer(stream if stream is not None else previous)
+
+    def prompted_input(prompt=""):
+        renderer.write(str(prompt))
+        return read_line()
+
+    sys.stdout, builtins.input = renderer, prompted_input
+    try:
+        yield renderer
+    finally:
+        renderer.flush()
+        sys.stdout, builtins.input = previous, read_line
@@ -0,0 +1,543 @@
+"""
+search.py
+
+Full-text and typo-tolerant search over the parts of an inventory, so shoppers can find a
+part by what they remember of its name, type or ID instead of typing its exact ID.
+
+The index is built from the inventory the first time it is searched. Every part is split
+into lower-cased tokens: the words of its name, its type and the letter parts of its ID.
+
+- The token vocabulary is kept sorted, and each token's rows (the parts holding it) sit in
+  one flat array, so a million parts cost a few arrays rather than a million lists. Exact
+  tokens and prefixes are found by bisection. A second flat array lists every row's tokens.
+- A trigram index maps every three-character slice of a token to the tokens containing it.
+  It finds the tokens a query term is a substring of and, for a term of letters only, the
+  tokens within one or two typos of it, whose edit distance is then checked. Tokens made
+  only of digits (model and part numbers) are left out of it; they are still found exactly
+  and by prefix.
+- Tokens in a large share of the parts (types, brands, series) also keep their rows as the
+  set bits of an integer, so the parts sharing several common words are found with a few
+  integer ANDs instead of a walk over their rows.
+- The numbers of IDs are not tokenized. A query that looks like an ID is instead looked up
+  directly under the spellings a shopper may have meant ("cpu 1", "CPU-01" and "cpu01" all
+  find "CPU_01"), which costs a few dictionary lookups.
+
+Each query term scores every token it matches: 1.0 for the token itself, 0.8 for a token it
+is a prefix of, 0.6 for one it is a substring of and, only when a term matches no token
+exactly or by prefix, less the more typos a close token needs. A part must match every term
+and ranks by its summed scores. The rows of the most selective term are visited best token
+first, each checked against the other terms through its tokens, and the visit stops as soon
+as no remaining row can beat the results found so far. When even the most selective term is
+common, the terms' bitmaps are intersected first: no common part ends the search at once,
+and few are scored outright.
+
+Results are looked up in the inventory by ID when they are returned, so price changes need
+no re-indexing. The index takes the inventory's hot-reload diffs like a build or a cart
+does: added parts are indexed in place and removed ones hidden; it is rebuilt once the
+changes outgrow the indexed parts, or when the inventory changed without a diff.
+
+Classes:
+- SearchIndex: The token and trigram indexes of one inventory.
+
+Functions:
+- tokenize(text): Splits text into lower-cased search tokens.
+- choose_part(search_index, text): Resolves what a shopper typed at a part ID prompt.
+
+Acknowledged Pylint Standard Errors:
+src\\search.py:58:0: E0401: Unable to import 'src.versioned' (import-error)
+"""
+import heapq
+import re
+import threading
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from itertools import islice
+from typing import Dict, List, Optional
+
+from src.versioned import pinned # pylint: disable=import-error
+
+# Scores of a term matching a token exactly, as a prefix and as a substring.
+EXACT_SCORE = 1.0
+PREFIX_SCORE = 0.8
+SUBSTRING_SCORE = 0.6
+# Score of a token one typo away from a term; each further typo costs TYPO_COST.
+FUZZY_SCORE = 0.5
+TYPO_COST = 0.15
+# Most tokens a single term expands to by prefix, substring or typo.
+MAX_EXPANSIONS = 64
+# A multi-word query whose rarest word is in more parts than this intersects the words'
+# bitmaps first, and scores the parts left outright when there are no more than this.
+SCAN_ROWS = 256
+# Tokens in at least one part in this many keep a bitmap of their parts.
+DENSE_FRACTION = 32
+# Widest zero-padded number tried when a query is looked up as an ID.
+MAX_ID_DIGITS = 8
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+_ID_PART = re.compile(r"[a-z]+|[0-9]+")
+_LETTER = re.compile(r"[a-z]")
+_NONZERO = re.compile(rb"[^\x00]")
+
+def tokenize(text: str) -> List[str]:
+    """
+    Splits text into lower-cased search tokens: runs of letters and digits.
+
+    Args:
+        text (str): A part name, a type or a query.
+
+    Returns:
+        list: The tokens, in order.
+    """
+    return _TOKEN.findall(str(text).lower())
+
+def _set_bits(bitmap: int):
+    """Yields the positions of the set bits of an integer, lowest first."""
+    data = bitmap.to_bytes((bitmap.bit_length() + 7) // 8, "little")
+    for found in _NONZERO.finditer(data):
+        byte = data[found.start()]
+        for bit in range(8):
+            if byte >> bit & 1:
+                yield found.start() * 8 + bit
+
+def _set_rows(bits: bytearray, rows):
+    """Sets the bits of some rows in a bitmap."""
+    for row in rows:
+        bits[row >> 3] |= 1 << (row & 7)
+
+def _item_tokens(item) -> List[str]:
+    """The distinct tokens of a part: its name's words, its type and its ID's letter parts."""
+    tokens = tokenize(item.name)
+    tokens.extend(tokenize(item.item_type))
+    tokens.extend(token for token in tokenize(item.item_id) if not token.isdigit())
+    return list(dict.fromkeys(tokens))
+
+def _trigrams(token: str) -> set:
+    """The three-character slices of a token padded with a space at each end."""
+    padded = f" {token} "
+    return {padded[start:start + 3] for start in range(len(padded) - 2)}
+
+def _typo_limit(term: str) -> int:
+    """How many typos a term may have: one up to four characters, two above."""
+    return 1 if len(term) <= 4 else 2
+
+def _edit_distance(first: str, second: str, limit: int) -> int:
+    """
+    The number of insertions, deletions, substitutions and swaps of neighbouring
+    characters between two strings, or limit + 1 once it is known to exceed `limit`.
+    """
+    if abs(len(first) - len(second)) > limit:
+        return limit + 1
+    before = None
+    previous = list(range(len(second) + 1))
+    for row, char in enumerate(first, 1):
+        current = [row] + [0] * len(second)
+        for column, other in enumerate(second, 1):
+            cost = 0 if char == other else 1
+            current[column] = min(previous[column] + 1, current[column - 1] + 1,
+                                  previous[column - 1] + cost)
+            if (before is not None and column > 1 and char == second[column - 2]
+                    and first[row - 2] == other):
+                current[column] = min(current[column], before[column - 2] + 1)
+        if min(current) > limit:
+            return limit + 1
+        before, previous = previous, current
+    return previous[-1]
+
+def _id_spellings(query: str) -> List[str]:
+    """
+    The IDs a query may stand for: its letter and digit runs joined by '_', '-' or nothing,
+    with the last number as typed, without leading zeros and zero-padded up to
+    MAX_ID_DIGITS digits.
+    """
+    text = query.strip().lower()
+    parts = _ID_PART.findall(text)
+    if not parts or len(parts) > 4 or not parts[-1].isdigit():
+        return [text] if text else []
+    number = parts[-1].lstrip("0") or "0"
+    numbers = dict.fromkeys([parts[-1], number] +
+                            [number.zfill(width) for width in
+                             range(len(number) + 1, MAX_ID_DIGITS + 1)])
+    spellings = [text]
+    for separator in ("_", "-", ""):
+        for digits in numbers:
+            spellings.append(separator.join(parts[:-1] + [digits]))
+    return list(dict.fromkeys(spellings))
+
+class _Term:
+    """One query term and the tokens it matches, with their scores."""
+    def __init__(self, term: str):
+        self.term = term
+        self.scores: Dict[str, float] = {}
+        self.rows = 0
+
+    @property
+    def best(self) -> float:
+        """The best score the term gives any token."""
+        return max(self.scores.values(), default=0.0)
+
+class SearchIndex:
+    """
+    The token and trigram indexes of one inventory, and ranked searches over them.
+
+    Attributes:
+        inventory_object: The inventory searched.
+        built_version (int): The inventory version the index reflects, or None before the
+            first search.
+    """
+    def __init__(self, inventory_object):
+        self.inventory_object = inventory_object
+        self.built_version: Optional[int] = None
+        self._built = False
+        # Row -> item ID; rows of removed parts stay, listed in _dead
+        self._ids: List[str] = []
+        self._dead: set = set()
+        # Tokens as of the last build, sorted, with their rows in _rows[_starts[n]:_starts[n+1]]
+        self._tokens: List[str] = []
+        self._starts = array("i", [0])
+        self._rows = array("i")
+        # Token numbers of the rows as of the last build, row r's in
+        # _forward[_row_starts[r]:_row_starts[r+1]]
+        self._forward = array("i")
+        self._row_starts = array("i", [0])
+        # Rows added by diffs since the last build, by token, and their tokens
+        self._added: Dict[str, List[int]] = {}
+        self._added_tokens: Dict[int, List[str]] = {}
+        # Trigram -> tokens containing it
+        self._trigrams: Dict[str, List[str]] = {}
+        # Token -> its rows as the set bits of an integer, for the tokens in at least one
+        # part in DENSE_FRACTION
+        self._bitmaps: Dict[str, int] = {}
+        self._lock = threading.RLock()
+
+    def refresh(self):
+        """Builds the index if it was never built or the inventory changed without a diff."""
+        with self._lock:
+            if not self._built or self.built_version != getattr(self.inventory_object,
+                                                                "version", None):
+                self._build()
+
+    def _build(self):
+        """Indexes every part of the inventory from scratch."""
+        # Token -> [number in order of first use, rows...]
+        postings: Dict[str, list] = {}
+        forward = array("i")
+        row_starts = array("i", [0])
+        ids: List[str] = []
+        with pinned(self.inventory_object) as inventory:
+            version = getattr(inventory, "version", None)
+            for row, item in enumerate(inventory.items):
+                ids.append(item.item_id)
+                for token in _item_tokens(item):
+                    entry = postings.get(token)
+                    if entry is None:
+                        entry = postings[token] = [len(postings)]
+                    entry.append(row)
+                    forward.append(entry[0])
+                row_starts.append(len(forward))
+
+        tokens = sorted(postings)
+        renumber = array("i", bytes(4 * len(tokens)))
+        starts = array("i", [0])
+        rows = array("i")
+        trigrams: Dict[str, List[str]] = {}
+        bitmaps: Dict[str, int] = {}
+        for number, token in enumerate(tokens):
+            entry = postings[token]
+            renumber[entry[0]] = number
+            rows.extend(islice(entry, 1, None))
+            starts.append(len(rows))
+            if (len(entry) - 1) * DENSE_FRACTION >= len(ids):
+                bits = bytearray(len(ids) // 8 + 1)
+                _set_rows(bits, islice(entry, 1, None))
+                bitmaps[token] = int.from_bytes(bits, "little")
+            if _LETTER.search(token):
+                for trigram in _trigrams(token):
+                    trigrams.setdefault(trigram, []).append(token)
+        del postings
+        self._ids, self._dead = ids, set()
+        self._tokens, self._starts, self._rows = tokens, starts, rows
+        self._forward = array("i", map(renumber.__getitem__, forward))
+        self._row_starts = row_starts
+        self._added, self._added_tokens = {}, {}
+        self._trigrams, self._bitmaps = trigrams, bitmaps
+        self.built_version = version
+        self._built = True
+
+    def apply_inventory_diff(self, diff) -> List[str]:
+        """
+        Indexes the parts a reload added and hides the ones it removed. A changed part is
+        re-indexed only if its name or type changed.
+
+        Args:
+            diff (InventoryDiff): The changes already applied to the inventory.
+
+        Returns:
+            list: No notices; the index has nothing to tell the user.
+        """
+        with self._lock:
+            if not self._built:
+                return []
+            removed = list(diff.removed)
+            added = list(diff.added)
+            for old, new in diff.changed:
+                if _item_tokens(old) != _item_tokens(new):
+                    removed.append(old)
+                    added.append(new)
+            for item in removed:
+                self._hide_row(item)
+            for item in added:
+                self._add_row(item)
+            self.built_version = getattr(self.inventory_object, "version", None)
+            if len(self._dead) + len(self._added_tokens) > max(1024, len(self._ids) // 8):
+                # Mostly changed; rebuilt on the next search
+                self._built = False
+        return []
+
+    def _hide_row(self, item):
+        """Hides the row of a part, found among the rows of its rarest token."""
+        tokens = _item_tokens(item)
+        if not tokens:
+            return
+        item_key = item.item_id.lower()
+        for row in self._token_rows(min(tokens, key=self._row_count)):
+            if self._ids[row].lower() == item_key:
+                self._dead.add(row)
+
+    def _add_row(self, item):
+        """Indexes one part in the rows added since the last build."""
+        row = len(self._ids)
+        self._ids.append(item.item_id)
+        tokens = _item_tokens(item)
+        for token in tokens:
+            if not self._row_count(token) and _LETTER.search(token):
+                for trigram in _trigrams(token):
+                    self._trigrams.setdefault(trigram, []).append(token)
+            self._added.setdefault(token, []).append(row)
+            if token in self._bitmaps:
+                self._bitmaps[token] |= 1 << row
+        self._added_tokens[row] = tokens
+
+    def _number(self, token: str) -> int:
+        """The number of a token as of the last build, or -1."""
+        number = bisect_left(self._tokens, token)
+        if number < len(self._tokens) and self._tokens[number] == token:
+            return number
+        return -1
+
+    def _token_rows(self, token: str):
+        """Every row holding a token, in ascending order."""
+        number = self._number(token)
+        rows = self._rows[self._starts[number]:self._starts[number + 1]] if number >= 0 else ()
+        added = self._added.get(token)
+        return list(rows) + added if added else rows
+
+    def _row_count(self, token: str) -> int:
+        """How many rows hold a token."""
+        number = self._number(token)
+        count = len(self._added.get(token, ()))
+        if number >= 0:
+            count += self._starts[number + 1] - self._starts[number]
+        return count
+
+    def _row_tokens(self, row: int) -> List[str]:
+        """The tokens of a row."""
+        if row in self._added_tokens:
+            return self._added_tokens[row]
+        tokens = self._tokens
+        return [tokens[number] for number in
+                self._forward[self._row_starts[row]:self._row_starts[row + 1]]]
+
+    def _term_bitmap(self, match: _Term) -> int:
+        """The rows a term matches as the set bits of an integer."""
+        bitmap = 0
+        bits = None
+        for token in match.scores:
+            kept = self._bitmaps.get(token)
+            if kept is not None:
+                bitmap |= kept
+            else:
+                if bits is None:
+                    bits = bytearray(len(self._ids) // 8 + 1)
+                _set_rows(bits, self._token_rows(token))
+        if bits is not None:
+            bitmap |= int.from_bytes(bits, "little")
+        return bitmap
+
+    def _match(self, term: str) -> _Term:
+        """Finds the tokens a query term matches exactly, by prefix, substring or typo."""
+        match = _Term(term)
+        scores = match.scores
+        if self._row_count(term):
+            scores[term] = EXACT_SCORE
+        number = bisect_left(self._tokens, term)
+        while (number < len(self._tokens) and len(scores) < MAX_EXPANSIONS
+               and self._tokens[number].startswith(term)):
+            scores.setdefault(self._tokens[number], PREFIX_SCORE)
+            number += 1
+        for token in self._added:
+            if len(scores) >= MAX_EXPANSIONS:
+                break
+            if token.startswith(term):
+                scores.setdefault(token, PREFIX_SCORE)
+
+        if len(term) >= 3:
+            slices = min((self._trigrams.get(term[start:start + 3], ())
+                          for start in range(len(term) - 2)), key=len)
+            for token in slices:
+                if len(scores) >= MAX_EXPANSIONS:
+                    break
+                if term in token:
+                    scores.setdefault(token, SUBSTRING_SCORE)
+
+        if not scores and term.isalpha():
+            self._match_typos(match)
+        match.rows = sum(self._row_count(token) for token in scores)
+        return match
+
+    def _match_typos(self, match: _Term):
+        """Adds the tokens within the term's typo limit, fewest typos first."""
+        term = match.term
+        limit = _typo_limit(term)
+        trigrams = _trigrams(term)
+        # Each typo changes at most three of the term's trigrams
+        needed = max(1, len(trigrams) - 3 * limit)
+        shared = Counter()
+        for trigram in trigrams:
+            shared.update(self._trigrams.get(trigram, ()))
+        close = []
+        for token, count in shared.items():
+            if count >= needed and abs(len(token) - len(term)) <= limit:
+                typos = _edit_distance(term, token, limit)
+                if typos <= limit:
+                    close.append((typos, token))
+        for typos, token in sorted(close)[:MAX_EXPANSIONS]:
+            match.scores[token] = FUZZY_SCORE - TYPO_COST * (typos - 1)
+
+    def search(self, query: str, limit: int = 10) -> list:
+        """
+        Finds the parts best matching a query.
+
+        Args:
+            query (str): Words of a part's name, its type or ID, complete or not, possibly
+                misspelled.
+            limit (int): The most parts returned.
+
+        Returns:
+            list: The matching items, best first; a part whose ID the query spells comes
+            before the rest.
+        """
+        with pinned(self.inventory_object) as inventory:
+            found = {}
+            for item_id in _id_spellings(query):
+                item = inventory.get_item(item_id)
+                if item is not None:
+                    found.setdefault(item.item_id.lower(), item)
+            terms = list(dict.fromkeys(tokenize(query)))
+            if not terms or limit <= len(found):
+                return list(found.values())[:max(limit, 0)]
+
+            with self._lock:
+                self.refresh()
+                rows = self._rank([self._match(term) for term in terms], limit)
+                ids = [self._ids[row] for row in rows]
+            for item_id in ids:
+                item = inventory.get_item(item_id)
+                if item is not None and len(found) < limit:
+                    found.setdefault(item.item_id.lower(), item)
+            return list(found.values())
+
+    def _rank(self, matches: List[_Term], limit: int) -> List[int]:
+        """The best `limit` rows matching every term, best first."""
+        if any(not match.scores for match in matches):
+            return []
+        matches.sort(key=lambda match: match.rows)
+        driver, others = matches[0], matches[1:]
+        best: list = []
+        member = None
+        if others and driver.rows > SCAN_ROWS:
+            # Every term is common: intersect their bitmaps, and score the rows outright
+            # when few are left
+            common = -1
+            for match in matches:
+                common &= self._term_bitmap(match)
+                if not common:
+                    return []
+            if common.bit_count() <= SCAN_ROWS:
+                for row in _set_bits(common):
+                    if row not in self._dead:
+                        self._keep(best, self._score(row, matches), row, limit)
+                return [row for _, _, row in sorted(best, reverse=True)]
+            member = common.to_bytes(len(self._ids) // 8 + 1, "little")
+
+        # Rows of the rarest term, best token first, until no later row can do better
+        others_best = sum(match.best for match in others)
+        seen = set()
+        for token, score in sorted(driver.scores.items(), key=lambda pair: -pair[1]):
+            if len(best) == limit and best[0][0] >= score + others_best:
+                break
+            for row in self._token_rows(token):
+                if row in seen or row in self._dead:
+                    continue
+                if member is not None and not member[row >> 3] >> (row & 7) & 1:
+                    continue
+                seen.add(row)
+                total = score + self._score(row, others) if others else score
+                if total > score or not others:
+                    self._keep(best, total, row, limit)
+                    if len(best) == limit and best[0][0] >= score + others_best:
+                        break
+        return [row for _, _, row in sorted(best, reverse=True)]
+
+    def _score(self, row: int, matches: List[_Term]) -> float:
+        """The summed scores of the terms for a row, 0 unless every one matches."""
+        tokens = self._row_tokens(row)
+        total = 0.0
+        for match in matches:
+            get = match.scores.get
+            term_score = 0.0
+            for token in tokens:
+                score = get(token, 0.0)
+                if score > term_score:
+                    term_score = score
+            if not term_score:
+                return 0.0
+            total += term_score
+        return total
+
+    @staticmethod
+    def _keep(best: list, total: float, row: int, limit: int):
+        """Keeps a row among the best `limit`, earlier rows winning ties."""
+        entry = (total, -row, row)
+        if len(best) < limit:
+            heapq.heappush(best, entry)
+        elif entry > best[0]:
+            heapq.heapreplace(best, entry)
+
+def choose_part(search_index: SearchIndex, text: str, limit: int = 5):
+    """
+    Resolves what a shopper typed at a part ID prompt. An exact ID is taken as it is;
+    otherwise the best matches are listed and the shopper picks one.
+
+    Args:
+        search_index (SearchIndex): The index of the inventory.
+        text (str): What the shopper typed.
+        limit (int): The most matches listed.
+
+    Returns:
+        Item: The part, or None if nothing matched or the shopper picked none.
+    """
+    item = search_index.inventory_object.get_item(text.strip())
+    if item is not None:
+        return item
+    matches = search_index.search(text, limit)
+    if not matches:
+        print(f"No parts match '{text.strip()}'.")
+        return None
+    print(f"No part has the ID '{text.strip()}'. Did you mean:")
+    for number, match in enumerate(matches, 1):
+        print(f"{number}. {match} [{match.item_id.lower()}]")
+    user_input = input("Option (Enter to cancel): ").strip()
+    if user_input.isdigit() and 1 <= int(user_input) <= len(matches):
+        return matches[int(user_input) - 1]
+    return None
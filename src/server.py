@@ -0,0 +1,541 @@
+"""
+server.py
+
+Serves the storefront over HTTP/JSON to many shoppers at once, using only the standard
+library (asyncio streams and a small HTTP/1.1 parser).
+
+Every shopper gets a session with their own user, build and cart (a `CommandSession`, kept
+between requests in a compact form by a `SessionStore` that expires idle sessions and evicts
+the least recently used ones under a memory cap), while all sessions share the one loaded
+inventory and its compatibility matrix, verdict cache, candidate indexes, Pareto frontier,
+search index and sorted listings. Connections are kept alive between requests (HTTP/1.1 by
+default, HTTP/1.0 with "Connection: keep-alive") until the client closes them or they sit
+idle for `idle_timeout` seconds; pipelined requests are answered in order.
+
+Requests that only look things up or change a session run on the event loop. Generating
+builds (`build/auto`, `builds`, `pareto`, `build/candidates`) and searching for parts run on
+a single worker thread, so they do not hold up other shoppers' requests, and the shared
+indexes those requests use are only ever touched by that one thread. The search index, which
+also suggests parts for unknown IDs on the event loop, guards itself with a lock. Price
+updates run on the worker too; the requests that use the session store wait for them on the
+event loop instead of blocking it on the store's lock. Requests of one session are handled
+one at a time.
+
+Endpoints (bodies and results are JSON; errors are {"error": ...} with a 4xx status, or a
+generic 500 for an unexpected failure):
+
+    GET    /parts?type=<category|all>          parts by category (default all)
+           [&sort=<key>&desc=1]                with any of these, one page of the parts
+           [&price=<low>..<high>&capacity=...] sorted by price, power_draw, power_supplied,
+           [&page=<n>&per_page=<n>]            capacity or name, within the ranges given
+    GET    /parts/<part_id>                    every field of a part
+    GET    /compatibility?ids=a,b[&complete=1] compatibility verdict of a set of parts
+    GET    /search?q=<words>[&limit=<n>]        parts best matching words of their name,
+                                               type or ID
+    GET    /stats                              session store, verdict cache and stock counters
+    POST   /prices                             {"prices": {<part_id>: <price>, ...}} re-prices
+                                               parts and the sessions holding them
+    POST   /sessions                           starts a session: {"session": <id>}
+    GET    /sessions/<id>                      the session's user, build status and cart totals
+    DELETE /sessions/<id>                      ends the session
+    PUT    /sessions/<id>/user                 {"name": ..., "budget": ...}
+    GET    /sessions/<id>/build                the build
+    DELETE /sessions/<id>/build                clears the build
+    POST   /sessions/<id>/build/parts          {"part_id": ...} adds a part
+    DELETE /sessions/<id>/build/parts/<part>   removes a part
+    GET    /sessions/<id>/build/check          the build's compatibility verdict
+    GET    /sessions/<id>/build/candidates     parts that can still complete the build
+    POST   /sessions/<id>/build/auto           {"objective": "ram"|"storage"} build for me
+    GET    /sessions/<id>/builds               next page of valid builds, cheapest first
+    GET    /sessions/<id>/pareto               best value builds within the budget
+    GET    /sessions/<id>/cart                 the cart
+    DELETE /sessions/<id>/cart                 empties the cart
+    POST   /sessions/<id>/cart/items           {"part_id": ...} adds a part
+    DELETE /sessions/<id>/cart/items/<part>    removes a part, or the build with "build"
+    POST   /sessions/<id>/cart/build           adds the build
+    POST   /sessions/<id>/checkout             buys the cart
+
+Classes:
+- StorefrontServer: The routes, the sessions and the HTTP connection handling.
+
+Functions:
+- serve(inventory, host, port, ready, session_ttl, session_memory): Runs a server until it
+  is cancelled.
+
+Acknowledged Pylint Standard Errors:
+src\\server.py:86:0: E0401: Unable to import 'src.candidates' (import-error)
+src\\server.py:87:0: E0401: Unable to import 'src.compatibility' (import-error)
+src\\server.py:88:0: E0401: Unable to import 'src.headless' (import-error)
+src\\server.py:89:0: E0401: Unable to import 'src.listing' (import-error)
+src\\server.py:90:0: E0401: Unable to import 'src.pareto' (import-error)
+src\\server.py:91:0: E0401: Unable to import 'src.prices' (import-error)
+src\\server.py:92:0: E0401: Unable to import 'src.search' (import-error)
+src\\server.py:93:0: E0401: Unable to import 'src.session_store' (import-error)
+src\\server.py:94:0: E0401: Unable to import 'src.stock' (import-error)
+"""
+import asyncio
+import json
+import logging
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager, suppress
+from http import HTTPStatus
+from typing import Callable, Dict, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from src.candidates import CandidateFinder # pylint: disable=import-error
+from src.compatibility import Compatibility # pylint: disable=import-error
+from src.headless import CommandError, CommandSession, part_details, part_summary # pylint: disable=import-error
+from src.listing import RANGE_KEYS, ListingIndex, parse_listing # pylint: disable=import-error
+from src.pareto import ParetoFrontier # pylint: disable=import-error
+from src.prices import apply_price_updates # pylint: disable=import-error
+from src.search import SearchIndex # pylint: disable=import-error
+from src.session_store import DEFAULT_MAX_BYTES, DEFAULT_TTL, SessionStore # pylint: disable=import-error
+from src.stock import StockLedger # pylint: disable=import-error
+
+# Seconds a kept-alive connection may sit idle before it is closed.
+IDLE_TIMEOUT = 15.0
+# Largest request body accepted, in bytes.
+MAX_BODY = 64 * 1024
+# Most parts a search returns.
+MAX_SEARCH_RESULTS = 50
+# Most parts on one page of a sorted or filtered listing.
+MAX_PAGE_SIZE = 100
+# Query parameters that ask /parts for one page of a sorted or filtered listing.
+LISTING_PARAMETERS = ("sort", "desc", "page", "per_page") + RANGE_KEYS
+# Where requests that fail unexpectedly are reported.
+LOGGER = logging.getLogger(__name__)
+
+class _HTTPError(Exception):
+    """A request that is answered with an error status."""
+    def __init__(self, status: HTTPStatus, message: str):
+        super().__init__(message)
+        self.status = status
+
+class StorefrontServer:
+    """
+    The storefront's HTTP/JSON service for one inventory.
+
+    Attributes:
+        inventory_object: The inventory every session shares.
+        compatibility_object (Compatibility): Shared compatibility checks and verdict cache.
+        sessions (SessionStore): The shoppers' sessions, kept between requests.
+        stock_ledger (StockLedger): The stock held and sold across every session.
+        idle_timeout (float): Seconds a kept-alive connection may sit idle.
+    """
+    def __init__(self, inventory_object, idle_timeout: float = IDLE_TIMEOUT,
+                 session_ttl: float = DEFAULT_TTL, session_memory: int = DEFAULT_MAX_BYTES):
+        self.inventory_object = inventory_object
+        self.idle_timeout = idle_timeout
+        self.compatibility_object = Compatibility(inventory_object)
+        self.candidate_finder = CandidateFinder(inventory_object,
+                                                self.compatibility_object.matrix)
+        self.pareto_frontier = ParetoFrontier(inventory_object)
+        self.search_index = SearchIndex(inventory_object)
+        self.listing_index = ListingIndex(inventory_object)
+        self.stock_ledger = StockLedger()
+        self.sessions = SessionStore(self._new_session, session_ttl, session_memory)
+        # A lock per session with requests in flight, so they run one at a time
+        self._session_locks: weakref.WeakValueDictionary = weakref.WeakValueDictionary()
+        self._worker = ThreadPoolExecutor(max_workers=1, thread_name_prefix="storefront")
+        # Clear while price updates hold the session store's lock on the worker; the event
+        # loop waits on it rather than on that lock
+        self._prices_settled = asyncio.Event()
+        self._prices_settled.set()
+        self._price_updates = 0
+        self._listings: Dict[tuple, bytes] = {}
+        # Answers the requests that need no session of their own
+        self._lookups = self._new_session()
+
+        # (method, path pattern, handler, runs on the worker). None in a pattern captures a
+        # path segment; routes under /sessions/<id> get the session as their first argument.
+        self._routes = [
+            ("GET", ("parts",), self._list_parts, False),
+            ("GET", ("parts", None), self._part_details, False),
+            ("GET", ("compatibility",), self._compatibility, False),
+            ("GET", ("search",), self._search, True),
+            ("GET", ("stats",), self._stats, False),
+            ("POST", ("prices",), self._update_prices, False),
+            ("POST", ("sessions",), self._start_session, False),
+            ("GET", ("sessions", None), self._session_summary, False),
+            ("DELETE", ("sessions", None), self._end_session, False),
+            ("PUT", ("sessions", None, "user"), self._update_user, False),
+            ("GET", ("sessions", None, "build"), lambda s, q, b: s.build_show(), False),
+            ("DELETE", ("sessions", None, "build"), lambda s, q, b: s.clear_build(), False),
+            ("POST", ("sessions", None, "build", "parts"),
+             lambda s, q, b: s.build_add([_part_id(b)]), False),
+            ("DELETE", ("sessions", None, "build", "parts", None),
+             lambda s, part_id, q, b: s.build_remove([part_id]), False),
+            ("GET", ("sessions", None, "build", "check"),
+             lambda s, q, b: s.build_check(), False),
+            ("GET", ("sessions", None, "build", "candidates"),
+             lambda s, q, b: s.build_candidates(), True),
+            ("POST", ("sessions", None, "build", "auto"),
+             lambda s, q, b: s.build_auto([str(b.get("objective", "ram"))]), True),
+            ("GET", ("sessions", None, "builds"), lambda s, q, b: s.next_builds([]), True),
+            ("GET", ("sessions", None, "pareto"), lambda s, q, b: s.pareto([]), True),
+            ("GET", ("sessions", None, "cart"), lambda s, q, b: s.cart_show(), False),
+            ("DELETE", ("sessions", None, "cart"), lambda s, q, b: s.cart_clear(), False),
+            ("POST", ("sessions", None, "cart", "items"),
+             lambda s, q, b: s.cart_add([_part_id(b)]), False),
+            ("DELETE", ("sessions", None, "cart", "items", None),
+             lambda s, part_id, q, b: s.cart_remove([part_id]), False),
+            ("POST", ("sessions", None, "cart", "build"),
+             lambda s, q, b: s.cart_add_build(), False),
+            ("POST", ("sessions", None, "checkout"), lambda s, q, b: s.checkout(), False),
+        ]
+
+    def _route(self, method: str, segments: Tuple[str, ...]) -> Tuple[Callable, list, bool]:
+        """Finds the handler of a request, its captured path segments and where it runs."""
+        allowed = False
+        for route_method, pattern, handler, slow in self._routes:
+            if len(pattern) != len(segments) or any(
+                    part is not None and part != segment
+                    for part, segment in zip(pattern, segments)):
+                continue
+            if route_method != method:
+                allowed = True
+                continue
+            captured = [segment for part, segment in zip(pattern, segments) if part is None]
+            return handler, captured, slow
+        if allowed:
+            raise _HTTPError(HTTPStatus.METHOD_NOT_ALLOWED, f"{method} is not allowed here")
+        raise _HTTPError(HTTPStatus.NOT_FOUND, "No such endpoint")
+
+    async def handle(self, method: str, target: str, body: bytes = b"") -> Tuple[int, bytes]:
+        """
+        Answers one request.
+
+        Args:
+            method (str): The HTTP method.
+            target (str): The request target: path and query string.
+            body (bytes): The request body, JSON or empty.
+
+        Returns:
+            tuple: The status code and the JSON body of the response.
+        """
+        try:
+            url = urlsplit(target)
+            segments = tuple(unquote(segment) for segment in url.path.split("/") if segment)
+            handler, captured, slow = self._route(method, segments)
+            query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+            try:
+                arguments = json.loads(body) if body.strip() else {}
+            except ValueError as error:
+                raise _HTTPError(HTTPStatus.BAD_REQUEST, "The body is not valid JSON") \
+                    from error
+            if not isinstance(arguments, dict):
+                raise _HTTPError(HTTPStatus.BAD_REQUEST, "The body must be a JSON object")
+
+            if segments[0] == "sessions" and len(segments) > 2:
+                async with self._session(captured[0]) as session:
+                    result = await self._call(
+                        (handler, session, *captured[1:], query, arguments), slow)
+            else:
+                result = await self._call((handler, *captured, query, arguments), slow)
+            status = HTTPStatus.CREATED if method == "POST" and segments == ("sessions",) \
+                else HTTPStatus.OK
+        except CommandError as error:
+            status, result = HTTPStatus.BAD_REQUEST, {"error": str(error)}
+        except _HTTPError as error:
+            status, result = error.status, {"error": str(error)}
+        except Exception: # pylint: disable=broad-exception-caught
+            # One failing request must not take the connection or the server down, nor show
+            # the client the server's internals
+            LOGGER.exception("%s %s failed", method, target)
+            status, result = HTTPStatus.INTERNAL_SERVER_ERROR, {"error": "Internal server error"}
+        if not isinstance(result, bytes):
+            result = json.dumps(result).encode()
+        return int(status), result
+
+    async def _call(self, call: tuple, slow: bool):
+        handler, *arguments = call
+        if slow:
+            return await asyncio.get_running_loop().run_in_executor(
+                self._worker, lambda: handler(*arguments))
+        result = handler(*arguments)
+        if asyncio.iscoroutine(result):
+            result = await result
+        return result
+
+    @asynccontextmanager
+    async def _session(self, session_id: str):
+        """
+        Loads a session for one request once its earlier requests are done, and keeps its
+        state afterwards.
+        """
+        lock = self._session_locks.get(session_id)
+        if lock is None:
+            lock = self._session_locks[session_id] = asyncio.Lock()
+        async with lock:
+            await self._prices_settled.wait()
+            session = self.sessions.load(session_id)
+            if session is None:
+                raise _HTTPError(HTTPStatus.NOT_FOUND, "No such session")
+            try:
+                yield session
+            finally:
+                await self._prices_settled.wait()
+                self.sessions.save(session_id, session)
+
+    def _list_parts(self, query: dict, _body: dict):
+        """
+        Parts by category, encoded once per inventory version and category, or one page of
+        a sorted and range-filtered listing when any listing parameter is given.
+        """
+        category = query.get("type", "all").lower()
+        if any(parameter in query for parameter in LISTING_PARAMETERS):
+            return self._page_parts(category, query)
+        version = getattr(self.inventory_object, "version", None)
+        key = (version, category)
+        listing = self._listings.get(key) if version is not None else None
+        if listing is None:
+            listing = json.dumps(self._lookups.list_parts([category])).encode()
+            if version is not None:
+                if any(cached_version != version for cached_version, _ in self._listings):
+                    self._listings.clear()
+                self._listings[key] = listing
+        return listing
+
+    def _page_parts(self, category: str, query: dict) -> dict:
+        words = [category]
+        if query.get("sort"):
+            descending = query.get("desc", "").lower() in ("1", "true", "yes")
+            words += ["sort", query["sort"], "desc" if descending else "asc"]
+        words += [f"{key} {query[key]}" for key in RANGE_KEYS if key in query]
+        if "page" in query:
+            words += ["page", query["page"]]
+        try:
+            listing = parse_listing(" ".join(words))
+            listing.page_size = max(1, min(int(query.get("per_page", listing.page_size)),
+                                           MAX_PAGE_SIZE))
+        except ValueError as error:
+            raise _HTTPError(HTTPStatus.BAD_REQUEST, str(error)) from error
+        return self._lookups.page_parts(listing)
+
+    def _part_details(self, part_id: str, _query: dict, _body: dict) -> dict:
+        item = self.inventory_object.get_item(part_id)
+        if item is None:
+            raise _HTTPError(HTTPStatus.NOT_FOUND, f"Unknown part ID: {part_id}")
+        return part_details(item)
+
+    def _compatibility(self, query: dict, _body: dict) -> dict:
+        part_ids = [part_id for part_id in query.get("ids", "").split(",") if part_id.strip()]
+        if not part_ids:
+            raise _HTTPError(HTTPStatus.BAD_REQUEST, "Give the part IDs as ?ids=a,b,...")
+        return self.compatibility_object.check_parts(
+            part_ids, query.get("complete", "").lower() in ("1", "true", "yes"))
+
+    def _search(self, query: dict, _body: dict) -> list:
+        words = query.get("q", "").strip()
+        if not words:
+            raise _HTTPError(HTTPStatus.BAD_REQUEST, "Give the words to search for as ?q=...")
+        try:
+            limit = int(query.get("limit", 10))
+        except ValueError as error:
+            raise _HTTPError(HTTPStatus.BAD_REQUEST, "The limit must be a number") from error
+        return [part_summary(item) for item in
+                self.search_index.search(words, max(1, min(limit, MAX_SEARCH_RESULTS)))]
+
+    def _new_session(self) -> CommandSession:
+        return CommandSession(self.inventory_object, self.compatibility_object,
+                              self.candidate_finder, self.pareto_frontier, self.stock_ledger,
+                              self.search_index, self.listing_index)
+
+    async def _stats(self, _query: dict, _body: dict) -> dict:
+        await self._prices_settled.wait()
+        return {"sessions": self.sessions.stats(),
+                "verdict_cache": self.compatibility_object.cache_stats(),
+                "stock": self.stock_ledger.stats()}
+
+    async def _update_prices(self, _query: dict, body: dict) -> dict:
+        """
+        Applies a batch of new prices and re-prices only the sessions holding those parts.
+        Runs on the worker, so no build search sees the inventory half updated; meanwhile the
+        requests that use the session store wait for it on the event loop.
+        """
+        prices = body.get("prices")
+        if not isinstance(prices, dict):
+            raise _HTTPError(HTTPStatus.BAD_REQUEST,
+                             'Give the prices as {"prices": {<part_id>: <price>, ...}}')
+        self._price_updates += 1
+        self._prices_settled.clear()
+        try:
+            diff, unknown, repriced = await asyncio.get_running_loop().run_in_executor(
+                self._worker, self._apply_prices, prices)
+        finally:
+            self._price_updates -= 1
+            if not self._price_updates:
+                self._prices_settled.set()
+        return {"updated": len(diff.changed), "unknown": unknown, "sessions": repriced}
+
+    def _apply_prices(self, prices: dict) -> tuple:
+        """Changes the prices and re-prices the sessions and search index; on the worker."""
+        with self.sessions.locked():
+            try:
+                diff, unknown = apply_price_updates(self.inventory_object, prices.items())
+            except ValueError as error:
+                raise _HTTPError(HTTPStatus.BAD_REQUEST, str(error)) from error
+            repriced = self.sessions.apply_inventory_diff(diff)
+        self.search_index.apply_inventory_diff(diff)
+        return diff, unknown, repriced
+
+    async def _start_session(self, _query: dict, _body: dict) -> dict:
+        await self._prices_settled.wait()
+        return {"session": self.sessions.create()}
+
+    async def _session_summary(self, session_id: str, _query: dict, _body: dict) -> dict:
+        """The session's user, and the status of its build and cart."""
+        async with self._session(session_id) as session:
+            return {"session": session_id,
+                    "name": session.user_object.get_name(),
+                    "budget": session.user_object.get_budget(),
+                    "build": session.build_status(),
+                    "cart": session.cart_status()}
+
+    async def _end_session(self, session_id: str, _query: dict, _body: dict) -> dict:
+        await self._prices_settled.wait()
+        record = self.sessions.record(session_id)
+        if record is None or not self.sessions.delete(session_id):
+            raise _HTTPError(HTTPStatus.NOT_FOUND, "No such session")
+        if record.holder is not None:
+            # The parts the shopper held are free for others at once
+            self.stock_ledger.release(record.holder)
+        return {"session": session_id, "ended": True}
+
+    @staticmethod
+    def _update_user(session: CommandSession, _query: dict, body: dict) -> dict:
+        if "budget" in body:
+            session.budget([str(body["budget"])])
+        if "name" in body:
+            session.name([str(body["name"])])
+        return {"name": session.user_object.get_name(),
+                "budget": session.user_object.get_budget()}
+
+    async def handle_connection(self, reader: asyncio.StreamReader,
+                                writer: asyncio.StreamWriter):
+        """
+        Serves the requests of one connection until it is closed or sits idle.
+
+        Args:
+            reader, writer: The connection's streams, as given by `asyncio.start_server`.
+        """
+        try:
+            while True:
+                try:
+                    head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"),
+                                                  self.idle_timeout)
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError,
+                        asyncio.TimeoutError, ConnectionError):
+                    return
+                keep_alive = await self._respond(head, reader, writer)
+                await writer.drain()
+                if not keep_alive:
+                    return
+        except ConnectionError:
+            return
+        finally:
+            writer.close()
+            with suppress(ConnectionError):
+                await writer.wait_closed()
+
+    async def _respond(self, head: bytes, reader: asyncio.StreamReader,
+                       writer: asyncio.StreamWriter) -> bool:
+        """Reads the body of one request, writes the response and says whether to go on."""
+        lines = head.decode("latin-1").split("\r\n")
+        try:
+            method, target, version = lines[0].split(" ")
+        except ValueError:
+            self._write(writer, HTTPStatus.BAD_REQUEST, b'{"error": "Malformed request"}',
+                        False)
+            return False
+        headers = {}
+        for line in lines[1:]:
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        connection = headers.get("connection", "").lower()
+        keep_alive = connection != "close" if version == "HTTP/1.1" \
+            else connection == "keep-alive"
+        if "transfer-encoding" in headers:
+            self._write(writer, HTTPStatus.NOT_IMPLEMENTED,
+                        b'{"error": "Send the body with a Content-Length"}', False)
+            return False
+        try:
+            length = int(headers.get("content-length", 0))
+        except ValueError:
+            length = -1
+        if not 0 <= length <= MAX_BODY:
+            self._write(writer, HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                        b'{"error": "Bad or too large Content-Length"}', False)
+            return False
+        try:
+            body = await reader.readexactly(length) if length else b""
+        except asyncio.IncompleteReadError:
+            # The client closed the connection before sending the whole body
+            return False
+
+        status, payload = await self.handle(method.upper(), target, body)
+        self._write(writer, status, payload, keep_alive, version)
+        return keep_alive
+
+    @staticmethod
+    def _write(writer: asyncio.StreamWriter, status: int, payload: bytes, keep_alive: bool,
+               version: str = "HTTP/1.1"):
+        phrase = HTTPStatus(status).phrase
+        connection = "keep-alive" if keep_alive else "close"
+        writer.write(f"{version} {status} {phrase}\r\n"
+                     f"Content-Type: application/json\r\n"
+                     f"Content-Length: {len(payload)}\r\n"
+                     f"Connection: {connection}\r\n\r\n".encode("latin-1") + payload)
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8080) -> asyncio.AbstractServer:
+        """
+        Starts listening, and builds the search index on the worker meanwhile.
+
+        Args:
+            host (str): The address to listen on.
+            port (int): The port to listen on; 0 picks a free one.
+
+        Returns:
+            asyncio.AbstractServer: The listening server.
+        """
+        self._worker.submit(self.search_index.refresh)
+        return await asyncio.start_server(self.handle_connection, host, port)
+
+    def close(self):
+        """Stops the worker thread."""
+        self._worker.shutdown(wait=False, cancel_futures=True)
+
+def _part_id(body: dict) -> str:
+    """The "part_id" of a request body."""
+    part_id = body.get("part_id")
+    if not isinstance(part_id, str) or not part_id.strip():
+        raise _HTTPError(HTTPStatus.BAD_REQUEST, 'Give the part as {"part_id": ...}')
+    return part_id
+
+async def serve(inventory_object, host: str = "127.0.0.1", port: int = 8080, # pylint: disable=too-many-arguments, too-many-positional-arguments
+                ready: Optional[Callable[[int], None]] = None,
+                session_ttl: float = DEFAULT_TTL, session_memory: int = DEFAULT_MAX_BYTES):
+    """
+    Serves the inventory until the task is cancelled.
+
+    Args:
+        inventory_object: The inventory to serve.
+        host (str): The address to listen on.
+        port (int): The port to listen on; 0 picks a free one.
+        ready (callable, optional): Called with the port once the server is listening.
+        session_ttl (float): Seconds a session may sit idle before it expires.
+        session_memory (int): Bytes the sessions may take before the least recently used
+            are evicted.
+    """
+    server = StorefrontServer(inventory_object, session_ttl=session_ttl,
+                              session_memory=session_memory)
+    listener = await server.start(host, port)
+    try:
+        if ready is not None:
+            ready(listener.sockets[0].getsockname()[1])
+        async with listener:
+            await listener.serve_forever()
+    finally:
+        server.close()
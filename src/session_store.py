@@ -0,0 +1,485 @@
+"""
+session_store.py
+
+Keeps the state of many shoppers' sessions (user, build and cart) between their requests.
+
+A live `CommandSession` holds dictionaries of `Item` references, a `BuildState` and a table
+of bound commands, which is far more than a shopper's state needs. The store keeps every
+session as a `SessionRecord` instead: the name and budget, the build, the cart's parts and
+the build in the cart as tuples of part IDs (the inventory's own ID strings, so they are not
+copied), the cached totals and where paging through builds has got to. A request thaws the
+record into a `CommandSession`, which re-resolves the parts in the current inventory (parts
+that were removed since drop out). The most recently used sessions stay thawed between
+requests, so a shopper's next request does not thaw them again; a session is frozen back into
+its record when it falls out of that set or its record is read.
+
+Records are kept in least-recently-used order:
+
+- A record left idle for longer than the TTL expires. Expired records are at the front, so
+  they are dropped as the store is used, without scanning it.
+- The store estimates the bytes held by each record; while the total exceeds the memory cap
+  the least recently used records are evicted, except the one just saved.
+
+Every session's parts are kept in a `PriceIndex`, updated as each request is saved, so
+`apply_inventory_diff` re-prices only the sessions holding a re-priced or removed part: a
+thawed session is re-priced in place, a session in use when its request is saved, and a
+record has its totals adjusted by the price differences without being thawed.
+
+Classes:
+- SessionRecord: The compact state of one session.
+- SessionStore: Records by session ID, with TTL expiry and LRU eviction under a memory cap.
+
+Functions:
+- freeze(session): The record of a `CommandSession`.
+- thaw(record, session): Restores a record into a new `CommandSession`.
+
+Acknowledged Pylint Standard Errors:
+src\\session_store.py:46:0: E0401: Unable to import 'src.prices' (import-error)
+"""
+import secrets
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional
+
+from src.prices import PriceIndex # pylint: disable=import-error
+
+# Seconds a session may sit idle before it expires.
+DEFAULT_TTL = 30 * 60
+# Bytes the records may take before the least recently used are evicted.
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+# Sessions kept thawed between requests.
+DEFAULT_HOT_CAPACITY = 256
+# Bytes an entry of the store's ordered dictionary takes besides the record and its key.
+_ENTRY_OVERHEAD = 104
+
+class SessionRecord: # pylint: disable=too-few-public-methods
+    """
+    The compact state of one session.
+
+    Attributes:
+        name (str): The user's name, or None.
+        budget (int): The user's budget.
+        build (tuple): The IDs of the parts in the build.
+        cart (tuple): The IDs of the single parts in the cart.
+        cart_build (tuple): The IDs of the parts of the build in the cart, or None.
+        build_total (int): The price of the build when it was saved.
+        cart_total (int): The price of the cart when it was saved.
+        browse_cursor (tuple): (price, rank) of the last build paged through, or None.
+        holder (str): The holder ID of the session's stock holds, or None.
+        last_used (float): When the session was last used, by the store's clock.
+        size (int): Estimated bytes held by the record.
+    """
+    __slots__ = ("name", "budget", "build", "cart", "cart_build", "build_total",
+                 "cart_total", "browse_cursor", "holder", "last_used", "size")
+
+    def __init__(self):
+        self.name: Optional[str] = None
+        self.budget = 0
+        self.build: tuple = ()
+        self.cart: tuple = ()
+        self.cart_build: Optional[tuple] = None
+        self.build_total = 0
+        self.cart_total = 0
+        self.browse_cursor: Optional[tuple] = None
+        self.holder: Optional[str] = None
+        self.last_used = 0.0
+        self.size = 0
+
+    def footprint(self) -> int:
+        """Estimates the bytes held by the record, not counting the shared ID strings."""
+        size = sys.getsizeof(self) + sys.getsizeof(self.build) + sys.getsizeof(self.cart)
+        if self.name is not None:
+            size += sys.getsizeof(self.name)
+        if self.cart_build is not None:
+            size += sys.getsizeof(self.cart_build)
+        if self.browse_cursor is not None:
+            size += sys.getsizeof(self.browse_cursor)
+        if self.holder is not None:
+            size += sys.getsizeof(self.holder)
+        return size
+
+def _part_ids(parts) -> tuple:
+    """The IDs of a build dictionary's parts."""
+    return tuple(item.item_id for part in parts.values()
+                 for item in (part if isinstance(part, list) else [part]) if item is not None)
+
+def _session_part_keys(session) -> set:
+    """The lower-cased IDs of the parts in a session's build and cart."""
+    keys = {item_id.lower() for item_id in _part_ids(session.build)}
+    for key, entry in session.cart.items():
+        if key == "BUILD":
+            keys.update(item_id.lower() for item_id in _part_ids(entry))
+        else:
+            keys.add(key.lower())
+    return keys
+
+def _reprice_record(record: SessionRecord, changes: Dict[str, tuple]):
+    """
+    Adjusts a record's totals by the price differences of its changed parts and drops its
+    removed parts.
+
+    Args:
+        record (SessionRecord): The record.
+        changes (dict): Lower-cased item ID -> (old price, new item or None if removed).
+    """
+    def reprice(part_ids: tuple) -> tuple:
+        kept, delta = [], 0
+        for item_id in part_ids:
+            change = changes.get(item_id.lower())
+            if change is None:
+                kept.append(item_id)
+            elif change[1] is None:
+                delta -= change[0]
+            else:
+                kept.append(item_id)
+                delta += int(change[1].price) - change[0]
+        return tuple(kept), delta
+
+    record.build, delta = reprice(record.build)
+    record.build_total += delta
+    record.cart, delta = reprice(record.cart)
+    record.cart_total += delta
+    if record.cart_build is not None:
+        record.cart_build, delta = reprice(record.cart_build)
+        record.cart_total += delta
+
+def freeze(session) -> SessionRecord:
+    """
+    Returns the compact record of a session.
+
+    Args:
+        session (CommandSession): The session.
+    """
+    record = SessionRecord()
+    record.name = session.user_object.get_name()
+    record.budget = session.user_object.get_budget()
+    record.build = _part_ids(session.build)
+    record.cart = tuple(item.item_id for key, item in session.cart.items() if key != "BUILD")
+    if "BUILD" in session.cart:
+        record.cart_build = _part_ids(session.cart["BUILD"])
+    record.build_total = session.build_total
+    record.cart_total = session.cart_total
+    if session.browse_cursor is not None:
+        record.browse_cursor = (session.browse_cursor["price"], session.browse_cursor["rank"])
+    record.holder = session.stock_hold.holder
+    record.size = record.footprint()
+    return record
+
+def thaw(record: SessionRecord, session):
+    """
+    Restores a record into a new session, resolving its parts in the current inventory.
+
+    Args:
+        record (SessionRecord): The record.
+        session (CommandSession): A new session to restore into.
+
+    Returns:
+        CommandSession: The session.
+    """
+    inventory = session.inventory_object
+    if record.holder is not None:
+        # The parts are still held under the session's holder ID
+        session.stock_hold.holder = record.holder
+    session.user_object.user_name = record.name
+    session.user_object.budget = record.budget
+    session.put_parts(item for item in map(inventory.get_item, record.build)
+                      if item is not None)
+    for item in map(inventory.get_item, record.cart):
+        if item is not None:
+            session.cart[item.item_id.upper()] = item
+            session.cart_total += int(item.price)
+    if record.cart_build is not None:
+        build = {"CPU": None, "GPU": None, "RAM": [], "PSU": None, "Motherboard": None,
+                 "Storage": []}
+        for item in map(inventory.get_item, record.cart_build):
+            if item is None:
+                continue
+            if isinstance(build[item.item_type], list):
+                build[item.item_type].append(item)
+            else:
+                build[item.item_type] = item
+            session.build_cost += int(item.price)
+        session.cart["BUILD"] = build
+        session.cart_total += session.build_cost
+    if record.browse_cursor is not None:
+        session.browse_cursor = {"price": record.browse_cursor[0],
+                                 "rank": record.browse_cursor[1]}
+    return session
+
+class SessionStore:
+    """
+    Session records by ID, expired after an idle TTL and evicted least recently used first
+    when their estimated size exceeds a memory cap.
+
+    The sessions used most recently are also kept thawed, up to `hot_capacity` of them, so a
+    shopper's consecutive requests do not thaw and freeze the same state again; a thawed
+    session is frozen back into its record when it drops out of that set or its record is
+    read. The memory cap covers the records; the thawed sessions are bounded by their count.
+
+    Attributes:
+        session_factory (callable): Makes the new, empty session a record is thawed into.
+        ttl (float): Seconds a session may sit idle.
+        max_bytes (int): The memory cap for the records, in estimated bytes.
+        hot_capacity (int): The most sessions kept thawed.
+        bytes (int): The estimated bytes held by the records.
+        created, expired, evicted, deleted (int): Sessions created, expired, evicted and ended.
+        repriced (int): Sessions re-priced after inventory changes.
+        price_index (PriceIndex): The sessions holding each part.
+    """
+    def __init__(self, session_factory: Callable, ttl: float = DEFAULT_TTL, # pylint: disable=too-many-arguments, too-many-positional-arguments
+                 max_bytes: int = DEFAULT_MAX_BYTES, hot_capacity: int = DEFAULT_HOT_CAPACITY,
+                 clock: Callable[[], float] = time.monotonic):
+        if ttl <= 0 or max_bytes <= 0 or hot_capacity < 0:
+            raise ValueError("The TTL and the memory cap must be positive and the hot capacity "
+                             "not negative")
+        self.session_factory = session_factory
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.hot_capacity = hot_capacity
+        self.clock = clock
+        self.bytes = 0
+        self.created = 0
+        self.expired = 0
+        self.evicted = 0
+        self.deleted = 0
+        self.repriced = 0
+        self.price_index = PriceIndex()
+        self._records: OrderedDict = OrderedDict()
+        self._hot: OrderedDict = OrderedDict()
+        self._in_use: set = set()
+        # Session ID -> diffs to apply to a session in use once its request is saved
+        self._pending: Dict[str, list] = {}
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __contains__(self, session_id: str) -> bool:
+        return self.record(session_id) is not None
+
+    def create(self) -> str:
+        """
+        Starts a session with an empty build and cart.
+
+        Returns:
+            str: The new session's ID.
+        """
+        session_id = secrets.token_hex(16)
+        record = SessionRecord()
+        record.size = record.footprint()
+        with self._lock:
+            self.created += 1
+            record.last_used = self.clock()
+            self._records[session_id] = record
+            self.bytes += record.size + sys.getsizeof(session_id) + _ENTRY_OVERHEAD
+            self._evict()
+        return session_id
+
+    def record(self, session_id: str) -> Optional[SessionRecord]:
+        """
+        Returns a session's record, marking the session as used, or None if it is unknown,
+        expired or evicted. The record is up to date unless a request is using the session.
+        """
+        with self._lock:
+            record = self._touch(session_id)
+            if record is not None and session_id in self._hot \
+                    and session_id not in self._in_use:
+                record = self._write_back(session_id, self._hot[session_id])
+            return record
+
+    def load(self, session_id: str):
+        """
+        Returns a session for a request, thawing it unless it is kept thawed. The session is
+        in use, and is not frozen, until it is saved.
+
+        Returns:
+            CommandSession: The session, or None if it is unknown, expired or evicted.
+        """
+        with self._lock:
+            record = self._touch(session_id)
+            if record is None:
+                return None
+            session = self._hot.get(session_id)
+            self._in_use.add(session_id)
+            if session is None:
+                session = thaw(record, self.session_factory())
+            self._keep_hot(session_id, session)
+            return session
+
+    def save(self, session_id: str, session):
+        """
+        Keeps a session's state after a request. A session that expired or was evicted or
+        ended meanwhile is not brought back.
+
+        Args:
+            session_id (str): The session's ID.
+            session (CommandSession): The session.
+        """
+        with self._lock:
+            self._in_use.discard(session_id)
+            if session_id in self._records:
+                for diff in self._pending.pop(session_id, ()):
+                    session.apply_inventory_diff(diff)
+                self.price_index.track(session_id, _session_part_keys(session))
+                self._keep_hot(session_id, session)
+
+    def locked(self) -> threading.RLock:
+        """
+        The store's lock, to hold while the inventory changes before `apply_inventory_diff`:
+        a session thawed from the new prices and frozen in between would be re-priced twice.
+        """
+        return self._lock
+
+    def apply_inventory_diff(self, diff) -> int:
+        """
+        Re-prices the sessions holding a part the diff changed or removed, found through the
+        price index; no other session is visited.
+
+        Args:
+            diff (InventoryDiff): The changes that were applied to the inventory.
+
+        Returns:
+            int: The number of sessions re-priced.
+        """
+        changes = {old.item_id.lower(): (int(old.price), new) for old, new in diff.changed}
+        changes.update((item.item_id.lower(), (int(item.price), None)) for item in diff.removed)
+        with self._lock:
+            owners = self.price_index.owners_of(diff)
+            for session_id in owners:
+                record = self._records.get(session_id)
+                if record is None:
+                    self.price_index.forget(session_id)
+                elif session_id in self._in_use:
+                    self._pending.setdefault(session_id, []).append(diff)
+                elif session_id in self._hot:
+                    session = self._hot[session_id]
+                    session.apply_inventory_diff(diff)
+                    self.price_index.track(session_id, _session_part_keys(session))
+                else:
+                    _reprice_record(record, changes)
+                    size = record.footprint()
+                    self.bytes += size - record.size
+                    record.size = size
+                    self.price_index.track(session_id, (
+                        item_id.lower()
+                        for item_id in record.build + record.cart + (record.cart_build or ())))
+            self.repriced += len(owners)
+            return len(owners)
+
+    def delete(self, session_id: str) -> bool:
+        """
+        Ends a session.
+
+        Returns:
+            bool: Whether the session existed.
+        """
+        with self._lock:
+            if session_id not in self._records:
+                return False
+            self._drop(session_id)
+            self.deleted += 1
+            return True
+
+    def expire(self) -> int:
+        """
+        Drops the sessions idle for longer than the TTL.
+
+        Returns:
+            int: The number of sessions dropped.
+        """
+        with self._lock:
+            return self._expire()
+
+    def stats(self) -> dict:
+        """
+        Returns the store's counters.
+
+        Returns:
+            dict: "resident" sessions, how many are kept thawed ("hot"), the records'
+            estimated "bytes", "max_bytes", "ttl", the sessions "created", "expired",
+            "evicted", "deleted" and "repriced", and how many are in the price index
+            ("priced").
+        """
+        with self._lock:
+            self._expire()
+            return {
+                "resident": len(self._records),
+                "hot": len(self._hot),
+                "bytes": self.bytes,
+                "max_bytes": self.max_bytes,
+                "ttl": self.ttl,
+                "created": self.created,
+                "expired": self.expired,
+                "evicted": self.evicted,
+                "deleted": self.deleted,
+                "repriced": self.repriced,
+                "priced": len(self.price_index),
+            }
+
+    def _touch(self, session_id: str) -> Optional[SessionRecord]:
+        """Marks a session as used and returns its record. The lock must be held."""
+        self._expire()
+        record = self._records.get(session_id)
+        if record is not None:
+            record.last_used = self.clock()
+            self._records.move_to_end(session_id)
+        return record
+
+    def _keep_hot(self, session_id: str, session):
+        """
+        Keeps a session thawed, freezing the least recently used thawed ones that are not in
+        use while there are too many.
+        """
+        self._hot[session_id] = session
+        self._hot.move_to_end(session_id)
+        while len(self._hot) > self.hot_capacity:
+            oldest_id = next((hot_id for hot_id in self._hot if hot_id not in self._in_use),
+                             None)
+            if oldest_id is None:
+                break
+            self._write_back(oldest_id, self._hot.pop(oldest_id))
+
+    def _write_back(self, session_id: str, session) -> Optional[SessionRecord]:
+        """Freezes a session into its record and evicts down to the cap."""
+        previous = self._records.get(session_id)
+        if previous is None:
+            return None
+        record = freeze(session)
+        record.last_used = previous.last_used
+        # Assigning to an existing key keeps its place in the LRU order
+        self._records[session_id] = record
+        self.bytes += record.size - previous.size
+        self._evict(keep=session_id)
+        return self._records.get(session_id)
+
+    def _evict(self, keep: Optional[str] = None):
+        """Evicts the least recently used records while the cap is exceeded."""
+        while self.bytes > self.max_bytes and len(self._records) > 1:
+            oldest_id = next(iter(self._records))
+            if oldest_id == keep:
+                oldest_id = list(self._records)[1]
+            self._drop(oldest_id)
+            self.evicted += 1
+
+    def _drop(self, session_id: str):
+        """Removes a session and its thawed state. The lock must be held."""
+        record = self._records.pop(session_id)
+        self._hot.pop(session_id, None)
+        self._pending.pop(session_id, None)
+        self.price_index.forget(session_id)
+        self.bytes -= record.size + sys.getsizeof(session_id) + _ENTRY_OVERHEAD
+
+    def _expire(self) -> int:
+        """Drops the expired records from the front. The lock must be held."""
+        deadline = self.clock() - self.ttl
+        dropped = 0
+        while self._records:
+            session_id, record = next(iter(self._records.items()))
+            if record.last_used > deadline:
+                break
+            self._drop(session_id)
+            dropped += 1
+        self.expired += dropped
+        return dropped
@@ -0,0 +1,464 @@
+"""
+snapshot.py
+
+Compiled binary snapshots of an inventory file for near-instant startup.
+
+The first time a JSON inventory is opened with snapshots enabled it is parsed once and
+written next to the source as `<inventory_file>.snap`. Later launches `mmap` that file and
+read nothing but its fixed-size header: items are decoded from their fixed-width records
+only when a lookup or listing touches them, so startup time does not grow with the size of
+the catalog.
+
+Snapshot layout (little-endian):
+- Header: magic, format version, the source file's mtime (ns), size and SHA-256, the row
+  and hash-slot counts, and the offsets of the sections below.
+- Records: one fixed-width record per item, grouped by item type (file order is kept within
+  a type) so a category listing is one contiguous range.
+- Slots: an open-addressing hash table of row numbers keyed by the CRC-32 of the lower-cased
+  item ID.
+- Strings: the UTF-8 IDs and names the records point into.
+- Dictionary: a small JSON document with the type and socket names the records encode and
+  the row range of every type.
+
+A snapshot is current when the source's mtime and size match the header. When only the
+mtime differs the source is hashed and, if the content is unchanged, the header is updated
+in place; otherwise the snapshot is rebuilt.
+
+Classes:
+- SnapshotInventory: Read-mostly Inventory backed by a memory-mapped snapshot.
+
+Functions:
+- snapshot_path(inventory_file): Returns where the snapshot of a source file lives.
+- write_snapshot(inventory_file, snapshot_file): Compiles a JSON inventory into a snapshot.
+- open_snapshot(inventory_file): Opens a current snapshot, rebuilding a stale one first.
+
+Acknowledged Pylint Standard Errors:
+src\\snapshot.py:47:0: E0401: Unable to import 'src.inventory' (import-error)
+src\\snapshot.py:48:0: E0401: Unable to import 'src.loader' (import-error)
+"""
+import hashlib
+import json
+import mmap
+import os
+import struct
+import zlib
+from typing import Dict, List, Optional
+
+from src.inventory import CPU, GPU, RAM, PSU, Motherboard, Storage, Item, part_types # pylint: disable=import-error
+from src.loader import load_inventory_file # pylint: disable=import-error
+
+SNAPSHOT_SUFFIX = ".snap"
+MAGIC = b"SFSNAP01"
+FORMAT_VERSION = 2
+
+# magic, version, source mtime_ns, source size, source sha256, row count, slot count,
+# records / slots / strings / dictionary offsets, dictionary length
+HEADER = struct.Struct("<8sIqq32sIIQQQQI")
+# id offset, id length, name offset, name length, type code, socket code, overclockable,
+# price, power_draw, power_supplied, capacity, ram_slots, stock (NO_CODE if not tracked)
+RECORD = struct.Struct("<QIQIbhbqqqqqq")
+SLOT = struct.Struct("<I")
+MTIME_OFFSET = struct.calcsize("<8sI")
+
+NO_CODE = -1
+EMPTY_SLOT = 0
+
+def snapshot_path(inventory_file: str) -> str:
+    """Returns the path of the snapshot kept next to `inventory_file`."""
+    return inventory_file + SNAPSHOT_SUFFIX
+
+def _hash_file(path: str) -> bytes:
+    """Returns the SHA-256 digest of a file, read in 1 MiB blocks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for block in iter(lambda: file.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.digest()
+
+def _slot_of(item_key: str, slot_count: int) -> int:
+    """Returns the home slot of a lower-cased item ID."""
+    return zlib.crc32(item_key.encode('utf-8')) & (slot_count - 1)
+
+def write_snapshot(inventory_file: str, snapshot_file: Optional[str] = None) -> str:
+    """
+    Parses a JSON inventory and writes its binary snapshot.
+
+    The snapshot is written to a temporary file and renamed into place, so a concurrent
+    reader never sees a half-written snapshot.
+
+    Args:
+        inventory_file (str): Path to the JSON inventory.
+        snapshot_file (str, optional): Destination. Defaults to `snapshot_path(inventory_file)`.
+
+    Returns:
+        str: The path of the written snapshot.
+    """
+    snapshot_file = snapshot_file or snapshot_path(inventory_file)
+    source_stat = os.stat(inventory_file)
+    source_hash = _hash_file(inventory_file)
+    inventory = load_inventory_file(inventory_file)
+
+    type_names = list(part_types)
+    rows: List[Item] = []
+    type_ranges = {}
+    for item_type in type_names:
+        start = len(rows)
+        rows.extend(inventory.get_items_by_type(item_type))
+        type_ranges[item_type] = [start, len(rows)]
+
+    socket_names: List[str] = []
+    socket_lookup: Dict[str, int] = {}
+    strings = bytearray()
+    records = bytearray()
+    for item in rows:
+        id_offset = len(strings)
+        strings += item.item_id.encode('utf-8')
+        name_offset = len(strings)
+        strings += item.name.encode('utf-8')
+
+        socket = getattr(item, "socket", None)
+        socket_code = NO_CODE
+        if socket is not None:
+            if socket not in socket_lookup:
+                socket_lookup[socket] = len(socket_names)
+                socket_names.append(socket)
+            socket_code = socket_lookup[socket]
+        overclockable = getattr(item, "overclockable", None)
+
+        records += RECORD.pack(
+            id_offset, name_offset - id_offset, name_offset, len(strings) - name_offset,
+            type_names.index(item.item_type), socket_code,
+            NO_CODE if overclockable is None else int(overclockable),
+            int(item.price), int(item.power_draw), int(getattr(item, "power_supplied", 0)),
+            int(getattr(item, "capacity", 0)), int(getattr(item, "ram_slots", 0)),
+            NO_CODE if item.stock is None else int(item.stock)
+        )
+
+    slot_count = 8
+    while slot_count * 2 < len(rows) * 3:
+        slot_count *= 2
+    slots = [EMPTY_SLOT] * slot_count
+    for row, item in enumerate(rows):
+        slot = _slot_of(item.item_id.lower(), slot_count)
+        while slots[slot] != EMPTY_SLOT:
+            slot = (slot + 1) & (slot_count - 1)
+        slots[slot] = row + 1
+
+    dictionary = json.dumps({
+        "type_names": type_names,
+        "socket_names": socket_names,
+        "type_ranges": type_ranges,
+    }).encode('utf-8')
+
+    records_offset = HEADER.size
+    slots_offset = records_offset + len(records)
+    strings_offset = slots_offset + slot_count * SLOT.size
+    dictionary_offset = strings_offset + len(strings)
+
+    temporary_file = f"{snapshot_file}.{os.getpid()}.tmp"
+    with open(temporary_file, 'wb') as file:
+        file.write(HEADER.pack(
+            MAGIC, FORMAT_VERSION, source_stat.st_mtime_ns, source_stat.st_size, source_hash,
+            len(rows), slot_count, records_offset, slots_offset, strings_offset,
+            dictionary_offset, len(dictionary)
+        ))
+        file.write(records)
+        file.write(struct.pack(f"<{slot_count}I", *slots))
+        file.write(strings)
+        file.write(dictionary)
+    os.replace(temporary_file, snapshot_file)
+    return snapshot_file
+
+def _snapshot_is_current(inventory_file: str, snapshot_file: str) -> bool:
+    """
+    Checks a snapshot against its source, refreshing the stored mtime when only the
+    timestamp (not the content) of the source changed.
+    """
+    try:
+        with open(snapshot_file, 'rb') as file:
+            header = file.read(HEADER.size)
+    except OSError:
+        return False
+    if len(header) != HEADER.size:
+        return False
+
+    magic, version, mtime_ns, size, source_hash = HEADER.unpack(header)[:5]
+    if magic != MAGIC or version != FORMAT_VERSION:
+        return False
+
+    source_stat = os.stat(inventory_file)
+    if source_stat.st_size != size:
+        return False
+    if source_stat.st_mtime_ns == mtime_ns:
+        return True
+    if _hash_file(inventory_file) != source_hash:
+        return False
+
+    with open(snapshot_file, 'r+b') as file:
+        file.seek(MTIME_OFFSET)
+        file.write(struct.pack("<q", source_stat.st_mtime_ns))
+    return True
+
+def open_snapshot(inventory_file: str):
+    """
+    Opens the snapshot of an inventory file, (re)building it first if it is missing or stale.
+
+    Args:
+        inventory_file (str): Path to the JSON inventory.
+
+    Returns:
+        SnapshotInventory: The memory-mapped inventory.
+    """
+    snapshot_file = snapshot_path(inventory_file)
+    if not _snapshot_is_current(inventory_file, snapshot_file):
+        write_snapshot(inventory_file, snapshot_file)
+    return SnapshotInventory(snapshot_file)
+
+class SnapshotInventory:
+    """
+    Inventory backed by a memory-mapped snapshot.
+
+    Rows are decoded into Item objects on first access and cached, so repeated lookups of
+    the same part return the same object. Items added or removed at runtime are kept in an
+    in-memory overlay; the snapshot file itself is never modified.
+
+    Attributes:
+        snapshot_file (str): Path of the mapped snapshot.
+        row_count (int): Number of items stored in the snapshot.
+    """
+    def __init__(self, snapshot_file: str) -> None:
+        self.snapshot_file = snapshot_file
+        with open(snapshot_file, 'rb') as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        (magic, _, _, _, _, self.row_count, self._slot_count, self._records_offset,
+         self._slots_offset, self._strings_offset, dictionary_offset,
+         dictionary_length) = HEADER.unpack_from(
+             self._map, 0
+        )
+        if magic != MAGIC:
+            raise ValueError(f"{snapshot_file} is not an inventory snapshot")
+
+        dictionary = json.loads(
+            self._map[dictionary_offset:dictionary_offset + dictionary_length]
+        )
+        self._type_names: List[str] = dictionary["type_names"]
+        self._socket_names: List[str] = dictionary["socket_names"]
+        self._type_ranges: Dict[str, List[int]] = dictionary["type_ranges"]
+
+        self._cache: Dict[int, Item] = {}
+        self._socket_rows: Optional[Dict[tuple, List[int]]] = None
+        self._ram_slots_rows: Optional[Dict[int, List[int]]] = None
+        self._added: Dict[str, Item] = {}
+        self._removed: set = set()
+        self.version: int = 0
+
+    @property
+    def items(self):
+        """All items, grouped by type, decoded as they are iterated."""
+        for item_type in self._type_names:
+            yield from self.get_items_by_type(item_type)
+        for item in self._added.values():
+            if item.item_type not in self._type_names:
+                yield item
+
+    def __len__(self) -> int:
+        return self.row_count - len(self._removed) + len(self._added)
+
+    def add_item(self, item: Item):
+        """
+        Adds an item to the in-memory overlay.
+
+        Raises:
+            ValueError: If an item with the same ID (ignoring case) is already in the inventory.
+        """
+        item_key = item.item_id.lower()
+        if self.get_item(item_key) is not None:
+            raise ValueError(f"Duplicate item ID: {item.item_id}")
+        self._added[item_key] = item
+        self.version += 1
+
+    def remove_item(self, item_id: str) -> Optional[Item]:
+        """
+        Removes an item, hiding it if it lives in the snapshot.
+
+        Returns:
+            Item: The removed item, or None if the ID is not in the inventory.
+        """
+        item_key = item_id.strip().lower()
+        item = self.get_item(item_key)
+        if item is None:
+            return None
+
+        self._added.pop(item_key, None)
+        if self._find_row(item_key) is not None:
+            self._removed.add(item_key)
+        self.version += 1
+        return item
+
+    def replace_item(self, item: Item) -> Optional[Item]:
+        """
+        Replaces the item that has the same ID by shadowing it in the overlay.
+
+        Returns:
+            Item: The replaced item, or None (and nothing is changed) if the ID is not in the
+            inventory.
+        """
+        item_key = item.item_id.lower()
+        old_item = self.get_item(item_key)
+        if old_item is None:
+            return None
+
+        if self._find_row(item_key) is not None:
+            self._removed.add(item_key)
+        self._added[item_key] = item
+        self.version += 1
+        return old_item
+
+    def get_item(self, item_id: str) -> Optional[Item]:
+        """
+        Looks up an item by its ID by probing the snapshot's hash table.
+
+        Args:
+            item_id (str): The ID of the item, matched without regard to case.
+
+        Returns:
+            Item: The matching item, or None if the ID is not in the inventory.
+        """
+        item_key = item_id.strip().lower()
+        if item_key in self._added:
+            return self._added[item_key]
+        if item_key in self._removed:
+            return None
+
+        row = self._find_row(item_key)
+        return None if row is None else self._materialize(row)
+
+    def _find_row(self, item_key: str) -> Optional[int]:
+        """Returns the snapshot row holding a lower-cased ID, ignoring the overlay."""
+        mask = self._slot_count - 1
+        slot = _slot_of(item_key, self._slot_count)
+        while True:
+            (entry,) = SLOT.unpack_from(self._map, self._slots_offset + slot * SLOT.size)
+            if entry == EMPTY_SLOT:
+                return None
+            row = entry - 1
+            if self._read_id(row).lower() == item_key:
+                return row
+            slot = (slot + 1) & mask
+
+    def get_items_by_type(self, item_type: str) -> List[Item]:
+        """
+        Returns the items of one type, decoding only that type's contiguous row range.
+        """
+        start, end = self._type_ranges.get(item_type, (0, 0))
+        items = self._materialize_rows(range(start, end))
+        items.extend(item for item in self._added.values() if item.item_type == item_type)
+        return items
+
+    def get_items_by_socket(self, item_type: str, socket: str) -> List[Item]:
+        """
+        Returns the CPUs or motherboards (per `item_type`) that use the given socket.
+        """
+        if self._socket_rows is None:
+            self._build_secondary_indexes()
+        items = self._materialize_rows(self._socket_rows.get((item_type, socket), ()))
+        items.extend(
+            item for item in self._added.values()
+            if item.item_type == item_type and getattr(item, "socket", None) == socket
+        )
+        return items
+
+    def get_items_by_ram_slots(self, ram_slots: int) -> List[Item]:
+        """
+        Returns the motherboards that have exactly `ram_slots` RAM slots.
+        """
+        if self._ram_slots_rows is None:
+            self._build_secondary_indexes()
+        items = self._materialize_rows(self._ram_slots_rows.get(ram_slots, ()))
+        items.extend(
+            item for item in self._added.values()
+            if item.item_type == "Motherboard" and int(item.ram_slots) == ram_slots
+        )
+        return items
+
+    def get_ram_slot_counts(self) -> List[int]:
+        """
+        Returns the distinct motherboard RAM slot counts present, in ascending order.
+        """
+        return sorted({int(board.ram_slots) for board in self.get_items_by_type("Motherboard")})
+
+    def close(self):
+        """Releases the memory map."""
+        self._map.close()
+
+    def _build_secondary_indexes(self):
+        """
+        Builds the socket and RAM slot indexes from the CPU and motherboard row ranges,
+        reading only the record fields involved.
+        """
+        self._socket_rows = {}
+        self._ram_slots_rows = {}
+        for item_type in ("CPU", "Motherboard"):
+            start, end = self._type_ranges.get(item_type, (0, 0))
+            for row in range(start, end):
+                record = RECORD.unpack_from(self._map, self._record_offset(row))
+                socket = self._socket_names[record[5]]
+                self._socket_rows.setdefault((item_type, socket), []).append(row)
+                if item_type == "Motherboard":
+                    self._ram_slots_rows.setdefault(record[11], []).append(row)
+
+    def _record_offset(self, row: int) -> int:
+        """Returns the file offset of a row's record."""
+        return self._records_offset + row * RECORD.size
+
+    def _read_id(self, row: int) -> str:
+        """Decodes just the ID of a row."""
+        id_offset, id_length = struct.unpack_from("<QI", self._map, self._record_offset(row))
+        return self._read_string(id_offset, id_length)
+
+    def _read_string(self, offset: int, length: int) -> str:
+        """Decodes a value from the strings section."""
+        start = self._strings_offset + offset
+        return self._map[start:start + length].decode('utf-8')
+
+    def _materialize_rows(self, rows) -> List[Item]:
+        """Decodes the rows that have not been removed."""
+        items = []
+        for row in rows:
+            item = self._materialize(row)
+            if item.item_id.lower() not in self._removed:
+                items.append(item)
+        return items
+
+    def _materialize(self, row: int) -> Item:
+        """Decodes one record into its Item subclass, caching the result."""
+        item = self._cache.get(row)
+        if item is not None:
+            return item
+
+        (id_offset, id_length, name_offset, name_length, type_code, socket_code,
+         overclockable, price, power_draw, power_supplied, capacity,
+         ram_slots, stock) = RECORD.unpack_from(self._map, self._record_offset(row))
+        item_id = self._read_string(id_offset, id_length)
+        name = self._read_string(name_offset, name_length)
+        item_type = self._type_names[type_code]
+
+        if item_type == "CPU":
+            item = CPU(item_id, name, price, power_draw, self._socket_names[socket_code])
+        elif item_type == "GPU":
+            item = GPU(item_id, name, price, power_draw, bool(overclockable))
+        elif item_type == "RAM":
+            item = RAM(item_id, name, price, power_draw, capacity)
+        elif item_type == "PSU":
+            item = PSU(item_id, name, price, power_supplied)
+        elif item_type == "Motherboard":
+            item = Motherboard(item_id, name, price, power_draw,
+                               self._socket_names[socket_code], ram_slots)
+        else:
+            item = Storage(item_id, name, price, capacity)
+        if stock != NO_CODE:
+            item.stock = stock
+
+        self._cache[row] = item
+        return item
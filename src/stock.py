@@ -0,0 +1,371 @@
+"""
+stock.py
+
+Stock levels and reservations, safe for many shoppers checking out at once.
+
+A catalog entry may carry a "stock" field; parts without one are not tracked and are never
+short. The `StockLedger` is the live authority for the tracked parts: it starts each part
+at the stock it was loaded with and keeps, per part, the units left and the units held by
+shoppers.
+
+- Putting a part in a build or a cart holds a unit of it for the shopper. A shopper's holds
+  are set as a whole from what their build and cart contain, so whatever was added,
+  removed, replaced or reloaded the shopper holds exactly what they have. A part in both
+  the build and the cart is held once, since only the cart is bought.
+- Holds are time-limited: a shopper who does nothing for `hold_seconds` loses them, and the
+  units are free for others again. Any change to the build or cart renews them.
+- Checkout commits the shopper's parts in one step: either every part is still available to
+  them (held, or free) and all of them are taken from stock, or nothing changes and the
+  parts that are short are reported.
+
+Each part is guarded by one of a fixed set of striped locks chosen by its ID, never by a
+lock over the whole ledger, so shoppers buying different parts do not wait for each other.
+An operation on several parts takes their stripes in ascending order, so two checkouts can
+not deadlock.
+
+Classes:
+- OutOfStockError: Raised when parts are not available in the quantities asked for.
+- StockLedger: The units left and held of every tracked part.
+- StockHold: The holds of one shopper, kept in step with their build and cart.
+
+Functions:
+- part_counts(parts): Counts the tracked parts of some build and cart contents.
+"""
+import itertools
+import threading
+import time
+from collections import OrderedDict
+from contextlib import ExitStack
+from typing import Callable, Dict, Iterable, Optional
+
+# Seconds a shopper's holds last without any change to their build or cart.
+DEFAULT_HOLD_SECONDS = 15 * 60
+# Locks the parts are spread over.
+LOCK_STRIPES = 64
+
+_holder_numbers = itertools.count(1)
+
+class OutOfStockError(Exception):
+    """
+    Raised when parts are not available in the quantities asked for.
+
+    Attributes:
+        shortages (dict): Item ID -> (units wanted, units available).
+    """
+    def __init__(self, shortages: Dict[str, tuple]):
+        self.shortages = shortages
+        details = ", ".join(f"{item_id} ({wanted} wanted, {available} available)"
+                            for item_id, (wanted, available) in shortages.items())
+        super().__init__(f"Not enough stock: {details}")
+
+def part_counts(parts: Iterable) -> Dict[str, list]:
+    """
+    Counts the tracked parts among some build and cart contents.
+
+    Args:
+        parts: Items, lists of items (a build's RAM or storage), dictionaries of either
+            (a build, a cart) and None for empty slots, in any nesting.
+
+    Returns:
+        dict: Lower-cased item ID -> [item, units], for the parts whose stock is tracked.
+    """
+    counts: Dict[str, list] = {}
+    pending = list(parts)
+    while pending:
+        part = pending.pop()
+        if part is None:
+            continue
+        if isinstance(part, dict):
+            pending.extend(part.values())
+        elif isinstance(part, list):
+            pending.extend(part)
+        elif part.stock is not None:
+            entry = counts.setdefault(part.item_id.lower(), [part, 0])
+            entry[1] += 1
+    return counts
+
+class StockLedger:
+    """
+    The units left and held of every tracked part.
+
+    Attributes:
+        hold_seconds (float): Seconds a holder's holds last without being renewed.
+        clock (callable): Returns the current time in seconds.
+        committed (int): Checkouts committed.
+        rejected (int): Holds and checkouts refused for lack of stock.
+        expired (int): Holders whose holds lapsed.
+    """
+    def __init__(self, hold_seconds: float = DEFAULT_HOLD_SECONDS, stripes: int = LOCK_STRIPES,
+                 clock: Callable[[], float] = time.monotonic):
+        self.hold_seconds = hold_seconds
+        self.clock = clock
+        self.committed = 0
+        self.rejected = 0
+        self.expired = 0
+        # Item key -> units left / units held by holders whose holds have not lapsed, each
+        # changed only under the item's stripe.
+        self._left: Dict[str, int] = {}
+        self._held: Dict[str, int] = {}
+        self._stripes = [threading.Lock() for _ in range(stripes)]
+        # Holder -> {item key: units}, and the holders by deadline, soonest first
+        self._holds: Dict[str, Dict[str, int]] = {}
+        self._deadlines: OrderedDict = OrderedDict()
+        self._holders_lock = threading.Lock()
+        # Guards `committed` and `rejected`, which holds and checkouts on different stripes
+        # count at the same time
+        self._counters_lock = threading.Lock()
+
+    def new_holder(self) -> str:
+        """Returns a new holder ID for a shopper."""
+        return f"holder-{next(_holder_numbers)}"
+
+    def available(self, item) -> Optional[int]:
+        """
+        Returns the units of a part that are neither sold nor held, or None if its stock is
+        not tracked.
+        """
+        if item.stock is None:
+            return None
+        self._expire()
+        item_key = item.item_id.lower()
+        with self._stripe(item_key):
+            return self._left.get(item_key, int(item.stock)) - self._held.get(item_key, 0)
+
+    def hold(self, holder: str, counts: Dict[str, list]):
+        """
+        Sets a holder's holds to the given parts, renewing them. Either every part that is
+        held more of than before is available, and all holds are updated, or nothing changes.
+
+        Args:
+            holder (str): The holder ID.
+            counts (dict): Lower-cased item ID -> [item, units], as made by `part_counts`.
+
+        Raises:
+            OutOfStockError: If more of a part is wanted than is free.
+        """
+        self._expire()
+        current = self._renew(holder)
+        changes = {item_key: units - current.get(item_key, 0)
+                   for item_key, (_, units) in counts.items()}
+        for item_key, units in current.items():
+            if item_key not in counts:
+                changes[item_key] = -units
+        changes = {item_key: units for item_key, units in changes.items() if units}
+        if not changes:
+            if not counts:
+                # Nothing held, so nothing to expire
+                with self._holders_lock:
+                    self._deadlines.pop(holder, None)
+            return
+
+        items = {item_key: item for item_key, (item, _) in counts.items()}
+        with self._stripes_of(changes):
+            shortages = {}
+            for item_key, units in changes.items():
+                if units > 0:
+                    free = self._left_of(item_key, items[item_key]) - self._held.get(item_key, 0)
+                    if units > free:
+                        shortages[items[item_key].item_id] = (counts[item_key][1],
+                                                              free + current.get(item_key, 0))
+            if shortages:
+                with self._counters_lock:
+                    self.rejected += 1
+                raise OutOfStockError(shortages)
+            for item_key, units in changes.items():
+                self._held[item_key] = self._held.get(item_key, 0) + units
+        with self._holders_lock:
+            if counts:
+                self._holds[holder] = {item_key: units for item_key, (_, units) in counts.items()}
+            else:
+                self._holds.pop(holder, None)
+                self._deadlines.pop(holder, None)
+
+    def release(self, holder: str):
+        """Drops all of a holder's holds."""
+        with self._holders_lock:
+            self._deadlines.pop(holder, None)
+            holds = self._holds.pop(holder, {})
+        self._unhold(holds)
+
+    def commit(self, holder: str, counts: Dict[str, list]):
+        """
+        Takes a holder's parts out of stock, all or none of them, and drops their holds.
+
+        A part counts as available to the holder when they hold it or it is free, so a
+        checkout whose holds lapsed still succeeds while nobody else took the parts.
+
+        Args:
+            holder (str): The holder ID.
+            counts (dict): Lower-cased item ID -> [item, units], as made by `part_counts`.
+
+        Raises:
+            OutOfStockError: If a part is short; nothing is taken.
+        """
+        self._expire()
+        with self._holders_lock:
+            self._deadlines.pop(holder, None)
+            holds = self._holds.pop(holder, {})
+        with self._stripes_of(set(counts) | set(holds)):
+            shortages = {}
+            for item_key, (item, units) in counts.items():
+                own = holds.get(item_key, 0)
+                free = self._left_of(item_key, item) - self._held.get(item_key, 0) + own
+                if units > free:
+                    shortages[item.item_id] = (units, free)
+            if shortages:
+                with self._counters_lock:
+                    self.rejected += 1
+                # The holder keeps the holds they had
+                with self._holders_lock:
+                    self._holds[holder] = holds
+                    self._deadlines[holder] = self.clock() + self.hold_seconds
+                raise OutOfStockError(shortages)
+            for item_key, (_, units) in counts.items():
+                self._left[item_key] -= units
+            for item_key, units in holds.items():
+                self._held[item_key] -= units
+            with self._counters_lock:
+                self.committed += 1
+
+    def restock(self, item, units: int):
+        """
+        Adds units of a part to the stock, starting to track it if it was not.
+
+        Args:
+            item (Item): The part.
+            units (int): The units added.
+        """
+        if item.stock is None:
+            item.stock = 0
+        item_key = item.item_id.lower()
+        with self._stripe(item_key):
+            self._left[item_key] = self._left_of(item_key, item) + units
+
+    def stats(self) -> dict:
+        """
+        Returns the ledger's counters.
+
+        Returns:
+            dict: "holders" with holds, "tracked" parts touched so far, checkouts
+            "committed", holds and checkouts "rejected" and holders "expired".
+        """
+        self._expire()
+        with self._counters_lock:
+            committed, rejected = self.committed, self.rejected
+        return {"holders": len(self._holds), "tracked": len(self._left),
+                "committed": committed, "rejected": rejected, "expired": self.expired}
+
+    def _left_of(self, item_key: str, item) -> int:
+        """The units left of a part, starting from its catalog stock. The stripe is held."""
+        left = self._left.get(item_key)
+        if left is None:
+            left = self._left[item_key] = int(item.stock)
+        return left
+
+    def _renew(self, holder: str) -> Dict[str, int]:
+        """Pushes a holder's deadline back and returns their holds."""
+        with self._holders_lock:
+            self._deadlines.pop(holder, None)
+            self._deadlines[holder] = self.clock() + self.hold_seconds
+            return self._holds.get(holder, {})
+
+    def _expire(self):
+        """Drops the holds of the holders whose deadline passed, soonest first."""
+        now = self.clock()
+        lapsed = []
+        with self._holders_lock:
+            while self._deadlines:
+                holder, deadline = next(iter(self._deadlines.items()))
+                if deadline > now:
+                    break
+                del self._deadlines[holder]
+                lapsed.append(self._holds.pop(holder, {}))
+            self.expired += len(lapsed)
+        for holds in lapsed:
+            self._unhold(holds)
+
+    def _unhold(self, holds: Dict[str, int]):
+        """Returns held units to the free stock."""
+        if holds:
+            with self._stripes_of(holds):
+                for item_key, units in holds.items():
+                    self._held[item_key] -= units
+
+    def _stripe(self, item_key: str) -> threading.Lock:
+        """The lock guarding a part."""
+        return self._stripes[hash(item_key) % len(self._stripes)]
+
+    def _stripes_of(self, item_keys) -> ExitStack:
+        """Takes the locks guarding some parts, in ascending order, until the block ends."""
+        numbers = sorted({hash(item_key) % len(self._stripes) for item_key in item_keys})
+        stack = ExitStack()
+        for number in numbers:
+            stack.enter_context(self._stripes[number])
+        return stack
+
+class StockHold:
+    """
+    The holds of one shopper, kept in step with the build and cart they come from.
+
+    Each source is counted on its own and the shopper holds, of every part, the most any
+    source needs: a build that was also put in the cart needs its parts once, while a part in
+    the cart both on its own and in the cart's build needs two units.
+
+    Attributes:
+        ledger (StockLedger): The ledger, or None when stock is not checked.
+        holder (str): The shopper's holder ID.
+        sources (list): Callables returning the contents to hold, e.g. the build and the cart.
+    """
+    def __init__(self, ledger: Optional[StockLedger], holder: Optional[str] = None):
+        self.ledger = ledger
+        self.holder = holder if holder is not None or ledger is None else ledger.new_holder()
+        self.sources: list = []
+
+    def counts(self) -> Dict[str, list]:
+        """Returns the units to hold of every tracked part, as made by `part_counts`."""
+        counts: Dict[str, list] = {}
+        for source in self.sources:
+            for item_key, (item, units) in part_counts([source()]).items():
+                if units > counts.get(item_key, (None, 0))[1]:
+                    counts[item_key] = [item, units]
+        return counts
+
+    def sync(self):
+        """
+        Holds what the sources contain now, renewing the holds. Call it after adding parts,
+        and undo the change if it fails.
+
+        Raises:
+            OutOfStockError: If a part is needed more than is free; the holds do not change.
+        """
+        if self.ledger is not None:
+            self.ledger.hold(self.holder, self.counts())
+
+    def refresh(self):
+        """
+        Holds what the sources contain now, after parts were taken out. The holds only
+        shrink, unless they had lapsed and the parts were taken meanwhile, in which case the
+        shopper holds nothing and checkout reports what is short.
+        """
+        try:
+            self.sync()
+        except OutOfStockError:
+            pass
+
+    def commit(self, contents):
+        """
+        Takes the parts bought out of stock, all or none of them, and drops the holds.
+
+        Args:
+            contents: The contents bought, e.g. the cart.
+
+        Raises:
+            OutOfStockError: If a part is short; nothing is taken.
+        """
+        if self.ledger is not None:
+            self.ledger.commit(self.holder, part_counts([contents]))
+
+    def release(self):
+        """Drops the shopper's holds."""
+        if self.ledger is not None:
+            self.ledger.release(self.holder)
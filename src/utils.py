@@ -1,14 +1,25 @@
 """
 Utility function to clear the terminal screen.
 
-Uses 'cls' for Windows and 'clear' for other operating systems.
+The screen is cleared with ANSI sequences rather than by running 'cls' or 'clear'. While the
+menus run under a `TerminalRenderer` (see render.py) clearing only starts a new screen, which
+the renderer draws in one write; otherwise the sequences are written straight away. Nothing
+is cleared when stdout is not a terminal, so piped output stays append-only.
 
 This function is part of the utils.py module.
+
+Acknowledged Pylint Standard Errors:
+src\\utils.py:15:0: E0401: Unable to import 'src.render' (import-error)
 """
-import os
+import sys
+from src.render import ERASE_SCREEN, HOME, TerminalRenderer # pylint: disable=import-error
 
 def clear_screen():
     """
-    Clears the terminal screen using 'cls' for Windows and 'clear' for other systems.
+    Clears the terminal screen, or starts a new screen when output goes through a renderer.
     """
-    os.system('cls' if os.name == 'nt' else 'clear')
+    if isinstance(sys.stdout, TerminalRenderer):
+        sys.stdout.clear()
+    elif sys.stdout.isatty():
+        sys.stdout.write(HOME + ERASE_SCREEN)
+        sys.stdout.flush()
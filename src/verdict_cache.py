@@ -0,0 +1,170 @@
+"""
+verdict_cache.py
+
+A bounded LRU cache of compatibility verdicts.
+
+The same part combinations are checked over and over (the compatibility menu, "add to cart",
+generated builds), while a verdict only depends on the parts themselves. Verdicts are
+therefore cached under the canonical multiset of their part IDs: the lower-cased IDs with
+their counts, in sorted order, so "cpu_01, RAM_01, ram_01" and "ram_01, CPU_01, ram_01" share
+an entry.
+
+Every entry records the inventory version it was computed at and the member items it was
+computed from. A lookup at the same version is a hit straight away. At a later version the
+entry is only reused if every member is still the very same item; if any member was replaced
+or removed (or an unknown ID now names a part) the entry is dropped and counted as
+invalidated. `invalidate` drops the entries of given parts eagerly, e.g. after a reload.
+
+Classes:
+- VerdictCache: LRU cache of verdicts keyed by part-ID multiset.
+
+Functions:
+- multiset_key(part_ids): The canonical multiset of a list of part IDs.
+"""
+import threading
+from collections import Counter, OrderedDict
+from typing import Dict, Iterable, List, Optional, Set
+
+# Verdicts kept by default before the least recently used one is evicted.
+DEFAULT_CAPACITY = 4096
+
+def multiset_key(part_ids: Iterable[str]) -> tuple:
+    """
+    Returns the canonical multiset of part IDs: (lower-cased ID, count) pairs, sorted.
+
+    Args:
+        part_ids (iterable): The IDs, in any order and case.
+    """
+    return tuple(sorted(Counter(part_id.strip().lower() for part_id in part_ids).items()))
+
+class VerdictCache:
+    """
+    Bounded LRU cache of compatibility verdicts.
+
+    Cached verdicts are shared between callers and must be treated as read-only.
+
+    Attributes:
+        capacity (int): The most verdicts kept.
+        hits (int): Lookups answered from the cache.
+        misses (int): Lookups that found no usable entry.
+        evictions (int): Entries dropped to stay within the capacity.
+        invalidations (int): Entries dropped because a member part changed.
+    """
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        if capacity < 1:
+            raise ValueError("The cache capacity must be at least 1")
+        self.capacity = capacity
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._entries: OrderedDict = OrderedDict()
+        self._keys_by_part: Dict[str, Set[tuple]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: tuple, version, members: List, verify: bool = False) -> Optional[dict]:
+        """
+        Returns the cached verdict for a key, or None.
+
+        Args:
+            key (tuple): The cache key; its first element is the part-ID multiset.
+            version: The current inventory version.
+            members (list): The items the verdict would be computed from now, in the order
+                of the multiset (None for unknown IDs). Only compared when the version moved.
+            verify (bool): Compare the members even at the same version, for items that
+                were not read from the inventory.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (verify or entry[1] != version):
+                if len(entry[2]) == len(members) and \
+                        all(old is new for old, new in zip(entry[2], members)):
+                    entry[1] = version
+                else:
+                    self._drop(key)
+                    self.invalidations += 1
+                    entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: tuple, version, members: List, verdict: dict):
+        """
+        Stores a verdict, evicting the least recently used one if the cache is full.
+
+        Args:
+            key (tuple): The cache key; its first element is the part-ID multiset.
+            version: The inventory version the verdict was computed at.
+            members (list): The items the verdict was computed from, as for `get`.
+            verdict (dict): The verdict.
+        """
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = [verdict, version, list(members)]
+            for part_id, _ in key[0]:
+                self._keys_by_part.setdefault(part_id, set()).add(key)
+            while len(self._entries) > self.capacity:
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate(self, part_ids: Iterable[str]) -> int:
+        """
+        Drops every verdict involving any of the parts.
+
+        Args:
+            part_ids (iterable): The IDs of the parts that changed.
+
+        Returns:
+            int: The number of verdicts dropped.
+        """
+        with self._lock:
+            keys = set()
+            for part_id in part_ids:
+                keys.update(self._keys_by_part.get(part_id.strip().lower(), ()))
+            for key in keys:
+                self._drop(key)
+            self.invalidations += len(keys)
+            return len(keys)
+
+    def clear(self):
+        """Drops every verdict; the counters are kept."""
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_part.clear()
+
+    def stats(self) -> dict:
+        """
+        Returns the cache counters.
+
+        Returns:
+            dict: "hits", "misses", "evictions", "invalidations", "size", "capacity" and
+            "hit_rate" (hits per lookup, 0.0 before the first lookup).
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "size": len(self._entries),
+                "capacity": self.capacity,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+    def _drop(self, key: tuple):
+        """Removes an entry and its reverse-index references. The lock must be held."""
+        del self._entries[key]
+        for part_id, _ in key[0]:
+            keys = self._keys_by_part.get(part_id)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_part[part_id]
@@ -0,0 +1,492 @@
+"""
+versioned.py
+
+Multi-version (MVCC) inventory for readers that must not see an update half way through.
+
+Every state of the inventory is an immutable `InventoryVersion`. A writer never changes a
+published version: it builds the next one from the current one and publishes it by swapping
+a single reference. The next version shares everything it did not touch with the previous
+one. Items are kept in fixed-size chunks and the ID index in hash segments, so one change
+copies a chunk, a segment and the (short) outer tuples, never the whole catalog.
+
+Readers pin a version for the length of an operation (a listing, a compatibility check) and
+every lookup made on that thread while the pin is held is answered from that version, however
+many updates are published in the meantime. A version that is neither current nor pinned is
+dropped from the inventory's bookkeeping and reclaimed by the garbage collector.
+
+Classes:
+- InventoryVersion: One immutable, readable state of the inventory.
+- VersionedInventory: Publishes versions and hands them out to readers.
+
+Functions:
+- pinned(inventory): Pins a version for the length of an operation on any inventory backend.
+- updating(inventory): Groups changes into one published version on any inventory backend.
+"""
+import threading
+from contextlib import contextmanager, nullcontext
+from typing import Dict, List, Optional
+
+# Items per chunk of the item and bucket vectors.
+CHUNK_SIZE = 64
+
+# Number of hash segments of the ID index (a power of two).
+SEGMENT_COUNT = 256
+
+def _bucket_keys(item) -> List[tuple]:
+    """Returns the key of every secondary index bucket the item belongs in."""
+    bucket_keys = [("type", item.item_type)]
+    if item.item_type in ("CPU", "Motherboard"):
+        bucket_keys.append(("socket", item.item_type, item.socket))
+    if item.item_type == "Motherboard":
+        bucket_keys.append(("ram_slots", int(item.ram_slots)))
+    return bucket_keys
+
+class _Bucket:
+    """
+    An immutable secondary index bucket: the positions of its items, in insertion order.
+
+    Removed items leave their position behind (the item vector holds None there); the
+    bucket is rewritten without them once they make up more than half of it.
+    """
+    __slots__ = ("chunks", "length", "dead")
+
+    def __init__(self, chunks: tuple = (), length: int = 0, dead: int = 0):
+        self.chunks = chunks
+        self.length = length
+        self.dead = dead
+
+class _ChunkedVector:
+    """
+    Copy-on-write editor for a tuple of chunks. Only chunks that are written to are copied,
+    each at most once per edit, so the result shares every other chunk with the original.
+    """
+    def __init__(self, chunks: tuple, length: int):
+        self.chunks = list(chunks)
+        self.length = length
+        self.copied = set()
+
+    def _writable(self, chunk_number: int) -> list:
+        if chunk_number not in self.copied:
+            self.chunks[chunk_number] = list(self.chunks[chunk_number])
+            self.copied.add(chunk_number)
+        return self.chunks[chunk_number]
+
+    def append(self, value):
+        """Appends a value at position `length`."""
+        if self.length % CHUNK_SIZE == 0:
+            self.chunks.append([])
+            self.copied.add(len(self.chunks) - 1)
+        self._writable(len(self.chunks) - 1).append(value)
+        self.length += 1
+
+    def set(self, position: int, value):
+        """Overwrites the value at `position`."""
+        self._writable(position // CHUNK_SIZE)[position % CHUNK_SIZE] = value
+
+    def freeze(self) -> tuple:
+        """Returns the edited chunks as an immutable tuple of tuples."""
+        for chunk_number in self.copied:
+            self.chunks[chunk_number] = tuple(self.chunks[chunk_number])
+        return tuple(self.chunks)
+
+class InventoryVersion:
+    """
+    One immutable state of the inventory. Offers the read half of the inventory interface,
+    so it can be handed to anything that only reads (listings, compatibility checks).
+
+    Attributes:
+        number (int): Sequence number of the version; the first published version is 1.
+    """
+    def __init__(self, number: int, item_chunks: tuple, item_slots: int, count: int,
+                 segments: tuple, buckets: Dict[tuple, _Bucket]):
+        self.number = number
+        self._item_chunks = item_chunks
+        self._item_slots = item_slots
+        self._count = count
+        self._segments = segments
+        self._buckets = buckets
+
+    @classmethod
+    def empty(cls) -> "InventoryVersion":
+        """Returns version 0, which has no items."""
+        return cls(0, (), 0, 0, tuple({} for _ in range(SEGMENT_COUNT)), {})
+
+    @property
+    def version(self) -> int:
+        """The version number, under the name the other backends use."""
+        return self.number
+
+    @property
+    def items(self):
+        """All items of this version, in insertion order."""
+        return (item for chunk in self._item_chunks for item in chunk if item is not None)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _position(self, item_key: str) -> Optional[int]:
+        return self._segments[hash(item_key) % SEGMENT_COUNT].get(item_key)
+
+    def _item_at(self, position: int):
+        return self._item_chunks[position // CHUNK_SIZE][position % CHUNK_SIZE]
+
+    def _bucket_items(self, bucket_key: tuple) -> list:
+        bucket = self._buckets.get(bucket_key)
+        if bucket is None:
+            return []
+        items = (self._item_at(position) for chunk in bucket.chunks for position in chunk)
+        return [item for item in items if item is not None]
+
+    def get_item(self, item_id: str):
+        """
+        Looks up an item by its ID.
+
+        Args:
+            item_id (str): The ID of the item, matched without regard to case.
+
+        Returns:
+            Item: The matching item, or None if the ID is not in this version.
+        """
+        position = self._position(item_id.strip().lower())
+        return None if position is None else self._item_at(position)
+
+    def get_items_by_type(self, item_type: str) -> list:
+        """
+        Returns the items of one type (e.g. "CPU", "RAM") in insertion order.
+        """
+        return self._bucket_items(("type", item_type))
+
+    def get_items_by_socket(self, item_type: str, socket: str) -> list:
+        """
+        Returns the CPUs or motherboards (per `item_type`) that use the given socket.
+        """
+        return self._bucket_items(("socket", item_type, socket))
+
+    def get_items_by_ram_slots(self, ram_slots: int) -> list:
+        """
+        Returns the motherboards that have exactly `ram_slots` RAM slots.
+        """
+        return self._bucket_items(("ram_slots", ram_slots))
+
+    def get_ram_slot_counts(self) -> List[int]:
+        """
+        Returns the distinct motherboard RAM slot counts present, in ascending order.
+        """
+        return sorted(bucket_key[1] for bucket_key in self._buckets
+                      if bucket_key[0] == "ram_slots")
+
+class _VersionBuilder:
+    """
+    Accumulates changes on top of a published version and produces the next version.
+
+    Offers the write half of the inventory interface (add_item, remove_item, replace_item)
+    plus get_item, which sees the changes made so far.
+    """
+    def __init__(self, base: InventoryVersion):
+        self.base = base
+        self.changed = False
+        self._items = _ChunkedVector(base._item_chunks, base._item_slots) # pylint: disable=protected-access
+        self._count = len(base)
+        self._segments = list(base._segments) # pylint: disable=protected-access
+        self._copied_segments = set()
+        self._buckets = dict(base._buckets) # pylint: disable=protected-access
+        self._bucket_edits: Dict[tuple, _ChunkedVector] = {}
+
+    def _item_at(self, position: int):
+        return self._items.chunks[position // CHUNK_SIZE][position % CHUNK_SIZE]
+
+    def _segment(self, item_key: str, writable: bool = False) -> dict:
+        segment_number = hash(item_key) % SEGMENT_COUNT
+        if writable and segment_number not in self._copied_segments:
+            self._segments[segment_number] = dict(self._segments[segment_number])
+            self._copied_segments.add(segment_number)
+        return self._segments[segment_number]
+
+    def _bucket_vector(self, bucket_key: tuple) -> _ChunkedVector:
+        vector = self._bucket_edits.get(bucket_key)
+        if vector is None:
+            bucket = self._buckets.get(bucket_key) or _Bucket()
+            vector = _ChunkedVector(bucket.chunks, bucket.length)
+            self._bucket_edits[bucket_key] = vector
+            self._buckets[bucket_key] = _Bucket(bucket.chunks, bucket.length, bucket.dead)
+        return vector
+
+    def _append(self, item_key: str, item):
+        position = self._items.length
+        self._items.append(item)
+        self._segment(item_key, writable=True)[item_key] = position
+        for bucket_key in _bucket_keys(item):
+            self._bucket_vector(bucket_key).append(position)
+            self._buckets[bucket_key].length += 1
+        self._count += 1
+        self.changed = True
+
+    def _tombstone(self, item_key: str, position: int, item):
+        self._items.set(position, None)
+        del self._segment(item_key, writable=True)[item_key]
+        for bucket_key in _bucket_keys(item):
+            self._bucket_vector(bucket_key)
+            self._buckets[bucket_key].dead += 1
+        self._count -= 1
+        self.changed = True
+
+    def get_item(self, item_id: str):
+        """Looks up an item by its ID, including the changes made so far."""
+        position = self._segment(item_id.strip().lower()).get(item_id.strip().lower())
+        return None if position is None else self._item_at(position)
+
+    def add_item(self, item):
+        """
+        Adds an item.
+
+        Raises:
+            ValueError: If an item with the same ID (ignoring case) is already present.
+        """
+        item_key = item.item_id.lower()
+        if item_key in self._segment(item_key):
+            raise ValueError(f"Duplicate item ID: {item.item_id}")
+        self._append(item_key, item)
+
+    def remove_item(self, item_id: str):
+        """
+        Removes an item.
+
+        Returns:
+            Item: The removed item, or None if the ID is not present.
+        """
+        item_key = item_id.strip().lower()
+        position = self._segment(item_key).get(item_key)
+        if position is None:
+            return None
+        item = self._item_at(position)
+        self._tombstone(item_key, position, item)
+        return item
+
+    def replace_item(self, item):
+        """
+        Replaces the item that has the same ID. The new item takes the old one's place
+        unless it moves to different index buckets, in which case it is appended.
+
+        Returns:
+            Item: The replaced item, or None (and nothing is changed) if the ID is not present.
+        """
+        item_key = item.item_id.lower()
+        position = self._segment(item_key).get(item_key)
+        if position is None:
+            return None
+        old_item = self._item_at(position)
+        if _bucket_keys(old_item) == _bucket_keys(item):
+            self._items.set(position, item)
+            self.changed = True
+        else:
+            self._tombstone(item_key, position, old_item)
+            self._append(item_key, item)
+        return old_item
+
+    def freeze(self, number: int) -> InventoryVersion:
+        """Returns the next version, compacting buckets that are mostly dead rows."""
+        for bucket_key, vector in self._bucket_edits.items():
+            bucket = self._buckets[bucket_key]
+            if bucket.dead * 2 <= bucket.length:
+                bucket.chunks = vector.freeze()
+                continue
+            live = _ChunkedVector((), 0)
+            for chunk in vector.chunks:
+                for position in chunk:
+                    if self._item_at(position) is not None:
+                        live.append(position)
+            if live.length:
+                self._buckets[bucket_key] = _Bucket(live.freeze(), live.length)
+            else:
+                del self._buckets[bucket_key]
+
+        return InventoryVersion(number, self._items.freeze(), self._items.length, self._count,
+                                tuple(self._segments), self._buckets)
+
+class VersionedInventory:
+    """
+    Inventory backend that publishes immutable versions, so readers never see a torn state.
+
+    Writes (add_item, remove_item, replace_item, or several at once through `update()`) are
+    serialised and each publishes one new version. Reads answer from the version pinned by
+    the calling thread, or from the current version when the thread holds no pin.
+
+    Attributes:
+        current (InventoryVersion): The latest published version.
+    """
+    def __init__(self, items=()):
+        """
+        Args:
+            items (iterable, optional): Items to publish as the first version, e.g. the items
+                of an already loaded Inventory.
+        """
+        self.current = InventoryVersion.empty()
+        self._write_lock = threading.Lock()
+        self._pin_lock = threading.Lock()
+        self._pin_counts: Dict[int, int] = {}
+        self._retained: Dict[int, InventoryVersion] = {}
+        self._local = threading.local()
+
+        with self.update() as writer:
+            for item in items:
+                writer.add_item(item)
+
+    @property
+    def version(self) -> int:
+        """The number of the current version."""
+        return self.current.number
+
+    @contextmanager
+    def update(self):
+        """
+        Groups several changes into one new version. Readers see either none or all of them;
+        if the block raises, nothing is published.
+
+        Yields:
+            An editor with add_item, remove_item, replace_item and get_item.
+        """
+        with self._write_lock:
+            writer = _VersionBuilder(self.current)
+            yield writer
+            if writer.changed:
+                self._publish(writer.freeze(self.current.number + 1))
+
+    def _publish(self, version: InventoryVersion):
+        with self._pin_lock:
+            previous = self.current
+            self.current = version
+            if not self._pin_counts.get(previous.number):
+                self._retained.pop(previous.number, None)
+
+    @contextmanager
+    def pin(self):
+        """
+        Pins the current version for the calling thread until the block ends. Nested pins
+        reuse the outer one.
+
+        Yields:
+            InventoryVersion: The pinned version.
+        """
+        pinned_version = getattr(self._local, "version", None)
+        if pinned_version is not None:
+            yield pinned_version
+            return
+
+        with self._pin_lock:
+            pinned_version = self.current
+            number = pinned_version.number
+            self._pin_counts[number] = self._pin_counts.get(number, 0) + 1
+            self._retained[number] = pinned_version
+        self._local.version = pinned_version
+        try:
+            yield pinned_version
+        finally:
+            self._local.version = None
+            with self._pin_lock:
+                self._pin_counts[number] -= 1
+                if not self._pin_counts[number]:
+                    del self._pin_counts[number]
+                    if number != self.current.number:
+                        self._retained.pop(number, None)
+
+    def retained_versions(self) -> List[int]:
+        """Returns the numbers of the older versions still kept alive by a pin."""
+        with self._pin_lock:
+            return sorted(number for number in self._retained
+                          if number != self.current.number)
+
+    def _reader(self) -> InventoryVersion:
+        """Returns the version pinned by this thread, or the current version."""
+        pinned_version = getattr(self._local, "version", None)
+        return self.current if pinned_version is None else pinned_version
+
+    @property
+    def items(self):
+        """All items of the version being read, in insertion order."""
+        return self._reader().items
+
+    def __len__(self) -> int:
+        return len(self._reader())
+
+    def add_item(self, item):
+        """
+        Publishes a version with the item added.
+
+        Raises:
+            ValueError: If an item with the same ID (ignoring case) is already in the inventory.
+        """
+        with self.update() as writer:
+            writer.add_item(item)
+
+    def remove_item(self, item_id: str):
+        """
+        Publishes a version without the item.
+
+        Returns:
+            Item: The removed item, or None if the ID is not in the inventory.
+        """
+        with self.update() as writer:
+            return writer.remove_item(item_id)
+
+    def replace_item(self, item):
+        """
+        Publishes a version with the item that has the same ID replaced.
+
+        Returns:
+            Item: The replaced item, or None (and nothing is changed) if the ID is not in
+            the inventory.
+        """
+        with self.update() as writer:
+            return writer.replace_item(item)
+
+    def get_item(self, item_id: str):
+        """Looks up an item by its ID, matched without regard to case."""
+        return self._reader().get_item(item_id)
+
+    def get_items_by_type(self, item_type: str) -> list:
+        """Returns the items of one type in insertion order."""
+        return self._reader().get_items_by_type(item_type)
+
+    def get_items_by_socket(self, item_type: str, socket: str) -> list:
+        """Returns the CPUs or motherboards (per `item_type`) that use the given socket."""
+        return self._reader().get_items_by_socket(item_type, socket)
+
+    def get_items_by_ram_slots(self, ram_slots: int) -> list:
+        """Returns the motherboards that have exactly `ram_slots` RAM slots."""
+        return self._reader().get_items_by_ram_slots(ram_slots)
+
+    def get_ram_slot_counts(self) -> List[int]:
+        """Returns the distinct motherboard RAM slot counts present, in ascending order."""
+        return self._reader().get_ram_slot_counts()
+
+def pinned(inventory):
+    """
+    Pins a version of the inventory for the length of a `with` block. Backends without
+    versions are returned as they are.
+
+    Args:
+        inventory: Any inventory backend.
+
+    Returns:
+        A context manager yielding the object to read from.
+    """
+    if isinstance(inventory, VersionedInventory):
+        return inventory.pin()
+    return nullcontext(inventory)
+
+def updating(inventory):
+    """
+    Groups the changes made in a `with` block: a VersionedInventory publishes them as one
+    version and a DatabaseInventory commits them as one transaction. Other backends are
+    changed in place, one call at a time.
+
+    Args:
+        inventory: Any inventory backend.
+
+    Returns:
+        A context manager yielding the object to make the changes on.
+    """
+    update = getattr(inventory, "update", None)
+    if update is not None:
+        return update()
+    return nullcontext(inventory)
@@ -10,49 +10,96 @@ include validating the input file, loading and processing the inventory data, an
 the main menu for user interaction.
 
 Functions:
-- process_inventory_file(inventory_file): Validates and loads the JSON inventory file, 
-  ensuring it exists and is in the correct format.
+- process_inventory_file(inventory_file, inventory, use_snapshot, item_sources, use_database):
+  Validates and loads the JSON inventory file, ensuring it exists and is in the correct format.
+- parse_arguments(argv): Parses the command line arguments.
+- run_batch(inventory_data, batch_file): Runs a stream of commands without the menus.
+- run_server(inventory_data, host, port): Serves the storefront over HTTP/JSON.
 - main(): The main function that acts as the application's entry point, handling the initial
   setup and triggering the user interface.
 
 Usage:
 To run the application:
-    python3 storefront.py <inventory_file.json>
+    python3 storefront.py <inventory_file.json> [--columnar | --snapshot | --sqlite | --versioned]
+    python3 storefront.py <shard_directory | "shards/*.json"> [--columnar]
+To run a stream of commands (one per line, "-" for stdin) and print one JSON result per line:
+    python3 storefront.py <inventory_file.json> --batch <commands.txt | ->
+To serve the storefront to many shoppers as an HTTP/JSON service:
+    python3 storefront.py <inventory_file.json> --serve <port> [--host <address>]
+        [--session-ttl <seconds>] [--session-memory <MiB>]
 """
 
-import json
+import argparse
+import asyncio
+import sqlite3
 import sys
 
-from src.inventory import load_inventory # pylint: disable=import-error
+from src.columnar import ColumnarInventory # pylint: disable=import-error
+from src.loader import ( # pylint: disable=import-error
+    load_inventory_shards, resolve_inventory_files, InventoryFormatError
+)
+from src.snapshot import open_snapshot # pylint: disable=import-error
+from src.database import open_database # pylint: disable=import-error
+from src.reload import InventoryWatcher # pylint: disable=import-error
+from src.versioned import VersionedInventory # pylint: disable=import-error
 from src.menu import main_menu # pylint: disable=import-error
+from src.headless import run_commands # pylint: disable=import-error
+from src.render import buffered_output # pylint: disable=import-error
+from src.server import serve # pylint: disable=import-error
+from src.session_store import DEFAULT_MAX_BYTES, DEFAULT_TTL # pylint: disable=import-error
 from src.utils import clear_screen # pylint: disable=import-error
 
-def process_inventory_file(inventory_file):
+def process_inventory_file(inventory_file, inventory=None, use_snapshot=False, # pylint: disable=too-many-arguments, too-many-positional-arguments
+                           item_sources=None, use_database=False):
     """
-    Validates and loads inventory data from a JSON file.
+    Validates and loads inventory data from a JSON file or a set of JSON shards.
 
     Args:
-        inventory_file (str): Path to the JSON file containing the inventory data.
+        inventory_file (str): Path to the JSON file containing the inventory data, a
+            directory of `.json` shards, or a glob pattern matching the shards.
+        inventory (object, optional): The inventory backend to load into, e.g. a
+            ColumnarInventory. A regular Inventory is used when omitted.
+        use_snapshot (bool): Memory-map a compiled snapshot kept next to the file instead
+            of parsing the JSON, building the snapshot first if it is missing or stale.
+        item_sources (dict, optional): Filled with the file every item was loaded from, so
+            that changed files can later be reloaded on their own.
+        use_database (bool): Query a SQLite database kept next to the file instead of
+            parsing the JSON, importing the file first if the database is missing or stale.
 
     Returns:
-        dict: Loaded inventory data if the file is valid and successfully processed.
+        Inventory: Loaded inventory data if the file is valid and successfully processed. The
+        file is streamed, so the raw JSON document is never held in memory as a whole.
+        Multiple shards are parsed in parallel worker processes and merged.
 
     Exits:
         On file format, existence, or decoding errors, the program will terminate.
     """
+    shard_files = resolve_inventory_files(inventory_file)
+    if not shard_files:
+        print(f"Error: No .json files were found at {inventory_file}.")
+        sys.exit(1)
 
-    # Check if the file has a .json extension
-    if not inventory_file.endswith('.json'):
+    # Check if every file has a .json extension
+    if not all(shard_file.endswith('.json') for shard_file in shard_files):
         print("Error: File must be a .json file.")
         sys.exit(1)
 
-    # Load the JSON data
+    if use_snapshot and len(shard_files) > 1:
+        print("Error: Snapshots can only be built from a single .json file.")
+        sys.exit(1)
+
+    if use_database and len(shard_files) > 1:
+        print("Error: Databases can only be imported from a single .json file.")
+        sys.exit(1)
+
+    # Stream the JSON data into the inventory one item at a time
     try:
-        with open(inventory_file, 'r', encoding='utf-8') as file:
-            json_data = json.load(file)
-            inventory_data = load_inventory(json_data)
-            return inventory_data
-    except json.JSONDecodeError as e:
+        if use_snapshot:
+            return open_snapshot(inventory_file)
+        if use_database:
+            return open_database(inventory_file)
+        return load_inventory_shards(shard_files, inventory, item_sources=item_sources)
+    except (InventoryFormatError, UnicodeDecodeError) as e:
         print(f"Error: Could not decode JSON.\n{e}")
         sys.exit(1)
     except FileNotFoundError as e:
@@ -61,22 +108,117 @@ def process_inventory_file(inventory_file):
     except OSError as e:
         print(f"Error: There was an issue opening the file.\n{e}")
         sys.exit(1)
+    except sqlite3.Error as e:
+        print(f"Error: There was an issue with the inventory database.\n{e}")
+        sys.exit(1)
 
-def main():
+def parse_arguments(argv=None):
     """
-    Main function to run the application.
+    Parses the command line arguments.
+
+    Args:
+        argv (list, optional): Arguments to parse. Defaults to sys.argv[1:].
+
+    Returns:
+        argparse.Namespace: The parsed arguments.
+    """
+    parser = argparse.ArgumentParser(
+        prog="storefront.py",
+        description="Command-line storefront for building custom computers."
+    )
+    parser.add_argument("inventory_file",
+                        help="JSON file containing the inventory data, or a directory or "
+                             "glob pattern of JSON shards")
+    backend = parser.add_mutually_exclusive_group()
+    backend.add_argument("--columnar", action="store_true",
+                         help="store the catalog column by column to reduce memory use")
+    backend.add_argument("--snapshot", action="store_true",
+                         help="memory-map a compiled snapshot of the inventory for fast startup")
+    backend.add_argument("--sqlite", action="store_true",
+                         help="import the inventory into a SQLite database once and query it "
+                              "instead of loading the catalog into memory")
+    backend.add_argument("--versioned", action="store_true",
+                         help="publish inventory updates as immutable versions so readers "
+                              "never see a partial update")
+    parser.add_argument("--batch", metavar="COMMAND_FILE",
+                        help="run the commands in COMMAND_FILE ('-' for stdin) without the "
+                             "menus and print one JSON result per line")
+    parser.add_argument("--serve", metavar="PORT", type=int,
+                        help="serve the storefront as an HTTP/JSON service on PORT")
+    parser.add_argument("--host", default="127.0.0.1",
+                        help="address the HTTP/JSON service listens on (default 127.0.0.1)")
+    parser.add_argument("--session-ttl", metavar="SECONDS", type=float, default=DEFAULT_TTL,
+                        help="idle time after which a shopper's session expires "
+                             f"(default {DEFAULT_TTL})")
+    parser.add_argument("--session-memory", metavar="MIB", type=int,
+                        default=DEFAULT_MAX_BYTES // (1024 * 1024),
+                        help="memory the sessions may take before the least recently used "
+                             f"are evicted (default {DEFAULT_MAX_BYTES // (1024 * 1024)})")
+    return parser.parse_args(argv)
+
+def run_batch(inventory_data, batch_file):
     """
+    Runs a stream of commands against the inventory and prints one JSON result per command.
 
-    if len(sys.argv) != 2:
-        print("\nUsage: python3 storefront.py inventory.json")
-        print("Or you can make storefront.py an exicutable and run \
-              ./storefront.py inventory.json\n")
-        sys.exit(1)
+    Args:
+        inventory_data (object): The loaded inventory.
+        batch_file (str): The file holding the commands, or "-" to read them from stdin.
+
+    Returns:
+        int: The exit status, 1 if any command failed.
+    """
+    if batch_file == "-":
+        # Whoever writes to stdin may wait for each answer before sending the next command
+        counts = run_commands(inventory_data, sys.stdin, sys.stdout, flush_lines=True)
+    else:
+        try:
+            with open(batch_file, "r", encoding="utf-8") as commands:
+                counts = run_commands(inventory_data, commands, sys.stdout)
+        except OSError as e:
+            print(f"Error: There was an issue opening the file.\n{e}", file=sys.stderr)
+            return 1
+    return 1 if counts["failed"] else 0
+
+def run_server(inventory_data, host, port, session_ttl=DEFAULT_TTL,
+               session_memory=DEFAULT_MAX_BYTES):
+    """
+    Serves the storefront over HTTP/JSON until interrupted.
 
-    inventory_file = sys.argv[1]
-    inventory_data = process_inventory_file(inventory_file)
+    Args:
+        inventory_data (object): The loaded inventory, shared by every session.
+        host (str): The address to listen on.
+        port (int): The port to listen on.
+        session_ttl (float): Seconds a shopper's session may sit idle.
+        session_memory (int): Bytes the sessions may take.
+    """
+    def ready(bound_port):
+        print(f"Serving the storefront on http://{host}:{bound_port}/ (Ctrl+C to stop)",
+              flush=True)
+    asyncio.run(serve(inventory_data, host, port, ready, session_ttl, session_memory))
 
-    main_menu(inventory_data)
+def main():
+    """
+    Main function to run the application.
+    """
+    arguments = parse_arguments()
+    inventory = ColumnarInventory() if arguments.columnar else None
+    item_sources = None if arguments.snapshot or arguments.sqlite else {}
+    inventory_data = process_inventory_file(arguments.inventory_file, inventory,
+                                            arguments.snapshot, item_sources, arguments.sqlite)
+    if arguments.versioned:
+        inventory_data = VersionedInventory(inventory_data.items)
+    if arguments.batch is not None:
+        sys.exit(run_batch(inventory_data, arguments.batch))
+    if arguments.serve is not None:
+        run_server(inventory_data, arguments.host, arguments.serve, arguments.session_ttl,
+                   arguments.session_memory * 1024 * 1024)
+        return
+
+    # Picks up edits to the inventory file(s) while the storefront is running
+    watcher = InventoryWatcher(arguments.inventory_file, inventory_data, item_sources)
+    # Every screen of the menus is sent to the terminal in one write
+    with buffered_output():
+        main_menu(inventory_data, watcher)
 
 if __name__ == "__main__":
     try:
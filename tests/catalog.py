@@ -0,0 +1,69 @@
+"""
+The small catalog of parts the tests build their inventories from, and helpers for the tests
+of the build generators.
+"""
+import itertools
+from unittest.mock import MagicMock
+
+from src.build import Build
+from src.buildspace import BuildSpace
+from src.compatibility_matrix import CompatibilityMatrix
+from src.inventory import CPU, GPU, RAM, PSU, Motherboard, Storage, Inventory
+
+def make_items(*item_ids):
+    """
+    Fresh copies of the catalog's parts, in catalog order.
+
+    Args:
+        *item_ids: The IDs of the parts wanted; every part if none are given.
+    """
+    items = [CPU("CPU_01", "Thunderbolt", 200, 120, "LGA"),
+             CPU("CPU_02", "Lightning", 120, 65, "PGA"),
+             CPU("CPU_03", "Spark", 90, 50, "PGA"),
+             Motherboard("MB_01", "BoardBasic", 100, 40, "LGA", 2),
+             Motherboard("MB_02", "BoardPlus", 180, 50, "PGA", 4),
+             RAM("RAM_01", "Basic 8GB", 40, 5, 8),
+             RAM("RAM_02", "Pro 32GB", 150, 8, 32),
+             RAM("RAM_03", "Mid 16GB", 80, 6, 16),
+             Storage("STO_01", "Small SSD", 50, 500),
+             Storage("STO_02", "Large HDD", 90, 4000),
+             GPU("GPU_01", "Render 9000", 400, 250, True),
+             PSU("PSU_01", "PowerPy 150", 40, 150),
+             PSU("PSU_02", "PowerPy 650", 110, 650)]
+    if not item_ids:
+        return items
+    return [item for item in items if item.item_id in item_ids]
+
+def make_inventory(*item_ids, items=None):
+    """
+    An inventory of the catalog's parts.
+
+    Args:
+        *item_ids: The IDs of the parts to stock; every part if none are given.
+        items: Parts to stock instead of the catalog's, for tests that need others.
+    """
+    inventory = Inventory()
+    for item in make_items(*item_ids) if items is None else items:
+        inventory.add_item(item)
+    return inventory
+
+def every_build(inventory, budget):
+    """
+    Every valid build within the budget, as its list of choices, found by checking every
+    combination of choices one at a time.
+    """
+    space = BuildSpace(inventory)
+    matrix = CompatibilityMatrix(inventory)
+    cpus = [choice for choices in space.cpus_by_class.values() for choice in choices]
+    for choices in itertools.product(space.motherboards, cpus, space.rams, space.storage,
+                                     space.gpus, space.psus):
+        if sum(choice.price for choice in choices) > budget:
+            continue
+        if matrix.check_build(BuildSpace.to_build(choices))["valid"]:
+            yield list(choices)
+
+def menu_build(inventory, budget):
+    """A `Build` as the menus use it, for a user with the given budget."""
+    user = MagicMock()
+    user.get_budget.return_value = budget
+    return Build(user, MagicMock(), inventory, MagicMock())
@@ -0,0 +1,111 @@
+import time
+import unittest
+from unittest.mock import patch
+
+from catalog import every_build, make_inventory, make_items, menu_build
+from src.autobuild import _Search, _TimeUp, find_best_build
+from src.buildspace import BuildSpace, MAX_STORAGE_DRIVES
+from src.compatibility_matrix import CompatibilityMatrix
+from src.inventory import CPU, PSU, Motherboard
+
+PARTS = ("CPU_01", "CPU_02", "MB_01", "MB_02", "RAM_01", "RAM_02", "STO_01", "STO_02",
+         "GPU_01", "PSU_01", "PSU_02")
+
+def best_of_every_build(inventory, budget, category):
+    """Best (capacity, -price) over every valid build."""
+    return max(((sum(choice.capacity for choice in choices if choice.part_type == category),
+                 -sum(choice.price for choice in choices))
+                for choices in every_build(inventory, budget)), default=None)
+
+class TestFindBestBuild(unittest.TestCase):
+    def test_matches_brute_force(self):
+        """
+        Test that the optimum equals an exhaustive search for several budgets and objectives.
+        """
+        inventory = make_inventory(*PARTS)
+        for budget in (300, 450, 700, 1200, 3000):
+            for objective, category in (("ram", "RAM"), ("storage", "Storage")):
+                expected = best_of_every_build(inventory, budget, category)
+                result = find_best_build(inventory, budget, objective, max_workers=1)
+                if expected is None:
+                    self.assertIsNone(result)
+                    continue
+                self.assertTrue(result["complete"])
+                self.assertEqual((result["value"], -result["price"]), expected,
+                                 (budget, objective))
+
+    def test_result_passes_compatibility(self):
+        """
+        Test that a generated build is complete and valid per the compatibility rules.
+        """
+        inventory = make_inventory(*PARTS)
+        result = find_best_build(inventory, 3000, "storage", max_workers=1)
+        verdict = CompatibilityMatrix(inventory).check_build(result["parts"])
+
+        self.assertTrue(verdict["valid"])
+        self.assertEqual(len(result["parts"]["Storage"]), MAX_STORAGE_DRIVES)
+        self.assertEqual(result["storage_capacity"], 4000 * MAX_STORAGE_DRIVES)
+
+    def test_process_pool_agrees(self):
+        """
+        Test that splitting the search over worker processes gives the same optimum.
+        """
+        inventory = make_inventory(*PARTS)
+        single = find_best_build(inventory, 1200, "ram", max_workers=1)
+        pooled = find_best_build(inventory, 1200, "ram", max_workers=2)
+        self.assertEqual((pooled["value"], pooled["price"]), (single["value"], single["price"]))
+
+    def test_ties_go_to_the_cheaper_build(self):
+        """
+        Test that of two builds with the same RAM the cheaper one is chosen, even when it
+        needs a pricier CPU that draws little enough for the small PSU.
+        """
+        inventory = make_inventory(items=[
+            Motherboard("MB_01", "BoardBasic", 100, 40, "LGA", 2),
+            CPU("CPU_01", "Hot", 100, 300, "LGA"),
+            CPU("CPU_02", "Cool", 110, 50, "LGA"),
+            *make_items("RAM_01", "STO_01"),
+            PSU("PSU_01", "Small", 20, 200),
+            PSU("PSU_02", "Big", 200, 1000)])
+        result = find_best_build(inventory, 1000, "ram", max_workers=1)
+
+        self.assertEqual((result["value"], result["price"]), (16, 360))
+        self.assertEqual(result["parts"]["CPU"].item_id, "CPU_02")
+        self.assertEqual(result["parts"]["PSU"].item_id, "PSU_01")
+
+    def test_completion_stops_at_deadline(self):
+        """
+        Test that completing a build looks at the deadline too, not only the outer loop.
+        """
+        space = BuildSpace(make_inventory(*PARTS))
+        search = _Search(space, 3000, "RAM", time.time() - 1)
+        with patch("src.autobuild.DEADLINE_CHECK_NODES", 1), self.assertRaises(_TimeUp):
+            search._cheapest_rest(space.motherboards[0], 0, 0, 3000)
+        search.search(space.motherboards)
+        self.assertTrue(search.timed_out)
+
+    def test_unknown_objective(self):
+        """
+        Test that an unknown objective is rejected.
+        """
+        with self.assertRaises(ValueError):
+            find_best_build(make_inventory(*PARTS), 1000, "gpu")
+
+class TestAutoBuild(unittest.TestCase):
+    @patch('src.build.clear_screen')
+    @patch('builtins.print')
+    def test_auto_build_loads_parts(self, _mock_print, _mock_clear):
+        """
+        Test that the generated build is loaded into Build with its totals.
+        """
+        build = menu_build(make_inventory(*PARTS), 1200)
+        build.auto_build("ram", max_workers=1)
+
+        self.assertEqual(len(build.build["RAM"]), 4)
+        self.assertEqual(build.total_cost, sum(
+            item.price for part in build.build.values()
+            for item in (part if isinstance(part, list) else [part]) if item is not None))
+        self.assertGreaterEqual(build.total_power_draw, 0)
+
+if __name__ == '__main__':
+    unittest.main()
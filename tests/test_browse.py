@@ -0,0 +1,87 @@
+import unittest
+from unittest.mock import patch
+
+from catalog import every_build, make_inventory, make_items, menu_build
+from src.browse import BuildBrowser, iter_builds, page_builds
+from src.buildspace import BuildSpace
+from src.inventory import CPU
+
+def make_browse_inventory():
+    # CPU_03 spells its socket in lower case, unlike its motherboard
+    return make_inventory(items=[*make_items("CPU_01", "CPU_02"),
+                                 CPU("CPU_03", "Spark", 90, 50, "pga"),
+                                 *make_items("MB_01", "MB_02", "RAM_01", "RAM_02", "STO_01",
+                                             "STO_02", "GPU_01", "PSU_01", "PSU_02")])
+
+def build_key(parts):
+    return tuple(sorted(item.item_id for part in parts.values()
+                        for item in (part if isinstance(part, list) else [part]) if item))
+
+def brute_force(inventory, budget):
+    """Every valid build within the budget, as (price, parts key)."""
+    return [(sum(choice.price for choice in choices), build_key(BuildSpace.to_build(choices)))
+            for choices in every_build(inventory, budget)]
+
+class TestIterBuilds(unittest.TestCase):
+    def test_matches_brute_force_in_price_order(self):
+        """
+        Test that the enumeration yields exactly the valid builds under the cap, cheapest first.
+        """
+        inventory = make_browse_inventory()
+        for budget in (400, 900, 2000):
+            expected = brute_force(inventory, budget)
+            results = list(iter_builds(inventory, budget))
+            prices = [result["price"] for result in results]
+
+            self.assertEqual(prices, sorted(prices))
+            self.assertEqual(sorted((result["price"], build_key(result["parts"]))
+                                    for result in results), sorted(expected))
+
+    def test_pages_resume_from_cursor(self):
+        """
+        Test that following the cursors page by page gives the same builds as one pass.
+        """
+        inventory = make_browse_inventory()
+        everything = [build_key(result["parts"]) for result in iter_builds(inventory, 1200)]
+        paged, cursor = [], None
+        while True:
+            page = page_builds(inventory, 1200, page_size=7, cursor=cursor)
+            paged.extend(build_key(result["parts"]) for result in page["builds"])
+            cursor = page["cursor"]
+            if cursor is None:
+                break
+
+        self.assertEqual(paged, everything)
+
+    def test_browser_pages(self):
+        """
+        Test that the browser keeps its place between pages and reports when it is done.
+        """
+        inventory = make_browse_inventory()
+        everything = [build_key(result["parts"]) for result in iter_builds(inventory, 900)]
+        browser = BuildBrowser(inventory, 900, page_size=5)
+        paged = []
+        while not browser.exhausted:
+            paged.extend(build_key(result["parts"]) for result in browser.next_page())
+
+        self.assertEqual(paged, everything)
+        self.assertEqual(browser.next_page(), [])
+
+class TestBrowseBuilds(unittest.TestCase):
+    @patch('src.build.clear_screen')
+    @patch('builtins.print')
+    @patch('builtins.input', side_effect=["n", "12"])
+    def test_load_build_from_second_page(self, _mock_input, _mock_print, _mock_clear):
+        """
+        Test that a build picked on the second page is loaded into the build.
+        """
+        inventory = make_browse_inventory()
+        build = menu_build(inventory, 1200)
+        build.browse_builds()
+
+        expected = list(iter_builds(inventory, 1200))[11]
+        self.assertEqual(build_key(build.build), build_key(expected["parts"]))
+        self.assertEqual(build.total_cost, expected["price"])
+
+if __name__ == '__main__':
+    unittest.main()
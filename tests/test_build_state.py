@@ -0,0 +1,104 @@
+import random
+import unittest
+from unittest.mock import MagicMock, patch
+
+from catalog import make_inventory, make_items
+from src.build import Build
+from src.compatibility import Compatibility
+from src.compatibility_matrix import CompatibilityMatrix
+from src.inventory import CPU, RAM, PSU, Motherboard, Storage
+
+def make_socket_inventory():
+    # Socket spellings that differ only in case and punctuation, and a smaller PSU
+    return make_inventory(items=[
+        CPU("CPU_01", "Thunderbolt", 200, 120, "LGA 1700"),
+        CPU("CPU_02", "Lightning", 120, 65, "AM4"),
+        Motherboard("MB_01", "BoardBasic", 100, 40, "lga-1700", 2),
+        Motherboard("MB_02", "BoardPlus", 180, 50, "AM4", 4),
+        *make_items("RAM_01", "RAM_02", "STO_01", "GPU_01"),
+        PSU("PSU_01", "PowerPy 300", 60, 300),
+        *make_items("PSU_02")])
+
+def statuses(verdict):
+    return {name: rule["status"] for name, rule in verdict["rules"].items()}
+
+@patch('src.build.clear_screen')
+@patch('builtins.print')
+class TestBuildState(unittest.TestCase):
+    def setUp(self):
+        self.inventory = make_socket_inventory()
+        self.compatibility = Compatibility(self.inventory)
+        self.cart = MagicMock()
+        self.build = Build(MagicMock(), self.cart, self.inventory, self.compatibility)
+
+    def test_matches_full_check(self, _mock_print, _mock_clear):
+        """
+        Test that the live state agrees with a full check after every add and remove.
+        """
+        generator = random.Random(3)
+        matrix = CompatibilityMatrix(self.inventory)
+        part_ids = [item.item_id for item in self.inventory.items]
+        for _ in range(300):
+            parts = [item for part in self.build.build.values()
+                     for item in (part if isinstance(part, list) else [part]) if item]
+            if parts and generator.random() < 0.4:
+                item = generator.choice(parts)
+                if item.item_type in ("RAM", "Storage"):
+                    self.build.build[item.item_type].remove(item)
+                else:
+                    self.build.build[item.item_type] = None
+                self.build.record_removed(item)
+            else:
+                self.build.add_item(generator.choice(part_ids))
+
+            verdict = self.build.state.verdict()
+            expected = matrix.check_build(self.build.build)
+            self.assertEqual(statuses(verdict), statuses(expected))
+            self.assertEqual(verdict["valid"], expected["valid"])
+            self.assertEqual(self.build.total_power_draw, self.build.state.power_balance)
+            self.assertEqual(self.build.total_cost, sum(
+                item.price for part in self.build.build.values()
+                for item in (part if isinstance(part, list) else [part]) if item))
+
+    def test_replacing_a_part_keeps_totals(self, _mock_print, _mock_clear):
+        """
+        Test that adding a second CPU replaces the first in the totals as well.
+        """
+        self.build.add_item("cpu_01")
+        self.build.add_item("cpu_02")
+
+        self.assertEqual(self.build.total_cost, 120)
+        self.assertEqual(self.build.total_power_draw, -65)
+        self.assertEqual(self.build.state.cpu.item_id, "CPU_02")
+
+    @patch('builtins.input', return_value="psu")
+    def test_psu_removal(self, _mock_input, _mock_print, _mock_clear):
+        """
+        Test that removing the PSU takes back its cost and the power it supplied.
+        """
+        self.build.add_item("psu_01")
+        self.build.add_item("mb_01")
+        self.build.remove_item()
+
+        self.assertIsNone(self.build.build["PSU"])
+        self.assertEqual(self.build.total_cost, 100)
+        self.assertEqual(self.build.total_power_draw, -40)
+        self.assertEqual(self.build.state.missing[-1], "PSU")
+
+    def test_add_to_cart_reads_state(self, _mock_print, _mock_clear):
+        """
+        Test that "add to cart" uses the live verdict instead of a full check.
+        """
+        self.compatibility.build_check = MagicMock()
+        for part_id in ("mb_02", "cpu_02", "ram_01", "ram_01", "sto_01"):
+            self.build.add_item(part_id)
+        self.build.add_to_cart()
+        self.cart.add_build.assert_not_called()
+
+        self.build.add_item("psu_01")
+        self.build.add_to_cart()
+        self.cart.add_build.assert_called_once_with(self.build.build, 490)
+        self.compatibility.build_check.assert_not_called()
+
+if __name__ == '__main__':
+    unittest.main()
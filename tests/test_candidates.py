@@ -0,0 +1,122 @@
+import random
+import unittest
+from collections import Counter
+from unittest.mock import MagicMock, patch
+
+from catalog import make_inventory
+from src.browse import iter_builds
+from src.build import Build
+from src.candidates import CATEGORIES, CandidateFinder
+from src.inventory import CPU, GPU, RAM, PSU, Motherboard, Storage
+
+def empty_build():
+    return {"CPU": None, "GPU": None, "RAM": [], "PSU": None, "Motherboard": None, "Storage": []}
+
+def with_part(build, item):
+    build = {part_type: list(part) if isinstance(part, list) else part
+             for part_type, part in build.items()}
+    if item.item_type in ("RAM", "Storage"):
+        build[item.item_type].append(item)
+    else:
+        build[item.item_type] = item
+    return build
+
+def extends(parts, partial):
+    """Whether a complete build contains every part of a partial build."""
+    for part_type in ("CPU", "GPU", "PSU", "Motherboard"):
+        if partial[part_type] is not None and parts[part_type] is not partial[part_type]:
+            return False
+    for part_type in ("RAM", "Storage"):
+        have = Counter(item.item_id for item in parts[part_type])
+        if Counter(item.item_id for item in partial[part_type]) - have:
+            return False
+    return True
+
+class TestCandidateFinder(unittest.TestCase):
+    def setUp(self):
+        self.inventory = make_inventory()
+        self.finder = CandidateFinder(self.inventory)
+
+    def test_never_drops_a_completable_part(self):
+        """
+        Test that every part that leads to some valid complete build is offered.
+        """
+        generator = random.Random(11)
+        items = list(self.inventory.items)
+        for _ in range(60):
+            budget = generator.choice((500, 700, 1000, 1500))
+            complete = [result["parts"] for result in iter_builds(self.inventory, budget)]
+            build = empty_build()
+            for item in generator.sample(items, generator.randint(0, 3)):
+                if item.item_type not in ("RAM", "Storage") or not build[item.item_type]:
+                    build = with_part(build, item)
+
+            candidates = self.finder.candidates(build, budget)
+            for item in items:
+                if item in candidates[item.item_type]:
+                    continue
+                target = with_part(build, item)
+                self.assertFalse(any(extends(parts, target) for parts in complete),
+                                 (item.item_id, budget))
+
+    def test_pairwise_rules_narrow_the_domains(self):
+        """
+        Test that a chosen motherboard, RAM and parts rule out the incompatible candidates.
+        """
+        build = with_part(empty_build(), self.inventory.get_item("mb_01"))
+        build = with_part(build, self.inventory.get_item("ram_01"))
+        build = with_part(build, self.inventory.get_item("ram_01"))
+        candidates = self.finder.candidates(build, 2000)
+
+        self.assertEqual([item.item_id for item in candidates["CPU"]], ["CPU_01"])
+        # Both slots are taken
+        self.assertEqual(candidates["RAM"], [])
+        # 150W cannot power the board, the CPU and the RAM
+        self.assertEqual([item.item_id for item in candidates["PSU"]], ["PSU_02"])
+        # Swapping the board is fine until a CPU ties it to a socket
+        self.assertEqual(len(candidates["Motherboard"]), 2)
+        build = with_part(build, self.inventory.get_item("cpu_01"))
+        self.assertEqual([item.item_id for item in
+                          self.finder.candidates(build, 2000)["Motherboard"]], ["MB_01"])
+
+    def test_budget_and_updates(self):
+        """
+        Test that the budget prunes candidates and that inventory changes are picked up.
+        """
+        self.assertEqual(self.finder.candidates(empty_build(), 100)["CPU"], [])
+        cheap = self.finder.candidates(empty_build(), 400)
+        self.assertEqual([item.item_id for item in cheap["CPU"]], ["CPU_03"])
+        self.assertEqual(cheap["GPU"], [])
+
+        self.inventory.add_item(CPU("CPU_04", "Ember", 60, 35, "PGA"))
+        cheap = self.finder.candidates(empty_build(), 400)
+        self.assertEqual([item.item_id for item in cheap["CPU"]], ["CPU_04", "CPU_03"])
+
+    def test_mismatched_ram_has_no_candidates(self):
+        """
+        Test that a build with different RAM sticks cannot be completed by adding parts.
+        """
+        build = with_part(empty_build(), self.inventory.get_item("ram_01"))
+        build = with_part(build, self.inventory.get_item("ram_02"))
+        candidates = self.finder.candidates(build, 5000)
+        self.assertTrue(all(not candidates[part_type] for part_type in CATEGORIES))
+
+class TestShowCandidates(unittest.TestCase):
+    @patch('src.build.clear_screen')
+    @patch('builtins.print')
+    @patch('builtins.input', side_effect=["mb_02", "m"])
+    def test_add_from_candidates(self, _mock_input, mock_print, _mock_clear):
+        """
+        Test that a part entered in the candidates view is added and the lists refresh.
+        """
+        user = MagicMock()
+        user.get_budget.return_value = 1500
+        build = Build(user, MagicMock(), make_inventory(), MagicMock())
+        build.show_candidates()
+
+        self.assertEqual(build.build["Motherboard"].item_id, "MB_02")
+        printed = [call.args[0] for call in mock_print.call_args_list if call.args]
+        self.assertIn("CPU: 2 compatible", printed)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import unittest
+
+from src.columnar import ColumnarInventory
+from src.inventory import RAM, Motherboard, gen_parts_dict
+from src.loader import load_inventory_file
+
+class TestColumnarInventory(unittest.TestCase):
+    def setUp(self):
+        self.objects = load_inventory_file('inventory.json')
+        self.columns = load_inventory_file('inventory.json', ColumnarInventory())
+
+    def test_views_match_object_model(self):
+        """
+        Test that every materialised view carries the same attributes as the original object.
+        """
+        self.assertEqual(len(self.columns), len(self.objects))
+        for item in self.objects.items:
+            view = self.columns.get_item(item.item_id.lower())
+            self.assertIs(type(view), type(item))
+            self.assertEqual(vars(view), vars(item))
+
+    def test_listing_matches_object_model(self):
+        """
+        Test that gen_parts_dict returns the same parts in the same order for both backends.
+        """
+        expected = {key: [vars(item) for item in items]
+                    for key, items in gen_parts_dict(self.objects).items()}
+        actual = {key: [vars(item) for item in items]
+                  for key, items in gen_parts_dict(self.columns).items()}
+        self.assertEqual(actual, expected)
+
+    def test_remove_item(self):
+        """
+        Test that removed rows disappear from lookups and secondary indexes.
+        """
+        removed = self.columns.remove_item("MB_01")
+        self.assertEqual(removed.item_id, "MB_01")
+        self.assertIsNone(self.columns.get_item("mb_01"))
+        self.assertNotIn("MB_01", [board.item_id for board in
+                                   self.columns.get_items_by_socket("Motherboard", "LGA")])
+        self.assertEqual(len(self.columns), 29)
+
+    def test_replace_item_in_place(self):
+        """
+        Test that a replaced item keeps its row and its place, and that both backends agree
+        after it moves to another socket under a longer name.
+        """
+        rows = len(self.columns.live)
+        for inventory in (self.objects, self.columns):
+            old_item = inventory.replace_item(
+                Motherboard("mb_01", "MotherMainframe Elite Mk II", 95, 12, "PGA", 4))
+            self.assertEqual((old_item.name, old_item.price), ("MotherMainframe Elite", 100))
+        self.assertEqual(len(self.columns.live), rows)
+        self.assertEqual(len(self.columns), len(self.objects))
+        for item in self.objects.items:
+            self.assertEqual(vars(self.columns.get_item(item.item_id)), vars(item))
+        self.assertEqual([vars(item) for item in self.columns.items],
+                         [vars(item) for item in self.objects.items])
+        for socket in ("LGA", "PGA"):
+            self.assertEqual(
+                [vars(board) for board in self.columns.get_items_by_socket("Motherboard", socket)],
+                [vars(board) for board in self.objects.get_items_by_socket("Motherboard", socket)])
+
+    def test_many_items_grow_hash_table(self):
+        """
+        Test that lookups keep working after the ID hash table has been resized.
+        """
+        inventory = ColumnarInventory()
+        for number in range(1000):
+            inventory.add_item(RAM(f"RAM_X{number}", "Bulk", 1, 1, 8))
+        self.assertEqual(inventory.get_item("ram_x999").item_id, "RAM_X999")
+        self.assertEqual(len(inventory), 1000)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import itertools
+import unittest
+
+from src.inventory import CPU, RAM, PSU, Motherboard, Inventory
+
+try:
+    from src.combinations import evaluate_combinations, count_valid_combinations
+except ImportError:
+    evaluate_combinations = None
+
+def make_inventory():
+    inventory = Inventory()
+    for number in range(6):
+        inventory.add_item(CPU(f"CPU_{number}", "Processor", 100 + number, 60 + 20 * number,
+                               ("LGA", "AM4", "AM5")[number % 3]))
+        inventory.add_item(Motherboard(f"MB_{number}", "Board", 80 + number, 30,
+                                       ("LGA", "AM4")[number % 2], 1 + number % 4))
+        inventory.add_item(RAM(f"RAM_{number}", "Memory", 20 + number, 5 + 3 * number, 8))
+    for supplied in (150, 250, 400):
+        inventory.add_item(PSU(f"PSU_{supplied}", "Power", supplied // 5, supplied))
+    return inventory
+
+def brute_force(inventory):
+    """The same rules checked one combination at a time."""
+    valid = set()
+    for cpu, board, ram, psu in itertools.product(
+            inventory.get_items_by_type("CPU"), inventory.get_items_by_type("Motherboard"),
+            inventory.get_items_by_type("RAM"), inventory.get_items_by_type("PSU")):
+        for dimm_count in range(1, board.ram_slots + 1):
+            draw = cpu.power_draw + board.power_draw + dimm_count * ram.power_draw
+            if cpu.socket == board.socket and psu.power_supplied >= draw:
+                price = cpu.price + board.price + dimm_count * ram.price + psu.price
+                valid.add((cpu.item_id, board.item_id, ram.item_id, dimm_count,
+                           psu.item_id, price))
+    return valid
+
+@unittest.skipIf(evaluate_combinations is None, "NumPy is not installed")
+class TestCombinations(unittest.TestCase):
+    def test_matches_brute_force_for_any_chunk_size(self):
+        """
+        Test that the vectorized result equals a per-combination loop, however it is chunked.
+        """
+        inventory = make_inventory()
+        expected = brute_force(inventory)
+        for max_cells in (1, 7, 64, 1 << 20):
+            table = evaluate_combinations(inventory, max_cells=max_cells)
+            rows = {tuple(row[key] for key in ("cpu", "motherboard", "ram", "dimm_count",
+                                               "psu", "price"))
+                    for row in map(table.row, range(len(table)))}
+            self.assertEqual(len(table), len(expected))
+            self.assertEqual(rows, expected)
+            self.assertEqual(count_valid_combinations(inventory, max_cells), len(expected))
+
+    def test_cheapest(self):
+        """
+        Test that the cheapest combinations come back in ascending price order.
+        """
+        table = evaluate_combinations(make_inventory())
+        prices = [row["price"] for row in table.cheapest(5)]
+        self.assertEqual(prices, sorted(table.price.tolist())[:5])
+
+    def test_missing_category_gives_empty_table(self):
+        """
+        Test that a catalog without PSUs has no valid combinations.
+        """
+        inventory = Inventory()
+        inventory.add_item(CPU("CPU_1", "Processor", 1, 1, "LGA"))
+        self.assertEqual(len(evaluate_combinations(inventory)), 0)
+
+if __name__ == '__main__':
+    unittest.main()
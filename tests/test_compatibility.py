@@ -0,0 +1,91 @@
+import unittest
+from unittest.mock import patch
+
+from src.compatibility import Compatibility
+from src.compatibility_matrix import CompatibilityMatrix, PASS, FAIL, SKIPPED
+from src.inventory import CPU, RAM, PSU, Motherboard, Storage, Inventory
+
+def make_inventory():
+    inventory = Inventory()
+    for item in (CPU("CPU_01", "PyProcessor Thunderbolt", 100, 150, "LGA 1700"),
+                 CPU("CPU_02", "PyProcessor Lightning", 80, 100, "AM4"),
+                 Motherboard("MB_01", "BoardBasic", 100, 50, "lga-1700", 2),
+                 Motherboard("MB_02", "BoardPlus", 150, 50, "AM4+", 4),
+                 RAM("RAM_01", "ByteBooster Basic", 50, 10, 8),
+                 RAM("RAM_02", "ByteBooster Pro", 90, 10, 16),
+                 PSU("PSU_01", "PowerPy 220", 40, 220),
+                 Storage("STO_01", "Speicher", 60, 1000)):
+        inventory.add_item(item)
+    return inventory
+
+class TestCompatibilityMatrix(unittest.TestCase):
+    def setUp(self):
+        self.inventory = make_inventory()
+        self.matrix = CompatibilityMatrix(self.inventory, equivalences=[("AM4", "AM4+")])
+
+    def test_socket_classes(self):
+        """
+        Test that socket spellings and configured aliases form one class.
+        """
+        self.assertEqual(self.matrix.socket_class("LGA 1700"), self.matrix.socket_class("lga_1700"))
+        cpu = self.inventory.get_item("cpu_02")
+        self.assertEqual([board.item_id for board in self.matrix.compatible_motherboards(cpu)],
+                         ["MB_02"])
+        self.assertEqual(self.matrix.pair_count(), 2)
+
+    def test_check_set_reports_every_rule(self):
+        """
+        Test that a verdict carries a structured result per rule.
+        """
+        verdict = self.matrix.check_set(["cpu_01", "MB_02", "ram_01", "ram_02", "ram_01",
+                                         "psu_01"])
+        rules = verdict["rules"]
+
+        self.assertFalse(verdict["valid"])
+        self.assertEqual(rules["complete"]["status"], SKIPPED)
+        self.assertEqual(rules["socket"], {"status": FAIL, "pairs": [
+            {"cpu": "cpu_01", "motherboard": "mb_02", "compatible": False}]})
+        self.assertEqual(rules["ram_slots"]["status"], PASS)
+        self.assertEqual(rules["ram_match"]["status"], FAIL)
+        self.assertEqual(rules["power"], {"status": FAIL, "supplied": 220, "draw": 230,
+                                          "headroom": -10})
+
+    def test_check_sets_batch(self):
+        """
+        Test that a batch returns one verdict per set, including unknown IDs.
+        """
+        verdicts = self.matrix.check_sets([["cpu_02", "mb_02"], ["cpu_01", "gpu_99"]] * 500)
+
+        self.assertEqual(len(verdicts), 1000)
+        self.assertTrue(verdicts[0]["valid"])
+        self.assertEqual(verdicts[1]["unknown_ids"], ["gpu_99"])
+        self.assertFalse(verdicts[1]["valid"])
+
+    def test_tables_follow_inventory_changes(self):
+        """
+        Test that the precomputed pairs are rebuilt after the inventory changes.
+        """
+        self.assertEqual(self.matrix.pair_count(), 2)
+        self.inventory.add_item(Motherboard("MB_03", "BoardMax", 200, 50, "LGA1700", 4))
+        self.assertEqual(self.matrix.pair_count(), 3)
+
+class TestBuildCheck(unittest.TestCase):
+    @patch('src.compatibility.clear_screen')
+    @patch('builtins.print')
+    def test_build_check_returns_verdict(self, _mock_print, _mock_clear):
+        """
+        Test that build_check returns True only for a complete, compatible build.
+        """
+        inventory = make_inventory()
+        compatibility = Compatibility(inventory)
+        build = {"CPU": inventory.get_item("cpu_01"), "GPU": None,
+                 "RAM": [inventory.get_item("ram_01")], "PSU": inventory.get_item("psu_01"),
+                 "Motherboard": inventory.get_item("mb_01"),
+                 "Storage": [inventory.get_item("sto_01")]}
+        self.assertTrue(compatibility.build_check(build, 0))
+
+        build["Storage"] = []
+        self.assertFalse(compatibility.build_check(build, 0))
+
+if __name__ == '__main__':
+    unittest.main()
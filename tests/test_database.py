@@ -0,0 +1,158 @@
+import gc
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from src.compatibility import Compatibility
+from src.database import DatabaseInventory, database_path, import_inventory, open_database
+from src.inventory import CPU, gen_parts_dict
+from src.loader import load_inventory_file
+
+class TestDatabase(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.inventory_file = os.path.join(self.directory, 'inventory.json')
+        shutil.copy('inventory.json', self.inventory_file)
+        self.expected = load_inventory_file(self.inventory_file)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_database_matches_json(self):
+        """
+        Test that every item read from the database matches the JSON source.
+        """
+        database = open_database(self.inventory_file)
+        self.assertTrue(os.path.isfile(database_path(self.inventory_file)))
+        self.assertEqual(len(database), len(self.expected))
+        for item in self.expected.items:
+            self.assertEqual(vars(database.get_item(item.item_id.lower())), vars(item))
+        self.assertIsNone(database.get_item("cpu_99"))
+        self.assertEqual([item.item_id for item in database.items],
+                         [item.item_id for item in self.expected.items])
+        self.assertEqual(
+            [board.item_id for board in database.get_items_by_socket("Motherboard", "LGA")],
+            [board.item_id for board in self.expected.get_items_by_socket("Motherboard", "LGA")]
+        )
+        self.assertEqual(database.get_ram_slot_counts(), self.expected.get_ram_slot_counts())
+        self.assertEqual(
+            {key: [part.item_id for part in parts]
+             for key, parts in gen_parts_dict(database).items()},
+            {key: [part.item_id for part in parts]
+             for key, parts in gen_parts_dict(self.expected).items()}
+        )
+        prices = [int(gpu.price) for gpu in database.get_items_by_price("GPU", 300)]
+        self.assertEqual(prices, sorted(prices))
+        self.assertTrue(all(price <= 300 for price in prices))
+        database.close()
+
+    def test_only_requested_rows_are_loaded(self):
+        """
+        Test that lookups return shared items and that nothing stays loaded once unused.
+        """
+        database = open_database(self.inventory_file)
+        cpu = database.get_item("CPU_01")
+        self.assertIs(database.get_item("cpu_01"), cpu)
+        parts = Compatibility(database).check_ids(["cpu_01", "mb_01"])
+        self.assertIs(parts["CPU"][0], cpu)
+        del cpu, parts
+        gc.collect()
+        self.assertEqual(len(database._items), 0)
+        database.close()
+
+    def test_checks_load_only_the_parts_checked(self):
+        """
+        Test that a compatibility check on the database keeps no table of the catalog, and
+        that socket partners read through the socket index match the JSON inventory's.
+        """
+        database = open_database(self.inventory_file)
+        compatibility = Compatibility(database)
+        verdict = compatibility.check_parts(["cpu_01", "mb_01"])
+        gc.collect()
+        self.assertEqual(verdict["unknown_ids"], [])
+        self.assertLessEqual(len(database._items), 2)
+
+        expected = Compatibility(self.expected).matrix
+        cpu, board = database.get_item("cpu_01"), database.get_item("mb_01")
+        self.assertEqual([part.item_id for part in compatibility.matrix.compatible_cpus(board)],
+                         [part.item_id for part in expected.compatible_cpus(board)])
+        self.assertEqual(
+            [part.item_id for part in compatibility.matrix.compatible_motherboards(cpu)],
+            [part.item_id for part in expected.compatible_motherboards(cpu)])
+        self.assertEqual(compatibility.matrix.pair_count(), expected.pair_count())
+        database.close()
+
+    def test_changes_are_written(self):
+        """
+        Test that adding, replacing and removing parts updates the database.
+        """
+        database = open_database(self.inventory_file)
+        with self.assertRaises(ValueError):
+            database.add_item(CPU("cpu_01", "Copy", 1, 1, "LGA"))
+        database.add_item(CPU("CPU_99", "Extra", 10, 20, "AM5"))
+        database.replace_item(CPU("CPU_01", "Renamed", 50, 400, "PGA"))
+        self.assertEqual(database.remove_item("cpu_02").item_id, "CPU_02")
+        self.assertEqual(database.version, 3)
+        database.close()
+
+        reopened = DatabaseInventory(database_path(self.inventory_file))
+        self.assertEqual(reopened.get_item("cpu_99").socket, "AM5")
+        self.assertEqual(reopened.get_items_by_type("CPU")[0].name, "Renamed")
+        self.assertIn("CPU_01", [cpu.item_id for cpu in reopened.get_items_by_socket("CPU", "PGA")])
+        self.assertIsNone(reopened.get_item("cpu_02"))
+        reopened.close()
+
+    def test_update_is_one_transaction(self):
+        """
+        Test that changes grouped in an update block are rolled back together.
+        """
+        database = open_database(self.inventory_file)
+        with self.assertRaises(RuntimeError):
+            with database.update() as writer:
+                writer.replace_item(CPU("CPU_01", "Renamed", 50, 400, "PGA"))
+                writer.remove_item("cpu_02")
+                raise RuntimeError("feed failed")
+        self.assertEqual(database.get_item("cpu_01").name, "PyProcessor Thunderbolt")
+        self.assertIsNotNone(database.get_item("cpu_02"))
+        with database.update() as writer:
+            writer.remove_item("cpu_02")
+        database.close()
+        reopened = DatabaseInventory(database_path(self.inventory_file))
+        self.assertIsNone(reopened.get_item("cpu_02"))
+        reopened.close()
+
+    def test_database_reimported_when_source_changes(self):
+        """
+        Test that editing the JSON source invalidates the database.
+        """
+        open_database(self.inventory_file).close()
+        with open(self.inventory_file, 'r', encoding='utf-8') as file:
+            content = file.read()
+        with open(self.inventory_file, 'w', encoding='utf-8') as file:
+            file.write(content.replace('"PyProcessor Thunderbolt"', '"PyProcessor Lightning"'))
+
+        database = open_database(self.inventory_file)
+        self.assertEqual(database.get_item("cpu_01").name, "PyProcessor Lightning")
+        database.close()
+
+    def test_import_in_batches_skips_duplicates(self):
+        """
+        Test that a batch boundary does not lose rows and duplicate IDs keep the first entry.
+        """
+        with open(self.inventory_file, 'r', encoding='utf-8') as file:
+            data = json.load(file)
+        duplicate = dict(data["inventory"][0]["item"], id="cpu_01", name="Duplicate")
+        data["inventory"].append({"item": duplicate})
+        with open(self.inventory_file, 'w', encoding='utf-8') as file:
+            json.dump(data, file)
+
+        database_file = import_inventory(self.inventory_file, batch_size=7)
+        database = DatabaseInventory(database_file)
+        self.assertEqual(len(database), len(self.expected))
+        self.assertEqual(database.get_item("cpu_01").name, "PyProcessor Thunderbolt")
+        database.close()
+
+if __name__ == '__main__':
+    unittest.main()
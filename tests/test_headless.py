@@ -0,0 +1,150 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+from catalog import make_inventory
+import storefront
+from src.headless import CommandError, CommandSession, run_commands
+
+PARTS = ("CPU_01", "CPU_02", "MB_01", "MB_02", "RAM_01", "RAM_02", "STO_01", "GPU_01",
+         "PSU_01", "PSU_02")
+
+def run(lines, session=None):
+    output = io.StringIO()
+    counts = run_commands(make_inventory(*PARTS) if session is None else session.inventory_object,
+                          lines, output, session)
+    return counts, [json.loads(line) for line in output.getvalue().splitlines()]
+
+class TestCommandSession(unittest.TestCase):
+    def setUp(self):
+        self.session = CommandSession(make_inventory(*PARTS))
+
+    def test_list_and_details(self):
+        listing = self.session.execute("list cpu")
+        self.assertEqual([part["id"] for part in listing["cpu"]], ["cpu_01", "cpu_02"])
+        self.assertEqual(len(self.session.execute("list all")), 6)
+        details = self.session.execute("details MB_02")
+        self.assertEqual(details["id"], "mb_02")
+        self.assertEqual(details["ram_slots"], 4)
+        self.assertEqual(details["socket"], "PGA")
+        with self.assertRaises(CommandError):
+            self.session.execute("details nope")
+        with self.assertRaises(CommandError):
+            self.session.execute("list toasters")
+
+    def test_sorted_listing(self):
+        page = self.session.execute("list ram sort capacity desc")
+        self.assertEqual([part["id"] for part in page["items"]], ["ram_02", "ram_01"])
+        self.assertEqual((page["total"], page["page"], page["pages"]), (2, 1, 1))
+        page = self.session.execute("list all price 100..200 sort price")
+        self.assertEqual([part["id"] for part in page["items"]],
+                         ["mb_01", "psu_02", "cpu_02", "ram_02", "mb_02", "cpu_01"])
+        with self.assertRaisesRegex(CommandError, "Cannot sort by 'socket'"):
+            self.session.execute("list cpu sort socket")
+        with self.assertRaises(CommandError):
+            self.session.execute("list")
+
+    def test_search_and_suggestions(self):
+        found = self.session.execute("search powerpy 65")
+        self.assertEqual([part["id"] for part in found], ["psu_02"])
+        self.assertEqual(self.session.execute("search lightnign")[0]["id"], "cpu_02")
+        with self.assertRaisesRegex(CommandError, r"Unknown part ID: boardplsu\. "
+                                                  r"Did you mean: mb_02\?"):
+            self.session.execute("build add boardplsu")
+        with self.assertRaisesRegex(CommandError, r"^Unknown part ID: zzz$"):
+            self.session.execute("details zzz")
+        with self.assertRaises(CommandError):
+            self.session.execute("search")
+
+    def test_compat(self):
+        verdict = self.session.execute("compat cpu_01,mb_02")
+        self.assertFalse(verdict["valid"])
+        self.assertEqual(verdict["rules"]["socket"]["status"], "fail")
+        self.assertTrue(self.session.execute("compat cpu_02, mb_02")["valid"])
+        self.assertFalse(self.session.execute("compat complete cpu_02,mb_02")["valid"])
+
+    def test_build_and_cart(self):
+        self.session.execute("budget 1000")
+        shown = self.session.execute("build add mb_02 cpu_02 ram_01,sto_01")
+        self.assertFalse(shown["valid"])
+        self.assertEqual(shown["problems"], ["Missing: PSU"])
+        with self.assertRaises(CommandError):
+            self.session.execute("cart add-build")
+
+        shown = self.session.execute("build add psu_02")
+        self.assertTrue(shown["valid"])
+        self.assertEqual(shown["cost"], 500)
+        self.assertTrue(self.session.execute("build check")["valid"])
+
+        cart = self.session.execute("cart add-build")
+        self.assertEqual(cart["total"], 500)
+        cart = self.session.execute("cart add gpu_01")
+        self.assertEqual(cart["total"], 900)
+        cart = self.session.execute("cart remove build")
+        self.assertEqual(cart["total"], 400)
+        purchase = self.session.execute("cart checkout")
+        self.assertEqual(purchase["total"], 400)
+        self.assertEqual(self.session.execute("cart show")["items"], [])
+
+    def test_checkout_needs_budget(self):
+        self.session.execute("budget 100")
+        self.session.execute("cart add gpu_01")
+        with self.assertRaises(CommandError):
+            self.session.execute("cart checkout")
+
+    def test_build_remove_and_replace(self):
+        self.session.execute("build add psu_01")
+        status = self.session.execute("build add psu_02")
+        self.assertEqual(status["power_balance"], 650)
+        self.assertEqual(status["part_count"], 1)
+        self.assertEqual(self.session.execute("build show")["parts"]["PSU"]["id"], "psu_02")
+        self.session.execute("build remove psu_02")
+        self.assertIsNone(self.session.execute("build show")["parts"]["PSU"])
+        with self.assertRaises(CommandError):
+            self.session.execute("build remove psu_02")
+
+    def test_generated_builds_need_budget(self):
+        with self.assertRaises(CommandError):
+            self.session.execute("builds")
+        self.session.execute("budget 700")
+        page = self.session.execute("builds")
+        prices = [build["price"] for build in page["builds"]]
+        self.assertEqual(prices, sorted(prices))
+        self.assertTrue(all(build["price"] <= 700 for build in page["builds"]))
+        self.assertTrue(self.session.execute("pareto"))
+        candidates = self.session.execute("build candidates")
+        self.assertEqual(set(candidates), {"motherboard", "cpu", "ram", "storage", "gpu", "psu"})
+
+class TestRunCommands(unittest.TestCase):
+    def test_one_result_per_command(self):
+        counts, results = run(["# comment", "", "list psu", "bogus", "details cpu_01\n"])
+        self.assertEqual(counts, {"succeeded": 2, "failed": 1})
+        self.assertEqual([result["line"] for result in results], [3, 4, 5])
+        self.assertEqual([result["ok"] for result in results], [True, False, True])
+        self.assertEqual(results[1]["error"], "Unknown command: bogus")
+
+    def test_unexpected_errors_do_not_stop(self):
+        session = CommandSession(make_inventory(*PARTS))
+        broken = MagicMock(side_effect=KeyError("cpu_01"))
+        with patch.dict(session._commands, {"compat": broken}):
+            counts, results = run(["compat cpu_01,mb_01", "details cpu_01"], session)
+        self.assertEqual(counts, {"succeeded": 1, "failed": 1})
+        self.assertEqual(results[0]["error"], "Internal error: KeyError: 'cpu_01'")
+        self.assertTrue(results[1]["ok"])
+
+    def test_batch_argument(self):
+        with tempfile.TemporaryDirectory() as directory:
+            commands = os.path.join(directory, "commands.txt")
+            with open(commands, "w", encoding="utf-8") as handle:
+                handle.write("details cpu_01\n")
+            output = io.StringIO()
+            with patch("sys.stdout", output):
+                status = storefront.run_batch(make_inventory(*PARTS), commands)
+        self.assertEqual(status, 0)
+        self.assertEqual(json.loads(output.getvalue())["result"]["name"], "Thunderbolt")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+import unittest
+from unittest.mock import patch
+
+from src.inventory import (CPU, RAM, Motherboard, Inventory, load_inventory, get_part_details,
+                           gen_parts_dict)
+
+class TestInventoryIndex(unittest.TestCase):
+    def setUp(self):
+        self.inventory = Inventory()
+        self.cpu = CPU("CPU_01", "PyProcessor Thunderbolt", 100, 400, "LGA")
+        self.ram = RAM("RAM_01", "ByteBooster Basic", 50, 10, 8)
+        self.inventory.add_item(self.cpu)
+        self.inventory.add_item(self.ram)
+
+    def test_get_item_is_case_insensitive(self):
+        """
+        Test that items can be found by ID regardless of case.
+        """
+        self.assertIs(self.inventory.get_item("cpu_01"), self.cpu)
+        self.assertIs(self.inventory.get_item("CPU_01"), self.cpu)
+        self.assertIs(get_part_details(self.inventory, "Ram_01"), self.ram)
+
+    def test_get_item_unknown_id(self):
+        """
+        Test that an unknown ID returns None.
+        """
+        self.assertIsNone(self.inventory.get_item("gpu_99"))
+
+    def test_add_item_duplicate_id(self):
+        """
+        Test that adding a second item with the same ID is rejected.
+        """
+        with self.assertRaises(ValueError):
+            self.inventory.add_item(CPU("cpu_01", "Other", 1, 1, "PGA"))
+        self.assertEqual(len(self.inventory.items), 2)
+
+class TestSecondaryIndexes(unittest.TestCase):
+    def setUp(self):
+        self.inventory = Inventory()
+        self.cpu = CPU("CPU_01", "PyProcessor Thunderbolt", 100, 400, "LGA")
+        self.board = Motherboard("MB_01", "BoardBasic", 100, 50, "LGA", 4)
+        self.inventory.add_item(self.cpu)
+        self.inventory.add_item(self.board)
+
+    def test_indexes_updated_on_insert(self):
+        """
+        Test that type, socket and RAM slot indexes include newly added items.
+        """
+        self.assertEqual(list(self.inventory.get_items_by_type("CPU")), [self.cpu])
+        self.assertEqual(list(self.inventory.get_items_by_socket("Motherboard", "LGA")),
+                         [self.board])
+        self.assertEqual(list(self.inventory.get_items_by_ram_slots(4)), [self.board])
+        self.assertEqual(gen_parts_dict(self.inventory)["motherboard"], [self.board])
+
+    def test_indexes_updated_on_delete(self):
+        """
+        Test that removing an item drops it from every index.
+        """
+        self.assertIs(self.inventory.remove_item("mb_01"), self.board)
+        self.assertIsNone(self.inventory.get_item("MB_01"))
+        self.assertEqual(list(self.inventory.get_items_by_socket("Motherboard", "LGA")), [])
+        self.assertEqual(self.inventory.get_ram_slot_counts(), [])
+        self.assertIsNone(self.inventory.remove_item("mb_01"))
+
+class TestLoadInventory(unittest.TestCase):
+    @patch('builtins.print')
+    def test_load_inventory_reports_duplicates(self, mock_print):
+        """
+        Test that duplicate IDs are skipped and reported when loading.
+        """
+        entry = {"item": {"id": "CPU_01", "type": "CPU", "name": "A", "price": 1,
+                          "power_draw": 1, "socket": "LGA"}}
+        inventory = load_inventory({"inventory": [entry, entry]})
+
+        self.assertEqual(len(inventory.items), 1)
+        mock_print.assert_called_once()
+        self.assertIn("CPU_01", mock_print.call_args[0][0])
+
+if __name__ == '__main__':
+    unittest.main()
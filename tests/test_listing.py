@@ -0,0 +1,199 @@
+import gc
+import os
+import random
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from catalog import make_inventory, make_items
+from src.database import open_database
+from src.inventory import GPU, RAM, Inventory
+from src.listing import SORT_LIMIT, ListingIndex, ListingQuery, list_parts, parse_listing
+from src.loader import load_inventory_file
+from src.versioned import VersionedInventory
+
+PARTS = ("CPU_01", "CPU_02", "RAM_01", "RAM_02", "RAM_03", "STO_01", "GPU_01", "PSU_02")
+
+def ids(page):
+    return [item.item_id for item in page["items"]]
+
+class TestParseListing(unittest.TestCase):
+    def test_clauses(self):
+        """
+        Test that the category, order, ranges and page are read from the words, and that
+        repeated ranges on one key keep only their overlap.
+        """
+        listing = parse_listing("GPU sort price desc price 100..400 page 2")
+        self.assertEqual((listing.category, listing.sort, listing.descending, listing.page),
+                         ("gpu", "price", True, 2))
+        self.assertEqual(listing.ranges, {"price": (100, 400)})
+        listing = parse_listing("ram capacity >= 16 capacity<64 price ..100 sort name")
+        self.assertEqual(listing.ranges, {"capacity": (16, 63), "price": (None, 100)})
+        self.assertEqual((listing.sort, listing.descending), ("name", False))
+        self.assertEqual(parse_listing("all price 50..").ranges, {"price": (50, None)})
+
+    def test_errors(self):
+        """
+        Test that unknown categories, keys and clauses are refused.
+        """
+        for text in ("", "toasters", "cpu sort socket", "cpu name 1..2", "cpu price",
+                     "cpu page x", "cpu sort price sideways"):
+            with self.assertRaises(ValueError, msg=text):
+                parse_listing(text)
+
+class TestListingIndex(unittest.TestCase):
+    def setUp(self):
+        self.inventory = make_inventory(*PARTS)
+        self.index = ListingIndex(self.inventory)
+
+    def query(self, text, page_size=20):
+        listing = parse_listing(text)
+        listing.page_size = page_size
+        return self.index.query(listing)
+
+    def test_sorted_and_ranged(self):
+        """
+        Test sorting in both directions, ranges on one and on several keys, and that parts
+        lacking the sort key come last and are dropped by a range on it.
+        """
+        self.assertEqual(ids(self.query("ram sort price")), ["RAM_01", "RAM_03", "RAM_02"])
+        self.assertEqual(ids(self.query("ram sort capacity desc")),
+                         ["RAM_02", "RAM_03", "RAM_01"])
+        self.assertEqual(ids(self.query("all sort capacity"))[:4],
+                         ["RAM_01", "RAM_03", "RAM_02", "STO_01"])
+        self.assertEqual(ids(self.query("all sort capacity"))[4:],
+                         ["CPU_01", "CPU_02", "GPU_01", "PSU_02"])
+        self.assertEqual(ids(self.query("all capacity >= 16")), ["RAM_02", "RAM_03", "STO_01"])
+        self.assertEqual(ids(self.query("all price 100..200 sort power_draw desc")),
+                         ["CPU_01", "CPU_02", "RAM_02", "PSU_02"])
+        self.assertEqual(ids(self.query("ram capacity 8..16 price 60..")), ["RAM_03"])
+        self.assertEqual(ids(self.query("cpu sort name")), ["CPU_02", "CPU_01"])
+        self.assertEqual(self.query("gpu price ..100")["total"], 0)
+
+    def test_pages(self):
+        """
+        Test that the pages of a listing, ascending and descending, cover it once and that a
+        page past the end shows the last one.
+        """
+        for text in ("all", "all sort capacity desc", "all price 40..150 sort name desc"):
+            whole = ids(self.query(text))
+            first = self.query(text, 3)
+            self.assertEqual(first["pages"], -(-len(whole) // 3))
+            paged = []
+            for page in range(1, first["pages"] + 1):
+                paged += ids(self.query(f"{text} page {page}", 3))
+            self.assertEqual(paged, whole, text)
+        self.assertEqual(self.query("all page 9", 3)["page"], 3)
+
+    def test_matches_brute_force(self):
+        """
+        Test random listings against sorting and filtering the whole category, both sorting
+        the parts in range and walking the sorted order for them, with ties in catalog order
+        whichever way the listing runs.
+        """
+        generator = random.Random(5)
+        inventory = Inventory()
+        for number in range(400):
+            inventory.add_item(RAM(f"RAM_{number}", f"Stick {number}",
+                                   generator.randrange(20, 300), generator.randrange(1, 12),
+                                   generator.choice((4, 8, 16, 32, 64))))
+        index = ListingIndex(inventory)
+        for sort_limit in (SORT_LIMIT, 0):
+            for _ in range(50):
+                low = generator.randrange(0, 300)
+                listing = ListingQuery("ram", generator.choice(("price", "capacity", None)),
+                                       generator.random() < 0.5, page_size=7,
+                                       page=generator.randrange(1, 4))
+                listing.add_range("price", low, low + generator.randrange(0, 150))
+                if generator.random() < 0.5:
+                    listing.add_range("capacity", generator.choice((8, 16)), None)
+                price, capacity = listing.ranges["price"], listing.ranges.get("capacity")
+                expected = [item for item in inventory.items
+                            if price[0] <= item.price <= price[1]
+                            and (capacity is None or item.capacity >= capacity[0])]
+                if listing.sort is not None:
+                    expected.sort(key=lambda item, key=listing.sort: getattr(item, key),
+                                  reverse=listing.descending)
+                with patch("src.listing.SORT_LIMIT", sort_limit):
+                    page = index.query(listing)
+                start = (page["page"] - 1) * 7
+                self.assertEqual(ids(page), [item.item_id for item in
+                                             expected[start:start + 7]])
+                self.assertEqual(page["total"], len(expected))
+
+    def test_resorted_after_change(self):
+        """
+        Test that the orders are sorted again once the inventory changes.
+        """
+        inventory = VersionedInventory(make_items(*PARTS))
+        index = ListingIndex(inventory)
+        self.assertEqual(ids(index.query(parse_listing("ram sort price")))[0], "RAM_01")
+        inventory.add_item(RAM("RAM_04", "Budget 4GB", 20, 3, 4))
+        self.assertEqual(ids(index.query(parse_listing("ram sort price")))[0], "RAM_04")
+
+    def test_categories_read_on_first_use(self):
+        """
+        Test that listing one category reads only that category.
+        """
+        self.query("cpu sort price")
+        self.assertEqual(list(self.index._catalog), ["cpu"])
+
+    @patch("src.listing.clear_screen")
+    def test_list_parts_pages(self, _clear_screen):
+        """
+        Test that the listing prompt shows one page at a time and moves between pages.
+        """
+        index = ListingIndex(self.inventory)
+        with patch("src.listing.PAGE_SIZE", 3), \
+                patch("builtins.input", side_effect=["all sort price", "n", "n", "p", ""]), \
+                patch("builtins.print") as output:
+            list_parts(self.inventory, index)
+        printed = [call[0][0] for call in output.call_args_list if call[0]]
+        pages = [line for line in printed if line.strip().startswith("Page")]
+        self.assertEqual([page.split(" (")[0].strip() for page in pages],
+                         ["Page 1 of 3", "Page 2 of 3", "Page 3 of 3", "Page 2 of 3"])
+        self.assertIn("ALL by price (ascending)", printed)
+        with patch("builtins.input", return_value="cpu sort socket"), \
+                patch("builtins.print") as output:
+            list_parts(self.inventory, index)
+        self.assertIn("Cannot sort by 'socket'", str(output.call_args_list[-1]))
+
+class TestDatabaseListing(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        inventory_file = os.path.join(self.directory, 'inventory.json')
+        shutil.copy('inventory.json', inventory_file)
+        self.expected = ListingIndex(load_inventory_file(inventory_file))
+        self.database = open_database(inventory_file)
+        self.index = ListingIndex(self.database)
+
+    def tearDown(self):
+        self.database.close()
+        shutil.rmtree(self.directory)
+
+    def test_database_listings_match(self):
+        """
+        Test that listings sorted, filtered and paged by the database match the in-memory
+        ones, and that only the parts of the page are loaded.
+        """
+        for text in ("all", "cpu", "cpu sort price", "all sort price page 2",
+                     "gpu price 100..400", "all capacity >= 16 sort capacity",
+                     "all price ..200 sort power_draw", "all sort price desc page 3",
+                     "all price 50..200 sort price desc", "all sort capacity desc",
+                     "ram sort name desc", "all page 99"):
+            listing = parse_listing(text)
+            listing.page_size = 4
+            page = self.index.query(listing)
+            expected = self.expected.query(listing)
+            self.assertEqual(ids(page), ids(expected), text)
+            self.assertEqual((page["total"], page["page"], page["pages"]),
+                             (expected["total"], expected["page"], expected["pages"]), text)
+        del page
+        gc.collect()
+        self.index.query(parse_listing("cpu sort price"))
+        gc.collect()
+        self.assertEqual(len(self.database._items), 0)
+
+if __name__ == '__main__':
+    unittest.main()
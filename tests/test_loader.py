@@ -0,0 +1,131 @@
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from src.loader import (iter_inventory_entries, iter_inventory_items, load_inventory_file,
+                        load_inventory_shards, resolve_inventory_files, InventoryFormatError)
+
+DOCUMENT = json.dumps({
+    "meta": {"vendor": "PyParts"},
+    "inventory": [
+        {"item": {"id": "CPU_01", "type": "CPU", "name": "PyProcessor Thunderbolt",
+                  "price": 100, "power_draw": 400, "socket": "LGA"}},
+        {"item": {"id": "STO_01", "type": "Storage", "name": "Speicher für alle",
+                  "price": 12345, "capacity": 1000}},
+    ]
+}).encode('utf-8')
+
+class TestIterInventoryEntries(unittest.TestCase):
+    def test_entries_match_json_load_for_any_chunk_size(self):
+        """
+        Test that the streamed entries equal a full json.load regardless of chunk size.
+        """
+        expected = json.loads(DOCUMENT)["inventory"]
+        for chunk_size in (1, 3, 16, 64 * 1024):
+            entries = [entry for _, entry in iter_inventory_entries(io.BytesIO(DOCUMENT),
+                                                                    chunk_size)]
+            self.assertEqual(entries, expected)
+
+    def test_entry_offsets_point_at_each_entry(self):
+        """
+        Test that the reported byte offsets locate the start of every entry.
+        """
+        for offset, _ in iter_inventory_entries(io.BytesIO(DOCUMENT), 5):
+            self.assertEqual(DOCUMENT[offset:offset + 8], b'{"item":')
+
+    def test_syntax_error_reports_offset(self):
+        """
+        Test that invalid JSON raises InventoryFormatError with the byte offset.
+        """
+        document = b'{"inventory": [{"item": {"id": 1,}}]}'
+        with self.assertRaises(InventoryFormatError) as context:
+            list(iter_inventory_entries(io.BytesIO(document), 4))
+        self.assertEqual(context.exception.offset, document.index(b'}'))
+
+    def test_missing_inventory_array(self):
+        """
+        Test that a document without an "inventory" array is rejected.
+        """
+        with self.assertRaises(InventoryFormatError):
+            list(iter_inventory_entries(io.BytesIO(b'{"items": []}')))
+
+class TestIterInventoryItems(unittest.TestCase):
+    @patch('builtins.print')
+    def test_malformed_entry_is_skipped(self, mock_print):
+        """
+        Test that an entry with an unknown type is reported with its offset and skipped.
+        """
+        document = b'{"inventory": [{"item": {"id": "X_01", "type": "Fan"}}]}'
+        self.assertEqual(list(iter_inventory_items(io.BytesIO(document))), [])
+        self.assertIn("byte 15", mock_print.call_args[0][0])
+
+class TestLoadInventoryFile(unittest.TestCase):
+    def test_load_sample_inventory(self):
+        """
+        Test that the bundled inventory streams into an indexed Inventory.
+        """
+        inventory = load_inventory_file('inventory.json')
+        self.assertEqual(len(inventory), 30)
+        self.assertEqual(inventory.get_item("cpu_01").socket, "LGA")
+
+class TestLoadInventoryShards(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        with open('inventory.json', 'r', encoding='utf-8') as file:
+            entries = json.load(file)["inventory"]
+        for number, start in enumerate(range(0, len(entries), 10)):
+            shard = {"inventory": entries[start:start + 10]}
+            with open(os.path.join(self.directory, f'vendor_{number}.json'), 'w',
+                      encoding='utf-8') as file:
+                json.dump(shard, file)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_resolve_directory_and_glob(self):
+        """
+        Test that a directory and a glob pattern expand to the same sorted shard list.
+        """
+        from_directory = resolve_inventory_files(self.directory)
+        from_glob = resolve_inventory_files(os.path.join(self.directory, 'vendor_*.json'))
+        self.assertEqual(len(from_directory), 3)
+        self.assertEqual(from_directory, from_glob)
+        self.assertEqual(resolve_inventory_files('inventory.json'), ['inventory.json'])
+
+    def test_shards_merge_into_one_inventory(self):
+        """
+        Test that parallel shard parsing produces the same inventory as the single file.
+        """
+        inventory = load_inventory_shards(resolve_inventory_files(self.directory), max_workers=2)
+        expected = load_inventory_file('inventory.json')
+        self.assertEqual([vars(item) for item in inventory.items],
+                         [vars(item) for item in expected.items])
+
+    @patch('builtins.print')
+    def test_conflicting_ids_are_reported(self, mock_print):
+        """
+        Test that an ID defined in two shards is reported and the first definition kept.
+        """
+        shutil.copy(os.path.join(self.directory, 'vendor_0.json'),
+                    os.path.join(self.directory, 'vendor_9.json'))
+        inventory = load_inventory_shards(resolve_inventory_files(self.directory), max_workers=2)
+        self.assertEqual(len(inventory), 30)
+        self.assertEqual(mock_print.call_count, 10)
+        self.assertIn("vendor_9.json", mock_print.call_args[0][0])
+
+    def test_shard_errors_name_the_shard(self):
+        """
+        Test that a decode error raised in a worker identifies the broken shard.
+        """
+        with open(os.path.join(self.directory, 'vendor_5.json'), 'w', encoding='utf-8') as file:
+            file.write('{"inventory": [}')
+        with self.assertRaises(InventoryFormatError) as context:
+            load_inventory_shards(resolve_inventory_files(self.directory), max_workers=2)
+        self.assertTrue(context.exception.source.endswith('vendor_5.json'))
+
+if __name__ == '__main__':
+    unittest.main()
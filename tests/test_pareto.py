@@ -0,0 +1,83 @@
+import random
+import unittest
+from unittest.mock import patch
+
+from catalog import make_inventory, menu_build
+from src.browse import iter_builds
+from src.inventory import RAM
+from src.pareto import ParetoFrontier, pareto_builds, pareto_filter
+
+def objectives(build):
+    headroom = build["parts"]["PSU"].power_supplied - build["power_draw"]
+    return (build["price"], -build["ram_capacity"], -build["storage_capacity"], -headroom)
+
+def naive_frontier(vectors):
+    return {vector for vector in vectors
+            if not any(other != vector and all(a <= b for a, b in zip(other, vector))
+                       for other in vectors)}
+
+class TestParetoFilter(unittest.TestCase):
+    def test_matches_pairwise_dominance(self):
+        """
+        Test that the filter keeps exactly the vectors no other vector dominates.
+        """
+        generator = random.Random(7)
+        for width in (1, 2, 3, 4):
+            vectors = [tuple(generator.randint(0, 6) for _ in range(width)) for _ in range(300)]
+            kept = pareto_filter([(vector, None) for vector in vectors])
+
+            self.assertEqual([vector for vector, _ in kept], sorted(naive_frontier(set(vectors))))
+
+    def test_too_many_components(self):
+        """
+        Test that vectors with more than four components are rejected.
+        """
+        with self.assertRaises(ValueError):
+            pareto_filter([((1, 2, 3, 4, 5), None)])
+
+class TestParetoBuilds(unittest.TestCase):
+    def test_matches_exhaustive_frontier(self):
+        """
+        Test that the staged search finds the same frontier as filtering every build.
+        """
+        inventory = make_inventory()
+        for budget in (700, 1200, 3000):
+            everything = {objectives(build) for build in iter_builds(inventory, budget)}
+            frontier = [objectives(build) for build in pareto_builds(inventory, budget)]
+
+            self.assertEqual(sorted(frontier), sorted(naive_frontier(everything)))
+            self.assertEqual(frontier, sorted(frontier))
+
+    def test_frontier_follows_inventory_changes(self):
+        """
+        Test that the cached frontier is recomputed once the inventory changes.
+        """
+        inventory = make_inventory()
+        frontier = ParetoFrontier(inventory)
+        before = frontier.builds(3000)
+        inventory.add_item(RAM("RAM_04", "Value 64GB", 40, 5, 64))
+        after = frontier.builds(3000)
+
+        self.assertNotEqual(before, after)
+        self.assertTrue(all(build["parts"]["RAM"][0].item_id == "RAM_04"
+                            for build in after))
+        self.assertTrue(all(build["price"] <= 700 for build in frontier.builds(700)))
+
+class TestBestValueBuilds(unittest.TestCase):
+    @patch('src.build.clear_screen')
+    @patch('builtins.print')
+    @patch('builtins.input', side_effect=["1"])
+    def test_load_best_value_build(self, _mock_input, _mock_print, _mock_clear):
+        """
+        Test that picking a best value build loads it into the build.
+        """
+        inventory = make_inventory()
+        build = menu_build(inventory, 1500)
+        build.best_value_builds()
+
+        cheapest = pareto_builds(inventory, 1500)[0]
+        self.assertEqual(build.total_cost, cheapest["price"])
+        self.assertIs(build.build["Motherboard"], cheapest["parts"]["Motherboard"])
+
+if __name__ == '__main__':
+    unittest.main()
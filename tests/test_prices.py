@@ -0,0 +1,110 @@
+import unittest
+
+from catalog import make_inventory, make_items
+from src.headless import CommandSession
+from src.inventory import CPU
+from src.prices import PriceIndex, apply_price_updates
+from src.session_store import SessionStore
+from src.versioned import VersionedInventory
+
+PARTS = ("CPU_01", "CPU_02", "RAM_01", "GPU_01")
+
+class TestApplyPriceUpdates(unittest.TestCase):
+    def test_batch_is_applied(self):
+        """
+        Test that new prices replace the parts, skipping unchanged prices and unknown IDs.
+        """
+        inventory = make_inventory(*PARTS)
+        old_cpu = inventory.get_item("cpu_01")
+        diff, unknown = apply_price_updates(
+            inventory, [("CPU_01", 150), ("cpu_01", 180), ("ram_01", 40), ("nope", 5),
+                        ("gpu_01", "350")])
+        self.assertEqual(unknown, ["nope"])
+        self.assertEqual([(old.item_id, new.price) for old, new in diff.changed],
+                         [("CPU_01", 180), ("GPU_01", 350)])
+        self.assertEqual(inventory.get_item("cpu_01").price, 180)
+        self.assertEqual(inventory.get_item("cpu_01").name, "Thunderbolt")
+        # Builds and carts still holding the old part see the old price until re-priced
+        self.assertEqual(old_cpu.price, 200)
+
+    def test_invalid_price_changes_nothing(self):
+        """
+        Test that a bad price anywhere in the batch rejects the whole batch.
+        """
+        inventory = make_inventory(*PARTS)
+        for bad in (-1, 12.5, "cheap", None, True, False):
+            with self.assertRaises(ValueError):
+                apply_price_updates(inventory, [("cpu_01", 150), ("gpu_01", bad)])
+        self.assertEqual(inventory.get_item("cpu_01").price, 200)
+
+    def test_versioned_batch_is_one_version(self):
+        """
+        Test that a versioned inventory publishes the whole batch as a single version.
+        """
+        inventory = VersionedInventory(make_items(*PARTS))
+        version = inventory.version
+        apply_price_updates(inventory, [("cpu_01", 1), ("cpu_02", 2), ("gpu_01", 3)])
+        self.assertEqual(inventory.version, version + 1)
+        self.assertEqual([int(cpu.price) for cpu in inventory.get_items_by_type("CPU")], [1, 2])
+
+class TestPriceIndex(unittest.TestCase):
+    def test_owners_of_changed_parts(self):
+        """
+        Test that only the owners holding a changed or removed part are found.
+        """
+        inventory = make_inventory(*PARTS)
+        index = PriceIndex()
+        index.track("a", ["cpu_01", "ram_01"])
+        index.track("b", ["gpu_01"])
+        index.track("c", ["cpu_02"])
+        index.track("a", ["ram_01"])
+        diff, _ = apply_price_updates(inventory, [("cpu_01", 1), ("ram_01", 2)])
+        self.assertEqual(index.owners_of(diff), {"a"})
+        diff.removed.append(inventory.get_item("gpu_01"))
+        self.assertEqual(index.owners_of(diff), {"a", "b"})
+        index.forget("a")
+        self.assertEqual(len(index), 2)
+        self.assertEqual(index.owners_of(diff), {"b"})
+
+class TestRepricingSessions(unittest.TestCase):
+    def setUp(self):
+        self.inventory = make_inventory(*PARTS)
+        self.store = SessionStore(lambda: CommandSession(self.inventory), hot_capacity=2)
+
+    def session(self, *commands) -> str:
+        session_id = self.store.create()
+        session = self.store.load(session_id)
+        for command in commands:
+            session.execute(command)
+        self.store.save(session_id, session)
+        return session_id
+
+    def test_only_affected_sessions_are_repriced(self):
+        """
+        Test that a price change adjusts the totals of the thawed and frozen sessions
+        holding the part, and of a session in use once it is saved, and no others.
+        """
+        frozen = self.session("build add cpu_01", "cart add cpu_01", "cart add ram_01")
+        untouched = self.session("cart add cpu_02")
+        thawed = self.session("build add ram_01 cpu_01")
+        in_use = self.session("cart add cpu_01")
+        self.assertEqual(self.store.stats()["hot"], 2)
+        hot_session = self.store.load(thawed)
+        self.store.save(thawed, hot_session)
+        session = self.store.load(in_use)
+
+        with self.store.locked():
+            diff, _ = apply_price_updates(self.inventory, [("cpu_01", 250), ("gpu_01", 1)])
+            self.assertEqual(self.store.apply_inventory_diff(diff), 3)
+
+        record = self.store.record(frozen)
+        self.assertEqual((record.build_total, record.cart_total), (250, 290))
+        self.assertEqual(self.store.record(untouched).cart_total, 120)
+        self.assertEqual(hot_session.build_status()["cost"], 290)
+        self.assertEqual(session.cart_total, 200)
+        self.store.save(in_use, session)
+        self.assertEqual(session.cart_total, 250)
+        self.assertEqual(self.store.stats()["repriced"], 3)
+
+if __name__ == '__main__':
+    unittest.main()
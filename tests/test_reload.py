@@ -0,0 +1,104 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+
+from src.build import Build
+from src.columnar import ColumnarInventory
+from src.loader import load_inventory_shards
+from src.reload import InventoryWatcher
+
+def entry(item_id, price, item_type="CPU"):
+    if item_type == "CPU":
+        return {"item": {"id": item_id, "type": "CPU", "name": f"Processor {item_id}",
+                         "price": price, "power_draw": 100, "socket": "LGA"}}
+    return {"item": {"id": item_id, "type": "PSU", "name": f"Supply {item_id}",
+                     "price": price, "power_supplied": 500}}
+
+class TestInventoryWatcher(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.write("a.json", [entry("CPU_01", 100), entry("CPU_02", 200)])
+        self.write("b.json", [entry("PSU_01", 50, "PSU")])
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def write(self, name, entries):
+        path = os.path.join(self.directory, name)
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump({"inventory": entries}, file)
+        # Make sure the change is visible even on filesystems with coarse timestamps
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    def load(self, inventory=None):
+        item_sources = {}
+        inventory = load_inventory_shards(
+            [os.path.join(self.directory, name) for name in ("a.json", "b.json")],
+            inventory, max_workers=1, item_sources=item_sources
+        )
+        return inventory, InventoryWatcher(self.directory, inventory, item_sources)
+
+    def test_unchanged_files_give_empty_diff(self):
+        """
+        Test that polling without changes does nothing.
+        """
+        _, watcher = self.load()
+        self.assertFalse(watcher.poll())
+
+    def test_only_changed_file_is_applied(self):
+        """
+        Test that added, removed and changed items of a modified shard are applied in place.
+        """
+        for backend in (None, ColumnarInventory()):
+            inventory, watcher = self.load(backend)
+            self.write("a.json", [entry("CPU_01", 150), entry("CPU_03", 300)])
+
+            self.assertEqual(watcher.changed_files(), [os.path.join(self.directory, "a.json")])
+            diff = watcher.reload()
+            self.assertEqual(diff.summary(), "1 added, 1 removed, 1 changed")
+            self.assertEqual(inventory.get_item("cpu_01").price, 150)
+            self.assertIsNone(inventory.get_item("cpu_02"))
+            self.assertEqual(sorted(item.item_id for item in
+                                    inventory.get_items_by_socket("CPU", "LGA")),
+                             ["CPU_01", "CPU_03"])
+            self.assertEqual(len(inventory), 3)
+            self.assertFalse(watcher.poll())
+            self.write("a.json", [entry("CPU_01", 100), entry("CPU_02", 200)])
+
+    def test_item_moved_between_shards_is_changed(self):
+        """
+        Test that an item moving to another shard is not reported as removed.
+        """
+        inventory, watcher = self.load()
+        self.write("a.json", [entry("CPU_01", 100)])
+        self.write("b.json", [entry("PSU_01", 50, "PSU"), entry("CPU_02", 250)])
+
+        diff = watcher.reload()
+        self.assertEqual(diff.summary(), "0 added, 0 removed, 1 changed")
+        self.assertEqual(inventory.get_item("cpu_02").price, 250)
+
+    def test_build_is_repriced(self):
+        """
+        Test that an open build is re-priced and loses parts that were removed.
+        """
+        inventory, watcher = self.load()
+        build = Build(MagicMock(), MagicMock(), inventory, MagicMock())
+        build.build["CPU"] = inventory.get_item("cpu_01")
+        build.build["PSU"] = inventory.get_item("psu_01")
+        build.recalculate_totals()
+
+        self.write("a.json", [entry("CPU_01", 175), entry("CPU_02", 200)])
+        self.write("b.json", [])
+        diff = watcher.reload(build)
+
+        self.assertEqual(build.build["CPU"].price, 175)
+        self.assertIsNone(build.build["PSU"])
+        self.assertEqual(build.total_cost, 175)
+        self.assertEqual(len(diff.messages), 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+import builtins
+import io
+import os
+import sys
+import unittest
+from unittest.mock import patch
+
+from src.render import ERASE_BELOW, ERASE_SCREEN, HOME, TerminalRenderer, buffered_output
+from src.utils import clear_screen
+
+class FakeTerminal(io.StringIO):
+    def __init__(self):
+        super().__init__()
+        self.writes = []
+
+    def isatty(self):
+        return True
+
+    def write(self, text):
+        self.writes.append(text)
+        return super().write(text)
+
+@patch('src.render.shutil.get_terminal_size', return_value=os.terminal_size((80, 24)))
+class TestTerminalRenderer(unittest.TestCase):
+    def screen(self, renderer, *lines, prompt=None):
+        clear_screen()
+        for line in lines:
+            print(line)
+        if prompt is not None:
+            print(prompt, end="")
+        renderer.flush()
+        return renderer.stream.writes.pop()
+
+    def test_screen_is_one_write(self, _size):
+        terminal = FakeTerminal()
+        with buffered_output(terminal) as renderer:
+            print("Main Menu")
+            print("1. list parts")
+            self.assertEqual(terminal.writes, [])
+            output = self.screen(renderer, "Main Menu", "1. list parts", prompt="Option: ")
+        self.assertTrue(output.startswith(HOME + ERASE_SCREEN))
+        self.assertTrue(output.endswith("Main Menu\n1. list parts\nOption: "))
+
+    def test_only_changed_rows_are_redrawn(self, _size):
+        terminal = FakeTerminal()
+        with buffered_output(terminal) as renderer:
+            self.screen(renderer, "Build", "CPU: none", "GPU: none")
+            output = self.screen(renderer, "Build", "CPU: cpu_01", "GPU: none")
+            self.assertNotIn("Build", output)
+            self.assertNotIn("GPU", output)
+            self.assertIn("\x1b[2;1HCPU: cpu_01", output)
+            self.assertNotIn(ERASE_SCREEN, output)
+
+            output = self.screen(renderer, "Build")
+            self.assertIn(ERASE_BELOW, output)
+
+    def test_answered_prompt_row_is_redrawn(self, _size):
+        terminal = FakeTerminal()
+        with buffered_output(terminal) as renderer:
+            self.screen(renderer, "Menu", prompt="Option: ")
+            # The terminal now shows the answer after the prompt
+            output = self.screen(renderer, "Menu", prompt="Option: ")
+        self.assertIn("\x1b[2;1HOption: ", output)
+        self.assertNotIn("Menu", output)
+
+    def test_screen_taller_than_terminal_is_redrawn_whole(self, size):
+        size.return_value = os.terminal_size((80, 3))
+        terminal = FakeTerminal()
+        with buffered_output(terminal) as renderer:
+            self.screen(renderer, "a", "b", "c", "d")
+            output = self.screen(renderer, "a", "b")
+        self.assertTrue(output.startswith(HOME + ERASE_SCREEN))
+
+    def test_not_a_terminal_appends(self, _size):
+        stream = io.StringIO()
+        with buffered_output(stream):
+            print("one")
+            clear_screen()
+            print("two")
+            self.assertEqual(stream.getvalue(), "")
+        self.assertEqual(stream.getvalue(), "one\ntwo\n")
+
+    def test_input_prompt_goes_through_renderer(self, _size):
+        terminal = FakeTerminal()
+        with patch("builtins.input", return_value="2") as read_line:
+            with buffered_output(terminal) as renderer:
+                print("Menu")
+                self.assertEqual(input("Option: "), "2")
+                self.assertTrue(renderer.isatty())
+        read_line.assert_called_once_with()
+        self.assertEqual(terminal.getvalue(), "Menu\nOption: ")
+        with self.assertRaises(io.UnsupportedOperation):
+            renderer.fileno()
+        with open(os.devnull, "w", encoding="utf-8") as stream:
+            self.assertEqual(TerminalRenderer(stream).fileno(), stream.fileno())
+
+    def test_renderer_is_removed_after_block(self, _size):
+        previous, previous_input = sys.stdout, builtins.input
+        with self.assertRaises(RuntimeError):
+            with buffered_output(io.StringIO()) as renderer:
+                print("left over")
+                raise RuntimeError
+        self.assertIs(sys.stdout, previous)
+        self.assertIs(builtins.input, previous_input)
+        self.assertEqual(renderer.stream.getvalue(), "left over\n")
+        self.assertIsInstance(renderer, TerminalRenderer)
+
+if __name__ == "__main__":
+    unittest.main()
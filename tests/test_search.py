@@ -0,0 +1,161 @@
+import random
+import unittest
+from unittest.mock import MagicMock, patch
+
+from catalog import make_inventory
+from src.build import Build
+from src.cart import Cart
+from src.inventory import CPU, GPU, RAM, Inventory, get_details
+from src.reload import InventoryDiff, apply_diff
+from src.search import SCAN_ROWS, SearchIndex, choose_part, tokenize
+from src.versioned import VersionedInventory
+
+def make_items():
+    # Names sharing words, for the search to rank
+    return [CPU("CPU_01", "PyProcessor Thunderbolt", 200, 120, "LGA"),
+            CPU("CPU_02", "PyProcessor Lightning", 120, 65, "PGA"),
+            CPU("CPU_03", "Hexacore Thunderstorm", 150, 95, "LGA"),
+            RAM("RAM_01", "Basic 8GB", 40, 5, 8),
+            GPU("GPU_01", "Render 9000 Ti", 400, 250, True),
+            GPU("GPU_02", "Render 7600X", 300, 180, False)]
+
+def ids(items):
+    return [item.item_id for item in items]
+
+class TestSearchIndex(unittest.TestCase):
+    def setUp(self):
+        self.inventory = make_inventory(items=make_items())
+        self.index = SearchIndex(self.inventory)
+
+    def test_ranked_matches(self):
+        """
+        Test that exact words rank above prefixes, prefixes above substrings, and that a
+        misspelled word still finds the part.
+        """
+        self.assertEqual(tokenize("Render 9000-Ti"), ["render", "9000", "ti"])
+        self.assertEqual(ids(self.index.search("thunderbolt")), ["CPU_01"])
+        self.assertEqual(ids(self.index.search("thunder")), ["CPU_01", "CPU_03"])
+        self.assertEqual(ids(self.index.search("bolt")), ["CPU_01"])
+        self.assertEqual(ids(self.index.search("thundrebolt")), ["CPU_01"])
+        self.assertEqual(ids(self.index.search("lightnig")), ["CPU_02"])
+        self.assertEqual(ids(self.index.search("ram")), ["RAM_01"])
+        self.assertEqual(ids(self.index.search("7600x")), ["GPU_02"])
+        self.assertEqual(ids(self.index.search("xyzzy")), [])
+        self.assertEqual(len(self.index.search("cpu", limit=2)), 2)
+
+    def test_every_word_must_match(self):
+        """
+        Test that a multi-word query only finds parts matching all of its words.
+        """
+        self.assertEqual(ids(self.index.search("pyprocessor thunder")), ["CPU_01"])
+        self.assertEqual(ids(self.index.search("render ti")), ["GPU_01"])
+        self.assertEqual(ids(self.index.search("hexacore lightning")), [])
+
+    def test_id_spellings(self):
+        """
+        Test that a query spelling an ID with another separator, case or padding finds it
+        first.
+        """
+        for query in ("cpu_01", "CPU-01", "cpu01", "cpu 1", "Cpu_001"):
+            self.assertEqual(ids(self.index.search(query))[:1], ["CPU_01"], query)
+        self.assertEqual(ids(self.index.search("cpu_99")), [])
+
+    def test_reload_diff_updates_index(self):
+        """
+        Test that added, removed and renamed parts are searchable at once without a full
+        rebuild, and that a price change needs no re-indexing.
+        """
+        self.index.search("render")
+        diff = InventoryDiff()
+        diff.added.append(RAM("RAM_02", "Vortex 32GB", 150, 8, 32))
+        diff.removed.append(self.inventory.get_item("cpu_02"))
+        old = self.inventory.get_item("gpu_01")
+        diff.changed.append((old, GPU("GPU_01", "Nimbus 9000", 420, 250, True)))
+        apply_diff(self.inventory, diff)
+        self.index.apply_inventory_diff(diff)
+        self.assertEqual(self.index.built_version, self.inventory.version)
+
+        with patch.object(self.index, "_build") as build:
+            self.assertEqual(ids(self.index.search("vortex")), ["RAM_02"])
+            self.assertEqual(ids(self.index.search("lightning")), [])
+            self.assertEqual(ids(self.index.search("render")), ["GPU_02"])
+            found = self.index.search("nimbus")
+            self.assertEqual((ids(found), found[0].price), (["GPU_01"], 420))
+            build.assert_not_called()
+
+    def test_change_without_diff_rebuilds(self):
+        """
+        Test that the index is rebuilt when the inventory changed without a diff.
+        """
+        inventory = VersionedInventory(make_items())
+        index = SearchIndex(inventory)
+        self.assertEqual(ids(index.search("basic")), ["RAM_01"])
+        inventory.add_item(RAM("RAM_03", "Basic 16GB", 70, 5, 16))
+        self.assertEqual(ids(index.search("basic")), ["RAM_01", "RAM_03"])
+
+    def test_common_words_match_brute_force(self):
+        """
+        Test that queries of common words, answered from the words' bitmaps, give the
+        same parts as checking every part.
+        """
+        generator = random.Random(3)
+        brands = ("Quasar", "Helix", "Lumen")
+        series = ("Titan", "Vortex", "Nimbus", "Falcon")
+        inventory = Inventory()
+        for number in range(6 * SCAN_ROWS):
+            name = f"{generator.choice(brands)} {generator.choice(series)} {number % 97}"
+            inventory.add_item(CPU(f"CPU_{number}", name, 100, 65, "LGA"))
+        index = SearchIndex(inventory)
+        for query in ("quasar titan", "helix vortex 5", "lumen nimbus 96", "quas falc"):
+            words = query.split()
+            expected = {item.item_id for item in inventory.items
+                        if all(any(token.startswith(word) for token in tokenize(item.name))
+                               for word in words)}
+            found = index.search(query, limit=len(inventory))
+            self.assertEqual(set(ids(found)), expected, query)
+            self.assertEqual(len(found), len(expected), query)
+
+class TestPrompts(unittest.TestCase):
+    def setUp(self):
+        self.inventory = make_inventory(items=make_items())
+        self.index = SearchIndex(self.inventory)
+
+    def test_choose_part(self):
+        """
+        Test that an exact ID is taken at once and a mistyped one offers the closest parts.
+        """
+        with patch("builtins.input") as user_input:
+            self.assertEqual(choose_part(self.index, "cpu_02").item_id, "CPU_02")
+            user_input.assert_not_called()
+        with patch("builtins.input", return_value="2"), patch("builtins.print") as output:
+            self.assertEqual(choose_part(self.index, "thunder").item_id, "CPU_03")
+            self.assertIn("Did you mean", output.call_args_list[0][0][0])
+        with patch("builtins.input", return_value=""), patch("builtins.print"):
+            self.assertIsNone(choose_part(self.index, "thunder"))
+        with patch("builtins.input") as user_input, patch("builtins.print"):
+            self.assertIsNone(choose_part(self.index, "xyzzy"))
+            user_input.assert_not_called()
+
+    @patch("src.inventory.clear_screen")
+    @patch("src.cart.clear_screen")
+    @patch("src.build.clear_screen")
+    def test_details_build_and_cart_prompts(self, *_clear_screen):
+        """
+        Test that the details, build and cart prompts offer the closest parts for an ID
+        that is not in the inventory.
+        """
+        cart = Cart(MagicMock(), self.inventory, search_index=self.index)
+        build = Build(MagicMock(), cart, self.inventory, MagicMock(), search_index=self.index)
+        with patch("builtins.input", side_effect=["render 9000", "1"]), \
+                patch("builtins.print"):
+            self.assertEqual(get_details(self.inventory, search_index=self.index).item_id,
+                             "GPU_01")
+        with patch("builtins.input", side_effect=["lightnin", "1"]), patch("builtins.print"):
+            self.assertEqual(build.add_item().item_id, "CPU_02")
+        with patch("builtins.input", side_effect=["8gb", "1"]), patch("builtins.print"):
+            cart.add_item()
+        self.assertEqual(list(cart.cart), ["RAM_01"])
+        self.assertIsNone(build.add_item("lightnin"))
+
+if __name__ == '__main__':
+    unittest.main()
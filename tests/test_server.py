@@ -0,0 +1,206 @@
+import asyncio
+import json
+import threading
+import unittest
+from unittest.mock import patch
+
+from catalog import make_inventory
+from src.prices import apply_price_updates
+from src.server import StorefrontServer
+
+PARTS = ("CPU_01", "CPU_02", "MB_01", "MB_02", "RAM_01", "STO_01", "GPU_01", "PSU_02")
+
+class TestRoutes(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.server = StorefrontServer(make_inventory(*PARTS))
+
+    def tearDown(self):
+        self.server.close()
+
+    async def request(self, method, target, body=None, expected=200):
+        status, payload = await self.server.handle(
+            method, target, json.dumps(body).encode() if body is not None else b"")
+        self.assertEqual(status, expected, payload)
+        return json.loads(payload)
+
+    async def test_lookups(self):
+        listing = await self.request("GET", "/parts?type=cpu")
+        self.assertEqual([part["id"] for part in listing["cpu"]], ["cpu_01", "cpu_02"])
+        self.assertEqual(await self.request("GET", "/parts?type=cpu"), listing)
+        self.assertEqual((await self.request("GET", "/parts/MB_02"))["ram_slots"], 4)
+        await self.request("GET", "/parts/nope", expected=404)
+        verdict = await self.request("GET", "/compatibility?ids=cpu_01,mb_02")
+        self.assertFalse(verdict["valid"])
+        await self.request("GET", "/nowhere", expected=404)
+        await self.request("POST", "/parts", expected=405)
+
+    async def test_session_build_and_cart(self):
+        session = (await self.request("POST", "/sessions", expected=201))["session"]
+        base = f"/sessions/{session}"
+        await self.request("PUT", f"{base}/user", {"name": "Ada", "budget": 1000})
+        for part_id in ("mb_02", "cpu_02", "ram_01", "sto_01", "psu_02"):
+            status = await self.request("POST", f"{base}/build/parts", {"part_id": part_id})
+        self.assertTrue(status["valid"])
+        self.assertEqual(status["cost"], 500)
+        self.assertTrue((await self.request("GET", f"{base}/build/check"))["valid"])
+
+        await self.request("POST", f"{base}/cart/build")
+        cart = await self.request("POST", f"{base}/cart/items", {"part_id": "gpu_01"})
+        self.assertEqual(cart["total"], 900)
+        await self.request("DELETE", f"{base}/cart/items/build")
+        summary = await self.request("GET", base)
+        self.assertEqual((summary["name"], summary["cart"]["total"]), ("Ada", 400))
+        self.assertEqual(summary["cart"]["budget"], summary["budget"])
+        self.assertEqual(set(summary["build"]),
+                         {"part_count", "cost", "power_balance", "valid", "problems"})
+        self.assertEqual((await self.request("POST", f"{base}/checkout"))["total"], 400)
+
+        await self.request("POST", f"{base}/cart/items", {"part_id": "nope"}, expected=400)
+        await self.request("POST", f"{base}/cart/items", {}, expected=400)
+        await self.request("DELETE", base)
+        await self.request("GET", f"{base}/cart", expected=404)
+        stats = (await self.request("GET", "/stats"))["sessions"]
+        self.assertEqual((stats["created"], stats["deleted"], stats["resident"]), (1, 1, 0))
+
+    async def test_price_updates_reach_sessions(self):
+        holding = (await self.request("POST", "/sessions", expected=201))["session"]
+        other = (await self.request("POST", "/sessions", expected=201))["session"]
+        await self.request("POST", f"/sessions/{holding}/cart/items", {"part_id": "gpu_01"})
+        await self.request("POST", f"/sessions/{other}/cart/items", {"part_id": "cpu_01"})
+        result = await self.request("POST", "/prices", {"prices": {"GPU_01": 350, "nope": 1}})
+        self.assertEqual(result, {"updated": 1, "unknown": ["nope"], "sessions": 1})
+        self.assertEqual((await self.request("GET", f"/sessions/{holding}"))["cart"]["total"],
+                         350)
+        self.assertEqual((await self.request("GET", "/parts/gpu_01"))["price"], 350)
+        await self.request("POST", "/prices", {"prices": {"gpu_01": -5}}, expected=400)
+        await self.request("POST", "/prices", {"prices": {"gpu_01": True}}, expected=400)
+        await self.request("POST", "/prices", {"prices": []}, expected=400)
+
+    async def test_sessions_wait_for_price_updates_without_blocking(self):
+        session = (await self.request("POST", "/sessions", expected=201))["session"]
+        await self.request("POST", f"/sessions/{session}/cart/items", {"part_id": "gpu_01"})
+        started, release, released = threading.Event(), threading.Event(), []
+
+        def slow_update(*arguments):
+            started.set()
+            released.append(release.wait(5))
+            return apply_price_updates(*arguments)
+
+        with patch("src.server.apply_price_updates", side_effect=slow_update):
+            update = asyncio.create_task(
+                self.request("POST", "/prices", {"prices": {"GPU_01": 350}}))
+            await asyncio.get_running_loop().run_in_executor(None, started.wait, 5)
+            summary = asyncio.create_task(self.request("GET", f"/sessions/{session}"))
+            await asyncio.sleep(0)
+            # The loop still answers lookups while the store's lock is held on the worker
+            self.assertEqual((await self.request("GET", "/parts/cpu_01"))["id"], "cpu_01")
+            self.assertFalse(summary.done())
+            release.set()
+            self.assertEqual((await update)["sessions"], 1)
+            self.assertEqual((await summary)["cart"]["total"], 350)
+        self.assertEqual(released, [True])
+
+    async def test_failures_are_not_shown(self):
+        with patch("src.server.part_details", side_effect=RuntimeError("secret detail")), \
+                self.assertLogs("src.server", "ERROR") as logs:
+            result = await self.request("GET", "/parts/cpu_01", expected=500)
+        self.assertEqual(result, {"error": "Internal server error"})
+        self.assertIn("secret detail", "\n".join(logs.output))
+
+    async def test_search(self):
+        found = await self.request("GET", "/search?q=render%209000")
+        self.assertEqual([part["id"] for part in found], ["gpu_01"])
+        found = await self.request("GET", "/search?q=board&limit=1")
+        self.assertEqual([part["id"] for part in found], ["mb_01"])
+        await self.request("GET", "/search", expected=400)
+        await self.request("GET", "/search?q=board&limit=many", expected=400)
+        await self.request("POST", "/prices", {"prices": {"MB_01": 90}})
+        self.assertEqual(self.server.search_index.built_version,
+                         self.server.inventory_object.version)
+
+    async def test_sorted_listing(self):
+        page = await self.request("GET", "/parts?sort=price&desc=1&per_page=2&page=2")
+        self.assertEqual([part["id"] for part in page["items"]], ["mb_02", "cpu_02"])
+        self.assertEqual((page["total"], page["pages"]), (8, 4))
+        page = await self.request("GET", "/parts?type=all&price=40..110&sort=name")
+        self.assertEqual([part["id"] for part in page["items"]],
+                         ["ram_01", "mb_01", "psu_02", "sto_01"])
+        await self.request("GET", "/parts?sort=socket", expected=400)
+        await self.request("GET", "/parts?capacity=lots", expected=400)
+        await self.request("GET", "/parts?page=1&per_page=many", expected=400)
+
+    async def test_sessions_are_separate(self):
+        first = (await self.request("POST", "/sessions", expected=201))["session"]
+        second = (await self.request("POST", "/sessions", expected=201))["session"]
+        await self.request("POST", f"/sessions/{first}/build/parts", {"part_id": "gpu_01"})
+        self.assertEqual((await self.request("GET", f"/sessions/{second}"))["build"]["cost"], 0)
+
+    async def test_generated_builds_run_on_the_worker(self):
+        session = (await self.request("POST", "/sessions", expected=201))["session"]
+        await self.request("PUT", f"/sessions/{session}/user", {"budget": 800})
+        page = await self.request("GET", f"/sessions/{session}/builds")
+        self.assertTrue(page["builds"])
+        # The paging position is kept in the session store between requests
+        following = await self.request("GET", f"/sessions/{session}/builds")
+        if following["builds"]:
+            self.assertGreaterEqual(following["builds"][0]["price"], page["builds"][-1]["price"])
+            self.assertNotEqual(following["builds"][0], page["builds"][0])
+        self.assertTrue(await self.request("GET", f"/sessions/{session}/pareto"))
+
+class TestConnections(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.server = StorefrontServer(make_inventory(*PARTS), idle_timeout=5)
+        self.listener = await self.server.start("127.0.0.1", 0)
+        self.port = self.listener.sockets[0].getsockname()[1]
+
+    async def asyncTearDown(self):
+        self.listener.close()
+        await self.listener.wait_closed()
+        self.server.close()
+
+    async def read_response(self, reader):
+        head = (await reader.readuntil(b"\r\n\r\n")).decode()
+        headers = dict(line.split(": ", 1) for line in head.split("\r\n")[1:] if line)
+        body = await reader.readexactly(int(headers["Content-Length"]))
+        return head.split(" ")[1], headers, json.loads(body)
+
+    async def test_keep_alive_and_pipelining(self):
+        reader, writer = await asyncio.open_connection("127.0.0.1", self.port)
+        writer.write(b"GET /parts/cpu_01 HTTP/1.1\r\nHost: test\r\n\r\n"
+                     b"POST /sessions HTTP/1.1\r\nHost: test\r\nContent-Length: 0\r\n\r\n")
+        status, headers, body = await self.read_response(reader)
+        self.assertEqual((status, headers["Connection"]), ("200", "keep-alive"))
+        self.assertEqual(body["name"], "Thunderbolt")
+        status, _, body = await self.read_response(reader)
+        self.assertEqual(status, "201")
+        self.assertIn("session", body)
+
+        writer.write(b"GET /parts/cpu_02 HTTP/1.1\r\nConnection: close\r\n\r\n")
+        status, headers, _ = await self.read_response(reader)
+        self.assertEqual(headers["Connection"], "close")
+        self.assertEqual(await reader.read(), b"")
+        writer.close()
+        await writer.wait_closed()
+
+    async def test_short_body_closes(self):
+        reader, writer = await asyncio.open_connection("127.0.0.1", self.port)
+        writer.write(b"POST /sessions HTTP/1.1\r\nContent-Length: 10\r\n\r\n{}")
+        writer.write_eof()
+        with self.assertNoLogs("asyncio", "ERROR"):
+            self.assertEqual(await reader.read(), b"")
+            writer.close()
+            await writer.wait_closed()
+            await asyncio.sleep(0.05)
+
+    async def test_http_10_closes(self):
+        reader, writer = await asyncio.open_connection("127.0.0.1", self.port)
+        writer.write(b"GET /parts?type=psu HTTP/1.0\r\n\r\n")
+        status, headers, body = await self.read_response(reader)
+        self.assertEqual((status, headers["Connection"]), ("200", "close"))
+        self.assertEqual(body["psu"][0]["id"], "psu_02")
+        self.assertEqual(await reader.read(), b"")
+        writer.close()
+        await writer.wait_closed()
+
+if __name__ == "__main__":
+    unittest.main()
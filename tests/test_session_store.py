@@ -0,0 +1,124 @@
+import unittest
+
+from catalog import make_inventory
+from src.headless import CommandSession
+from src.session_store import SessionStore, freeze, thaw
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+class TestFreezeThaw(unittest.TestCase):
+    def setUp(self):
+        self.inventory = make_inventory()
+
+    def session(self):
+        return CommandSession(self.inventory)
+
+    def test_round_trip(self):
+        session = self.session()
+        for command in ("name Ada", "budget 2000", "build add mb_02 cpu_02 ram_01 ram_01 sto_01",
+                        "build add psu_02", "cart add-build", "cart add gpu_01", "builds"):
+            session.execute(command)
+
+        record = freeze(session)
+        self.assertEqual(sorted(record.build), ["CPU_02", "MB_02", "PSU_02", "RAM_01", "RAM_01",
+                                                "STO_01"])
+        self.assertEqual(record.cart, ("GPU_01",))
+        self.assertEqual(record.cart_total, 940)
+        # The IDs are the inventory's own strings
+        self.assertIs(record.cart[0], self.inventory.get_item("gpu_01").item_id)
+
+        restored = thaw(record, self.session())
+        self.assertEqual(restored.build_status(), session.build_status())
+        self.assertEqual(restored.cart_status(), session.cart_status())
+        self.assertCountEqual(restored.cart_show()["items"], session.cart_show()["items"])
+        self.assertEqual(restored.execute("builds"), session.execute("builds"))
+        # The thawed session keeps holding its stock under the same holder
+        self.assertEqual(restored.stock_hold.holder, session.stock_hold.holder)
+
+    def test_removed_parts_drop_out(self):
+        session = self.session()
+        session.execute("build add gpu_01 cpu_01")
+        session.execute("cart add sto_02")
+        record = freeze(session)
+        self.inventory.remove_item("GPU_01")
+        self.inventory.remove_item("STO_02")
+        restored = thaw(record, self.session())
+        self.assertEqual(restored.build_status()["cost"], 200)
+        self.assertEqual(restored.cart_status()["total"], 0)
+
+class TestSessionStore(unittest.TestCase):
+    def setUp(self):
+        inventory = make_inventory()
+        self.clock = Clock()
+        self.store = SessionStore(lambda: CommandSession(inventory), ttl=60,
+                                  clock=self.clock)
+
+    def test_save_and_load(self):
+        session_id = self.store.create()
+        session = self.store.load(session_id)
+        session.execute("build add cpu_01")
+        self.store.save(session_id, session)
+        self.assertEqual(self.store.load(session_id).build_status()["cost"], 200)
+        self.assertIsNone(self.store.load("unknown"))
+
+    def test_idle_sessions_expire(self):
+        first = self.store.create()
+        self.clock.now = 40
+        second = self.store.create()
+        self.clock.now = 80
+        self.assertIsNone(self.store.record(first))
+        self.assertIsNotNone(self.store.record(second))
+        self.clock.now = 130
+        self.assertIsNotNone(self.store.record(second))
+        self.clock.now = 200
+        self.assertEqual(self.store.expire(), 1)
+        self.assertEqual(self.store.stats()["expired"], 2)
+        self.assertEqual(self.store.bytes, 0)
+
+    def test_least_recently_used_are_evicted(self):
+        ids = [self.store.create() for _ in range(3)]
+        per_session = self.store.bytes // 3
+        self.store.max_bytes = per_session * 3
+        self.store.record(ids[0])
+        session = self.store.load(ids[2])
+        session.execute("cart add gpu_01")
+        self.store.save(ids[2], session)
+        # Reading the record freezes the thawed session back into it
+        self.assertEqual(self.store.record(ids[2]).cart_total, 400)
+        self.assertEqual([session_id in self.store for session_id in ids], [True, False, True])
+        stats = self.store.stats()
+        self.assertEqual((stats["resident"], stats["evicted"]), (2, 1))
+        self.assertLessEqual(stats["bytes"], stats["max_bytes"])
+
+    def test_thawed_sessions_are_written_back(self):
+        self.store.hot_capacity = 1
+        first, second = self.store.create(), self.store.create()
+        session = self.store.load(first)
+        session.execute("build add cpu_01")
+        # A session in use is not frozen
+        self.assertEqual(self.store.record(first).build, ())
+        self.store.save(first, session)
+        self.assertIs(self.store.load(first), session)
+        self.store.save(first, session)
+        self.store.save(second, self.store.load(second))
+        self.assertEqual(self.store.stats()["hot"], 1)
+        self.assertEqual(self.store.record(first).build, ("CPU_01",))
+        restored = self.store.load(first)
+        self.assertIsNot(restored, session)
+        self.assertEqual(restored.build_status()["cost"], 200)
+
+    def test_ended_sessions_are_not_saved_back(self):
+        session_id = self.store.create()
+        session = self.store.load(session_id)
+        self.assertTrue(self.store.delete(session_id))
+        self.store.save(session_id, session)
+        self.assertNotIn(session_id, self.store)
+        self.assertFalse(self.store.delete(session_id))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from src.inventory import gen_parts_dict
+from src.loader import load_inventory_file
+from src.snapshot import open_snapshot, snapshot_path, SnapshotInventory
+
+class TestSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.inventory_file = os.path.join(self.directory, 'inventory.json')
+        shutil.copy('inventory.json', self.inventory_file)
+        self.expected = load_inventory_file(self.inventory_file)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_snapshot_matches_json(self):
+        """
+        Test that every item decoded from the snapshot matches the JSON source.
+        """
+        snapshot = open_snapshot(self.inventory_file)
+        self.assertTrue(os.path.isfile(snapshot_path(self.inventory_file)))
+        self.assertEqual(len(snapshot), len(self.expected))
+        for item in self.expected.items:
+            self.assertEqual(vars(snapshot.get_item(item.item_id.lower())), vars(item))
+        self.assertIsNone(snapshot.get_item("cpu_99"))
+        self.assertEqual(
+            [board.item_id for board in snapshot.get_items_by_socket("Motherboard", "LGA")],
+            [board.item_id for board in self.expected.get_items_by_socket("Motherboard", "LGA")]
+        )
+        self.assertEqual(snapshot.get_ram_slot_counts(), self.expected.get_ram_slot_counts())
+        snapshot.close()
+
+    def test_snapshot_reused_when_current(self):
+        """
+        Test that an up-to-date snapshot is mapped without being rewritten.
+        """
+        open_snapshot(self.inventory_file).close()
+        written = os.stat(snapshot_path(self.inventory_file)).st_ino
+        os.utime(self.inventory_file, ns=(1, 1))
+        open_snapshot(self.inventory_file).close()
+        open_snapshot(self.inventory_file).close()
+        self.assertEqual(os.stat(snapshot_path(self.inventory_file)).st_ino, written)
+
+    def test_snapshot_rebuilt_when_source_changes(self):
+        """
+        Test that editing the JSON source invalidates the snapshot.
+        """
+        open_snapshot(self.inventory_file).close()
+        with open(self.inventory_file, 'r', encoding='utf-8') as file:
+            content = file.read()
+        with open(self.inventory_file, 'w', encoding='utf-8') as file:
+            file.write(content.replace('"PyProcessor Thunderbolt"', '"PyProcessor Lightning"'))
+
+        snapshot = open_snapshot(self.inventory_file)
+        self.assertEqual(snapshot.get_item("cpu_01").name, "PyProcessor Lightning")
+        snapshot.close()
+
+    def test_overlay_add_and_remove(self):
+        """
+        Test that runtime changes are visible without touching the snapshot file.
+        """
+        snapshot = open_snapshot(self.inventory_file)
+        removed = snapshot.remove_item("CPU_01")
+        self.assertEqual(removed.item_id, "CPU_01")
+        self.assertIsNone(snapshot.get_item("cpu_01"))
+        snapshot.add_item(removed)
+        self.assertIs(snapshot.get_item("cpu_01"), removed)
+        self.assertEqual(len(gen_parts_dict(snapshot)["cpu"]), 5)
+        self.assertIsInstance(snapshot, SnapshotInventory)
+        snapshot.close()
+
+if __name__ == '__main__':
+    unittest.main()
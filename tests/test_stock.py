@@ -0,0 +1,234 @@
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+
+from catalog import make_inventory, make_items
+from src.build import Build
+from src.cart import Cart
+from src.headless import CommandError, CommandSession
+from src.inventory import CPU, RAM, create_item
+from src.stock import OutOfStockError, StockHold, StockLedger, part_counts
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def stocked(item, units):
+    item.stock = units
+    return item
+
+def make_stocked_inventory():
+    cpu, other_cpu, ram = make_items("CPU_01", "CPU_02", "RAM_01")
+    return make_inventory(items=[stocked(cpu, 2), stocked(ram, 3), other_cpu])
+
+class TestStockLedger(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.ledger = StockLedger(hold_seconds=60, clock=self.clock)
+        self.inventory = make_stocked_inventory()
+        self.cpu = self.inventory.get_item("cpu_01")
+        self.ram = self.inventory.get_item("ram_01")
+
+    def test_stock_field_is_optional(self):
+        """
+        Test that catalog entries carry stock only when they list it.
+        """
+        item = create_item({"id": "CPU_09", "type": "CPU", "name": "X", "price": 1,
+                            "power_draw": 1, "socket": "LGA", "stock": "4"})
+        self.assertEqual(item.stock, 4)
+        self.assertIsNone(self.inventory.get_item("cpu_02").stock)
+        self.assertEqual(part_counts([{"CPU": self.cpu, "RAM": [self.ram, self.ram]},
+                                      self.inventory.get_item("cpu_02")]),
+                         {"cpu_01": [self.cpu, 1], "ram_01": [self.ram, 2]})
+        self.assertIsNone(self.ledger.available(self.inventory.get_item("cpu_02")))
+
+    def test_holds_are_all_or_nothing(self):
+        """
+        Test that a hold that cannot be met in full leaves every hold as it was.
+        """
+        first, second = self.ledger.new_holder(), self.ledger.new_holder()
+        self.ledger.hold(first, part_counts([self.cpu, [self.ram, self.ram]]))
+        self.assertEqual(self.ledger.available(self.ram), 1)
+
+        with self.assertRaises(OutOfStockError) as raised:
+            self.ledger.hold(second, part_counts([self.cpu, [self.ram, self.ram]]))
+        self.assertEqual(raised.exception.shortages, {"RAM_01": (2, 1)})
+        self.assertEqual(self.ledger.available(self.cpu), 1)
+        self.assertEqual(self.ledger.available(self.ram), 1)
+
+        # Shrinking a hold frees the units for others
+        self.ledger.hold(first, part_counts([self.cpu]))
+        self.ledger.hold(second, part_counts([self.cpu, [self.ram, self.ram]]))
+        self.assertEqual(self.ledger.available(self.cpu), 0)
+
+    def test_commit_takes_stock(self):
+        """
+        Test that checkout takes the held parts out of stock and fails when they are gone.
+        """
+        first, second = self.ledger.new_holder(), self.ledger.new_holder()
+        self.ledger.hold(first, part_counts([self.ram]))
+        self.ledger.commit(first, part_counts([self.ram]))
+        self.assertEqual(self.ledger.available(self.ram), 2)
+
+        self.ledger.hold(second, part_counts([[self.ram, self.ram]]))
+        with self.assertRaises(OutOfStockError):
+            self.ledger.commit(first, part_counts([[self.ram, self.ram], self.cpu]))
+        self.assertEqual(self.ledger.available(self.cpu), 2)
+        self.ledger.commit(second, part_counts([[self.ram, self.ram]]))
+        self.assertEqual(self.ledger.available(self.ram), 0)
+        self.assertEqual(self.ledger.stats()["committed"], 2)
+
+    def test_holds_expire(self):
+        """
+        Test that the holds of an idle holder lapse and free their units.
+        """
+        holder = self.ledger.new_holder()
+        self.ledger.hold(holder, part_counts([self.cpu, self.cpu]))
+        self.clock.now = 59
+        self.ledger.hold(holder, part_counts([self.cpu, self.cpu]))
+        self.clock.now = 100
+        self.assertEqual(self.ledger.available(self.cpu), 0)
+        self.clock.now = 120
+        self.assertEqual(self.ledger.available(self.cpu), 2)
+        self.assertEqual(self.ledger.stats()["expired"], 1)
+
+        # A lapsed checkout still goes through while nobody took the parts
+        self.ledger.commit(holder, part_counts([self.cpu]))
+        self.assertEqual(self.ledger.available(self.cpu), 1)
+
+    def test_concurrent_checkouts_do_not_oversell(self):
+        """
+        Test that many threads checking out the same parts never sell more than the stock.
+        """
+        ledger = StockLedger(stripes=4)
+        cpu = stocked(CPU("CPU_10", "Hot", 1, 1, "LGA"), 50)
+        ram = stocked(RAM("RAM_10", "Hot", 1, 1, 8), 75)
+        sold = []
+
+        def shop():
+            for _ in range(40):
+                hold = StockHold(ledger)
+                contents = [cpu, ram]
+                hold.sources.append(lambda contents=contents: contents)
+                try:
+                    hold.sync()
+                    hold.commit(contents)
+                    sold.append(1)
+                except OutOfStockError:
+                    hold.release()
+
+        threads = [threading.Thread(target=shop) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(sold), 50)
+        self.assertEqual(ledger.available(cpu), 0)
+        self.assertEqual(ledger.available(ram), 25)
+
+    def test_concurrent_counters(self):
+        """
+        Test that checkouts and refusals of parts on different stripes are all counted.
+        """
+        ledger = StockLedger(stripes=8)
+        parts = [stocked(CPU(f"CPU_{number}", "Hot", 1, 1, "LGA"), 500) for number in range(8)]
+        refused = []
+
+        def shop(part):
+            for _ in range(1000):
+                holder = ledger.new_holder()
+                try:
+                    ledger.commit(holder, part_counts([part]))
+                except OutOfStockError:
+                    refused.append(1)
+
+        threads = [threading.Thread(target=shop, args=(part,)) for part in parts]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        stats = ledger.stats()
+        self.assertEqual(len(refused), 4000)
+        self.assertEqual((stats["committed"], stats["rejected"]), (4000, 4000))
+
+class TestStockHold(unittest.TestCase):
+    def setUp(self):
+        self.ledger = StockLedger()
+        self.inventory = make_stocked_inventory()
+        self.hold = StockHold(self.ledger)
+        self.cart = Cart(MagicMock(), self.inventory, self.hold)
+        self.build = Build(MagicMock(), self.cart, self.inventory, MagicMock(), self.hold)
+        self.cpu = self.inventory.get_item("cpu_01")
+
+    @patch('src.build.clear_screen')
+    def test_build_in_cart_is_held_once(self, _clear):
+        """
+        Test that a build put in the cart holds its parts once, and a part also bought on
+        its own twice.
+        """
+        self.build.add_item("cpu_01")
+        self.cart.add_build(self.build.build, 200)
+        self.assertEqual(self.ledger.available(self.cpu), 1)
+        self.cart.add_item("cpu_01")
+        self.assertEqual(self.ledger.available(self.cpu), 0)
+        self.assertEqual(self.cart.total_cost, 400)
+
+        self.cart.add_item("ram_01")
+        self.assertEqual(set(self.cart.cart), {"BUILD", "CPU_01", "RAM_01"})
+        other = StockHold(self.ledger)
+        other.sources.append(lambda: [self.cpu])
+        with self.assertRaises(OutOfStockError):
+            other.sync()
+
+    @patch('src.build.clear_screen')
+    def test_out_of_stock_build_is_not_added(self, _clear):
+        """
+        Test that a part held by someone else can not be added, and that removing parts
+        frees them.
+        """
+        other = StockHold(self.ledger)
+        other.sources.append(lambda: [self.cpu, self.cpu])
+        other.sync()
+        with patch('builtins.print'):
+            self.assertIsNone(self.build.add_item("cpu_01"))
+        self.assertIsNone(self.build.build["CPU"])
+        with self.assertRaises(OutOfStockError):
+            self.build.load_parts({"CPU": self.cpu})
+        self.assertIsNone(self.build.build["CPU"])
+
+        other.sources.clear()
+        other.refresh()
+        self.assertEqual(self.build.add_item("cpu_01"), self.cpu)
+
+    def test_headless_checkout(self):
+        """
+        Test that headless sessions sharing a ledger can not buy more than the stock.
+        """
+        first, second, third = (CommandSession(self.inventory, stock_ledger=self.ledger)
+                                for _ in range(3))
+        for session in (first, second, third):
+            session.execute("budget 10000")
+        first.execute("build add cpu_01")
+        self.assertEqual(first.execute("details cpu_01")["available"], 1)
+        second.execute("build add cpu_01")
+
+        with self.assertRaises(CommandError):
+            third.execute("cart add cpu_01")
+        with self.assertRaises(CommandError):
+            third.execute("build add cpu_01")
+        self.assertIsNone(third.execute("build show")["parts"]["CPU"])
+
+        first.execute("build clear")
+        third.execute("cart add cpu_01")
+        second.execute("cart add cpu_01")
+        self.assertEqual(second.execute("cart checkout")["item_count"], 1)
+        self.assertEqual(third.execute("cart checkout")["item_count"], 1)
+        with self.assertRaises(CommandError):
+            first.execute("cart add cpu_01")
+        self.assertEqual(self.ledger.available(self.cpu), 0)
+
+if __name__ == '__main__':
+    unittest.main()
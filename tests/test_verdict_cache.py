@@ -0,0 +1,114 @@
+import unittest
+
+from catalog import make_inventory, make_items
+from src.compatibility import Compatibility
+from src.compatibility_matrix import CompatibilityMatrix
+from src.inventory import CPU, RAM, PSU, Motherboard, Storage
+from src.reload import InventoryDiff
+from src.verdict_cache import VerdictCache, multiset_key
+
+def make_verdict_inventory():
+    return make_inventory(items=[*make_items("CPU_01", "MB_01", "MB_02", "RAM_01", "STO_01"),
+                                 PSU("PSU_01", "PowerPy 220", 40, 220)])
+
+class TestVerdictCache(unittest.TestCase):
+    def test_multiset_key(self):
+        """
+        Test that order, case and spacing do not change the key, but counts do.
+        """
+        self.assertEqual(multiset_key(["cpu_01", " RAM_01", "ram_01"]),
+                         multiset_key(["ram_01", "CPU_01", "ram_01"]))
+        self.assertNotEqual(multiset_key(["cpu_01", "ram_01"]),
+                            multiset_key(["cpu_01", "ram_01", "ram_01"]))
+
+    def test_lru_eviction(self):
+        """
+        Test that the least recently used verdict is evicted once the cache is full.
+        """
+        cache = VerdictCache(capacity=2)
+        keys = [(multiset_key([part_id]),) for part_id in ("a", "b", "c")]
+        cache.put(keys[0], 1, [None], {"valid": True})
+        cache.put(keys[1], 1, [None], {"valid": True})
+        cache.get(keys[0], 1, [None])
+        cache.put(keys[2], 1, [None], {"valid": False})
+
+        self.assertIsNone(cache.get(keys[1], 1, [None]))
+        self.assertIsNotNone(cache.get(keys[0], 1, [None]))
+        self.assertEqual(cache.stats()["evictions"], 1)
+        self.assertEqual((cache.hits, cache.misses), (2, 1))
+
+class TestMatrixCaching(unittest.TestCase):
+    def setUp(self):
+        self.inventory = make_verdict_inventory()
+        self.matrix = CompatibilityMatrix(self.inventory)
+
+    def test_repeated_sets_hit(self):
+        """
+        Test that the same parts in another order are answered from the cache.
+        """
+        first = self.matrix.check_set(["cpu_01", "mb_01", "ram_01", "psu_01"])
+        second = self.matrix.check_set(["PSU_01", "ram_01", "MB_01", "cpu_01"])
+
+        self.assertEqual(self.matrix.cache.stats()["hits"], 1)
+        self.assertEqual(second["part_ids"], ["PSU_01", "ram_01", "MB_01", "cpu_01"])
+        self.assertEqual(second["rules"], first["rules"])
+
+    def test_unrelated_change_keeps_entry(self):
+        """
+        Test that a change to a part outside the set does not invalidate its verdict.
+        """
+        self.matrix.check_set(["cpu_01", "mb_01"])
+        self.inventory.replace_item(Motherboard("MB_02", "BoardPlus", 99, 50, "AM4", 4))
+        self.matrix.check_set(["cpu_01", "mb_01"])
+
+        self.assertEqual(self.matrix.cache.stats()["hits"], 1)
+        self.assertEqual(self.matrix.cache.stats()["invalidations"], 0)
+
+    def test_member_change_invalidates(self):
+        """
+        Test that replacing or adding a member part gives a fresh verdict.
+        """
+        self.assertTrue(self.matrix.check_set(["cpu_01", "mb_01"])["valid"])
+        self.inventory.replace_item(Motherboard("MB_01", "BoardBasic", 100, 50, "AM4", 2))
+        self.assertFalse(self.matrix.check_set(["cpu_01", "mb_01"])["valid"])
+
+        self.assertFalse(self.matrix.check_set(["cpu_01", "gpu_01"])["valid"])
+        self.inventory.add_item(Storage("GPU_01", "Not a GPU", 10, 10))
+        self.assertTrue(self.matrix.check_set(["cpu_01", "gpu_01"])["valid"])
+        self.assertEqual(self.matrix.cache.stats()["invalidations"], 2)
+
+    def test_build_check_compares_items(self):
+        """
+        Test that a build holding a different item under a cached ID is re-evaluated.
+        """
+        build = {"CPU": self.inventory.get_item("cpu_01"), "GPU": None,
+                 "RAM": [self.inventory.get_item("ram_01")],
+                 "PSU": self.inventory.get_item("psu_01"),
+                 "Motherboard": self.inventory.get_item("mb_01"),
+                 "Storage": [self.inventory.get_item("sto_01")]}
+        self.assertTrue(self.matrix.check_build(build)["valid"])
+        self.assertTrue(self.matrix.check_build(dict(build))["valid"])
+        build["PSU"] = PSU("PSU_01", "PowerPy 100", 40, 100)
+
+        self.assertFalse(self.matrix.check_build(build)["valid"])
+        self.assertEqual(self.matrix.cache.stats()["hits"], 1)
+
+class TestCompatibilityCache(unittest.TestCase):
+    def test_reload_invalidates(self):
+        """
+        Test that an applied inventory diff drops the verdicts of its parts.
+        """
+        inventory = make_verdict_inventory()
+        compatibility = Compatibility(inventory)
+        compatibility.check_parts(["cpu_01", "mb_01"])
+        compatibility.check_parts(["cpu_01", "psu_01"])
+        compatibility.check_parts(["ram_01", "sto_01"])
+        diff = InventoryDiff()
+        diff.changed.append((inventory.get_item("cpu_01"), inventory.get_item("cpu_01")))
+
+        self.assertEqual(compatibility.apply_inventory_diff(diff), [])
+        self.assertEqual(compatibility.cache_stats()["invalidations"], 2)
+        self.assertEqual(compatibility.cache_stats()["size"], 1)
+
+if __name__ == '__main__':
+    unittest.main()
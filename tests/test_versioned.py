@@ -0,0 +1,113 @@
+import threading
+import unittest
+
+from src.inventory import CPU, PSU, Motherboard, Inventory
+from src.versioned import VersionedInventory, CHUNK_SIZE
+
+class TestVersionedInventory(unittest.TestCase):
+    def setUp(self):
+        self.cpu = CPU("CPU_01", "PyProcessor Thunderbolt", 100, 400, "LGA")
+        self.board = Motherboard("MB_01", "BoardBasic", 100, 50, "LGA", 4)
+        self.inventory = VersionedInventory([self.cpu, self.board])
+
+    def test_matches_inventory_interface(self):
+        """
+        Test that lookups and indexes behave like the regular Inventory.
+        """
+        self.assertEqual(self.inventory.version, 1)
+        self.assertIs(self.inventory.get_item("cpu_01"), self.cpu)
+        self.assertEqual(self.inventory.get_items_by_socket("Motherboard", "LGA"), [self.board])
+        self.assertEqual(self.inventory.get_ram_slot_counts(), [4])
+        with self.assertRaises(ValueError):
+            self.inventory.add_item(CPU("cpu_01", "Other", 1, 1, "PGA"))
+        self.assertEqual(self.inventory.version, 1)
+
+        self.assertIs(self.inventory.remove_item("MB_01"), self.board)
+        self.assertEqual(self.inventory.get_ram_slot_counts(), [])
+        self.assertEqual(len(self.inventory), 1)
+
+    def test_pinned_reader_sees_one_version(self):
+        """
+        Test that updates published while a version is pinned are invisible to the reader.
+        """
+        new_cpu = CPU("CPU_01", "PyProcessor Thunderbolt", 150, 400, "LGA")
+        with self.inventory.pin() as version:
+            self.inventory.replace_item(new_cpu)
+            self.inventory.remove_item("mb_01")
+            self.assertIs(self.inventory.get_item("cpu_01"), self.cpu)
+            self.assertEqual(version.get_items_by_type("Motherboard"), [self.board])
+            self.assertEqual(self.inventory.retained_versions(), [1])
+
+        self.assertIs(self.inventory.get_item("cpu_01"), new_cpu)
+        self.assertEqual(self.inventory.retained_versions(), [])
+
+    def test_other_threads_are_not_pinned(self):
+        """
+        Test that a pin only applies to the thread that holds it.
+        """
+        seen = []
+        with self.inventory.pin():
+            self.inventory.remove_item("cpu_01")
+            thread = threading.Thread(target=lambda: seen.append(
+                self.inventory.get_item("cpu_01")))
+            thread.start()
+            thread.join()
+        self.assertEqual(seen, [None])
+
+    def test_update_is_atomic(self):
+        """
+        Test that a failing update publishes none of its changes.
+        """
+        with self.assertRaises(ValueError):
+            with self.inventory.update() as writer:
+                writer.add_item(PSU("PSU_01", "Power", 50, 500))
+                writer.add_item(CPU("CPU_01", "Duplicate", 1, 1, "LGA"))
+        self.assertIsNone(self.inventory.get_item("psu_01"))
+        self.assertEqual(self.inventory.version, 1)
+
+    def test_unchanged_chunks_are_shared(self):
+        """
+        Test that publishing a version copies only the touched chunk.
+        """
+        items = [CPU(f"CPU_{number:03d}", "Processor", number, 10, "LGA")
+                 for number in range(CHUNK_SIZE * 3)]
+        inventory = VersionedInventory(items)
+        before = inventory.current
+        inventory.replace_item(CPU("CPU_000", "Processor", 999, 10, "LGA"))
+        after = inventory.current
+
+        # pylint: disable=protected-access
+        self.assertIsNot(before._item_chunks[0], after._item_chunks[0])
+        self.assertIs(before._item_chunks[1], after._item_chunks[1])
+        self.assertIs(before._item_chunks[2], after._item_chunks[2])
+        self.assertEqual(before.get_item("cpu_000").price, 0)
+        self.assertEqual([item.price for item in after.get_items_by_type("CPU")][:2], [999, 1])
+
+    def test_matches_inventory_after_churn(self):
+        """
+        Test that the indexes agree with Inventory after many adds, removes and moves.
+        """
+        reference = Inventory()
+        inventory = VersionedInventory()
+        for number in range(300):
+            board = Motherboard(f"MB_{number % 40}", "Board", number, 10,
+                                ("LGA", "PGA")[number % 2], 2 + number % 3)
+            for backend in (reference, inventory):
+                if backend.get_item(board.item_id) is None:
+                    backend.add_item(board)
+                elif number % 5:
+                    backend.replace_item(board)
+                else:
+                    backend.remove_item(board.item_id)
+
+        self.assertEqual(sorted(item.item_id for item in inventory.items),
+                         sorted(item.item_id for item in reference.items))
+        self.assertEqual(inventory.get_ram_slot_counts(), reference.get_ram_slot_counts())
+        for socket in ("LGA", "PGA"):
+            self.assertEqual(sorted(item.item_id for item in
+                                    inventory.get_items_by_socket("Motherboard", socket)),
+                             sorted(item.item_id for item in
+                                    reference.get_items_by_socket("Motherboard", socket)))
+
+if __name__ == '__main__':
+    unittest.main()